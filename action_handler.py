@@ -11,6 +11,9 @@ import psutil  # Para verificar processos
 import subprocess  # Para executar comandos do sistema
 import google.generativeai as genai
 from dotenv import load_dotenv
+from jarvis_tips import TipStore
+from jarvis_intents import IntentRouter
+from jarvis_processes import get_process_service
 
 # Configurações de segurança do PyAutoGUI
 pyautogui.FAILSAFE = True  # Fail-safe: mover mouse para canto superior esquerdo para
@@ -32,13 +35,16 @@ class ActionHandler:
         self.command_count = 0
         self.max_commands_per_session = 10
         
+        # Memória de longo prazo (dicas e erros resolvidos)
+        self.tip_store = TipStore()
+        
+        # Intenções dos comandos de ação (tabela 'actions' compilada)
+        self.intent_router = IntentRouter.for_scope('actions')
+        
     def _is_process_active(self, process_name):
         """Verifica se um processo está ativo"""
         try:
-            for proc in psutil.process_iter(['name']):
-                if process_name.lower() in proc.info['name'].lower():
-                    return True
-            return False
+            return get_process_service().is_running(process_name)
         except:
             return False
     
@@ -758,39 +764,14 @@ Analise a imagem e ajude o programador a resolver este erro.
                 print(f"⚠️ Erro ao remover arquivo temporário: {cleanup_error}")
     
     def _salvar_erro_resolvido(self, analise):
-        """Salva análise de erro no JSON de memória"""
+        """Salva análise de erro na memória de longo prazo"""
         try:
-            import json
-            import datetime
-            
-            # Carrega dados existentes
-            memoria_file = 'memoria_jarvis.json'
-            dados = {}
-            
-            if os.path.exists(memoria_file):
-                with open(memoria_file, 'r', encoding='utf-8') as f:
-                    dados = json.load(f)
-            
-            # Adiciona novo erro resolvido
-            if 'erros_resolvidos' not in dados:
-                dados['erros_resolvidos'] = []
-            
-            erro_entry = {
-                'data': datetime.datetime.now().isoformat(),
-                'tipo': 'debugging',
-                'analise': analise[:500] + '...' if len(analise) > 500 else analise,
-                'tags': ['erro', 'debug', 'python', 'traceback']
-            }
-            
-            dados['erros_resolvidos'].append(erro_entry)
-            
-            # Mantém apenas os últimos 50 erros
-            if len(dados['erros_resolvidos']) > 50:
-                dados['erros_resolvidos'] = dados['erros_resolvidos'][-50:]
-            
-            # Salva no arquivo
-            with open(memoria_file, 'w', encoding='utf-8') as f:
-                json.dump(dados, f, ensure_ascii=False, indent=2)
+            self.tip_store.add(
+                'erro',
+                analise[:500] + '...' if len(analise) > 500 else analise,
+                ['erro', 'debug', 'python', 'traceback'],
+                tipo='debugging'
+            )
             
             print("💾 Erro resolvido salvo na memória de longo prazo")
             
@@ -798,44 +779,20 @@ Analise a imagem e ajude o programador a resolver este erro.
             print(f"⚠️ Erro ao salvar erro na memória: {e}")
     
     def buscar_dica_memoria(self, termo_busca):
-        """Busca dicas no JSON de memória de longo prazo"""
+        """Busca dicas na memória de longo prazo"""
         try:
-            import json
-            
-            memoria_file = 'memoria_jarvis.json'
-            
-            if not os.path.exists(memoria_file):
+            if not len(self.tip_store):
                 return "Ainda não tenho dicas salvas na memória, mestre. Vamos construir esse conhecimento juntos!"
             
-            with open(memoria_file, 'r', encoding='utf-8') as f:
-                dados = json.load(f)
-            
+            # Busca indexada: apenas as entradas candidatas são verificadas
             resultados = []
-            termo_lower = termo_busca.lower()
-            
-            # Busca em erros resolvidos
-            if 'erros_resolvidos' in dados:
-                for erro in dados['erros_resolvidos']:
-                    if (termo_lower in erro.get('analise', '').lower() or 
-                        any(termo_lower in tag.lower() for tag in erro.get('tags', []))):
-                        resultados.append({
-                            'tipo': 'Erro Resolvido',
-                            'data': erro.get('data', ''),
-                            'conteudo': erro.get('analise', '')[:200] + '...',
-                            'tags': erro.get('tags', [])
-                        })
-            
-            # Busca em dicas gerais
-            if 'dicas_importantes' in dados:
-                for dica in dados['dicas_importantes']:
-                    if (termo_lower in dica.get('conteudo', '').lower() or 
-                        any(termo_lower in tag.lower() for tag in dica.get('tags', []))):
-                        resultados.append({
-                            'tipo': 'Dica Importante',
-                            'data': dica.get('data', ''),
-                            'conteudo': dica.get('conteudo', '')[:200] + '...',
-                            'tags': dica.get('tags', [])
-                        })
+            for entrada in self.tip_store.search(termo_busca):
+                resultados.append({
+                    'tipo': TipStore.KIND_LABELS.get(entrada['kind'], entrada['kind']),
+                    'data': entrada.get('data', ''),
+                    'conteudo': entrada.get('conteudo', '')[:200] + '...',
+                    'tags': entrada.get('tags', [])
+                })
             
             if not resultados:
                 return f"Não encontrei dicas sobre '{termo_busca}' na memória, mestre. Quer que eu salve esta informação para futuras consultas?"
@@ -860,39 +817,10 @@ Analise a imagem e ajude o programador a resolver este erro.
             print(f"⚠️ Erro ao buscar na memória: {str(e)}, mestre.")
     
     def salvar_dica_memoria(self, dica):
-        """Salva uma dica importante no JSON de memória"""
+        """Salva uma dica importante na memória de longo prazo"""
         try:
-            import json
-            import datetime
-            
-            memoria_file = 'memoria_jarvis.json'
-            dados = {}
-            
-            # Carrega dados existentes
-            if os.path.exists(memoria_file):
-                with open(memoria_file, 'r', encoding='utf-8') as f:
-                    dados = json.load(f)
-            
-            # Adiciona nova dica
-            if 'dicas_importantes' not in dados:
-                dados['dicas_importantes'] = []
-            
-            dica_entry = {
-                'data': datetime.datetime.now().isoformat(),
-                'conteudo': dica,
-                'tags': ['dica', 'importante', 'usuario'],
-                'categoria': 'geral'
-            }
-            
-            dados['dicas_importantes'].append(dica_entry)
-            
-            # Mantém apenas as últimas 100 dicas
-            if len(dados['dicas_importantes']) > 100:
-                dados['dicas_importantes'] = dados['dicas_importantes'][-100:]
-            
-            # Salva no arquivo
-            with open(memoria_file, 'w', encoding='utf-8') as f:
-                json.dump(dados, f, ensure_ascii=False, indent=2)
+            # Acrescenta uma linha ao arquivo; o limite de dicas é a política de retenção do TipStore
+            self.tip_store.add('dica', dica, ['dica', 'importante', 'usuario'], categoria='geral')
             
             print("💾 Dica salva na memória de longo prazo")
             return "✅ Dica salva com sucesso na memória, mestre!"
@@ -902,64 +830,71 @@ Analise a imagem e ajude o programador a resolver este erro.
             return f"❌ Erro ao salvar dica: {str(e)}, mestre."
     
     def process_command(self, command, ai_model=None):
-        """Processa um comando e executa a ação correspondente"""
+        """Processa um comando e executa a ação correspondente
+        
+        A intenção é reconhecida em uma única passada pelo IntentRouter
+        (tabela 'actions' de jarvis_intents) e despachada para o método do
+        comando.
+        """
+        match = self.intent_router.classify(command)
+        if match is None:
+            return None  # Retorna None se não encontrar comando correspondente
         
-        # Verifica se é comando do Modo Gamer
-        command_lower = command.lower()
+        intent = match.intent
         
-        # Verifica se é comando de menu
-        if any(keyword in command_lower for keyword in ['menu', 'comandos', 'ajuda', 'o que você sabe fazer']):
+        if intent == "menu":
             return self.menu_comandos()
         
-        # Verifica se é comando do Modo Estudo
-        if "modo estudo" in command_lower or "modostudo" in command_lower:
+        # Modo Estudo
+        if intent == "study_mode":
             return self.ativar_modo_estudo()
         
-        # Verifica se é comando do Modo Debugger Assistido
-        if "por que falhou" in command_lower or "debugger" in command_lower:
+        # Modo Debugger Assistido
+        if intent == "debugger":
             return self.modo_debugger_assistido()
         
-        # Verifica se é comando de busca na memória
-        if "lembra daquela dica" in command_lower or "busca dica" in command_lower:
+        # Busca na memória
+        if intent == "search_tip":
             # Extrai termo de busca
-            termo = command_lower.replace("lembra daquela dica", "").replace("busca dica", "").strip()
+            termo = command.lower().replace("lembra daquela dica", "").replace("busca dica", "").strip()
             if termo:
                 return self.buscar_dica_memoria(termo)
             else:
                 return "Por favor, especifique o que você quer lembrar, mestre. Ex: 'lembra daquela dica python'"
         
-        # Verifica se é comando para salvar dica
-        if command_lower.startswith("salvar dica:"):
+        # Salvar dica ("salvar dica:" no início)
+        if intent == "save_tip":
             dica = command[12:].strip()  # Remove "salvar dica:" do início
             if dica:
                 return self.salvar_dica_memoria(dica)
             else:
                 return "Por favor, forneça a dica para salvar, mestre. Ex: 'salvar dica: Sempre use try/except'"
         
-        if "modo gamer" in command_lower or "modogamer" in command_lower:
-            if "encerrar" in command_lower or "fechar" in command_lower or "desativar" in command_lower:
+        # Modo Gamer
+        if intent == "gamer_mode":
+            if match.slots.get("turn_off"):
                 return self.encerrar_modo_gamer()
             else:
                 return self.ativar_modo_gamer()
         
-        # Verifica se é comando Git
-        if command_lower.startswith("git:"):
+        # Git ("git:" no início)
+        if intent == "git_commit":
             mensagem_commit = command[4:].strip()  # Remove "git:" do início
             if mensagem_commit:
                 return self.git_commit(mensagem_commit)
             else:
                 return "Por favor, forneça uma mensagem para o commit, mestre."
         
-        # Verifica se é comando de análise de tela
-        if any(keyword in command_lower for keyword in ['olhe a tela', 'analise a tela', 'veja a tela']):
+        # Análise de tela
+        if intent == "screen_analysis":
             return self.analisar_tela(ai_model)
         
-        # Verifica se é comando para gerar código
-        if any(word in command_lower for word in ['escreva um código', 'gere um código', 'crie um código', 'gerar código', 'escrever código']):
+        # Gerar código
+        if intent == "generate_code":
             return self.gerar_e_colar_codigo(command, ai_model)
         
-        # Verifica se é comando para explicar erro
-        if any(word in command_lower for word in ['explique o erro', 'qual o erro', 'corrija o erro']):
+        # Explicar erro
+        if intent == "explain_error":
             return self.explicar_erro(command, ai_model)
         
         return None  # Retorna None se não encontrar comando correspondente
@@ -10,6 +10,7 @@ import pyperclip
 import psutil  # Para verificar processos
 import google.generativeai as genai
 from dotenv import load_dotenv
+from jarvis_processes import get_process_service
 
 # Configurações de segurança do PyAutoGUI
 pyautogui.FAILSAFE = True  # Fail-safe: mover mouse para canto superior esquerdo para
@@ -34,10 +35,7 @@ class ActionHandler:
     def _is_process_active(self, process_name):
         """Verifica se um processo está ativo"""
         try:
-            for proc in psutil.process_iter(['name']):
-                if process_name.lower() in proc.info['name'].lower():
-                    return True
-            return False
+            return get_process_service().is_running(process_name)
         except:
             return False
     
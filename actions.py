@@ -14,6 +14,7 @@ import random
 import string
 import re
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
 
@@ -26,6 +27,13 @@ from bs4 import BeautifulSoup
 
 # ==================== MÓDULOS PRÓPRIOS ====================
 from config import Config
+from jarvis_app_index import get_app_index, name_variations
+from jarvis_app_matcher import FuzzyAppMatcher, is_system_path
+from jarvis_hardware import get_hardware_sampler
+from jarvis_processes import get_process_service
+from jarvis_http import get_http_client
+from jarvis_currency import CurrencyService, CURRENCY_NAMES
+from jarvis_prefetch import PrefetchScheduler, PrefetchTask
 try:
     import pycaw
     from comtypes import CLSCTX_ALL
@@ -40,6 +48,75 @@ try:
 except ImportError:
     WMI_AVAILABLE = False
 
+# Mapeamento estrito de termos para executáveis (erros de digitação ficam com o FuzzyAppMatcher)
+MAPEAMENTO_ESTRITO = {
+    # Notepad - múltiplas combinações
+    'bloco': 'notepad.exe',
+    'notas': 'notepad.exe',
+    'bloco notas': 'notepad.exe',
+    'anotacoes': 'notepad.exe',
+    'texto': 'notepad.exe',
+    'editor texto': 'notepad.exe',
+    
+    # Calculadora
+    'calc': 'calc.exe',
+    'calculadora': 'calc.exe',
+    'calcular': 'calc.exe',
+    
+    # CMD/Terminal
+    'cmd': 'cmd.exe',
+    'prompt': 'cmd.exe',
+    'terminal': 'cmd.exe',
+    'linha comando': 'cmd.exe',
+    'comando': 'cmd.exe',
+    
+    # PowerShell
+    'powershell': 'powershell.exe',
+    'power shell': 'powershell.exe',
+    
+    # Explorador
+    'explorer': 'explorer.exe',
+    'arquivos': 'explorer.exe',
+    'gerenciador arquivos': 'explorer.exe',
+    
+    # Task Manager
+    'task': 'taskmgr.exe',
+    'taskmgr': 'taskmgr.exe',
+    'gerenciador tarefas': 'taskmgr.exe',
+    'tarefas': 'taskmgr.exe',
+    
+    # Painel de Controle
+    'painel': 'control.exe',
+    'controle': 'control.exe',
+    'painel controle': 'control.exe',
+    
+    # Paint
+    'paint': 'mspaint.exe',
+    'desenho': 'mspaint.exe',
+    'mspaint': 'mspaint.exe',
+    
+    # Deep Links Windows
+    'configuracoes': 'ms-settings:',
+    'settings': 'ms-settings:',
+    'loja': 'ms-windows-store:',
+    'store': 'ms-windows-store:',
+    'defender': 'ms-settings:windowsdefender',
+    'antivirus': 'ms-settings:windowsdefender',
+    'atualizacoes': 'ms-settings:windowsupdate-action',
+    'update': 'ms-settings:windowsupdate-action',
+    'rede': 'ms-settings:network',
+    'som': 'ms-settings:sound',
+    'audio': 'ms-settings:sound',
+    'energia': 'ms-settings:powersleep',
+    'bateria': 'ms-settings:powersleep',
+    'notificacoes': 'ms-settings:notifications',
+    'privacidade': 'ms-settings:privacy',
+    'contas': 'ms-settings:yourinfo',
+    'hora': 'ms-settings:dateandtime',
+    'data': 'ms-settings:dateandtime',
+    'acessibilidade': 'ms-settings:easeofaccess'
+}
+
 class SystemActions:
     """Classe responsável por todas as ações do sistema J.A.R.V.I.S. Mark 13.
     
@@ -78,6 +155,28 @@ class SystemActions:
         # Inicializa lista de lembretes
         self.reminders = []
         
+        # Catálogo de executáveis para a busca universal (atualizado em segundo plano)
+        self.app_index = get_app_index()
+        
+        # Índice aproximado dos sinônimos; o catálogo entra quando o índice muda
+        self.app_matcher = FuzzyAppMatcher(MAPEAMENTO_ESTRITO)
+        
+        # Métricas de hardware coletadas em segundo plano (status sem bloquear)
+        self.hardware = get_hardware_sampler()
+        self.processes = get_process_service()
+        
+        # Sessão HTTP compartilhada com cache (clima, cotações e notícias)
+        self.http = get_http_client()
+        self._parsed_news = (None, [])
+        
+        # Tabela de cotações: todas as moedas em um único download, pares cruzados incluídos
+        currency = Config.CURRENCY_CONFIG
+        self.currency = CurrencyService(ttl=currency['cache_ttl'], stale_ttl=currency['stale_ttl'],
+                                        period=currency['batch_period'], timeout=currency['timeout'])
+        
+        # Aquecimento dos comandos rápidos (iniciado por start_prefetch)
+        self.prefetch = None
+        
         if self.logger:
             self.logger.info("SystemActions inicializado", "ACTIONS")
             self.logger.system("Módulo de ações do sistema carregado", "INIT")
@@ -136,94 +235,57 @@ class SystemActions:
         # Log do nome processado
         self.logger.system(f"[DEBUG] Nome processado: '{nome_processado}' (palavras-chave: {palavras_chave})", "APP")
         
-        # Mapeamento estrito de termos para executáveis
-        mapeamento_estrito = {
-            # Notepad - múltiplas combinações
-            'bloco': 'notepad.exe',
-            'notas': 'notepad.exe',
-            'bloco notas': 'notepad.exe',
-            'bloc notas': 'notepad.exe',  # Para erros de digitação
-            'blocde notas': 'notepad.exe',  # Para erros de digitação
-            'anotacoes': 'notepad.exe',
-            'texto': 'notepad.exe',
-            'editor texto': 'notepad.exe',
-            
-            # Calculadora
-            'calc': 'calc.exe',
-            'calculadora': 'calc.exe',
-            'calcular': 'calc.exe',
-            
-            # CMD/Terminal
-            'cmd': 'cmd.exe',
-            'prompt': 'cmd.exe',
-            'terminal': 'cmd.exe',
-            'linha comando': 'cmd.exe',
-            'comando': 'cmd.exe',
-            
-            # PowerShell
-            'powershell': 'powershell.exe',
-            'power shell': 'powershell.exe',
-            'powershel': 'powershell.exe',  # Para erros de digitação
-            
-            # Explorador
-            'explorer': 'explorer.exe',
-            'arquivos': 'explorer.exe',
-            'gerenciador arquivos': 'explorer.exe',
-            
-            # Task Manager
-            'task': 'taskmgr.exe',
-            'taskmgr': 'taskmgr.exe',
-            'gerenciador tarefas': 'taskmgr.exe',
-            'tarefas': 'taskmgr.exe',
-            
-            # Painel de Controle
-            'painel': 'control.exe',
-            'controle': 'control.exe',
-            'painel controle': 'control.exe',
-            
-            # Paint
-            'paint': 'mspaint.exe',
-            'desenho': 'mspaint.exe',
-            'mspaint': 'mspaint.exe',
-            
-            # Deep Links Windows
-            'configuracoes': 'ms-settings:',
-            'settings': 'ms-settings:',
-            'loja': 'ms-windows-store:',
-            'store': 'ms-windows-store:',
-            'defender': 'ms-settings:windowsdefender',
-            'antivirus': 'ms-settings:windowsdefender',
-            'atualizacoes': 'ms-settings:windowsupdate-action',
-            'update': 'ms-settings:windowsupdate-action',
-            'rede': 'ms-settings:network',
-            'som': 'ms-settings:sound',
-            'audio': 'ms-settings:sound',
-            'energia': 'ms-settings:powersleep',
-            'bateria': 'ms-settings:powersleep',
-            'notificacoes': 'ms-settings:notifications',
-            'privacidade': 'ms-settings:privacy',
-            'contas': 'ms-settings:yourinfo',
-            'hora': 'ms-settings:dateandtime',
-            'data': 'ms-settings:dateandtime',
-            'acessibilidade': 'ms-settings:easeofaccess'
-        }
-        
         # 1. Verifica no mapeamento estrito
-        if nome_processado in mapeamento_estrito:
-            comando = mapeamento_estrito[nome_processado]
+        if nome_processado in MAPEAMENTO_ESTRITO:
+            comando = MAPEAMENTO_ESTRITO[nome_processado]
             self.logger.system(f"[DEBUG] Mapeamento estrito: '{nome_processado}' → '{comando}'", "APP")
             return self._executar_comando_direto(comando, app_name)
         
-        # 2. Verifica se contém palavras-chave específicas
-        for chave, comando in mapeamento_estrito.items():
-            if chave in nome_processado:
-                self.logger.system(f"[DEBUG] Palavra-chave encontrada: '{chave}' → '{comando}'", "APP")
-                return self._executar_comando_direto(comando, app_name)
+        # 2. Busca aproximada só nos sinônimos: erros de digitação e nome contido na frase
+        candidato = self._get_app_matcher().best(nome_processado, sources=('synonym',))
+        if candidato:
+            self.logger.system(f"[DEBUG] Busca aproximada: '{candidato.name}' → '{candidato.target}' "
+                               f"({candidato.reason}, confiança {candidato.score:.2f})", "APP")
+            return self._executar_comando_direto(candidato.target, app_name)
         
         # 3. Se não encontrou, tenta fallback inteligente
         self.logger.system(f"[DEBUG] Não encontrado no mapeamento, tentando fallback: '{nome_processado}'", "APP")
         return self._fallback_inteligente(nome_processado, app_name)
     
+    def _get_app_matcher(self) -> FuzzyAppMatcher:
+        """Matcher com o catálogo atual do AppIndex (reconstruído só quando o índice muda)
+        
+        Executáveis da pasta do Windows ficam de fora: estão no PATH e são
+        encontrados pelo nome exato, e um erro de digitação não pode virar
+        logoff.exe ou format.exe.
+        """
+        generation = self.app_index.generation
+        if self.app_matcher.generation != generation:
+            catalog = [(stem, path) for stem, path, _ in self.app_index.entries() if not is_system_path(path)]
+            self.app_matcher.set_catalog(catalog, generation)
+        return self.app_matcher
+    
+    def _catalog_lookup(self, app_name: str, original_name: str) -> Optional[str]:
+        """Catálogo de executáveis: o nome exato abre o app, nomes parecidos viram sugestão"""
+        candidatos = self._get_app_matcher().match(app_name, limit=3, min_score=0.8, sources=('catalog',))
+        if not candidatos:
+            return None
+        
+        melhor = candidatos[0]
+        self.logger.system(f"[DEBUG] Catálogo: {[(c.name, c.score) for c in candidatos]}", "APP")
+        if melhor.reason == 'exato':
+            try:
+                os.startfile(melhor.target)
+                self.logger.info(f"App encontrado no catálogo: {melhor.target}", "ACTIONS")
+                return f"{original_name.title()} acessado, senhor."
+            except Exception as e:
+                self.logger.warning(f"Falha ao abrir {melhor.target}: {e}", "ACTIONS")
+                return None
+        
+        # Parecido não é o mesmo app: nada é aberto sem o nome certo
+        nomes = ', '.join(candidato.name for candidato in candidatos)
+        return f"Não encontrei {original_name}, senhor. Você quis dizer: {nomes}?"
+    
     def _extrair_palavras_chave(self, texto: str) -> List[str]:
         """Extrai palavras-chave ignorando preposições"""
         # Lista de preposições e palavras irrelevantes
@@ -433,6 +495,11 @@ class SystemActions:
                 except Exception:
                     continue
             
+            # Catálogo de executáveis (depois do PATH e das pastas conhecidas)
+            resultado_catalogo = self._catalog_lookup(app_name, original_name)
+            if resultado_catalogo:
+                return resultado_catalogo
+            
             # Último recurso: busca no Google
             self.logger.system(f"[DEBUG] Último recurso: busca no Google para: {app_name}", "APP")
             import webbrowser
@@ -524,57 +591,19 @@ class SystemActions:
                 self.logger.error(e, f"Protocolo falhou para {app_name}", "ACTIONS")
                 return f"❌ Senhor, o sistema operacional recusou o protocolo. Verifique se o caminho está correto."
         
-        # 2. Para outros apps, usa where para encontrar o caminho real (busca agressiva)
-        try:
-            self.logger.system(f"Buscando caminho com 'where {app_name_lower}'", "APP")
-            where_result = os.popen(f'where {app_name_lower}').read().strip()
-            
-            if where_result:
-                # Pega a primeira linha (caminho mais relevante)
-                exe_path = where_result.split('\n')[0].strip()
-                self.logger.system(f"Encontrado: {exe_path}", "APP")
-                
-                try:
-                    os.startfile(exe_path)
-                    self.logger.info(f"Aplicativo executado com os.startfile: {exe_path}", "ACTIONS")
-                    return f"{app_name.title()} acessado, senhor."
-                except Exception as e:
-                    self.logger.error(e, f"Erro ao executar {app_name}", "ACTIONS")
-                    return f"❌ Senhor, o sistema operacional recusou o protocolo. Verifique se o caminho está correto."
-            else:
-                self.logger.system(f"{app_name} não encontrado com 'where'", "APP")
-                
-        except Exception as e:
-            self.logger.error(e, f"Erro no comando 'where'", "ACTIONS")
-        
-        # 2.1. Busca com variações do nome (busca agressiva)
-        name_variations = [
-            app_name_lower,
-            app_name_lower.replace(' ', ''),
-            app_name_lower.replace('-', ''),
-            app_name_lower.replace('_', ''),
-            app_name_lower + '.exe',
-            app_name_lower.replace(' ', '') + '.exe'
-        ]
-        
-        for variation in name_variations:
-            try:
-                self.logger.system(f"Tentando variação: 'where {variation}'", "APP")
-                where_result = os.popen(f'where {variation}').read().strip()
-                
-                if where_result:
-                    exe_path = where_result.split('\n')[0].strip()
-                    self.logger.system(f"Encontrado com variação: {exe_path}", "APP")
-                    
-                    try:
-                        os.startfile(exe_path)
-                        self.logger.info(f"Aplicativo executado com variação: {exe_path}", "ACTIONS")
-                        return f"{app_name.title()} acessado, senhor."
-                    except Exception as e:
-                        continue
-                        
-            except Exception:
+        # 2. Executáveis no PATH, com variações do nome (equivalente ao 'where', sem abrir processos)
+        for variation in name_variations(app_name_lower):
+            exe_path = shutil.which(variation)
+            if not exe_path:
                 continue
+            self.logger.system(f"Encontrado no PATH: {exe_path}", "APP")
+            try:
+                os.startfile(exe_path)
+                self.logger.info(f"Aplicativo executado com os.startfile: {exe_path}", "ACTIONS")
+                return f"{app_name.title()} acessado, senhor."
+            except Exception as e:
+                self.logger.error(e, f"Erro ao executar {app_name}", "ACTIONS")
+                return f"❌ Senhor, o sistema operacional recusou o protocolo. Verifique se o caminho está correto."
         
         # 2.2. Caminhos absolutos conhecidos para aplicativos comuns
         known_paths = {
@@ -608,53 +637,16 @@ class SystemActions:
                 except Exception as e:
                     self.logger.error(e, f"Erro ao executar caminho conhecido: {known_path}", "ACTIONS")
         
-        # 3. Se não encontrar com where, tenta busca direta em pastas comuns
-        search_paths = [
-            fr"C:\Program Files",
-            fr"C:\Program Files (x86)",
-            fr"C:\Users\{os.getenv('USERNAME')}\AppData\Local",
-            fr"C:\Users\{os.getenv('USERNAME')}\AppData\Roaming",
-            fr"C:\Users\{os.getenv('USERNAME')}\Desktop",
-            "C:\\Windows\\System32"
-        ]
-        
-        # Nomes possíveis de executáveis para buscar
-        possible_names = [
-            f"{app_name}.exe",
-            f"{app_name_lower}.exe",
-            f"{app_name.replace(' ', '')}.exe",
-            f"{app_name_lower.replace(' ', '')}.exe",
-            app_name,
-            app_name_lower
-        ]
-        
-        self.logger.system("Buscando em pastas do Windows...", "APP")
-        
-        for search_path in search_paths:
-            if not os.path.exists(search_path):
-                continue
-                
-            for possible_name in possible_names:
-                try:
-                    # Busca recursiva com glob
-                    pattern = os.path.join(search_path, "**", possible_name)
-                    matches = glob.glob(pattern, recursive=True)
-                    
-                    if matches:
-                        # Pega o primeiro match mais relevante
-                        best_match = matches[0]
-                        self.logger.system(f"Encontrado: {best_match}", "APP")
-                        
-                        try:
-                            os.startfile(best_match)
-                            self.logger.info(f"Aplicativo encontrado e executado: {best_match}", "ACTIONS")
-                            return f"{app_name.title()} acessado, senhor."
-                        except Exception as e:
-                            self.logger.error(e, f"Erro ao executar {app_name}", "ACTIONS")
-                            continue
-                                
-                except Exception as e:
-                    continue
+        # 3. Catálogo de executáveis (Program Files, AppData, Desktop, System32)
+        best_match = self.app_index.find(app_name)
+        if best_match:
+            self.logger.system(f"Encontrado no índice: {best_match}", "APP")
+            try:
+                os.startfile(best_match)
+                self.logger.info(f"Aplicativo encontrado e executado: {best_match}", "ACTIONS")
+                return f"{app_name.title()} acessado, senhor."
+            except Exception as e:
+                self.logger.error(e, f"Erro ao executar {app_name}", "ACTIONS")
         
         # 4. Se for pasta, tenta abrir com explorer
         if any(keyword in app_name_lower for keyword in ['pasta', 'folder', 'downloads', 'documents', 'desktop', 'pictures', 'music', 'videos']):
@@ -662,23 +654,11 @@ class SystemActions:
         
         # 5. Busca por palavras-chave em nomes de arquivos
         self.logger.system("Busca por palavras-chave...", "APP")
-        for search_path in search_paths:
-            if not os.path.exists(search_path):
-                continue
-                
+        for match in self.app_index.search(app_name_lower, limit=3):  # Limita a 3 resultados mais relevantes
             try:
-                # Busca arquivos que contenham o nome do app
-                pattern = os.path.join(search_path, "**", f"*{app_name_lower}*.exe")
-                matches = glob.glob(pattern, recursive=True)
-                
-                for match in matches[:3]:  # Limita a 3 resultados mais relevantes
-                    try:
-                        os.startfile(match)
-                        self.logger.info(f"Aplicativo encontrado por keyword: {match}", "ACTIONS")
-                        return f"{app_name.title()} acessado, senhor."
-                    except Exception:
-                        continue
-                        
+                os.startfile(match)
+                self.logger.info(f"Aplicativo encontrado por keyword: {match}", "ACTIONS")
+                return f"{app_name.title()} acessado, senhor."
             except Exception:
                 continue
         
@@ -963,26 +943,25 @@ class SystemActions:
     def get_system_status(self) -> str:
         """Retorna status completo do sistema (CPU, RAM, Disco)"""
         try:
-            # Uso da CPU
-            cpu_percent = psutil.cpu_percent(interval=1)
-            
-            # Uso de Memória RAM
-            memory = psutil.virtual_memory()
-            ram_percent = memory.percent
-            ram_used = memory.used / (1024**3)  # GB
-            ram_total = memory.total / (1024**3)  # GB
-            
-            # Uso de Disco
-            disk = psutil.disk_usage('/')
-            disk_percent = (disk.used / disk.total) * 100
-            disk_used = disk.used / (1024**3)  # GB
-            disk_total = disk.total / (1024**3)  # GB
+            # Leitura dos buffers do amostrador (sem o antigo cpu_percent(interval=1))
+            if not self.hardware.is_ready():
+                self.hardware.sample_once()
+            summary = self.hardware.summary(window=60)
+            cpu, ram, disk = summary['cpu'], summary['ram'], summary['disk']
+            
+            cpu_percent = cpu['last']
+            ram_percent = ram['last']
+            ram_used = summary['ram_used_gb']['last']
+            ram_total = summary['ram_total_gb']['last']
+            disk_percent = disk['last']
+            disk_used = summary['disk_used_gb']['last']
+            disk_total = summary['disk_total_gb']['last']
             
             # Monta status
             status = f"""📊 **STATUS DO SISTEMA**
             
-🖥️ **CPU**: {cpu_percent:.1f}%
-🧠 **RAM**: {ram_percent:.1f}% ({ram_used:.1f}GB / {ram_total:.1f}GB)
+🖥️ **CPU**: {cpu_percent:.1f}% (1 min: mín {cpu['min']:.1f}% · méd {cpu['avg']:.1f}% · máx {cpu['max']:.1f}%)
+🧠 **RAM**: {ram_percent:.1f}% ({ram_used:.1f}GB / {ram_total:.1f}GB) · máx 1 min {ram['max']:.1f}%
 💾 **Disco**: {disk_percent:.1f}% ({disk_used:.1f}GB / {disk_total:.1f}GB)
 ⏰ **Atualizado**: {datetime.now().strftime('%H:%M:%S')}"""
             
@@ -1196,31 +1175,30 @@ class SystemActions:
             self.logger.error(e, "Erro ao disparar lembrete", "PROD")
     
     def get_currency_rate(self, from_currency: str = 'USD', to_currency: str = 'BRL') -> str:
-        """Obtém taxa de câmbio usando yfinance em thread separada"""
+        """Obtém taxa de câmbio da tabela de cotações (em thread separada se a tabela ainda não foi baixada)"""
+        def format_quote(quote):
+            rate, fetched_at = quote
+            
+            # Formatação brasileira
+            if to_currency == 'BRL':
+                formatted_rate = f"R$ {rate:.4f}"
+            else:
+                formatted_rate = f"{rate:.4f} {to_currency}"
+            
+            self.logger.system(f"[PROD] Cotação obtida: {from_currency}/{to_currency} = {formatted_rate}", "ACTIONS")
+            return f"💱 **Cotação Atual**:\n\n**1 {from_currency} = {formatted_rate}**\n\n📊 **Atualizado:** {datetime.fromtimestamp(fetched_at).strftime('%H:%M:%S')}"
+        
         def currency_thread():
             try:
-                import yfinance as yf
-                
                 self.logger.system(f"[PROD] Buscando cotação: {from_currency}/{to_currency}", "ACTIONS")
                 
-                # Obtém cotação
-                ticker = f"{from_currency}{to_currency}=X"
-                data = yf.Ticker(ticker).history(period="1d")
+                # Baixa a tabela inteira (as próximas moedas já saem dela)
+                quote = self.currency.rate(from_currency, to_currency)
                 
-                if not data.empty:
-                    rate = data['Close'].iloc[-1]
-                    
-                    # Formatação brasileira
-                    if to_currency == 'BRL':
-                        formatted_rate = f"R$ {rate:.4f}"
-                    else:
-                        formatted_rate = f"{rate:.4f} {to_currency}"
-                    
-                    self.logger.system(f"[PROD] Cotação obtida: {from_currency}/{to_currency} = {formatted_rate}", "ACTIONS")
-                    
+                if quote:
                     # Atualiza através de callback
                     if hasattr(self, 'currency_callback'):
-                        self.currency_callback(f"💱 **Cotação Atual**:\n\n**1 {from_currency} = {formatted_rate}**\n\n📊 **Atualizado:** {datetime.now().strftime('%H:%M:%S')}")
+                        self.currency_callback(format_quote(quote))
                 else:
                     if hasattr(self, 'currency_callback'):
                         self.currency_callback(f"❌ Não foi possível obter cotação de {from_currency}/{to_currency}")
@@ -1231,6 +1209,10 @@ class SystemActions:
                     self.currency_callback(f"❌ Erro ao obter cotação: {e}")
         
         try:
+            # Tabela em memória (aquecida pelo prefetch): responde na hora
+            if self.currency.peek(from_currency, to_currency):
+                return format_quote(self.currency.rate(from_currency, to_currency))
+            
             # Executa em thread
             thread = threading.Thread(target=currency_thread)
             thread.start()
@@ -1252,7 +1234,8 @@ class SystemActions:
                 
                 # Requisição
                 url = f"{BASE_URL}?q={city}&appid={API_KEY}&units=metric&lang=pt_br"
-                response = requests.get(url, timeout=10)
+                config = Config.WEATHER_CONFIG
+                response = self.http.get(url, ttl=config['cache_ttl'], stale_ttl=config['stale_ttl'], timeout=10)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -1270,7 +1253,7 @@ class SystemActions:
 🌡️ **Temperatura:** {temp}°C (sensação de {feels_like}°C)
 💧 **Umidade:** {humidity}%
 ☁️ **Condição:** {description.title()}
-🕐 **Atualizado:** {datetime.now().strftime('%H:%M:%S')}"""
+🕐 **Atualizado:** {datetime.fromtimestamp(response.fetched_at).strftime('%H:%M:%S')}"""
                     
                     self.logger.system(f"[PROD] Clima obtido: {temp}°C em {city_name}", "ACTIONS")
                     return weather_info
@@ -1326,8 +1309,9 @@ class SystemActions:
             config = Config.WEATHER_CONFIG
             url = f"https://wttr.in/{config['fallback_city']}?format=j1"
             
-            # Requisição HTTP com timeout
-            response = requests.get(url, timeout=config['timeout'])
+            # Requisição pela sessão compartilhada (cache de 10 min, resposta antiga enquanto atualiza)
+            response = self.http.get(url, ttl=config['cache_ttl'], stale_ttl=config['stale_ttl'],
+                                     timeout=config['timeout'])
             
             if response.status_code == 200:
                 data = response.json()
@@ -1354,7 +1338,7 @@ class SystemActions:
 🌡️ **Temperatura:** {temp_c}°C (sensação de {feels_like_c}°C)
 💧 **Umidade:** {humidity}%
 ☁️ **Condição:** {description.title()}
-🕐 **Atualizado:** {datetime.now().strftime('%H:%M:%S')}
+🕐 **Atualizado:** {datetime.fromtimestamp(response.fetched_at).strftime('%H:%M:%S')}
 📡 **Fonte:** wttr.in ({config['fallback_city']})"""
                 
                 self.logger.system(f"[PROD] Clima obtido: {temp_c}°C na região", "ACTIONS")
@@ -1405,45 +1389,26 @@ class SystemActions:
             KeyError: Dados da API em formato inesperado
         """
         try:
-            import yfinance as yf
-            
-            # Mapeamento de moedas com validação
-            currency_map = {
-                'dólar': 'USD',
-                'dolar': 'USD',
-                'euro': 'EUR',
-                'bitcoin': 'BTC',
-                'real': 'BRL',
-                'peso': 'MXN',
-                'libra': 'GBP'
-            }
+            import yfinance  # Só verifica a disponibilidade; a consulta fica em CurrencyService
             
             # Normaliza o nome da moeda
             currency_lower = currency.lower()
-            from_currency = currency_map.get(currency_lower, currency.upper())
+            from_currency = CURRENCY_NAMES.get(currency_lower, currency.upper())
             
             if self.logger:
                 self.logger.system(f"[PROD] Buscando cotação: {from_currency}/BRL", "ACTIONS")
             
-            # Configurações da API
-            config = Config.CURRENCY_CONFIG
-            ticker = f"{from_currency}BRL=X"
-            
-            # Obtém cotação com tratamento de erro
+            # Obtém cotação da tabela (um download para todas as moedas, cache de 1 min)
             try:
-                data = yf.Ticker(ticker).history(period=config['period'], timeout=config['timeout'])
+                quote = self.currency.rate(from_currency)
             except Exception as api_error:
                 raise requests.RequestException(f"Erro na API yfinance: {str(api_error)}")
             
-            if data.empty:
-                self.logger.warning(f"Nenhum dado encontrado para {ticker}", "PROD")
+            if not quote:
+                self.logger.warning(f"Nenhum dado encontrado para {from_currency}/BRL", "PROD")
                 return Config.ERROR_MESSAGES["currency_error"]
             
-            # Extrai e valida o valor da cotação
-            if 'Close' not in data.columns:
-                raise ValueError("Coluna 'Close' não encontrada nos dados da API")
-            
-            rate = data['Close'].iloc[-1]
+            rate, fetched_at = quote
             
             # Validação do valor
             if not isinstance(rate, (int, float)) or rate <= 0:
@@ -1456,7 +1421,7 @@ class SystemActions:
 
 **1 {from_currency.upper()} = {formatted_rate}**
 
-📊 **Atualizado:** {datetime.now().strftime('%H:%M:%S')}
+📊 **Atualizado:** {datetime.fromtimestamp(fetched_at).strftime('%H:%M:%S')}
 📡 **Fonte:** Yahoo Finance"""
             
             self.logger.system(f"[PROD] Cotação obtida: {from_currency}/BRL = {formatted_rate}", "ACTIONS")
@@ -1500,44 +1465,19 @@ class SystemActions:
             url = config['url']
             headers = {'User-Agent': config['user_agent']}
             
-            # Requisição HTTP com timeout
-            response = requests.get(url, headers=headers, timeout=config['timeout'])
+            # Requisição pela sessão compartilhada (cache de 15 min)
+            response = self.http.get(url, ttl=config['cache_ttl'], stale_ttl=config['stale_ttl'],
+                                     headers=headers, timeout=config['timeout'])
             
             if response.status_code != 200:
                 self.logger.warning(f"Portal G1 retornou status {response.status_code}", "PROD")
                 return Config.ERROR_MESSAGES["news_error"]
             
-            # Parse do HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Busca manchetes principais com múltiplos seletores
-            headlines = []
-            selectors = [
-                '.feed-post-body-title',
-                '.feed-post-link',
-                'h2 a',
-                '.title a',
-                '[data-area="noticias"] h2 a'
-            ]
-            
-            for selector in selectors:
-                try:
-                    elements = soup.select(selector)[:config['max_headlines']]
-                    for element in elements:
-                        title = element.get_text(strip=True)
-                        # Validação do título
-                        if title and len(title) > 10 and len(title) < 200:
-                            # Remove caracteres problemáticos
-                            clean_title = re.sub(r'[^\w\s\-.,!?;:]', '', title).strip()
-                            if clean_title:
-                                headlines.append(f"📰 {clean_title}")
-                                if len(headlines) >= config['max_headlines']:
-                                    break
-                    if len(headlines) >= config['max_headlines']:
-                        break
-                except Exception as selector_error:
-                    self.logger.warning(f"Erro no seletor {selector}: {str(selector_error)}", "PROD")
-                    continue
+            # Parse do HTML só quando a página em cache mudou (o parse custa mais que a resposta)
+            parsed_at, headlines = self._parsed_news
+            if parsed_at != response.fetched_at:
+                headlines = self._extract_headlines(response.content, config['max_headlines'])
+                self._parsed_news = (response.fetched_at, headlines)
             
             # Validação das manchetes encontradas
             if not headlines:
@@ -1550,7 +1490,7 @@ class SystemActions:
 {chr(10).join(headlines[:config['max_headlines']])}
 
 📊 **Fonte:** G1
-🕐 **Atualizado:** {datetime.now().strftime('%H:%M:%S')}"""
+🕐 **Atualizado:** {datetime.fromtimestamp(response.fetched_at).strftime('%H:%M:%S')}"""
             
             self.logger.system("[PROD] Notícias obtidas com sucesso", "ACTIONS")
             return news_info
@@ -1565,6 +1505,40 @@ class SystemActions:
             self.logger.error(e, "Erro inesperado ao buscar notícias", "PROD")
             return Config.ERROR_MESSAGES["news_error"]
     
+    def _extract_headlines(self, content: bytes, max_headlines: int) -> List[str]:
+        """Manchetes da página do G1, testando os seletores em ordem"""
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        # Busca manchetes principais com múltiplos seletores
+        headlines = []
+        selectors = [
+            '.feed-post-body-title',
+            '.feed-post-link',
+            'h2 a',
+            '.title a',
+            '[data-area="noticias"] h2 a'
+        ]
+        
+        for selector in selectors:
+            try:
+                elements = soup.select(selector)[:max_headlines]
+                for element in elements:
+                    title = element.get_text(strip=True)
+                    # Validação do título
+                    if title and len(title) > 10 and len(title) < 200:
+                        # Remove caracteres problemáticos
+                        clean_title = re.sub(r'[^\w\s\-.,!?;:]', '', title).strip()
+                        if clean_title:
+                            headlines.append(f"📰 {clean_title}")
+                            if len(headlines) >= max_headlines:
+                                break
+                if len(headlines) >= max_headlines:
+                    break
+            except Exception as selector_error:
+                self.logger.warning(f"Erro no seletor {selector}: {str(selector_error)}", "PROD")
+                continue
+        return headlines
+    
     def empty_recycle_bin(self) -> str:
         """Esvazia a lixeira do Windows"""
         try:
@@ -1623,38 +1597,21 @@ class SystemActions:
         try:
             self.logger.system("[PROD] Listando processos mais consumidos...", "ACTIONS")
             
-            # Obtém todos os processos
-            processes = []
-            
-            for proc in psutil.process_iter(['pid', 'name', 'memory_info']):
-                try:
-                    mem_info = proc.memory_info()
-                    if mem_info:
-                        memory_mb = mem_info.rss / (1024 * 1024)  # Convert to MB
-                        processes.append({
-                            'name': proc.info['name'],
-                            'memory': memory_mb,
-                            'pid': proc.info['pid']
-                        })
-                except:
-                    continue
-            
-            # Ordena por consumo de memória (maior para menor)
-            processes.sort(key=lambda x: x['memory'], reverse=True)
-            
-            # Pega os 5 maiores
-            top_5 = processes[:5]
+            # Instantâneo compartilhado (mantido pelo amostrador e pelo prefetch) e seleção por heap dos 5 maiores
+            top_5 = self.processes.top(5, sort_by='rss', max_age=Config.PREFETCH_CONFIG['process_max_age'])
             
             process_info = f"""📊 **Top 5 Processos (Consumo de RAM)**
             
 """
             
             for i, proc in enumerate(top_5, 1):
-                process_info += f"{i}. **{proc['name']}** - {proc['memory']:.1f} MB (PID: {proc['pid']})\n"
+                process_info += f"{i}. **{proc.name}** - {proc.rss_mb:.1f} MB (PID: {proc.pid})\n"
             
+            summary = self.hardware.summary(window=60)
+            ram_percent = summary['ram']['last'] if summary else psutil.virtual_memory().percent
             process_info += f"""
-📊 **Total RAM em uso:** {psutil.virtual_memory().percent:.1f}%
-🕐 **Atualizado:** {datetime.now().strftime('%H:%M:%S')}"""
+📊 **Total RAM em uso:** {ram_percent:.1f}%
+🕐 **Atualizado:** {datetime.fromtimestamp(self.processes.taken_at).strftime('%H:%M:%S')}"""
             
             self.logger.system("[PROD] Lista de processos obtida", "ACTIONS")
             return process_info
@@ -1663,6 +1620,87 @@ class SystemActions:
             self.logger.error(e, "Erro ao listar processos", "PROD")
             return f"❌ Erro ao listar processos: {e}"
     
+    # ==================== PREFETCH E BRIEFING ====================
+    
+    def prefetch_tasks(self) -> List[PrefetchTask]:
+        """Fontes dos comandos rápidos aquecidas em segundo plano, na cadência do cache de cada uma"""
+        currency = Config.CURRENCY_CONFIG
+        processes_interval = Config.PREFETCH_CONFIG['process_interval']
+        
+        tasks = [
+            PrefetchTask('weather', self.get_weather_votorantim, ('weather', 'briefing'),
+                         Config.WEATHER_CONFIG['cache_ttl']),
+            PrefetchTask('news', self.get_news_headlines, ('news', 'briefing'), Config.NEWS_CONFIG['cache_ttl']),
+            PrefetchTask('processes', lambda: self.processes.snapshot(max_age=processes_interval),
+                         ('top_processes', 'briefing'), processes_interval),
+        ]
+        try:
+            import yfinance  # Sem yfinance a cotação não tem o que aquecer
+            tasks.insert(1, PrefetchTask('currency', self.currency.refresh, ('currency_usd', 'currency', 'briefing'),
+                                         currency['cache_ttl'], idle_interval=currency['idle_refresh']))
+        except ImportError:
+            pass
+        return tasks
+    
+    def start_prefetch(self, memory=None) -> Optional[PrefetchScheduler]:
+        """Inicia o aquecimento dos caches de clima, dólar, notícias e processos
+        
+        Args:
+            memory: JarvisMemory com o histórico de conversas (frequência de uso dos comandos)
+            
+        Returns:
+            PrefetchScheduler | None: Agendador iniciado, ou None se desativado na configuração
+        """
+        config = Config.PREFETCH_CONFIG
+        if not config['enabled']:
+            return None
+        if self.prefetch is None:
+            self.prefetch = PrefetchScheduler(
+                self.prefetch_tasks(), memory,
+                lookback_days=config['lookback_days'],
+                max_inputs=config['max_inputs'],
+                min_share=config['min_share'],
+                min_history=config['min_history'],
+                usage_refresh=config['usage_refresh'],
+            )
+            self.prefetch.start()
+            if self.logger:
+                self.logger.system("Prefetch dos comandos rápidos iniciado", "ACTIONS")
+        return self.prefetch
+    
+    def stop_prefetch(self):
+        """Interrompe o aquecimento em segundo plano"""
+        if self.prefetch:
+            self.prefetch.stop()
+    
+    def get_daily_briefing(self) -> str:
+        """Resumo do dia: clima, dólar, manchetes e top de processos em uma resposta
+        
+        Com o prefetch ativo, cada parte sai do cache; as que ainda não
+        estiverem prontas são buscadas em paralelo.
+        """
+        try:
+            self.logger.system("[PROD] Montando briefing do dia...", "ACTIONS")
+            
+            sections = (
+                self.get_weather_votorantim,
+                lambda: self.get_currency_final('dólar'),
+                self.get_news_headlines,
+                self.get_top_processes,
+            )
+            with ThreadPoolExecutor(max_workers=len(sections), thread_name_prefix="Briefing") as executor:
+                parts = list(executor.map(lambda section: section(), sections))
+            
+            briefing = f"☀️ **Briefing do Dia - {datetime.now().strftime('%d/%m/%Y %H:%M')}**\n\n"
+            briefing += "\n\n".join(part.strip() for part in parts)
+            
+            self.logger.system("[PROD] Briefing do dia montado", "ACTIONS")
+            return briefing
+            
+        except Exception as e:
+            self.logger.error(e, "Erro ao montar briefing", "PROD")
+            return f"❌ Erro ao montar briefing: {e}"
+    
     def play_music(self, query: str) -> str:
         """Abre navegador com busca de música no YouTube/Spotify"""
         def music_thread():
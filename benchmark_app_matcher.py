@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark da Busca Aproximada de Aplicativos do Jarvis
+Compara o mapeamento estrito anterior (dicionário + varredura de substrings) com o FuzzyAppMatcher
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_app_matcher import FuzzyAppMatcher, normalize_app_name
+from test_app_matcher import SYNONYMS
+
+SYLLABLES = ["ka", "ro", "mi", "te", "lu", "sa", "vo", "ne", "di", "pa", "zor", "gen", "fly", "tron"]
+
+def build_catalog(count, rng):
+    """Nomes sintéticos de executáveis (únicos) com caminhos fictícios"""
+    names = set()
+    while len(names) < count:
+        names.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return [(name, f"C:\\Program Files\\{name}\\{name}.exe") for name in sorted(names)]
+
+def make_typo(name, rng):
+    """Uma troca, remoção, inserção ou transposição de letra"""
+    i = rng.randrange(len(name))
+    kind = rng.choice(["replace", "delete", "insert", "swap"])
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    if kind == "replace":
+        return name[:i] + letter + name[i + 1:]
+    if kind == "delete":
+        return name[:i] + name[i + 1:]
+    if kind == "insert":
+        return name[:i] + letter + name[i:]
+    i = min(i, len(name) - 2)
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+def legacy_lookup(mapping, query):
+    """Caminho anterior: acerto exato e depois a primeira chave contida na consulta"""
+    if query in mapping:
+        return mapping[query]
+    for key, target in mapping.items():
+        if key in query:
+            return target
+    return None
+
+def time_lookup(function, queries):
+    """Tempo médio (µs) e alvos devolvidos"""
+    start = time.perf_counter()
+    results = [function(query) for query in queries]
+    return (time.perf_counter() - start) * 1_000_000 / len(queries), results
+
+def main():
+    """Função principal do benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark da busca aproximada de aplicativos")
+    parser.add_argument("--apps", type=int, default=10_000, help="executáveis no catálogo")
+    parser.add_argument("--queries", type=int, default=2_000, help="consultas com erro de digitação")
+    args = parser.parse_args()
+    
+    rng = random.Random(42)
+    catalog = build_catalog(args.apps, rng)
+    names = [name for name, _ in catalog] + [name for name in SYNONYMS if len(name) >= 6]
+    
+    mapping = dict(SYNONYMS)
+    mapping.update(catalog)
+    
+    start = time.perf_counter()
+    matcher = FuzzyAppMatcher(SYNONYMS, catalog)
+    build_ms = (time.perf_counter() - start) * 1000
+    
+    # Consultas: metade exatas, metade com um erro de digitação (alvo conhecido)
+    queries, expected = [], []
+    for _ in range(args.queries):
+        name = rng.choice(names)
+        query = name if rng.random() < 0.5 else make_typo(name, rng)
+        queries.append(normalize_app_name(query))
+        expected.append(mapping[name])
+    
+    def matcher_lookup(query):
+        candidate = matcher.best(query)
+        return candidate.target if candidate else None
+    
+    print("📊 J.A.R.V.I.S. - Benchmark da Busca Aproximada de Aplicativos")
+    print("=" * 60)
+    print(f"Catálogo: {len(matcher)} nomes, índice montado em {build_ms:.0f} ms")
+    print(f"{'implementação':<26}{'µs/consulta':>14}{'acertos':>10}{'errados':>10}")
+    for label, function in [("mapeamento anterior", lambda q: legacy_lookup(mapping, q)),
+                            ("FuzzyAppMatcher", matcher_lookup)]:
+        elapsed, results = time_lookup(function, queries)
+        hits = sum(1 for result, target in zip(results, expected) if result == target)
+        wrong = sum(1 for result, target in zip(results, expected) if result is not None and result != target)
+        print(f"{label:<26}{elapsed:>14.1f}{hits / len(queries):>10.1%}{wrong / len(queries):>10.1%}")
+
+if __name__ == "__main__":
+    main()
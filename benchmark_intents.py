@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark do Roteador de Intenções do Jarvis
+Compara as cadeias de any(...) anteriores da GUI e do ActionHandler com o IntentRouter
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_intents import IntentRouter, DIRECT_APPS
+from test_intents import REGRESSION_CORPUS
+
+def legacy_gui_intent(message):
+    """Cadeia anterior de JarvisGUI._detect_system_command (só a classificação)"""
+    message_lower = message.lower()
+    chain = [
+        ("power_shutdown", ["desligar", "desligue", "desliga", "shutdown", "desligamento"]),
+        ("power_restart", ["reiniciar", "reinicie", "restart", "reboot", "reinicialização", "reinicialize"]),
+        ("power_suspend", ["suspender", "suspenda", "hibernar", "dormir", "sleep"]),
+        ("check_updates", ["verificar atualizações", "verifique atualizações", "checar atualizações", "check updates", "procurar atualizações"]),
+        ("volume_set", ["volume", "som", "áudio", "audio"]),
+        ("system_status", ["status do sistema", "sistema status", "status sistema", "uso do sistema", "performance"]),
+        ("screenshot", ["print", "screenshot", "captura", "capturar tela", "print screen", "printar"]),
+        ("password", ["gerar senha", "criar senha", "senha forte", "password", "gerar password"]),
+        ("reminder", ["me lembre", "lembrete", "lembrar"]),
+        ("weather", ["tempo hoje", "clima hoje", "previsão do tempo", "tempo agora", "clima agora"]),
+        ("news", ["notícias", "manchetes", "notícia do dia", "jornal"]),
+        ("currency_usd", ["quanto está o dólar", "cotação do dólar", "dólar hoje", "usd brl"]),
+        ("currency", ["dólar", "dolar", "euro", "bitcoin", "real", "peso", "libra"]),
+        ("empty_recycle_bin", ["limpar lixeira", "esvaziar lixeira"]),
+        ("brightness_up", ["aumentar brilho", "mais brilho", "bright"]),
+        ("brightness_down", ["diminuir brilho", "menos brilho", "dark", "escurecer"]),
+        ("top_processes", ["processos", "processos ativos", "apps mais consumidos", "top processos", "uso de memória"]),
+    ]
+    for intent, keywords in chain:
+        if any(keyword in message_lower for keyword in keywords):
+            return intent
+    
+    music = ["tocar", "play", "música", "youtube", "spotify", "ouvir"]
+    if any(keyword in message_lower for keyword in music):
+        for keyword in music:
+            if keyword in message_lower:
+                if message_lower.replace(keyword, "", 1).strip():
+                    return "play_music"
+                break
+    
+    if any(keyword in message_lower for keyword in ["pomodoro", "timer", "cronômetro", "cronometro", "estudar", "foco"]):
+        return "pomodoro"
+    
+    for keyword in ["abra", "abrir", "abre", "iniciar", "start", "open", "execute", "executar"]:
+        if keyword in message_lower and message_lower.replace(keyword, "", 1).strip():
+            return "open_app"
+    
+    if any(app in message_lower for app in DIRECT_APPS):
+        return "open_direct_app"
+    return None
+
+def legacy_actions_intent(command):
+    """Cadeia anterior de ActionHandler.process_command (só a classificação)"""
+    command_lower = command.lower()
+    if any(keyword in command_lower for keyword in ['menu', 'comandos', 'ajuda', 'o que você sabe fazer']):
+        return "menu"
+    if "modo estudo" in command_lower or "modostudo" in command_lower:
+        return "study_mode"
+    if "por que falhou" in command_lower or "debugger" in command_lower:
+        return "debugger"
+    if "lembra daquela dica" in command_lower or "busca dica" in command_lower:
+        return "search_tip"
+    if command_lower.startswith("salvar dica:"):
+        return "save_tip"
+    if "modo gamer" in command_lower or "modogamer" in command_lower:
+        return "gamer_mode"
+    if command_lower.startswith("git:"):
+        return "git_commit"
+    if any(keyword in command_lower for keyword in ['olhe a tela', 'analise a tela', 'veja a tela']):
+        return "screen_analysis"
+    if any(word in command_lower for word in ['escreva um código', 'gere um código', 'crie um código', 'gerar código', 'escrever código']):
+        return "generate_code"
+    if any(word in command_lower for word in ['explique o erro', 'qual o erro', 'corrija o erro']):
+        return "explain_error"
+    return None
+
+def build_messages(count, seed=42):
+    """Mensagens sintéticas: frases do corpus e perguntas livres (que não casam com nada)"""
+    rng = random.Random(seed)
+    phrases = [phrase for _, phrase, _ in REGRESSION_CORPUS]
+    filler = ["explique", "recursão", "em", "python", "qual", "a", "diferença", "entre", "lista", "e", "tupla", "senhor"]
+    messages = []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            messages.append(rng.choice(phrases))
+        else:
+            messages.append(" ".join(rng.choice(filler) for _ in range(rng.randint(4, 20))) + "?")
+    return messages
+
+def time_classifier(function, messages):
+    """Tempo médio (µs) por mensagem"""
+    start = time.perf_counter()
+    for message in messages:
+        function(message)
+    return (time.perf_counter() - start) * 1_000_000 / len(messages)
+
+def main():
+    """Função principal do benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark do roteador de intenções")
+    parser.add_argument("--messages", type=int, default=20_000, help="quantidade de mensagens")
+    args = parser.parse_args()
+    
+    messages = build_messages(args.messages)
+    gui_router = IntentRouter.for_scope('gui')
+    actions_router = IntentRouter.for_scope('actions')
+    
+    def router_intent(router):
+        def classify(message):
+            match = router.classify(message)
+            return match.intent if match else None
+        return classify
+    
+    print("📊 J.A.R.V.I.S. - Benchmark do Roteador de Intenções")
+    print("=" * 60)
+    
+    # As duas implementações precisam concordar em todas as mensagens
+    for message in set(messages):
+        assert router_intent(gui_router)(message) == legacy_gui_intent(message), f"GUI divergiu: {message}"
+        assert router_intent(actions_router)(message) == legacy_actions_intent(message), f"Ações divergiram: {message}"
+    print(f"Mensagens: {len(messages)} ({len(set(messages))} distintas), classificação idêntica")
+    
+    results = [
+        ("GUI: cadeia anterior", time_classifier(legacy_gui_intent, messages)),
+        ("GUI: IntentRouter", time_classifier(router_intent(gui_router), messages)),
+        ("Ações: cadeia anterior", time_classifier(legacy_actions_intent, messages)),
+        ("Ações: IntentRouter", time_classifier(router_intent(actions_router), messages)),
+    ]
+    
+    print(f"{'implementação':<28}{'µs/msg':>10}{'msg/s':>12}")
+    for name, elapsed in results:
+        print(f"{name:<28}{elapsed:>10.2f}{1_000_000 / elapsed:>12.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark da Memória do Jarvis
+Popula um banco com muitas conversas e mede a latência por operação
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+import argparse
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_memory import JarvisMemory
+
+def populate(db_path, rows):
+    """Insere conversas e fatos sintéticos direto no SQLite"""
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        'INSERT INTO conversation_context (session_id, user_input, jarvis_response) VALUES (?, ?, ?)',
+        ((f"session_{i // 50}", f"pergunta número {i} sobre python", f"resposta número {i}") for i in range(rows))
+    )
+    conn.executemany(
+        "INSERT INTO memory (fact, category, data, importance) VALUES (?, ?, '', ?)",
+        ((f"fato {i} sobre o usuário", "preferencia", 1 + i % 3) for i in range(rows // 10))
+    )
+    conn.commit()
+    conn.close()
+
+def run_turns(memory, turns):
+    """Simula turnos do AIWorker: extração, contexto e armazenamento"""
+    for i in range(turns):
+        command = f"eu gosto de café número {i}"
+        memory.auto_extract_and_store(command, "bench")
+        memory.get_context_for_prompt("bench")
+        memory.store_conversation("bench", command, "Anotado, mestre.")
+
+def main():
+    """Função principal do benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark da memória do Jarvis")
+    parser.add_argument("--rows", type=int, default=100_000, help="conversas pré-existentes")
+    parser.add_argument("--turns", type=int, default=200, help="turnos simulados")
+    args = parser.parse_args()
+    
+    print("📊 J.A.R.V.I.S. - Benchmark da Memória")
+    print("=" * 60)
+    
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench_memory.db')
+    memory = JarvisMemory(db_path)
+    
+    start = time.perf_counter()
+    populate(db_path, args.rows)
+    print(f"📥 {args.rows} conversas inseridas em {time.perf_counter() - start:.2f}s")
+    
+    memory.pool.reset_latency_stats()
+    start = time.perf_counter()
+    run_turns(memory, args.turns)
+    total = time.perf_counter() - start
+    
+    print(f"\n⏱️ {args.turns} turnos em {total:.2f}s ({total / args.turns * 1000:.2f} ms/turno)")
+    print(f"{'operação':<28}{'chamadas':>10}{'média ms':>12}{'máx ms':>12}")
+    for operation, stats in sorted(memory.get_latency_stats().items()):
+        print(f"{operation:<28}{stats['calls']:>10}{stats['avg_ms']:>12.3f}{stats['max_ms']:>12.3f}")
+        
+    memory.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark do Instantâneo de Processos do Jarvis
+Compara o top 5 anterior (dicionário por processo + ordenação completa) com o ProcessSnapshotService
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import subprocess
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_processes import ProcessInfo, ProcessSnapshotService, PSUTIL_AVAILABLE
+
+if PSUTIL_AVAILABLE:
+    import psutil
+
+def legacy_top_from_list(processes):
+    """Seleção anterior: um dicionário por processo, ordenação completa e fatia"""
+    entries = [{'name': p.name, 'memory': p.rss_mb, 'pid': p.pid} for p in processes]
+    entries.sort(key=lambda x: x['memory'], reverse=True)
+    return entries[:5]
+
+def legacy_top_processes():
+    """get_top_processes anterior: process_iter com memory_info pedido duas vezes"""
+    processes = []
+    for proc in psutil.process_iter(['pid', 'name', 'memory_info']):
+        try:
+            mem_info = proc.memory_info()
+            if mem_info:
+                processes.append({'name': proc.info['name'], 'memory': mem_info.rss / (1024 * 1024),
+                                  'pid': proc.info['pid']})
+        except Exception:
+            continue
+    processes.sort(key=lambda x: x['memory'], reverse=True)
+    return processes[:5]
+
+def time_call(function, repeat):
+    """Tempo médio (ms) por chamada"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+def main():
+    """Função principal do benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark do instantâneo de processos")
+    parser.add_argument("--synthetic", type=int, default=2000, help="processos na lista sintética")
+    parser.add_argument("--spawn", type=int, default=0, help="processos filhos extras (para passar de 1000)")
+    parser.add_argument("--repeat", type=int, default=20, help="repetições por medida")
+    args = parser.parse_args()
+    
+    print("📊 J.A.R.V.I.S. - Benchmark do Instantâneo de Processos")
+    print("=" * 60)
+    
+    # Seleção pura sobre uma lista sintética (independe do sistema)
+    rng = random.Random(42)
+    synthetic = [ProcessInfo(pid, f"proc{pid}.exe", rng.lognormvariate(3, 1.5), rng.random() * 10)
+                 for pid in range(args.synthetic)]
+    service = ProcessSnapshotService(ttl=3600, collector=lambda with_cmdline: synthetic)
+    assert [p['pid'] for p in legacy_top_from_list(synthetic)] == [p.pid for p in service.top(5)]
+    
+    print(f"Seleção do top 5 em {args.synthetic} processos sintéticos:")
+    print(f"  {'ordenação completa':<28}{time_call(lambda: legacy_top_from_list(synthetic), args.repeat):>10.3f} ms")
+    print(f"  {'heapq.nlargest':<28}{time_call(lambda: service.top(5), args.repeat):>10.3f} ms")
+    
+    if not PSUTIL_AVAILABLE:
+        print("⚠️ psutil não disponível - leitura real não medida")
+        return
+    
+    children = [subprocess.Popen([sys.executable, "-c", "import time; time.sleep(600)"]) for _ in range(args.spawn)]
+    try:
+        real = ProcessSnapshotService(ttl=2.0)
+        count = len(psutil.pids())
+        print(f"\nLeitura real ({count} processos):")
+        print(f"  {'get_top_processes anterior':<28}{time_call(legacy_top_processes, args.repeat):>10.1f} ms")
+        print(f"  {'serviço, leitura nova':<28}{time_call(lambda: real.top(5, max_age=0), args.repeat):>10.1f} ms")
+        print(f"  {'serviço, cache (TTL 2 s)':<28}{time_call(lambda: real.top(5), args.repeat):>10.3f} ms")
+        print(f"  {'limpeza (linha de comando)':<28}"
+              f"{time_call(lambda: real.query(name_pattern='python', cmdline_contains='jarvis', max_age=0), args.repeat):>10.1f} ms")
+    finally:
+        for child in children:
+            child.kill()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark da Limpeza de Markdown do Jarvis
+Compara jarvis_sanitizer com as implementações anteriores em respostas de 50 KB
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_sanitizer import clean_markdown, StreamingMarkdownCleaner
+
+def legacy_core_clean(response):
+    """Limpeza anterior de JarvisCore._clean_response (5 replace + 6 re.sub)"""
+    cleaned = response.replace('###', '').replace('**', '').replace('---', '').replace('*', '').replace('`', '')
+    cleaned = re.sub(r'^#{1,6}\s+', '', cleaned, flags=re.MULTILINE)
+    cleaned = re.sub(r'\*\*(.*?)\*\*', r'\1', cleaned)
+    cleaned = re.sub(r'\*(.*?)\*', r'\1', cleaned)
+    cleaned = re.sub(r'`(.*?)`', r'\1', cleaned)
+    cleaned = re.sub(r'^[-*]{3,}\s*$', '', cleaned, flags=re.MULTILINE)
+    cleaned = re.sub(r'\s+', ' ', cleaned)
+    return cleaned.strip()
+
+def legacy_gui_clean(text):
+    """Limpeza anterior das interfaces (filter_ai_text / _clean_response otimizado)"""
+    text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
+    text = re.sub(r'\*(.*?)\*', r'\1', text)
+    text = re.sub(r'`(.*?)`', r'\1', text)
+    text = re.sub(r'^[-*]{3,}\s*$', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\s+', ' ', text)
+    lines = text.split('\n')
+    return '\n'.join(line.strip() for line in lines if line.strip())
+
+def build_response(size, seed=42):
+    """Gera uma resposta Markdown sintética com cerca de size bytes"""
+    rng = random.Random(seed)
+    words = ["processador", "memória", "função", "Python", "recursão", "senhor", "análise", "código", "sistema", "dados"]
+    blocks = []
+    total = 0
+    while total < size:
+        kind = rng.random()
+        if kind < 0.1:
+            block = f"### {rng.choice(words).title()} {rng.randint(1, 99)}"
+        elif kind < 0.2:
+            block = "---"
+        elif kind < 0.3:
+            block = "```python\nfor item in dados:\n    print(item)\n```"
+        elif kind < 0.5:
+            block = "\n".join(f"* **{rng.choice(words)}**: `{rng.choice(words)}` em *{rng.choice(words)}*" for _ in range(4))
+        else:
+            block = " ".join(rng.choice(words) for _ in range(40)) + "."
+        blocks.append(block)
+        total += len(block.encode('utf-8')) + 2
+    return "\n\n".join(blocks)
+
+def time_call(function, text, repeat):
+    """Tempo médio (ms) de uma função de limpeza"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(text)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+def stream_clean(text, chunk_size=40):
+    """Limpeza incremental em pedaços, como na resposta em streaming"""
+    cleaner = StreamingMarkdownCleaner()
+    parts = [cleaner.feed(text[i:i + chunk_size]) for i in range(0, len(text), chunk_size)]
+    parts.append(cleaner.flush())
+    return "".join(parts)
+
+def main():
+    """Função principal do benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark da limpeza de Markdown")
+    parser.add_argument("--size", type=int, default=50_000, help="tamanho da resposta em bytes")
+    parser.add_argument("--repeat", type=int, default=200, help="repetições por implementação")
+    parser.add_argument("--chunk", type=int, default=40, help="tamanho do pedaço no streaming")
+    args = parser.parse_args()
+    
+    text = build_response(args.size)
+    print("📊 J.A.R.V.I.S. - Benchmark da Limpeza de Markdown")
+    print("=" * 60)
+    print(f"Resposta: {len(text.encode('utf-8'))} bytes, {args.repeat} repetições")
+    
+    assert clean_markdown(text) == legacy_core_clean(text), "clean_markdown divergiu da limpeza do Core"
+    assert stream_clean(text, args.chunk) == clean_markdown(text), "streaming divergiu da limpeza completa"
+    
+    results = [
+        ("Core anterior (replace + re.sub)", time_call(legacy_core_clean, text, args.repeat)),
+        ("Interfaces anteriores (re.sub)", time_call(legacy_gui_clean, text, args.repeat)),
+        ("clean_markdown", time_call(clean_markdown, text, args.repeat)),
+        ("clean_markdown (blocos de código)", time_call(lambda t: clean_markdown(t, keep_code_blocks=True), text, args.repeat)),
+        (f"streaming ({args.chunk} caracteres/pedaço)", time_call(lambda t: stream_clean(t, args.chunk), text, args.repeat)),
+    ]
+    
+    baseline = results[0][1]
+    print(f"{'implementação':<42}{'ms':>10}{'x Core':>10}")
+    for name, elapsed in results:
+        print(f"{name:<42}{elapsed:>10.3f}{baseline / elapsed:>10.2f}")
+
+if __name__ == "__main__":
+    main()
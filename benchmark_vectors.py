@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark do Índice Vetorial do Jarvis
+Mede a latência de recall (top-k por cosseno) com 10k, 100k e 1M vetores
+"""
+
+import os
+import sys
+import time
+import tempfile
+import argparse
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from jarvis_vectors import HashingEmbedder, VectorIndex
+
+def build_index(size, dim):
+    """Cria um índice sintético gravando os vetores direto no memory-map"""
+    base = os.path.join(tempfile.mkdtemp(), f'bench_{size}')
+    index = VectorIndex(base, HashingEmbedder(dim=dim))
+    index._grow(size)
+    
+    rng = np.random.default_rng(42)
+    chunk = 100_000
+    for start in range(0, size, chunk):
+        end = min(start + chunk, size)
+        block = rng.standard_normal((end - start, dim), dtype=np.float32)
+        block /= np.linalg.norm(block, axis=1, keepdims=True)
+        index._vectors[start:end] = block
+    index._entries = [{'source': 'fato', 'key': str(i), 'text': f"fato {i}"} for i in range(size)]
+    return index
+
+def main():
+    """Função principal do benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark do índice vetorial")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="tamanhos separados por vírgula")
+    parser.add_argument("--dim", type=int, default=256, help="dimensão dos vetores")
+    parser.add_argument("--queries", type=int, default=50, help="consultas por tamanho")
+    parser.add_argument("--k", type=int, default=5, help="resultados por consulta")
+    args = parser.parse_args()
+    
+    print("📊 J.A.R.V.I.S. - Benchmark do Índice Vetorial")
+    print("=" * 60)
+    print(f"{'vetores':>10}{'média ms':>12}{'p95 ms':>12}{'máx ms':>12}")
+    
+    for size in (int(value) for value in args.sizes.split(',')):
+        index = build_index(size, args.dim)
+        timings = []
+        for i in range(args.queries):
+            start = time.perf_counter()
+            index.search(f"consulta de teste número {i}", k=args.k)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings = np.array(timings)
+        print(f"{size:>10}{timings.mean():>12.2f}{np.percentile(timings, 95):>12.2f}{timings.max():>12.2f}")
+        index.close()
+
+if __name__ == "__main__":
+    main()
@@ -35,6 +35,13 @@ class Config:
     MAX_HISTORY = 5
     TEMPERATURE = 0.7
     MAX_TOKENS = 150
+    AI_STREAMING = os.getenv('AI_STREAMING', 'true').lower() == 'true'  # Exibe a resposta enquanto é gerada
+    AI_KEEP_CODE_BLOCKS = os.getenv('AI_KEEP_CODE_BLOCKS', 'false').lower() == 'true'  # Preserva blocos ``` na limpeza
+    RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+    RESPONSE_CACHE_TTL = 6 * 3600  # segundos
+    RESPONSE_CACHE_MAX_ENTRIES = 500
+    PROMPT_TOKEN_BUDGET = int(os.getenv('PROMPT_TOKEN_BUDGET', '3000'))  # tokens por requisição (sem a persona)
+    PROMPT_RECENT_TURNS = 6  # mensagens mantidas na íntegra; as anteriores viram resumo
     
     # ==================== CONFIGURAÇÕES DO SYSTEM ACTIONS ====================
     WORKSPACE_PATH = os.getenv('WORKSPACE_PATH', os.path.expanduser("~/Desktop"))
@@ -42,6 +49,11 @@ class Config:
     
     # ==================== CONFIGURAÇÕES VISUAIS M-13 ====================
     
+    # Efeito de digitação (quadros agendados com after() na thread principal)
+    TYPEWRITER_FPS = 60
+    TYPEWRITER_CHARS_PER_SECOND = 50
+    TYPEWRITER_INSTANT_CHARS = 2000  # mensagens maiores aparecem de uma vez
+    
     # Tema Deep Charcoal & Electric Blue
     M13_COLORS = {
         "background": "#121212",  # Deep Charcoal
@@ -90,7 +102,9 @@ class Config:
         "city": "Votorantim",
         "fallback_city": "Sorocaba",
         "units": "metric",
-        "lang": "pt_br"
+        "lang": "pt_br",
+        "cache_ttl": 600,   # Clima muda devagar: 10 min
+        "stale_ttl": 3600   # Resposta antiga servida enquanto atualiza
     }
     
     # Yahoo Finance
@@ -98,7 +112,11 @@ class Config:
         "timeout": 10,
         "period": "1d",
         "default_from": "USD",
-        "default_to": "BRL"
+        "default_to": "BRL",
+        "batch_period": "5d",  # Tabela de cotações: último fechamento dos últimos dias
+        "cache_ttl": 60,    # Cotações: 1 min
+        "stale_ttl": 300,
+        "idle_refresh": 900  # Tabela renovada a cada 15 min mesmo sem pedidos
     }
     
     # G1 Notícias
@@ -106,7 +124,21 @@ class Config:
         "url": "https://g1.globo.com/",
         "timeout": 10,
         "max_headlines": 3,
-        "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+        "cache_ttl": 900,   # Manchetes: 15 min
+        "stale_ttl": 3600
+    }
+    
+    # Prefetch dos comandos rápidos (clima, dólar, notícias, processos)
+    PREFETCH_CONFIG = {
+        "enabled": True,
+        "lookback_days": 14,      # Histórico de conversas usado na frequência
+        "max_inputs": 2000,
+        "min_share": 0.05,        # Fração mínima dos pedidos para manter o cache sempre quente
+        "min_history": 10,        # Abaixo disso, todos os comandos rápidos são aquecidos
+        "usage_refresh": 1800,    # Releitura da frequência: 30 min
+        "process_interval": 10,   # Lista de processos: mesma cadência do amostrador
+        "process_max_age": 15     # Idade aceita da lista no top 5
     }
     
     # ==================== CONFIGURAÇÕES DE SISTEMA ====================
@@ -154,6 +186,7 @@ class Config:
 • "dólar" - Cotação em tempo real
 • "tempo hoje" - Clima Votorantim
 • "processos" - Top 5 consumo RAM
+• "briefing" - Clima, dólar, notícias e processos
 • "pomodoro" - Timer de 25 min
 
 **OMNI PROTOCOLS ENGAGED** 🚀""",
@@ -7,7 +7,7 @@ e efeito de digitação em tempo real.
 # ==================== BIBLIOTECAS PADRÃO ====================
 import os
 import sys
-import re
+import time
 import threading
 from datetime import datetime
 from typing import Optional, Dict, List, Tuple
@@ -18,12 +18,15 @@ from dotenv import load_dotenv
 
 # ==================== MÓDULOS PRÓPRIOS ====================
 from config import Config
+from jarvis_sanitizer import clean_markdown, StreamingMarkdownCleaner, SentenceBuffer
+from jarvis_response_cache import ResponseCache
+from jarvis_prompt import PromptAssembler
 
 class JarvisCore:
     """Núcleo de processamento do J.A.R.V.I.S. Mark 13 M-13 OMNI.
     
     Esta classe é responsável pelo processamento de linguagem natural,
-    integração com a API Gemini AI e efeitos de digitação em tempo real.
+    integração com a API Gemini AI e respostas em streaming.
     Implementa o sistema de memória contextual e tratamento de comandos.
     
     Attributes:
@@ -31,18 +34,35 @@ class JarvisCore:
         api_key (str): Chave de API do Google Gemini
         vision_enabled (bool): Indica se a visão computacional está ativa
         model: Modelo de IA Gemini configurado
-        typing_active (bool): Indica se efeito de digitação está ativo
-        typing_callbacks (list): Lista de callbacks para efeito de digitação
+        memory_manager: Motor de memória compartilhado (jarvis_memory.MemoryManager)
     """
     
-    def __init__(self, logger):
+    # Persona e regras fixas, enviadas uma única vez como system_instruction
+    # do modelo em vez de repetidas no prompt de cada requisição
+    SYSTEM_INSTRUCTION = """Você é J.A.R.V.I.S., assistente de IA avançada com controle de sistema.
+
+Regras de resposta:
+- Seja objetivo e direto, sem introduções longas
+- Limite: 2-3 parágrafos curtos
+- Tom: técnico, útil, levemente sarcástico/atencioso
+- Sem enrolações como "Com certeza" ou "Aqui está sua análise"
+- Responda de forma técnica e direta
+
+Quando a requisição indicar MODO DETALHADO:
+- Forneça análise profunda e técnica (ignore a regra de concisão)
+- Use todo o contexto disponível
+- Seja detalhado e completo"""
+    
+    def __init__(self, logger, memory_manager=None):
         """Inicializa o núcleo de processamento J.A.R.V.I.S.
         
-        Configura a API Gemini, sistema de digitação e memória contextual.
+        Configura a API Gemini, cache de respostas e memória contextual.
         Valida a disponibilidade dos serviços e registra o status inicial.
         
         Args:
             logger: Instância do logger para registrar eventos do sistema
+            memory_manager: Motor de memória compartilhado; se omitido,
+                as interações são apenas registradas no log
             
         Raises:
             Exception: Caso ocorra erro na configuração da API Gemini
@@ -50,9 +70,21 @@ class JarvisCore:
         self.logger = logger
         self.api_key = None
         self.vision_enabled = False
-        self.typing_active = False
-        self.typing_callbacks = []
         self.auth_error_message = None
+        self.memory_manager = memory_manager
+        self.last_stream_metrics = {}
+        self.response_cache = None
+        if Config.RESPONSE_CACHE_ENABLED:
+            self.response_cache = ResponseCache(
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jarvis_response_cache.json'),
+                ttl=Config.RESPONSE_CACHE_TTL,
+                max_entries=Config.RESPONSE_CACHE_MAX_ENTRIES
+            )
+        self.session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.prompt_assembler = PromptAssembler(
+            budget=Config.PROMPT_TOKEN_BUDGET,
+            recent_turns=Config.PROMPT_RECENT_TURNS
+        )
         
         # Carrega API key
         self._load_api_key()
@@ -61,7 +93,7 @@ class JarvisCore:
         if self.api_key:
             try:
                 genai.configure(api_key=self.api_key)
-                self.model = genai.GenerativeModel(Config.AI_MODEL)
+                self.model = genai.GenerativeModel(Config.AI_MODEL, system_instruction=self.SYSTEM_INSTRUCTION)
                 self.vision_enabled = True
                 self.logger.info("API Gemini configurada com sucesso", "CORE")
             except Exception as e:
@@ -202,6 +234,13 @@ class JarvisCore:
         if not self.is_available():
             return "❌ API Gemini não está disponível. Verifique sua API key no arquivo .env."
         
+        # Perguntas repetidas são respondidas pelo cache, sem chamar o modelo
+        fingerprint = self._context_fingerprint(message, conversation_history, memories, system_commands_info)
+        cached_response = self._get_cached_response(message, fingerprint)
+        if cached_response:
+            self._save_to_memory(message, cached_response)
+            return cached_response
+        
         try:
             self.logger.system("Enviando requisição para API Gemini...", "CORE")
             
@@ -233,6 +272,7 @@ class JarvisCore:
             
             # Salva na memória
             self._save_to_memory(message, cleaned_response)
+            self._cache_response(message, fingerprint, cleaned_response)
             
             return cleaned_response
             
@@ -240,67 +280,197 @@ class JarvisCore:
             self.logger.error(e, "Erro ao processar mensagem com Gemini", "CORE")
             return f"❌ Erro ao processar mensagem: {str(e)}"
     
-    def _prepare_context(self, message: str, conversation_history: List[Dict], memories: List[str], system_commands_info: str) -> str:
-        """Prepara o contexto completo para a API"""
-        # Histórico da conversa
-        history_lines = []
-        if conversation_history:
-            recent_messages = conversation_history[-10:]  # Últimas 10 mensagens
-            for msg in recent_messages:
-                if msg.get('is_user'):
-                    history_lines.append(f"VOCÊ: {msg['message']}")
-                elif msg.get('is_jarvis'):
-                    history_lines.append(f"JARVIS: {msg['message']}")
-                elif msg.get('is_system'):
-                    history_lines.append(f"SISTEMA: {msg['message']}")
+    def process_message_stream(self, message: str, conversation_history: List[Dict], memories: List[str],
+                               system_commands_info: str = "", on_chunk=None, on_sentence=None) -> str:
+        """Processa mensagem com Gemini em streaming
         
-        conversation_context = "\n".join(history_lines)
+        Cada pedaço recebido passa pela limpeza incremental de Markdown e é
+        entregue imediatamente, sem esperar a resposta completa.
         
+        Args:
+            on_chunk: Chamado com cada trecho de texto limpo (exibição)
+            on_sentence: Chamado com cada frase completa (síntese de voz)
+            
+        Returns:
+            str: Resposta completa já limpa
+        """
+        if not self.is_available():
+            return "❌ API Gemini não está disponível. Verifique sua API key no arquivo .env."
+        
+        cleaner = StreamingMarkdownCleaner(keep_code_blocks=Config.AI_KEEP_CODE_BLOCKS)
+        sentences = SentenceBuffer()
+        parts = []
+        
+        def deliver(text):
+            if not text:
+                return
+            parts.append(text)
+            if on_chunk:
+                on_chunk(text)
+            if on_sentence:
+                for sentence in sentences.feed(text):
+                    on_sentence(sentence)
+        
+        fingerprint = self._context_fingerprint(message, conversation_history, memories, system_commands_info)
+        cached_response = self._get_cached_response(message, fingerprint)
+        if cached_response:
+            deliver(cached_response)
+            if on_sentence:
+                for sentence in sentences.flush():
+                    on_sentence(sentence)
+            self.last_stream_metrics = {'ttft_ms': 0.0, 'total_ms': 0.0, 'tokens': 0, 'tokens_per_sec': 0.0, 'cached': True}
+            self._save_to_memory(message, cached_response)
+            return cached_response
+        
+        try:
+            self.logger.system("Enviando requisição em streaming para API Gemini...", "CORE")
+            context = self._prepare_context(message, conversation_history, memories, system_commands_info)
+            
+            generation_config = genai.types.GenerationConfig(
+                max_output_tokens=4096,
+                temperature=0.7,
+                stop_sequences=None,
+                candidate_count=1
+            )
+            
+            start = time.perf_counter()
+            first_token_at = None
+            raw_chars = 0
+            
+            response = self.model.generate_content(
+                context,
+                generation_config=generation_config,
+                stream=True
+            )
+            
+            for chunk in response:
+                text = self._extract_chunk_text(chunk)
+                if not text:
+                    continue
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                raw_chars += len(text)
+                deliver(cleaner.feed(text))
+            
+            deliver(cleaner.flush())
+            if on_sentence:
+                for sentence in sentences.flush():
+                    on_sentence(sentence)
+            
+            self.last_stream_metrics = self._stream_metrics(response, start, first_token_at, raw_chars)
+            self.logger.system(
+                f"Streaming concluído: TTFT {self.last_stream_metrics['ttft_ms']} ms, "
+                f"{self.last_stream_metrics['tokens']} tokens, "
+                f"{self.last_stream_metrics['tokens_per_sec']} tokens/s", "CORE"
+            )
+            
+            cleaned_response = "".join(parts)
+            self._save_to_memory(message, cleaned_response)
+            self._cache_response(message, fingerprint, cleaned_response)
+            return cleaned_response
+            
+        except Exception as e:
+            self.logger.error(e, "Erro ao processar mensagem em streaming com Gemini", "CORE")
+            # O erro também vai para a tela, no bloco já aberto (após o texto parcial, se houver)
+            error_text = f"❌ Erro ao processar mensagem: {str(e)}"
+            deliver(f"\n{error_text}" if parts else error_text)
+            self.last_stream_metrics = {'ttft_ms': 0.0, 'total_ms': 0.0, 'tokens': 0, 'tokens_per_sec': 0.0, 'error': True}
+            return error_text
+    
+    def _get_cached_response(self, message: str, fingerprint: str) -> Optional[str]:
+        """Busca a resposta no cache de respostas, se habilitado"""
+        if not self.response_cache:
+            return None
+        cached = self.response_cache.get(message, fingerprint)
+        if cached:
+            self.logger.system("Resposta obtida do cache", "CORE")
+        return cached
+    
+    def _cache_response(self, message: str, fingerprint: str, response: str):
+        """Armazena a resposta no cache (respostas de erro não são guardadas)"""
+        if self.response_cache and not response.startswith("❌"):
+            self.response_cache.put(message, fingerprint, response)
+    
+    def close(self):
+        """Grava o cache de respostas em disco"""
+        if self.response_cache:
+            self.response_cache.save()
+    
+    def get_cache_stats(self) -> Dict:
+        """Retorna acertos e falhas do cache de respostas"""
+        return self.response_cache.get_stats() if self.response_cache else {}
+    
+    def _extract_chunk_text(self, chunk) -> str:
+        """Extrai o texto de um pedaço do streaming (pedaços sem texto são ignorados)"""
+        try:
+            return chunk.text
+        except Exception:
+            return ""
+    
+    def _stream_metrics(self, response, start: float, first_token_at: Optional[float], raw_chars: int) -> Dict:
+        """Calcula tempo até o primeiro token e tokens/s de uma resposta em streaming"""
+        end = time.perf_counter()
+        
+        # Usa a contagem da API quando disponível; senão estima ~4 caracteres por token
+        tokens = None
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is not None:
+            tokens = getattr(usage, 'candidates_token_count', None)
+        if not tokens:
+            tokens = max(1, raw_chars // 4) if raw_chars else 0
+        
+        generation_time = end - (first_token_at or end)
+        return {
+            'ttft_ms': round(((first_token_at or end) - start) * 1000, 1),
+            'total_ms': round((end - start) * 1000, 1),
+            'tokens': tokens,
+            'tokens_per_sec': round(tokens / generation_time, 1) if generation_time > 0 else float(tokens),
+        }
+    
+    def get_stream_metrics(self) -> Dict:
+        """Retorna as métricas da última resposta em streaming"""
+        return dict(self.last_stream_metrics)
+    
+    def _context_parts(self, message: str, memories: List[str], system_commands_info: str):
+        """Seções de contexto e instruções do prompt (a mesma base do prompt e da chave do cache)"""
         # Memórias do sistema
         memory_context = "\n".join([f"- {mem}" for mem in memories]) if memories else ""
         
         # Detecção de pedido de detalhamento
         needs_detail = any(keyword in message.lower() for keyword in ['mais detalhes', 'continue', 'explique melhor', 'pode detalhar', 'mais informações'])
         
-        # Prompt otimizado
-        if needs_detail:
-            prompt = f"""Você é J.A.R.V.I.S., assistente de IA avançada com controle de sistema.
-
-Regras para esta resposta:
-- Forneça análise profunda e técnica (ignore a regra de concisão)
-- Use todo o contexto disponível
-- Seja detalhado e completo
-
-Histórico da conversa recente:
-{conversation_context}
-
-Memórias do sistema:
-{memory_context}
-{system_commands_info}
-
-Comando atual: {message}
-
-Responda com detalhamento técnico completo."""
-        else:
-            prompt = f"""Você é J.A.R.V.I.S., assistente de IA avançada com controle de sistema.
-
-Regras de resposta:
-- Seja objetivo e direto, sem introduções longas
-- Limite: 2-3 parágrafos curtos
-- Tom: técnico, útil, levemente sarcástico/atencioso
-- Sem enrolações como "Com certeza" ou "Aqui está sua análise"
-
-Histórico da conversa recente:
-{conversation_context}
-
-Memórias do sistema:
-{memory_context}
-{system_commands_info}
-
-Comando: {message}
-
-Responda de forma técnica e direta."""
+        sections = [("Memórias do sistema", memory_context), ("Comandos disponíveis", system_commands_info)]
+        return sections, "MODO DETALHADO" if needs_detail else ""
+    
+    def _context_fingerprint(self, message: str, conversation_history: List[Dict], memories: List[str],
+                             system_commands_info: str) -> str:
+        """Chave do cache: modelo e contexto montado; a conversa só entra se o comando se refere a ela"""
+        sections, instructions = self._context_parts(message, memories, system_commands_info)
+        recent = [(msg.get('sender'), msg.get('message')) for msg in (conversation_history or [])[-Config.PROMPT_RECENT_TURNS:]]
+        return ResponseCache.context_fingerprint(message, Config.AI_MODEL, sections, instructions, history=recent)
+    
+    def _prepare_context(self, message: str, conversation_history: List[Dict], memories: List[str], system_commands_info: str) -> str:
+        """Prepara o prompt da requisição dentro do orçamento de tokens
+        
+        A persona fica em SYSTEM_INSTRUCTION; aqui entram apenas o modo da
+        resposta, o contexto e a conversa. As mensagens que saem da janela
+        recente viram um resumo acumulado (ver PromptAssembler).
+        """
+        # Histórico da conversa
+        history = []
+        for msg in conversation_history or []:
+            if msg.get('is_user'):
+                history.append(("VOCÊ", msg['message']))
+            elif msg.get('is_jarvis'):
+                history.append(("JARVIS", msg['message']))
+            elif msg.get('is_system'):
+                history.append(("SISTEMA", msg['message']))
+        
+        sections, instructions = self._context_parts(message, memories, system_commands_info)
+        prompt = self.prompt_assembler.build(message, sections=sections, history=history, instructions=instructions)
         
+        stats = self.prompt_assembler.get_stats()
+        self.logger.system(f"Prompt montado: {stats['tokens']}/{stats['budget']} tokens estimados", "CORE")
         return prompt
     
     def _extract_response_text(self, response) -> str:
@@ -316,19 +486,9 @@ Responda de forma técnica e direta."""
     def _clean_response(self, response: str) -> str:
         """Limpa Markdown e formatação da resposta"""
         try:
-            # Limpeza direta de Markdown
-            cleaned = response.replace('###', '').replace('**', '').replace('---', '').replace('*', '').replace('`', '')
-            
-            # Limpeza adicional com regex
-            cleaned = re.sub(r'^#{1,6}\s+', '', cleaned, flags=re.MULTILINE)
-            cleaned = re.sub(r'\*\*(.*?)\*\*', r'\1', cleaned)
-            cleaned = re.sub(r'\*(.*?)\*', r'\1', cleaned)
-            cleaned = re.sub(r'`(.*?)`', r'\1', cleaned)
-            cleaned = re.sub(r'^[-*]{3,}\s*$', '', cleaned, flags=re.MULTILINE)
-            cleaned = re.sub(r'\s+', ' ', cleaned)
-            
+            cleaned = clean_markdown(response, keep_code_blocks=Config.AI_KEEP_CODE_BLOCKS)
             self.logger.system("Markdown limpo com sucesso", "CORE")
-            return cleaned.strip()
+            return cleaned
             
         except Exception as e:
             self.logger.error(e, "Erro na limpeza de Markdown", "CORE")
@@ -337,64 +497,35 @@ Responda de forma técnica e direta."""
     def _save_to_memory(self, user_message: str, jarvis_response: str):
         """Salva interação na memória"""
         try:
-            # Aqui poderia integrar com um sistema de memória persistente
-            # Por enquanto, apenas loga
+            if self.memory_manager:
+                self.memory_manager.process_user_input(user_message, self.session_id)
+                self.memory_manager.store_conversation(self.session_id, user_message, jarvis_response)
             self.logger.info(f"Memória: User='{user_message[:50]}...', Jarvis='{jarvis_response[:50]}...'", "CORE")
         except Exception as e:
             self.logger.error(e, "Erro ao salvar na memória", "CORE")
     
-    def register_typing_callback(self, callback):
-        """Registra callback para efeito de digitação"""
-        self.typing_callbacks.append(callback)
-    
-    def start_typing_effect(self, message: str, callback):
-        """Inicia efeito de digitação em thread separada"""
-        if not message or not isinstance(message, str):
-            callback("❌ Mensagem inválida para exibição")
-            return
+    def record_command(self, intent: str):
+        """Registra o uso de um comando de sistema (frequência de uso do prefetch)
         
-        self.typing_active = True
-        self.logger.system("Iniciando efeito de digitação", "CORE")
-        
-        def typing_thread():
-            try:
-                # Efeito de digitação caracter por caracter
-                displayed_text = ""
-                for i, char in enumerate(message):
-                    if not self.typing_active:
-                        break
-                    
-                    displayed_text += char
-                    
-                    # Adiciona cursor piscante
-                    text_with_cursor = displayed_text + "█"
-                    
-                    # Chama callback na thread principal
-                    if hasattr(callback, '__call__'):
-                        callback(text_with_cursor, i == len(message) - 1)
-                    
-                    # Pequeno delay para efeito de digitação
-                    import time
-                    time.sleep(0.02)  # 50ms por caractere
-                
-                # Remove cursor no final
-                if self.typing_active:
-                    callback(displayed_text, True)
-                    
-            except Exception as e:
-                self.logger.error(e, "Erro no efeito de digitação", "CORE")
-                callback(f"❌ Erro na exibição: {e}")
-            finally:
-                self.typing_active = False
-        
-        # Executa em thread separada para não bloquear
-        thread = threading.Thread(target=typing_thread, daemon=True)
-        thread.start()
+        Só a intenção é guardada, numa tabela à parte: o comando não vira uma
+        troca da conversa (nem entra na busca, no índice vetorial ou nos
+        prompts do Gemini) e resultados como a senha gerada não são salvos.
+        """
+        try:
+            if self.memory_manager:
+                self.memory_manager.record_command_usage(self.session_id, intent)
+        except Exception as e:
+            self.logger.error(e, "Erro ao registrar comando", "CORE")
     
-    def stop_typing(self):
-        """Para o efeito de digitação atual"""
-        self.typing_active = False
-        self.logger.system("Efeito de digitação parado", "CORE")
+    def get_memories(self, limit: int = 3) -> List[str]:
+        """Recupera os fatos mais recentes do motor de memória compartilhado"""
+        if not self.memory_manager:
+            return []
+        try:
+            return [fact for fact, _, _ in self.memory_manager.get_recent_memories(limit)]
+        except Exception as e:
+            self.logger.error(e, "Erro ao recuperar memórias", "CORE")
+            return []
     
     def get_api_status(self) -> Dict[str, any]:
         """Retorna status da API"""
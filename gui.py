@@ -6,6 +6,7 @@ Interface CustomTkinter profissional com System Monitor e tema Deep Charcoal & E
 # ==================== BIBLIOTECAS PADRÃO ====================
 import os
 import sys
+import queue
 import threading
 import time
 from typing import List, Dict, Optional, Callable
@@ -21,6 +22,9 @@ import base64
 
 # ==================== MÓDULOS PRÓPRIOS ====================
 from config import Config
+from jarvis_typewriter import TypewriterRenderer
+from jarvis_intents import IntentRouter, IntentMatch
+from jarvis_hardware import get_hardware_sampler
 
 class JarvisGUI:
     """Interface principal do J.A.R.V.I.S. Mark 13 M-13 OMNI.
@@ -74,6 +78,12 @@ class JarvisGUI:
         self.is_listening = False
         self.voice_enabled = False
         self.typing_active = False
+        self.speech_queue = None
+        self.typewriter = None
+        
+        # Comandos de sistema: tabela 'gui' compilada em um único autômato
+        self.intent_router = IntentRouter.for_scope('gui')
+        self.intent_handlers = self._build_intent_handlers()
         
         # Histórico e mensagens
         self.chat_history = []
@@ -298,6 +308,16 @@ class JarvisGUI:
         )
         toggle_button.pack(pady=5)
         
+        # Resumo de hardware lido dos buffers do amostrador
+        self.hardware = get_hardware_sampler()
+        self.hardware_label = ctk.CTkLabel(
+            monitor_header,
+            text=self.hardware.status_line(),
+            font=ctk.CTkFont(family="Consolas", size=10),
+            text_color="#00FF88"
+        )
+        self.hardware_label.pack()
+        
         # Área de log (inicialmente oculta)
         self.system_log_frame = ctk.CTkFrame(parent, fg_color="transparent")
         self.system_log_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
@@ -360,6 +380,9 @@ class JarvisGUI:
             while True:
                 try:
                     if self.monitor_visible and not self.typing_active:
+                        # Métricas de hardware (leitura instantânea dos buffers)
+                        self.hardware_label.configure(text=self.hardware.status_line())
+                        
                         # Obtém logs do buffer
                         logs = self.logger.get_buffer_logs(20)
                         
@@ -402,6 +425,7 @@ class JarvisGUI:
 • "dólar" - Cotação em tempo real
 • "tempo hoje" - Clima Votorantim
 • "processos" - Top 5 consumo RAM
+• "briefing" - Clima, dólar, notícias e processos
 • "pomodoro" - Timer de 25 min
 
 **OMNI PROTOCOLS ENGAGED** 🚀"""
@@ -427,7 +451,7 @@ class JarvisGUI:
         # Processa mensagem
         self._process_message(message)
     
-    def _process_message(self, message: str):
+    def _process_message(self, message: str, speak: bool = False):
         """Processa mensagem do usuário"""
         self.is_processing = True
         
@@ -443,14 +467,18 @@ class JarvisGUI:
                 if self.core.is_available():
                     # Prepara contexto
                     conversation_history = self._get_conversation_history()
-                    memories = []  # Aqui poderia integrar com sistema de memória
+                    memories = self.core.get_memories(3)
                     system_commands_info = self._get_system_commands_info()
                     
-                    # Processa com Gemini
-                    response = self.core.process_message(message, conversation_history, memories, system_commands_info)
-                    
-                    # Exibe com efeito de digitação
-                    self._display_with_typing("Jarvis", response)
+                    if Config.AI_STREAMING:
+                        # Exibe (e fala) os pedaços à medida que chegam
+                        self._stream_response(message, conversation_history, memories, system_commands_info, speak)
+                    else:
+                        # Processa com Gemini
+                        response = self.core.process_message(message, conversation_history, memories, system_commands_info)
+                        
+                        # Exibe com efeito de digitação (widgets só na thread principal)
+                        self.root.after(0, lambda: self._display_with_typing("Jarvis", response))
                 else:
                     # Verifica se há erro de autenticação específico
                     if self.core.has_auth_error():
@@ -471,196 +499,87 @@ class JarvisGUI:
         thread.start()
     
     def _detect_system_command(self, message: str) -> bool:
-        """Detecta e executa comandos de sistema"""
-        message_lower = message.lower()
-        
-        # Comandos de energia
-        if any(keyword in message_lower for keyword in ["desligar", "desligue", "desliga", "shutdown", "desligamento"]):
-            self._show_power_confirmation("shutdown")
-            return True
-        
-        if any(keyword in message_lower for keyword in ["reiniciar", "reinicie", "restart", "reboot", "reinicialização", "reinicialize"]):
-            self._show_power_confirmation("restart")
-            return True
-        
-        if any(keyword in message_lower for keyword in ["suspender", "suspenda", "hibernar", "dormir", "sleep"]):
-            result = self.actions.execute_power_command("suspend")
-            self.add_message("Jarvis", result, is_jarvis=True)
-            return True
-        
-        # Comandos de atualizações
-        if any(keyword in message_lower for keyword in ["verificar atualizações", "verifique atualizações", "checar atualizações", "check updates", "procurar atualizações"]):
-            result = self.actions.open_application("atualizações")
-            self.add_message("Jarvis", result, is_jarvis=True)
-            return True
-        
-        # Comandos de Hardware - Mark 13
-        if any(keyword in message_lower for keyword in ["volume", "som", "áudio", "audio"]):
-            # Extrai número da mensagem
-            import re
-            match = re.search(r'\d+', message_lower)
-            if match:
-                volume = match.group()
-                result = self.actions.set_volume(volume)
-            else:
-                result = "🔊 Por favor, especifique o volume (ex: 'volume em 50')."
-            self.add_message("Jarvis", result, is_jarvis=True)
-            return True
-        
-        if any(keyword in message_lower for keyword in ["status do sistema", "sistema status", "status sistema", "uso do sistema", "performance"]):
-            result = self.actions.get_system_status()
-            self.add_message("Jarvis", result, is_jarvis=True)
-            return True
-        
-        if any(keyword in message_lower for keyword in ["print", "screenshot", "captura", "capturar tela", "print screen", "printar"]):
-            result = self.actions.take_screenshot()
-            self.add_message("Jarvis", result, is_jarvis=True)
-            return True
-        
-        if any(keyword in message_lower for keyword in ["gerar senha", "criar senha", "senha forte", "password", "gerar password"]):
-            # Verifica se especificou comprimento
-            import re
-            match = re.search(r'\d+', message_lower)
-            if match:
-                length = int(match.group())
-                result = self.actions.generate_password(length)
-            else:
-                result = self.actions.generate_password()
-            self.add_message("Jarvis", result, is_jarvis=True)
-            return True
-        
-        if any(keyword in message_lower for keyword in ["me lembre", "lembrete", "lembrar"]):
-            # Extrai tempo
-            import re
-            time_match = re.search(r'(\d+)\s*(?:minuto| minutos|min|mins)', message_lower)
-            if time_match:
-                time_str = time_match.group()
-            else:
-                time_str = "30"  # default 30 minutos
-            
-            # Encontra a tarefa (após "de")
-            task_match = re.search(r'(?:de|em)\s+(.+)', message_lower)
-            task = task_match.group(1) if task_match else "tarefa não especificada"
-            
-            result = self.actions.set_reminder(time_str, task)
-            self.add_message("Jarvis", result, is_jarvis=True)
-            return True
-        
-        # Web - Clima
-        if any(keyword in message_lower for keyword in ["tempo hoje", "clima hoje", "previsão do tempo", "tempo agora", "clima agora"]):
-            result = self.actions.get_weather_votorantim()
-            self._show_jarvis_response(result, speak=True)
-            return True
-        
-        # Web - Notícias
-        if any(keyword in message_lower for keyword in ["notícias", "manchetes", "notícia do dia", "jornal"]):
-            result = self.actions.get_news_headlines()
-            self._show_jarvis_response(result, speak=True)
-            return True
-        
-        # Web - Cotações (específico)
-        if any(keyword in message_lower for keyword in ["quanto está o dólar", "cotação do dólar", "dólar hoje", "usd brl"]):
-            result = self.actions.get_currency_rate('USD', 'BRL')
-            self.add_message("Jarvis", result, is_jarvis=True)
-            return True
-        
-        # Web - Cotações (genérico)
-        if any(keyword in message_lower for keyword in ["dólar", "dolar", "euro", "bitcoin", "real", "peso", "libra"]):
-            # Encontra a moeda mencionada
-            currency = None
-            currencies = ["dólar", "dolar", "euro", "bitcoin", "real", "peso", "libra"]
-            for coin in currencies:
-                if coin in message_lower:
-                    currency = coin
-                    break
-            
-            if currency:
-                result = self.actions.get_currency_final(currency)
+        """Detecta e executa comandos de sistema
+        
+        O IntentRouter classifica a mensagem em uma única passada (tabela
+        'gui' de jarvis_intents, na ordem de prioridade original) e a
+        intenção vencedora é despachada para o seu handler.
+        """
+        match = self.intent_router.classify(message)
+        if match is None:
+            return False
+        
+        # Frequência de uso: orienta o que o prefetch mantém quente
+        if self.actions.prefetch:
+            self.actions.prefetch.note_request(match.intent)
+        
+        outcome = self.intent_handlers[match.intent](match, message.lower())
+        if outcome:
+            result, speak = outcome
+            if speak:
+                self._show_jarvis_response(result, speak=True)
             else:
-                result = self.actions.get_currency_final("dólar")  # Default para dólar
-            
-            self._show_jarvis_response(result, speak=True)
-            return True
-        
-        # Sistema - Limpar Lixeira
-        if any(keyword in message_lower for keyword in ["limpar lixeira", "esvaziar lixeira"]):
-            result = self.actions.empty_recycle_bin()
-            self.add_message("Jarvis", result, is_jarvis=True)
-            return True
-        
-        # Sistema - Brilho
-        if any(keyword in message_lower for keyword in ["aumentar brilho", "mais brilho", "bright"]):
-            result = self.actions.adjust_brightness("aumentar")
-            self.add_message("Jarvis", result, is_jarvis=True)
-            return True
-        
-        if any(keyword in message_lower for keyword in ["diminuir brilho", "menos brilho", "dark", "escurecer"]):
-            result = self.actions.adjust_brightness("diminuir")
-            self.add_message("Jarvis", result, is_jarvis=True)
-            return True
-        
-        # Sistema - Processos
-        if any(keyword in message_lower for keyword in ["processos", "processos ativos", "apps mais consumidos", "top processos", "uso de memória"]):
-            result = self.actions.get_top_processes()
-            self.add_message("Jarvis", result, is_jarvis=True)
-            return True
-        
-        # Foco - Música
-        if any(keyword in message_lower for keyword in ["tocar", "play", "música", "youtube", "spotify", "ouvir"]):
-            # Extrai nome da música/artista
-            import re
-            music_query = message_lower
-            for keyword in ["tocar", "play", "música", "youtube", "spotify", "ouvir"]:
-                if keyword in message_lower:
-                    music_query = message_lower.replace(keyword, "", 1).strip()
-                    break
-            
-            if music_query:
-                result = self.actions.play_music(music_query)
                 self.add_message("Jarvis", result, is_jarvis=True)
-                return True
-        
-        # Foco - Pomodoro
-        if any(keyword in message_lower for keyword in ["pomodoro", "timer", "cronômetro", "cronometro", "estudar", "foco"]):
-            # Extrai tarefa
-            task = "Estudo"
-            for keyword in ["estudar", "foco"]:
-                if keyword in message_lower:
-                    task = keyword.title()
-                    break
-            
-            result = self.actions.start_pomodoro_timer(task)
-            self.add_message("Jarvis", result, is_jarvis=True)
-            return True
-        
-        # Comandos de aplicativos
-        # Extrai nome do aplicativo sem limpeza agressiva
-        for keyword in ["abra", "abrir", "abre", "iniciar", "start", "open", "execute", "executar"]:
-            if keyword in message_lower:
-                # Apenas remove a palavra-chave, mantém o resto intacto
-                app_name = message_lower.replace(keyword, "", 1).strip()
-                
-                if app_name:
-                    result = self.actions.open_application(app_name)
-                    self.add_message("Jarvis", result, is_jarvis=True)
-                    return True
-        
-        # Comandos diretos sem palavra-chave (ex: "notepad", "calculadora")
-        direct_apps = [
-            "notepad", "bloco de notas", "calculadora", "calc", "calculator",
-            "configurações", "configuracoes", "settings", "painel de controle",
-            "cmd", "prompt", "terminal", "powershell", "explorer", "task manager",
-            "gerenciador de tarefas", "defender", "windows defender", "antivírus"
-        ]
-        
-        if any(app in message_lower for app in direct_apps):
-            for app in direct_apps:
-                if app in message_lower:
-                    result = self.actions.open_application(app)
-                    self.add_message("Jarvis", result, is_jarvis=True)
-                    return True
-        
-        return False
+        self.core.record_command(match.intent)
+        return True
+    
+    def _build_intent_handlers(self) -> Dict[str, Callable[[IntentMatch, str], Optional[tuple]]]:
+        """Handlers das intenções da tabela 'gui'
+        
+        Cada handler recebe (match, mensagem em minúsculas) e devolve
+        (resultado, falar) ou None quando já cuidou da exibição.
+        """
+        actions = self.actions
+        
+        def volume(match, text):
+            if "number" in match.slots:
+                return actions.set_volume(str(match.slots["number"])), False
+            return "🔊 Por favor, especifique o volume (ex: 'volume em 50').", False
+        
+        def password(match, text):
+            if "number" in match.slots:
+                return actions.generate_password(match.slots["number"]), False
+            return actions.generate_password(), False
+        
+        def reminder(match, text):
+            minutes = match.slots.get("duration", 30)  # default 30 minutos
+            task = match.slots.get("task", "tarefa não especificada")
+            return actions.set_reminder(str(minutes), task), False
+        
+        def pomodoro(match, text):
+            task = next((keyword.title() for keyword in ["estudar", "foco"] if keyword in text), "Estudo")
+            return actions.start_pomodoro_timer(task), False
+        
+        return {
+            # Energia
+            "power_shutdown": lambda match, text: self._show_power_confirmation("shutdown"),
+            "power_restart": lambda match, text: self._show_power_confirmation("restart"),
+            "power_suspend": lambda match, text: (actions.execute_power_command("suspend"), False),
+            "check_updates": lambda match, text: (actions.open_application("atualizações"), False),
+            # Hardware - Mark 13
+            "volume_set": volume,
+            "system_status": lambda match, text: (actions.get_system_status(), False),
+            "screenshot": lambda match, text: (actions.take_screenshot(), False),
+            "password": password,
+            "reminder": reminder,
+            # Web
+            "briefing": lambda match, text: (actions.get_daily_briefing(), False),
+            "weather": lambda match, text: (actions.get_weather_votorantim(), True),
+            "news": lambda match, text: (actions.get_news_headlines(), True),
+            "currency_usd": lambda match, text: (actions.get_currency_rate('USD', 'BRL'), False),
+            "currency": lambda match, text: (actions.get_currency_final(match.keyword), True),
+            # Sistema
+            "empty_recycle_bin": lambda match, text: (actions.empty_recycle_bin(), False),
+            "brightness_up": lambda match, text: (actions.adjust_brightness("aumentar"), False),
+            "brightness_down": lambda match, text: (actions.adjust_brightness("diminuir"), False),
+            "top_processes": lambda match, text: (actions.get_top_processes(), False),
+            # Foco
+            "play_music": lambda match, text: (actions.play_music(match.slots["remainder"]), False),
+            "pomodoro": pomodoro,
+            # Aplicativos
+            "open_app": lambda match, text: (actions.open_application(match.slots["remainder"]), False),
+            "open_direct_app": lambda match, text: (actions.open_application(match.keyword), False),
+        }
     
     def _show_power_confirmation(self, action: str):
         """Mostra diálogo de confirmação para comandos de energia"""
@@ -739,7 +658,7 @@ class JarvisGUI:
         self.add_message("Jarvis", result, is_jarvis=True)
     
     def _display_with_typing(self, sender: str, message: str):
-        """Exibe mensagem com efeito de digitação"""
+        """Exibe mensagem com efeito de digitação (chamar na thread principal)"""
         if not message or not isinstance(message, str):
             self.add_message(sender, "❌ Mensagem inválida", is_jarvis=True)
             return
@@ -752,42 +671,88 @@ class JarvisGUI:
             'is_jarvis': sender == "Jarvis"
         })
         
-        # Prepara display
-        self.chat_display.configure(state="normal")
+        # Mensagem anterior ainda em digitação termina de uma vez
+        if self.typewriter is None:
+            self.typewriter = TypewriterRenderer(
+                self.root, self._append_stream_text, on_complete=self._finish_typing,
+                fps=Config.TYPEWRITER_FPS, chars_per_second=Config.TYPEWRITER_CHARS_PER_SECOND,
+                instant_threshold=Config.TYPEWRITER_INSTANT_CHARS
+            )
+        elif self.typewriter.active:
+            self.typewriter.finish()
         
         # Nome do remetente
+        self.chat_display.configure(state="normal")
         self.chat_display.insert("end", f"\n{sender}:\n", "jarvis" if sender == "Jarvis" else "user")
+        self.chat_display.configure(state="disabled")
         
-        # Inicia efeito de digitação
+        # Inicia efeito de digitação (quadros agendados com root.after)
         self.typing_active = True
-        self.core.start_typing_effect(message, self._typing_callback)
+        self.typewriter.start(message)
     
-    def _typing_callback(self, text: str, is_complete: bool):
-        """Callback para efeito de digitação"""
-        try:
-            # Remove última entrada e adiciona nova
-            self.chat_display.configure(state="normal")
-            
-            # Encontra última linha para substituir
-            last_line = self.chat_display.index("end-1c")
-            line_start = self.chat_display.index(f"{last_line} linestart")
-            
-            # Deleta última linha
-            self.chat_display.delete(line_start, last_line)
-            
-            # Insere texto atualizado
-            display_text = text if not is_complete else text
-            self.chat_display.insert("end", display_text, "jarvis")
-            
-            # Auto-scroll
-            self.chat_display.see("end")
-            self.chat_display.configure(state="disabled")
-            
-            if is_complete:
-                self.typing_active = False
-                
-        except Exception as e:
-            self.logger.error(e, "Erro no callback de digitação", "GUI")
+    def _stream_response(self, message: str, conversation_history: List[Dict], memories: List[str],
+                         system_commands_info: str, speak: bool = False):
+        """Exibe a resposta do Gemini em streaming, pedaço a pedaço
+        
+        Os pedaços chegam na thread de processamento e são inseridos no chat
+        pela thread principal via root.after. Com speak=True, cada frase
+        completa vai para a fila de voz assim que termina.
+        """
+        self.root.after(0, self._begin_stream_message, "Jarvis")
+        
+        response = self.core.process_message_stream(
+            message, conversation_history, memories, system_commands_info,
+            on_chunk=lambda text: self.root.after(0, self._append_stream_text, text),
+            on_sentence=self._queue_speech if speak else None
+        )
+        
+        self.root.after(0, self._finish_stream_message, "Jarvis", response)
+    
+    def _begin_stream_message(self, sender: str):
+        """Insere o cabeçalho da mensagem que será preenchida em streaming"""
+        self.typing_active = True
+        self.chat_display.configure(state="normal")
+        self.chat_display.insert("end", f"\n{sender}:\n", "jarvis")
+        self.chat_display.configure(state="disabled")
+    
+    def _append_stream_text(self, text: str):
+        """Acrescenta um pedaço de texto ao final do chat"""
+        self.chat_display.configure(state="normal")
+        self.chat_display.insert("end", text, "jarvis")
+        self.chat_display.see("end")
+        self.chat_display.configure(state="disabled")
+    
+    def _finish_stream_message(self, sender: str, response: str):
+        """Fecha a mensagem em streaming e registra no histórico"""
+        self._append_stream_text("\n")
+        self.typing_active = False
+        self.chat_history.append({
+            'sender': sender,
+            'message': response,
+            'timestamp': time.time(),
+            'is_jarvis': True
+        })
+        metrics = self.core.get_stream_metrics()
+        if metrics and not metrics.get('error'):
+            self.logger.info(f"TTFT {metrics['ttft_ms']} ms | {metrics['tokens_per_sec']} tokens/s", "GUI")
+    
+    def _queue_speech(self, sentence: str):
+        """Enfileira uma frase para a síntese de voz, em ordem"""
+        if self.speech_queue is None:
+            self.speech_queue = queue.Queue()
+            threading.Thread(target=self._speech_loop, daemon=True).start()
+        self.speech_queue.put(sentence)
+    
+    def _speech_loop(self):
+        """Fala as frases enfileiradas uma de cada vez"""
+        while True:
+            sentence = self.speech_queue.get()
+            self._speak(sentence)
+    
+    def _finish_typing(self):
+        """Fecha a mensagem exibida com efeito de digitação"""
+        self._append_stream_text("\n")
+        self.typing_active = False
     
     def add_message(self, sender: str, message: str, is_user: bool = False, is_jarvis: bool = False, is_system: bool = False, speak: bool = False):
         """Adiciona mensagem ao chat e opcionalmente fala
@@ -912,15 +877,15 @@ class JarvisGUI:
     def _process_voice_command(self, text: str):
         """Processa comando de voz"""
         self.add_message("Voz", text, is_user=True)
-        self._process_message(text)
+        self._process_message(text, speak=True)
     
     def _update_status(self, text: str, color: str):
         """Atualiza barra de status"""
         self.status_label.configure(text=text, text_color=color)
     
     def _get_conversation_history(self) -> List[Dict]:
-        """Retorna histórico da conversa"""
-        return self.chat_history[-10:]  # Últimas 10 mensagens
+        """Retorna histórico da conversa (o Core mantém a janela recente e resume o resto)"""
+        return list(self.chat_history)
     
     def _get_system_commands_info(self) -> str:
         """Retorna informações dos comandos de sistema"""
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Índice de Executáveis do Jarvis
+Catálogo persistente dos aplicativos instalados, montado com os.scandir e atualizado por mtime de diretório
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Pastas que nunca contêm aplicativos para abrir e só deixam a varredura lenta
+SKIP_DIRS = {'winsxs', 'driverstore', 'node_modules', '__pycache__', '.git', 'temp', 'cache', 'crashpad'}
+
+
+def default_roots() -> List[str]:
+    """Pastas varridas pela busca universal de aplicativos (Windows)"""
+    user = os.getenv('USERNAME') or ''
+    return [
+        r"C:\Program Files",
+        r"C:\Program Files (x86)",
+        os.getenv('LOCALAPPDATA') or fr"C:\Users\{user}\AppData\Local",
+        os.getenv('APPDATA') or fr"C:\Users\{user}\AppData\Roaming",
+        fr"C:\Users\{user}\Desktop",
+        "C:\\Windows\\System32",
+    ]
+
+
+def name_variations(name: str) -> List[str]:
+    """Formas do nome usadas como chave ("Visual Studio" → "visual studio", "visualstudio")"""
+    name = name.lower().strip()
+    if name.endswith('.exe'):
+        name = name[:-4]
+    variations = [name, name.replace(' ', ''), name.replace('-', ''), name.replace('_', ''),
+                  name.replace(' ', '').replace('-', '').replace('_', '')]
+    return list(dict.fromkeys(v for v in variations if v))
+
+
+class AppIndex:
+    """Catálogo de executáveis (nome, caminho, mtime) persistido em disco
+    
+    Substitui as chamadas repetidas a `where` e os glob recursivos da busca
+    universal: as pastas são varridas uma vez com os.scandir e o resultado
+    fica em jarvis_app_index.json. Nas atualizações seguintes, um diretório
+    cujo mtime não mudou reaproveita a listagem salva (só um stat), então
+    apenas as pastas onde algo foi instalado ou removido são lidas de novo.
+    
+    A consulta por nome é um acesso a dicionário; search() faz a busca por
+    trecho do nome sobre o catálogo em memória.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, roots: Optional[List[str]] = None, cache_path: Optional[str] = 'jarvis_app_index.json',
+                 extensions: Tuple[str, ...] = ('.exe',), max_depth: int = 6):
+        """
+        Args:
+            roots: Pastas varridas (padrão: default_roots())
+            cache_path: Arquivo JSON do catálogo (None para não persistir)
+            extensions: Extensões consideradas executáveis
+            max_depth: Profundidade máxima abaixo de cada raiz
+        """
+        self.roots = [os.path.normpath(root) for root in (roots if roots is not None else default_roots())]
+        self.cache_path = cache_path
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.max_depth = max_depth
+        
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._dirs: Dict[str, Dict] = {}
+        self._by_name: Dict[str, List[Tuple[str, float]]] = {}
+        self._entries: List[Tuple[str, str, float]] = []
+        self.generation = 0
+        self.ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        
+        self.stats = {'refreshes': 0, 'scanned_dirs': 0, 'reused_dirs': 0,
+                      'executables': 0, 'last_refresh_ms': 0.0, 'lookups': 0, 'hits': 0}
+        self._load()
+    
+    # ==================== CONSULTA ====================
+    
+    def find(self, name: str) -> Optional[str]:
+        """Caminho do executável com esse nome (ou variação sem espaços/hífens)"""
+        with self._lock:
+            self.stats['lookups'] += 1
+            for key in name_variations(name):
+                matches = self._by_name.get(key)
+                if matches:
+                    self.stats['hits'] += 1
+                    return matches[0][0]
+        return None
+    
+    def find_latest(self, name: str) -> Optional[str]:
+        """Entre várias cópias do executável (ex.: app-1.0.9\\Discord.exe), a mais recente"""
+        with self._lock:
+            matches = self._by_name.get(name_variations(name)[0]) if name.strip() else None
+        if not matches:
+            return None
+        return max(matches, key=lambda match: match[1])[0]
+    
+    def search(self, fragment: str, limit: int = 3) -> List[str]:
+        """Executáveis cujo nome contém o trecho (equivalente ao antigo *nome*.exe)"""
+        fragment = fragment.lower().strip()
+        if not fragment:
+            return []
+        with self._lock:
+            entries = self._entries
+        return [path for name, path, _ in entries if fragment in name][:limit]
+    
+    def entries(self) -> List[Tuple[str, str, float]]:
+        """Catálogo completo como (nome sem extensão, caminho, mtime)"""
+        with self._lock:
+            return list(self._entries)
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+    
+    # ==================== ATUALIZAÇÃO ====================
+    
+    def refresh(self) -> Dict:
+        """Atualiza o catálogo, relendo só os diretórios cujo mtime mudou"""
+        with self._refresh_lock:
+            start = time.perf_counter()
+            with self._lock:
+                old_dirs = self._dirs
+            new_dirs: Dict[str, Dict] = {}
+            counts = {'scanned': 0, 'reused': 0}
+            
+            for root in self.roots:
+                self._walk(root, old_dirs, new_dirs, counts)
+            
+            self._install(new_dirs)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.stats['refreshes'] += 1
+                self.stats['scanned_dirs'] = counts['scanned']
+                self.stats['reused_dirs'] = counts['reused']
+                self.stats['last_refresh_ms'] = round(elapsed_ms, 2)
+            
+            if counts['scanned'] or len(new_dirs) != len(old_dirs):
+                self.save()
+            self.ready.set()
+            return self.get_stats()
+    
+    def _walk(self, root: str, old_dirs: Dict[str, Dict], new_dirs: Dict[str, Dict], counts: Dict[str, int]):
+        """Percorre uma raiz; diretórios com o mesmo mtime reaproveitam a listagem"""
+        stack = [(root, 0)]
+        while stack:
+            path, depth = stack.pop()
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+            
+            cached = old_dirs.get(path)
+            if cached is not None and cached['mtime'] == mtime:
+                entry = cached
+                counts['reused'] += 1
+            else:
+                entry = self._scan_dir(path, mtime)
+                if entry is None:
+                    continue
+                counts['scanned'] += 1
+            
+            new_dirs[path] = entry
+            if depth < self.max_depth:
+                stack.extend((os.path.join(path, subdir), depth + 1) for subdir in entry['subdirs'])
+    
+    def _scan_dir(self, path: str, mtime: float) -> Optional[Dict]:
+        """Lista executáveis e subpastas de um diretório com os.scandir"""
+        files, subdirs = [], []
+        try:
+            with os.scandir(path) as iterator:
+                for item in iterator:
+                    try:
+                        if item.is_dir(follow_symlinks=False):
+                            if item.name.lower() not in SKIP_DIRS:
+                                subdirs.append(item.name)
+                        elif item.name.lower().endswith(self.extensions):
+                            files.append([item.name, item.stat().st_mtime])
+                    except OSError:
+                        continue
+        except OSError:
+            # Sem permissão ou removido durante a varredura
+            return None
+        return {'mtime': mtime, 'files': files, 'subdirs': subdirs}
+    
+    def _install(self, dirs: Dict[str, Dict]):
+        """Troca o catálogo em uso pelo recém-montado"""
+        entries = []
+        for path, entry in dirs.items():
+            for file_name, file_mtime in entry['files']:
+                stem = os.path.splitext(file_name)[0].lower()
+                entries.append((stem, os.path.join(path, file_name), file_mtime))
+        
+        # Caminhos mais rasos primeiro (C:\Windows\System32\notepad.exe antes de cópias em subpastas)
+        entries.sort(key=lambda entry: (entry[1].count(os.sep), entry[1].lower()))
+        
+        by_name: Dict[str, List[Tuple[str, float]]] = {}
+        for stem, path, file_mtime in entries:
+            for key in name_variations(stem):
+                by_name.setdefault(key, []).append((path, file_mtime))
+        
+        with self._lock:
+            self._dirs = dirs
+            self._entries = entries
+            self._by_name = by_name
+            self.generation += 1
+            self.stats['executables'] = len(entries)
+    
+    def start(self, interval: Optional[float] = 1800.0):
+        """Atualiza o catálogo em segundo plano (e a cada interval segundos)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, args=(interval,),
+                                        name="AppIndexer", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Interrompe as atualizações periódicas"""
+        self._stop.set()
+    
+    def _refresh_loop(self, interval: Optional[float]):
+        while not self._stop.is_set():
+            try:
+                stats = self.refresh()
+                print(f"🗂️ Índice de aplicativos: {stats['executables']} executáveis "
+                      f"({stats['scanned_dirs']} pastas lidas, {stats['reused_dirs']} reaproveitadas) "
+                      f"em {stats['last_refresh_ms']:.0f} ms")
+            except Exception as e:
+                print(f"❌ Erro ao atualizar índice de aplicativos: {e}")
+            if not interval or self._stop.wait(interval):
+                return
+    
+    # ==================== PERSISTÊNCIA ====================
+    
+    def _load(self):
+        """Carrega o catálogo salvo; a próxima atualização só relê o que mudou"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != self.VERSION or data.get('extensions') != list(self.extensions):
+                return
+            self._install(data.get('dirs', {}))
+            self.ready.set()
+            print(f"💾 Índice de aplicativos carregado: {len(self._entries)} executáveis")
+        except Exception as e:
+            print(f"⚠️ Erro ao carregar índice de aplicativos: {e}")
+    
+    def save(self):
+        """Grava o catálogo em disco (escrita atômica)"""
+        if not self.cache_path:
+            return
+        # O catálogo é substituído, nunca alterado: pode ser gravado fora do lock
+        with self._lock:
+            data = {'version': self.VERSION, 'extensions': list(self.extensions), 'dirs': self._dirs}
+        try:
+            temp_path = f"{self.cache_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.cache_path)
+        except Exception as e:
+            print(f"⚠️ Erro ao salvar índice de aplicativos: {e}")
+    
+    def get_stats(self) -> Dict:
+        """Tamanho do catálogo, custo da última atualização e acertos de consulta"""
+        with self._lock:
+            return dict(self.stats)
+
+
+_shared_index = None
+_shared_lock = threading.Lock()
+
+
+def get_app_index() -> AppIndex:
+    """Índice compartilhado por SystemActions e SystemController, atualizado em segundo plano"""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = AppIndex()
+            _shared_index.start()
+        return _shared_index
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Busca Aproximada de Aplicativos do Jarvis
+Índice de trigramas com distância de edição limitada sobre os sinônimos e o catálogo de executáveis
+"""
+
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from itertools import chain
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+NORMALIZE_PATTERN = re.compile(r'[^a-z0-9+]+')
+
+# Ferramentas do sistema (logoff, format, reagentc...) nunca entram na busca aproximada
+SYSTEM_DIRS = (os.getenv('SystemRoot') or r"C:\Windows",)
+
+
+def normalize_app_name(name: str) -> str:
+    """Minúsculas, sem acentos e com separadores viram espaço ("Bloco-de_Notas" → "bloco de notas")"""
+    name = unicodedata.normalize('NFKD', name.lower())
+    name = ''.join(char for char in name if not unicodedata.combining(char))
+    return ' '.join(NORMALIZE_PATTERN.sub(' ', name).split())
+
+
+def is_system_path(path: str, system_dirs: Iterable[str] = SYSTEM_DIRS) -> bool:
+    """O executável está dentro da pasta do Windows?"""
+    path = path.lower().replace('/', '\\')
+    return any(path.startswith(folder.lower().replace('/', '\\').rstrip('\\') + '\\') for folder in system_dirs)
+
+
+def trigrams(text: str) -> List[str]:
+    """Trigramas do texto com um espaço de cada lado (" bl", "blo", ..., "as ")"""
+    padded = f" {text} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """Distância de Levenshtein, ou None assim que ultrapassar limit
+    
+    Só a faixa diagonal de largura 2 * limit + 1 é calculada, e a linha é
+    abandonada quando o menor valor passa do limite.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    if a == b:
+        return 0
+    if len(a) > len(b):
+        a, b = b, a
+    
+    infinity = limit + 1
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [infinity] * (len(b) + 1)
+        current[0] = i
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        char_a = a[i - 1]
+        row_min = current[0] if low == 1 else infinity
+        for j in range(low, high + 1):
+            cost = 0 if char_a == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return None
+        previous = current
+    
+    distance = previous[len(b)]
+    return distance if distance <= limit else None
+
+
+@dataclass
+class AppCandidate:
+    """Aplicativo candidato para um nome falado ou digitado"""
+    name: str
+    target: str
+    score: float
+    source: str
+    reason: str
+
+
+class FuzzyAppMatcher:
+    """Casamento aproximado de nomes de aplicativos, montado uma vez na inicialização
+    
+    Cada nome (sinônimos do mapeamento estrito e executáveis do catálogo) é
+    normalizado e indexado pelos seus trigramas. Uma consulta:
+    
+    1. acerto exato normalizado → confiança 1.0;
+    2. candidatos pelos trigramas em comum (sem percorrer todos os nomes);
+    3. cada candidato recebe a melhor nota entre distância de edição
+       limitada ("blocde notas" → "bloco notas"), nome contido na consulta
+       ("abrir o bloco de notas" contém "bloco") e similaridade de trigramas.
+    
+    Os sinônimos vêm antes do catálogo em caso de empate.
+    """
+    
+    SOURCE_ORDER = {'synonym': 0, 'catalog': 1}
+    
+    def __init__(self, synonyms: Optional[Dict[str, str]] = None, catalog: Iterable[Tuple[str, str]] = (),
+                 max_candidates: int = 64):
+        """
+        Args:
+            synonyms: Termo → comando (ex.: mapeamento estrito de SystemActions)
+            catalog: Pares (nome do executável, caminho) do AppIndex
+            max_candidates: Candidatos verificados por consulta, pelos trigramas em comum
+        """
+        self.max_candidates = max_candidates
+        self._lock = threading.Lock()
+        self._names: List[Tuple[str, str, str]] = []
+        self._exact: Dict[str, int] = {}
+        self._grams: Dict[str, List[int]] = defaultdict(list)
+        self._gram_counts: List[int] = []
+        self.generation = None
+        
+        for name, target in (synonyms or {}).items():
+            self._add(name, target, 'synonym')
+        self._synonym_count = len(self._names)
+        for name, target in catalog:
+            self._add(name, target, 'catalog')
+    
+    def _add(self, name: str, target: str, source: str):
+        key = normalize_app_name(name)
+        if not key or key in self._exact:
+            return
+        index = len(self._names)
+        self._names.append((key, target, source))
+        self._exact[key] = index
+        grams = set(trigrams(key))
+        for gram in grams:
+            self._grams[gram].append(index)
+        self._gram_counts.append(len(grams))
+    
+    def set_catalog(self, catalog: Iterable[Tuple[str, str]], generation=None):
+        """Troca os executáveis do catálogo, mantendo os sinônimos"""
+        rebuilt = FuzzyAppMatcher(max_candidates=self.max_candidates)
+        for key, target, source in self._names[:self._synonym_count]:
+            rebuilt._add(key, target, source)
+        rebuilt._synonym_count = len(rebuilt._names)
+        for name, target in catalog:
+            rebuilt._add(name, target, 'catalog')
+        
+        with self._lock:
+            self._names, self._exact = rebuilt._names, rebuilt._exact
+            self._grams, self._gram_counts = rebuilt._grams, rebuilt._gram_counts
+            self.generation = generation
+    
+    def __len__(self):
+        return len(self._names)
+    
+    def match(self, query: str, limit: int = 5, min_score: float = 0.5,
+              sources: Optional[Iterable[str]] = None) -> List[AppCandidate]:
+        """Candidatos ordenados por confiança (0 a 1), opcionalmente só de algumas origens"""
+        key = normalize_app_name(query)
+        if not key:
+            return []
+        sources = set(sources or self.SOURCE_ORDER)
+        with self._lock:
+            names, exact, grams, gram_counts = self._names, self._exact, self._grams, self._gram_counts
+        
+        if key in exact and names[exact[key]][2] in sources:
+            name, target, source = names[exact[key]]
+            return [AppCandidate(name, target, 1.0, source, 'exato')]
+        
+        # Trigramas em comum com cada nome, só para os nomes que compartilham algum
+        query_grams = set(trigrams(key))
+        shared = Counter(chain.from_iterable(grams.get(gram, ()) for gram in query_grams))
+        if not shared:
+            return []
+        
+        # Os mais parecidos pelos trigramas, mais os nomes inteiramente contidos na consulta
+        ranked = [index for index, _ in shared.most_common(self.max_candidates)]
+        ranked += [index for index, count in shared.items() if count == gram_counts[index]]
+        
+        candidates = []
+        for index in dict.fromkeys(ranked):
+            name, target, source = names[index]
+            if source not in sources:
+                continue
+            dice = 2 * shared[index] / (len(query_grams) + gram_counts[index])
+            score, reason = self._score(key, name, dice)
+            if score >= min_score:
+                candidates.append(AppCandidate(name, target, round(score, 3), source, reason))
+        
+        candidates.sort(key=lambda c: (-c.score, self.SOURCE_ORDER[c.source], -len(c.name)))
+        return candidates[:limit]
+    
+    def best(self, query: str, min_score: float = 0.75,
+             sources: Optional[Iterable[str]] = None) -> Optional[AppCandidate]:
+        """Melhor candidato com confiança mínima, ou None"""
+        candidates = self.match(query, limit=1, min_score=min_score, sources=sources)
+        return candidates[0] if candidates else None
+    
+    @staticmethod
+    def _score(query: str, name: str, dice: float) -> Tuple[float, str]:
+        """Nota de um candidato: erro de digitação, nome contido ou trigramas"""
+        best = (0.7 * dice, 'trigramas')
+        
+        # Erros de digitação: até 1 edição em nomes curtos, 2 nos demais
+        limit = 1 if len(name) <= 5 else 2
+        distance = bounded_edit_distance(query, name, limit)
+        if distance is not None:
+            best = max(best, (1.0 - distance / max(len(query), len(name)) * 0.5 - 0.03 * distance, 'digitação'))
+        
+        # Nome contido na consulta como palavra inteira ("abrir bloco" contém "bloco", "database" não contém "data")
+        if len(name) >= 3 and f" {name} " in f" {query} ":
+            best = max(best, (0.75 + 0.2 * len(name) / len(query), 'contido'))
+        
+        return best
@@ -21,15 +21,18 @@ class JarvisCleanup:
         self.cleanup_log = []
         
     def init_cleanup_protocol(self, log_callback=None):
-        """Inicia o protocolo de limpeza completo"""
+        """Inicia o protocolo de limpeza completo
+        
+        Só arquivos são limpos aqui. A interface encerra com o próprio
+        processo, e nenhum outro processo é finalizado: os filhos do Jarvis
+        incluem os programas que o usuário pediu para abrir.
+        """
         cleanup_steps = [
             ("Iniciando limpeza de sistema...", self._log_cleanup),
-            ("Fechando interface gráfica...", self._cleanup_gui),
             ("Limpando arquivos temporários...", self._cleanup_temp_files),
             ("Limpando logs de erro...", self._cleanup_error_logs),
             ("Limpando caches de visão...", self._cleanup_vision_cache),
             ("Limpando projetos temporários...", self._cleanup_temp_projects),
-            ("Finalizando processos...", self._cleanup_processes),
             ("Protocolo de encerramento concluído.", self._log_cleanup)
         ]
         
@@ -55,28 +58,6 @@ class JarvisCleanup:
         print(f"🧹 {log_entry}")
         return message
         
-    def _cleanup_gui(self):
-        """Fecha interface gráfica"""
-        try:
-            # Fecha instâncias PyQt6
-            import psutil
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    if 'python' in proc.info['name'].lower():
-                        cmdline = ' '.join(proc.info['cmdline'] or [])
-                        if any('jarvis' in cmd.lower() for cmd in cmdline):
-                            proc.terminate()
-                            self._log_cleanup(f"Processo GUI {proc.info['pid']} encerrado")
-                except:
-                    pass
-                    
-            return "Interface gráfica encerrada"
-        except ImportError:
-            # Fallback se psutil não estiver disponível
-            return "Interface gráfica será encerrada ao final"
-        except Exception as e:
-            return f"Erro ao fechar GUI: {e}"
-            
     def _cleanup_temp_files(self):
         """Limpa arquivos temporários do sistema"""
         temp_patterns = [
@@ -177,35 +158,6 @@ class JarvisCleanup:
                     
         return f"Projetos temporários: {cleaned_count} diretórios removidos"
         
-    def _cleanup_processes(self):
-        """Finaliza processos relacionados ao Jarvis"""
-        try:
-            import psutil
-            
-            jarvis_processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    cmdline = ' '.join(proc.info['cmdline'] or [])
-                    if any(keyword in cmd.lower() for keyword in ['jarvis', 'python.*jarvis']):
-                        jarvis_processes.append(proc.info['pid'])
-                except:
-                    pass
-                    
-            # Termina processos gentilmente
-            for pid in jarvis_processes:
-                try:
-                    proc = psutil.Process(pid)
-                    proc.terminate()
-                    self._log_cleanup(f"Processo {pid} finalizado")
-                except:
-                    pass
-                    
-            return f"Processos finalizados: {len(jarvis_processes)}"
-        except ImportError:
-            return "Finalização de processos requer psutil"
-        except Exception as e:
-            return f"Erro ao finalizar processos: {e}"
-            
     def _get_dir_size(self, path):
         """Calcula tamanho de diretório"""
         total_size = 0
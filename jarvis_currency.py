@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Cotações do Jarvis
+Tabela compartilhada de cotações em BRL, baixada de uma vez com yf.download, com taxas cruzadas entre quaisquer moedas
+"""
+
+import time
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from jarvis_http import TTLCache
+
+try:
+    import yfinance as yf
+    YFINANCE_AVAILABLE = True
+except ImportError:
+    YFINANCE_AVAILABLE = False
+
+# Nomes aceitos nos comandos ("dólar", "euro"...) e o código da moeda
+CURRENCY_NAMES = {
+    'dólar': 'USD',
+    'dolar': 'USD',
+    'euro': 'EUR',
+    'bitcoin': 'BTC',
+    'real': 'BRL',
+    'peso': 'MXN',
+    'libra': 'GBP'
+}
+
+# No Yahoo Finance as criptomoedas usam BTC-BRL em vez de BTCBRL=X
+CRYPTO_CODES = frozenset({'BTC', 'ETH'})
+
+
+def yahoo_ticker(code: str, base: str = 'BRL') -> str:
+    """Ticker do par code/base no Yahoo Finance"""
+    return f"{code}-{base}" if code in CRYPTO_CODES else f"{code}{base}=X"
+
+
+def download_closes(tickers: List[str], period: str = "5d", timeout: int = 10) -> Dict[str, float]:
+    """Último fechamento de cada ticker em uma única chamada yf.download
+    
+    O período de alguns dias cobre moedas sem pregão no dia (fins de semana
+    e feriados); de cada coluna vale o último valor preenchido.
+    """
+    if not YFINANCE_AVAILABLE:
+        raise ImportError("yfinance não disponível")
+    data = yf.download(tickers, period=period, group_by='column', auto_adjust=False,
+                       progress=False, threads=True, timeout=timeout)
+    if data is None or data.empty:
+        return {}
+    
+    closes = data['Close']
+    if not hasattr(closes, 'columns'):  # Um ticker só: o yfinance devolve uma série
+        closes = closes.to_frame(tickers[0])
+    
+    latest = {}
+    for ticker in tickers:
+        if ticker in closes.columns:
+            series = closes[ticker].dropna()
+            if not series.empty:
+                latest[ticker] = float(series.iloc[-1])
+    return latest
+
+
+class CurrencyService:
+    """Tabela de cotações em BRL de todas as moedas conhecidas
+    
+    Cada pergunta de cotação buscava o próprio ticker ("dólar", "euro" e
+    "bitcoin" em sequência eram três idas à rede). Aqui todos os tickers vêm
+    em um único yf.download e ficam numa tabela em memória com o horário da
+    busca; qualquer par sai dela, inclusive os cruzados (EUR/USD =
+    EURBRL / USDBRL).
+    
+    A tabela fica no TTLCache: dentro de ttl é servida direto, vencida há
+    menos de stale_ttl é servida enquanto uma nova é baixada em segundo
+    plano. refresh() baixa a tabela inteira na hora (usado pelo prefetch).
+    """
+    
+    TABLE_KEY = 'fx_table'
+    
+    def __init__(self, codes: Optional[Iterable[str]] = None, base: str = 'BRL', ttl: float = 60,
+                 stale_ttl: float = 300, period: str = "5d", timeout: int = 10,
+                 fetcher: Optional[Callable[[List[str]], Dict[str, float]]] = None,
+                 cache: Optional[TTLCache] = None):
+        """
+        Args:
+            codes: Moedas da tabela (padrão: todas de CURRENCY_NAMES)
+            base: Moeda em que a tabela é cotada
+            ttl: Segundos em que a tabela é considerada atual
+            stale_ttl: Segundos após o vencimento em que a tabela antiga ainda é servida
+            period: Período baixado (o último fechamento de cada moeda é usado)
+            timeout: Tempo limite do download
+            fetcher: Função tickers → {ticker: fechamento} (padrão: download_closes com yfinance)
+            cache: Cache da tabela (padrão: um TTLCache próprio)
+        """
+        self.base = base
+        self.codes = tuple(sorted(set(codes or CURRENCY_NAMES.values()) - {base}))
+        self.tickers = {code: yahoo_ticker(code, base) for code in self.codes}
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.fetcher = fetcher or (lambda tickers: download_closes(tickers, period, timeout))
+        self.cache = cache or TTLCache(max_entries=4)
+        self._lock = threading.Lock()
+        self.stats = {'downloads': 0, 'last_download_ms': 0.0, 'missing': []}
+    
+    def _download(self) -> Dict:
+        """Baixa todos os tickers de uma vez e monta a tabela {código: valor em base}"""
+        start = time.perf_counter()
+        closes = self.fetcher(list(self.tickers.values()))
+        rates = {code: closes[ticker] for code, ticker in self.tickers.items() if closes.get(ticker, 0) > 0}
+        if not rates:
+            raise ValueError("Nenhuma cotação retornada pelo Yahoo Finance")
+        rates[self.base] = 1.0
+        
+        with self._lock:
+            self.stats['downloads'] += 1
+            self.stats['last_download_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            self.stats['missing'] = [code for code in self.codes if code not in rates]
+        return {'rates': rates, 'fetched_at': time.time()}
+    
+    def table(self) -> Dict:
+        """Tabela atual como {'rates': {código: valor em base}, 'fetched_at': timestamp}"""
+        return self.cache.get_or_fetch(self.TABLE_KEY, self._download, self.ttl, self.stale_ttl)
+    
+    def refresh(self) -> Dict:
+        """Baixa a tabela inteira agora (em caso de falha, a anterior continua valendo)"""
+        return self.cache.get_or_fetch(self.TABLE_KEY, self._download, ttl=0, stale_ttl=0)
+    
+    def rate(self, from_code: str, to_code: Optional[str] = None) -> Optional[Tuple[float, float]]:
+        """Cotação de from_code em to_code (padrão: base) como (valor, horário da tabela)
+        
+        Returns:
+            tuple | None: (cotação, timestamp da busca) ou None se alguma das moedas não estiver na tabela
+        """
+        return self._cross(self.table(), from_code, to_code)
+    
+    def peek(self, from_code: str, to_code: Optional[str] = None) -> Optional[Tuple[float, float]]:
+        """Como rate(), mas só com a tabela já em memória e dentro da validade (nunca vai à rede)"""
+        table = self.cache.peek(self.TABLE_KEY, max_age=self.ttl + self.stale_ttl)
+        return self._cross(table, from_code, to_code) if table else None
+    
+    def _cross(self, table: Dict, from_code: str, to_code: Optional[str]) -> Optional[Tuple[float, float]]:
+        rates = table['rates']
+        from_code, to_code = from_code.upper(), (to_code or self.base).upper()
+        if from_code not in rates or to_code not in rates:
+            return None
+        return rates[from_code] / rates[to_code], table['fetched_at']
+    
+    def get_stats(self) -> Dict:
+        """Downloads feitos, custo do último e moedas que vieram sem cotação"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats['table_age'] = self.cache.age(self.TABLE_KEY)
+        return stats
+
@@ -5,7 +5,6 @@ Dark Mode com integração completa: Memória, Gemini, Voz e Visão
 """
 
 # Importações essenciais que devem estar sempre disponíveis
-import re
 import sys
 import os
 from datetime import datetime
@@ -51,7 +50,6 @@ try:
     import threading
     import queue
     import time
-    import sqlite3
     import json
     import pyautogui
     import tempfile
@@ -75,6 +73,12 @@ except ImportError as e:
     print(f"⚠️ Módulo de controle de sistema não disponível: {e}")
     SYSTEM_CONTROL_AVAILABLE = False
 
+# Motor de memória compartilhado com as demais interfaces
+from jarvis_memory import MemoryManager
+from jarvis_response_cache import ResponseCache
+from jarvis_sanitizer import clean_markdown
+from jarvis_typewriter import TypewriterRenderer
+
 # SISTEMA DE LOG DE ERRO GLOBAL
 class JarvisLogger:
     """Sistema de log para o J.A.R.V.I.S."""
@@ -203,77 +207,15 @@ STARK_COLORS = {
     "button_text": "#000000"
 }
 
-class JarvisMemory:
-    """Sistema de memória persistente simplificado"""
-    
-    def __init__(self, db_path=None):
-        if db_path is None:
-            # Caminho relativo que funciona tanto em dev quanto no executável
-            if getattr(sys, 'frozen', False):
-                # Estamos rodando como executável
-                base_path = os.path.dirname(sys.executable)
-            else:
-                # Estamos rodando como script Python
-                base_path = os.path.dirname(os.path.abspath(__file__))
-            db_path = os.path.join(base_path, 'jarvis_memory.db')
-        self.db_path = db_path
-        
-        # Log de inicialização
-        logger.log_info(f"Inicializando memória em: {db_path}", "MEMÓRIA")
-        
-        self.init_database()
-        
-    def init_database(self):
-        """Inicializa o banco de dados SQLite"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS memory (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    fact TEXT NOT NULL,
-                    category TEXT NOT NULL,
-                    data TEXT NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            conn.commit()
-            conn.close()
-            logger.log_success("Banco de dados inicializado com sucesso", "MEMÓRIA")
-        except Exception as e:
-            logger.log_error(e, "Falha ao inicializar banco de dados", "MEMÓRIA")
-    
-    def add_memory(self, fact, category="general", data=""):
-        """Adiciona uma memória"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO memory (fact, category, data) VALUES (?, ?, ?)",
-                (fact, category, data)
-            )
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            print(f"Erro ao adicionar memória: {e}")
-    
-    def get_recent_memories(self, limit=5):
-        """Recupera memórias recentes"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT fact, category, created_at FROM memory ORDER BY created_at DESC LIMIT ?",
-                (limit,)
-            )
-            memories = cursor.fetchall()
-            conn.close()
-            return memories
-        except Exception as e:
-            print(f"Erro ao recuperar memórias: {e}")
-            return []
+def get_memory_db_path():
+    """Caminho do banco de memória que funciona tanto em dev quanto no executável"""
+    if getattr(sys, 'frozen', False):
+        # Estamos rodando como executável
+        base_path = os.path.dirname(sys.executable)
+    else:
+        # Estamos rodando como script Python
+        base_path = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_path, 'jarvis_memory.db')
 
 class JarvisVision:
     """Sistema de visão computacional simplificado"""
@@ -409,7 +351,11 @@ class JarvisGUI:
         self.root.configure(fg_color=STARK_COLORS["background"])
         
         # Inicializa módulos
-        self.memory = JarvisMemory()
+        db_path = get_memory_db_path()
+        logger.log_info(f"Inicializando memória em: {db_path}", "MEMÓRIA")
+        self.memory = MemoryManager(db_path)
+        self.session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.response_cache = ResponseCache(os.path.join(os.path.dirname(db_path), 'jarvis_response_cache.json'))
         
         # Carrega API key do ambiente para passar para JarvisVision
         api_key = os.getenv('GEMINI_API_KEY')
@@ -429,6 +375,7 @@ class JarvisGUI:
         self.is_processing = False
         self.progress_animation_active = False
         self.current_response = None  # Armazena resposta completa para evitar limpeza
+        self.typewriter = None  # Efeito de digitação (criado na primeira resposta)
         
         # Fila de mensagens para thread-safe
         self.message_queue = queue.Queue()
@@ -822,6 +769,18 @@ class JarvisGUI:
                 # Detecção de pedido de detalhamento
                 needs_detail = any(keyword in message.lower() for keyword in ['mais detalhes', 'continue', 'explique melhor', 'pode detalhar', 'mais informações'])
                 
+                # Perguntas repetidas são respondidas pelo cache, sem chamar o modelo
+                fingerprint = ResponseCache.context_fingerprint(
+                    message, 'gemini-2.5-flash', memory_context, system_commands_info, history=conversation_history
+                )
+                cached_response = self.response_cache.get(message, fingerprint)
+                if cached_response:
+                    print("💾 Resposta obtida do cache")
+                    self.current_response = cached_response
+                    self.root.after(0, lambda: self.typewriter_effect("Jarvis", self.current_response))
+                    self.memory.store_conversation(self.session_id, message, cached_response)
+                    return
+                
                 # Prompt otimizado com contexto da conversa
                 if needs_detail:
                     prompt = f"""Você é J.A.R.V.I.S., assistente de IA avançada com controle de sistema.
@@ -885,18 +844,7 @@ Responda de forma técnica e direta."""
                 
                 # 2. DEPOIS: Limpeza de Markdown com tratamento de erro
                 try:
-                    # Limpeza direta de Markdown
-                    cleaned_response = full_response.replace('###', '').replace('**', '').replace('---', '').replace('*', '').replace('`', '')
-                    # Limpeza adicional com regex
-                    cleaned_response = re.sub(r'^#{1,6}\s+', '', cleaned_response, flags=re.MULTILINE)
-                    cleaned_response = re.sub(r'\*\*(.*?)\*\*', r'\1', cleaned_response)
-                    cleaned_response = re.sub(r'\*(.*?)\*', r'\1', cleaned_response)
-                    cleaned_response = re.sub(r'`(.*?)`', r'\1', cleaned_response)
-                    cleaned_response = re.sub(r'^[-*]{3,}\s*$', '', cleaned_response, flags=re.MULTILINE)
-                    cleaned_response = re.sub(r'\s+', ' ', cleaned_response)
-                    
-                    # Usa o texto limpo
-                    final_response = cleaned_response
+                    final_response = self.filter_ai_text(full_response)
                     print(f"✅ Markdown limpo com sucesso")
                     
                 except Exception as clean_error:
@@ -923,9 +871,10 @@ Responda de forma técnica e direta."""
                 else:
                     self.root.after(0, lambda: self.add_message("Jarvis", "❌ Resposta vazia recebida", is_jarvis=True))
                 
-                # Salva na memória
-                self.memory.add_memory(f"Usuário perguntou: {message}", "conversation")
-                self.memory.add_memory(f"Jarvis respondeu: {final_response[:100]}...", "conversation")
+                # Salva na memória e no cache de respostas
+                self.memory.store_conversation(self.session_id, message, final_response)
+                if final_response.strip():
+                    self.response_cache.put(message, fingerprint, final_response)
                 
             except Exception as e:
                 error_msg = f"❌ Erro ao processar: {e}"
@@ -1053,66 +1002,47 @@ Responda de forma técnica e direta."""
             self.add_message("Jarvis", "❌ Controlador de sistema não disponível", is_jarvis=True)
 
     def typewriter_effect(self, sender, message):
-        """Efeito typewriter para mensagens do Jarvis no layout clean"""
+        """Efeito typewriter para mensagens do Jarvis no layout clean
+        
+        Os caracteres são agrupados por quadro (~60 fps) e inseridos com
+        root.after na thread principal; respostas longas ou com a janela
+        minimizada aparecem de uma vez.
+        """
         # Verifica se a mensagem é válida antes de processar
         if not message or not isinstance(message, str):
             self.add_message("Jarvis", "❌ Mensagem inválida para exibição", is_jarvis=True)
             return
         
-        # Habilita o textbox para edição
-        self.chat_display.configure(state="normal")
+        if self.typewriter is None:
+            self.typewriter = TypewriterRenderer(
+                self.root, self._append_typed_text,
+                on_complete=lambda: self._append_typed_text("\n\n")
+            )
+        elif self.typewriter.active:
+            # Resposta anterior ainda digitando: exibe o restante de uma vez
+            self.typewriter.finish()
         
         # Layout Clean: Nome JARVIS em azul neon
+        self.chat_display.configure(state="normal")
         self.chat_display.insert("end", "JARVIS\n", "jarvis_name")
         self.chat_display.tag_config("jarvis_name", foreground="#00D2FF")
+        self.chat_display.tag_config("jarvis_message", foreground="#ffffff")
+        self.chat_display.configure(state="disabled")
         
-        # Armazena a mensagem completa em variável local para garantir persistência durante o loop
-        complete_message = str(message)  # Garante que é string
-        self.current_response = complete_message  # Backup em variável de instância
-        
-        # Efeito typewriter para a mensagem
-        def add_char_by_char():
-            try:
-                # Usa a variável de instância para garantir persistência durante o loop
-                message_to_type = self.current_response
-                
-                for i, char in enumerate(message_to_type):
-                    # Verifica se ainda está processando antes de cada caractere
-                    if not self.is_processing:
-                        # Se interrompido, adiciona o resto da mensagem de uma vez
-                        remaining_text = message_to_type[i:]
-                        self.chat_display.insert("end", remaining_text, "jarvis_message")
-                        self.chat_display.tag_config("jarvis_message", foreground="#ffffff")
-                        break
-                    
-                    # Adiciona caractere por caractere
-                    self.chat_display.insert("end", char, "jarvis_message")
-                    self.chat_display.tag_config("jarvis_message", foreground="#ffffff")
-                    
-                    # Auto-scroll e pequena pausa
-                    self.chat_display.see("end")
-                    self.root.update()
-                    time.sleep(0.01)  # Pequena pausa para efeito
-                
-                # Adiciona espaçamento final após a mensagem
-                self.chat_display.insert("end", "\n\n", "jarvis_message")
-                self.chat_display.tag_config("jarvis_message", foreground="#ffffff")
-                
-                # Auto-scroll final
-                self.chat_display.see("end")
-                
-            except Exception as e:
-                print(f"Erro no efeito typewriter: {e}")
-                # Em caso de erro, adiciona a mensagem completa
-                self.chat_display.insert("end", f"{message_to_type}\n\n", "jarvis_message")
-                self.chat_display.tag_config("jarvis_message", foreground="#ffffff")
-                self.chat_display.see("end")
-            finally:
-                # Sempre desabilita o textbox no final
-                self.chat_display.configure(state="disabled")
-        
-        # Executa o efeito em uma thread separada para não bloquear a interface
-        threading.Thread(target=add_char_by_char, daemon=True).start()
+        # Armazena a mensagem completa para garantir persistência durante o efeito
+        self.current_response = str(message)
+        self.typewriter.start(self.current_response)
+    
+    def _append_typed_text(self, text):
+        """Acrescenta ao chat o trecho novo do efeito typewriter"""
+        try:
+            self.chat_display.configure(state="normal")
+            self.chat_display.insert("end", text, "jarvis_message")
+            self.chat_display.see("end")
+        except Exception as e:
+            print(f"Erro no efeito typewriter: {e}")
+        finally:
+            self.chat_display.configure(state="disabled")
 
     def clear_chat(self):
         """Limpa o chat"""
@@ -1123,36 +1053,8 @@ Responda de forma técnica e direta."""
 
     def filter_ai_text(self, text):
         """Filtra texto da IA removendo símbolos indesejados e limpando formatação"""
-        if not text or not isinstance(text, str):
-            return text
-            
-        # Usa expressões regulares para limpeza mais eficiente
-        filtered_text = text
-        
-        # Remove cabeçalhos Markdown (###, ##, #)
-        filtered_text = re.sub(r'^#{1,6}\s+', '', filtered_text, flags=re.MULTILINE)
-        
-        # Remove negrito (**texto**)
-        filtered_text = re.sub(r'\*\*(.*?)\*\*', r'\1', filtered_text)
-        
-        # Remove itálico (*texto*)
-        filtered_text = re.sub(r'\*(.*?)\*', r'\1', filtered_text)
-        
-        # Remove código inline (`texto`)
-        filtered_text = re.sub(r'`(.*?)`', r'\1', filtered_text)
-        
-        # Remove linhas horizontais (--- ou ***)
-        filtered_text = re.sub(r'^[-*]{3,}\s*$', '', filtered_text, flags=re.MULTILINE)
-        
-        # Remove múltiplos espaços em branco
-        filtered_text = re.sub(r'\s+', ' ', filtered_text)
-        
-        # Remove espaços no início e fim de cada linha
-        lines = filtered_text.split('\n')
-        cleaned_lines = [line.strip() for line in lines if line.strip()]
-        
-        return '\n'.join(cleaned_lines)
-
+        return clean_markdown(text)
+    
     def add_message(self, sender, message, is_user=False, is_jarvis=False, is_system=False):
         """Adiciona mensagem ao chat estilo Gemini/ChatGPT com cores diferentes"""
         timestamp = datetime.now().strftime("%H:%M:%S")
@@ -1234,6 +1136,12 @@ Responda de forma técnica e direta."""
             self.is_processing = False
             self.progress_animation_active = False
             
+            # Grava as escritas pendentes da memória e o cache de respostas
+            if hasattr(self, 'memory'):
+                self.memory.close()
+            if hasattr(self, 'response_cache'):
+                self.response_cache.save()
+            
             # Fecha a janela principal
             if hasattr(self, 'root') and self.root:
                 self.root.quit()
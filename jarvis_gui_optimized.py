@@ -6,16 +6,13 @@ Interface Integrada com arquitetura melhorada e performance otimizada
 
 import os
 import sys
-import re
 import time
 import json
-import sqlite3
 import threading
 import queue
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, List, Any, Tuple
-from contextlib import contextmanager
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 
@@ -32,6 +29,11 @@ except ImportError as e:
     print(f"❌ Erro crítico de importação: {e}")
     sys.exit(1)
 
+# Motor de memória compartilhado com as demais interfaces
+from jarvis_memory import MemoryManager
+from jarvis_sanitizer import clean_markdown
+from jarvis_typewriter import TypewriterRenderer
+
 # Import do módulo de controle de sistema
 try:
     from jarvis_system_controller import SystemController
@@ -64,6 +66,11 @@ class JarvisConfig:
     MAX_TOKENS: int = 4096
     TEMPERATURE: float = 0.7
     
+    # Efeito de digitação
+    TYPEWRITER_FPS: int = 60
+    TYPEWRITER_CHARS_PER_SECOND: int = 100
+    TYPEWRITER_INSTANT_CHARS: int = 2000
+    
     # Cores Stark Industries
     COLORS: Dict[str, str] = {
         "background": "#0B0E14",
@@ -187,69 +194,6 @@ class EnvironmentManager:
             self.logger.info(f"API Key detectada: {masked_key}", "AMBIENTE")
         return api_key
 
-class MemoryManager:
-    """Sistema de memória otimizado"""
-    
-    def __init__(self, config: JarvisConfig, logger: Logger):
-        self.config = config
-        self.logger = logger
-        self._init_database()
-    
-    def _init_database(self) -> None:
-        """Inicializa banco de dados"""
-        try:
-            with sqlite3.connect(self.config.DB_FILE) as conn:
-                conn.execute('''
-                    CREATE TABLE IF NOT EXISTS memory (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        fact TEXT NOT NULL,
-                        category TEXT NOT NULL,
-                        data TEXT,
-                        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                conn.commit()
-            self.logger.info("Banco de dados inicializado", "MEMÓRIA")
-        except Exception as e:
-            self.logger.error(e, "Falha ao inicializar banco", "MEMÓRIA")
-    
-    @contextmanager
-    def get_connection(self):
-        """Context manager para conexões"""
-        conn = sqlite3.connect(self.config.DB_FILE)
-        try:
-            yield conn
-        finally:
-            conn.close()
-    
-    def add_memory(self, fact: str, category: str = "general", data: str = "") -> None:
-        """Adiciona memória de forma assíncrona"""
-        def add_async():
-            try:
-                with self.get_connection() as conn:
-                    conn.execute(
-                        "INSERT INTO memory (fact, category, data) VALUES (?, ?, ?)",
-                        (fact, category, data)
-                    )
-                    conn.commit()
-            except Exception as e:
-                self.logger.error(e, "Falha ao adicionar memória", "MEMÓRIA")
-        
-        threading.Thread(target=add_async, daemon=True).start()
-    
-    def get_recent_memories(self, limit: int = 5) -> List[tuple]:
-        """Recupera memórias recentes"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT fact, category, timestamp FROM memory ORDER BY timestamp DESC LIMIT ?",
-                    (limit,)
-                )
-                return cursor.fetchall()
-        except Exception as e:
-            self.logger.error(e, "Falha ao recuperar memórias", "MEMÓRIA")
-            return []
-
 class VisionManager:
     """Sistema de visão computacional otimizado"""
     
@@ -396,7 +340,8 @@ class JarvisGUI:
         self.logger = Logger(self.config)
         self.path_manager = PathManager(self.config)
         self.env_manager = EnvironmentManager(self.config, self.logger)
-        self.memory_manager = MemoryManager(self.config, self.logger)
+        self.memory_manager = MemoryManager(str(self.config.DB_FILE))
+        self.session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         self.vision_manager = VisionManager(self.config, self.logger, self.env_manager)
         self.voice_manager = VoiceManager(self.config, self.logger)
         self.chat_manager = ChatManager(self.config, self.logger)
@@ -413,6 +358,7 @@ class JarvisGUI:
         self.is_listening = False
         self.is_processing = False
         self.message_queue = queue.Queue()
+        self.typewriter = None
         
         self._setup_ui()
         self._load_initial_data()
@@ -727,8 +673,7 @@ Responda de forma concisa e técnica."""
                 self.root.after(0, lambda: self._typewriter_effect(cleaned_response))
                 
                 # Salva memória
-                self.memory_manager.add_memory(f"Usuário: {message}", "conversation")
-                self.memory_manager.add_memory(f"Jarvis: {cleaned_response[:100]}...", "conversation")
+                self.memory_manager.store_conversation(self.session_id, message, cleaned_response)
                 
             except Exception as e:
                 self.logger.error(e, "Erro ao processar mensagem", "GEMINI")
@@ -742,46 +687,38 @@ Responda de forma concisa e técnica."""
         """Limpa resposta da API"""
         if not text:
             return ""
-        
-        # Remove markdown
-        text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
-        text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-        text = re.sub(r'\*(.*?)\*', r'\1', text)
-        text = re.sub(r'`(.*?)`', r'\1', text)
-        text = re.sub(r'^[-*]{3,}\s*$', '', text, flags=re.MULTILINE)
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        return clean_markdown(text)
     
     def _typewriter_effect(self, message: str) -> None:
-        """Efeito typewriter otimizado"""
+        """Efeito typewriter em quadros agendados na thread principal"""
         if not message:
             return
         
+        if self.typewriter is None:
+            self.typewriter = TypewriterRenderer(
+                self.root, self._append_typed_text,
+                on_complete=lambda: self._append_typed_text("\n\n"),
+                fps=self.config.TYPEWRITER_FPS,
+                chars_per_second=self.config.TYPEWRITER_CHARS_PER_SECOND,
+                instant_threshold=self.config.TYPEWRITER_INSTANT_CHARS
+            )
+        elif self.typewriter.active:
+            self.typewriter.finish()
+        
         self.chat_display.configure(state="normal")
         self.chat_display.insert("end", "JARVIS\n", "jarvis_name")
         self.chat_display.tag_config("jarvis_name", foreground=self.config.COLORS["jarvis_name"])
+        self.chat_display.tag_config("jarvis_message", foreground="#ffffff")
+        self.chat_display.configure(state="disabled")
         
-        def type_chars():
-            try:
-                for i, char in enumerate(message):
-                    if not self.is_processing:
-                        # Se interrompido, adiciona resto
-                        remaining = message[i:]
-                        self.chat_display.insert("end", remaining, "jarvis_message")
-                        break
-                    
-                    self.chat_display.insert("end", char, "jarvis_message")
-                    self.chat_display.tag_config("jarvis_message", foreground="#ffffff")
-                    self.chat_display.see("end")
-                    time.sleep(0.01)
-                
-                self.chat_display.insert("end", "\n\n", "jarvis_message")
-                self.chat_display.see("end")
-            finally:
-                self.chat_display.configure(state="disabled")
-        
-        threading.Thread(target=type_chars, daemon=True).start()
+        self.typewriter.start(message)
+    
+    def _append_typed_text(self, text: str) -> None:
+        """Acrescenta ao chat o trecho novo do efeito typewriter"""
+        self.chat_display.configure(state="normal")
+        self.chat_display.insert("end", text, "jarvis_message")
+        self.chat_display.see("end")
+        self.chat_display.configure(state="disabled")
     
     def _reset_processing_state(self) -> None:
         """Reseta estado de processamento"""
@@ -884,6 +821,8 @@ Responda de forma concisa e técnica."""
         try:
             self.is_processing = False
             self.is_listening = False
+            if hasattr(self, 'memory_manager'):
+                self.memory_manager.close()
             if hasattr(self, 'root'):
                 self.root.quit()
                 self.root.destroy()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Amostrador de Hardware do Jarvis
+Thread de coleta de CPU, RAM, disco e memória por processo em buffers circulares NumPy
+"""
+
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from jarvis_processes import get_process_service
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Colunas do buffer de métricas do sistema
+METRICS = ('cpu', 'ram', 'ram_used_gb', 'ram_total_gb', 'disk', 'disk_used_gb', 'disk_total_gb')
+
+
+class RingBuffer:
+    """Série temporal de tamanho fixo: capacity linhas de width colunas, sobrescrevendo as mais antigas"""
+    
+    def __init__(self, capacity: int, width: int = 1, dtype=np.float64):
+        self.capacity = capacity
+        self.values = np.zeros((capacity, width), dtype=dtype)
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self._next = 0
+        self._size = 0
+    
+    def append(self, row, timestamp: Optional[float] = None):
+        """Grava uma linha na próxima posição (O(1), sem realocar)"""
+        self.values[self._next] = row
+        self.timestamps[self._next] = time.time() if timestamp is None else timestamp
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+    
+    def __len__(self):
+        return self._size
+    
+    def latest(self) -> Optional[np.ndarray]:
+        """Última linha gravada"""
+        if not self._size:
+            return None
+        return self.values[self._next - 1].copy()
+    
+    def window(self, seconds: Optional[float] = None, now: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, valores) dos últimos seconds segundos, em ordem cronológica"""
+        if self._size < self.capacity:
+            timestamps, values = self.timestamps[:self._size], self.values[:self._size]
+        else:
+            order = np.roll(np.arange(self.capacity), -self._next)
+            timestamps, values = self.timestamps[order], self.values[order]
+        if seconds is not None:
+            cutoff = (time.time() if now is None else now) - seconds
+            start = int(np.searchsorted(timestamps, cutoff, side='left'))
+            timestamps, values = timestamps[start:], values[start:]
+        return timestamps.copy(), values.copy()
+
+
+class HardwareSampler:
+    """Coleta periódica das métricas do sistema para leituras instantâneas
+    
+    Antes, cada "status do sistema" bloqueava a thread por 1 s em
+    psutil.cpu_percent(interval=1) e cada lista de processos percorria todos
+    eles de novo. Aqui uma thread grava as amostras em buffers circulares
+    NumPy; status, top de processos, o System Monitor da GUI e o /status do
+    Telegram só leem os buffers (mín./méd./máx. por janela de tempo).
+    
+    A CPU usa cpu_percent(interval=None), que mede desde a amostra anterior
+    sem bloquear. Os processos são lidos a cada process_every amostras, e só
+    os max_tracked maiores em RSS ganham histórico próprio.
+    """
+    
+    def __init__(self, interval: float = 2.0, history: int = 1800, process_every: int = 5,
+                 max_tracked: int = 32, disk_path: str = '/'):
+        """
+        Args:
+            interval: Segundos entre amostras
+            history: Amostras guardadas por série (padrão: 1 hora a cada 2 s)
+            process_every: A cada quantas amostras os processos são lidos
+            max_tracked: Processos com histórico de RSS (os maiores da última leitura)
+            disk_path: Partição medida
+        """
+        self.interval = interval
+        self.history = history
+        self.process_every = max(1, process_every)
+        self.max_tracked = max_tracked
+        self.disk_path = disk_path
+        
+        self._lock = threading.Lock()
+        self.metrics = RingBuffer(history, len(METRICS))
+        self._process_history: Dict[int, RingBuffer] = {}
+        self._process_names: Dict[int, str] = {}
+        self._snapshot_pids = np.zeros(0, dtype=np.int64)
+        self._snapshot_rss = np.zeros(0, dtype=np.float64)
+        self._snapshot_time = 0.0
+        
+        self._stop = threading.Event()
+        self._thread = None
+        self._ticks = 0
+        self.stats = {'samples': 0, 'process_scans': 0, 'last_sample_ms': 0.0, 'last_scan_ms': 0.0, 'errors': 0}
+    
+    # ==================== COLETA ====================
+    
+    def start(self):
+        """Inicia a thread de coleta"""
+        if not PSUTIL_AVAILABLE:
+            print("⚠️ psutil não disponível - amostrador de hardware desativado")
+            return
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        psutil.cpu_percent(interval=None)  # Primeira leitura só define a referência
+        self._thread = threading.Thread(target=self._sample_loop, name="HardwareSampler", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Interrompe a coleta"""
+        self._stop.set()
+    
+    def _sample_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.sample_once()
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"❌ Erro no amostrador de hardware: {e}")
+            self._stop.wait(self.interval)
+    
+    def sample_once(self):
+        """Lê as métricas do sistema (e os processos, a cada process_every amostras)"""
+        start = time.perf_counter()
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        self.record(
+            cpu=psutil.cpu_percent(interval=None),
+            ram=memory.percent,
+            ram_used_gb=memory.used / (1024**3),
+            ram_total_gb=memory.total / (1024**3),
+            disk=disk.used / disk.total * 100,
+            disk_used_gb=disk.used / (1024**3),
+            disk_total_gb=disk.total / (1024**3),
+        )
+        self.stats['last_sample_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        
+        if self._ticks % self.process_every == 0:
+            self.scan_processes()
+        self._ticks += 1
+    
+    def scan_processes(self):
+        """Lê o RSS de todos os processos pelo instantâneo compartilhado"""
+        start = time.perf_counter()
+        processes = [(proc.pid, proc.name, proc.rss_mb) for proc in get_process_service().snapshot()]
+        self.record_processes(processes)
+        self.stats['process_scans'] += 1
+        self.stats['last_scan_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    
+    def record(self, timestamp: Optional[float] = None, **values):
+        """Grava uma amostra das métricas do sistema (colunas de METRICS)"""
+        row = [values.get(name, np.nan) for name in METRICS]
+        with self._lock:
+            self.metrics.append(row, timestamp)
+            self.stats['samples'] += 1
+    
+    def record_processes(self, processes: List[Tuple[int, str, float]], timestamp: Optional[float] = None):
+        """Grava uma leitura de processos como (pid, nome, RSS em MB)"""
+        timestamp = time.time() if timestamp is None else timestamp
+        pids = np.fromiter((pid for pid, _, _ in processes), dtype=np.int64, count=len(processes))
+        rss = np.fromiter((mb for _, _, mb in processes), dtype=np.float64, count=len(processes))
+        names = {pid: name for pid, name, _ in processes}
+        
+        # Histórico só dos maiores; processos encerrados ou fora do top perdem o buffer
+        tracked = pids[np.argsort(rss)[::-1][:self.max_tracked]]
+        with self._lock:
+            self._snapshot_pids, self._snapshot_rss, self._snapshot_time = pids, rss, timestamp
+            self._process_names = names
+            history = {}
+            for index in np.flatnonzero(np.isin(pids, tracked)).tolist():
+                pid = int(pids[index])
+                buffer = self._process_history.get(pid)
+                if buffer is None:
+                    buffer = RingBuffer(max(1, self.history // self.process_every))
+                buffer.append(rss[index], timestamp)
+                history[pid] = buffer
+            self._process_history = history
+    
+    # ==================== CONSULTA ====================
+    
+    def summary(self, window: Optional[float] = 60.0) -> Dict[str, Dict[str, float]]:
+        """Última leitura e mín./méd./máx. de cada métrica na janela (segundos)"""
+        with self._lock:
+            latest = self.metrics.latest()
+            _, values = self.metrics.window(window)
+        if latest is None:
+            return {}
+        if not len(values):
+            values = latest.reshape(1, -1)
+        
+        result = {}
+        for column, name in enumerate(METRICS):
+            series = values[:, column]
+            result[name] = {
+                'last': float(latest[column]),
+                'min': float(np.nanmin(series)),
+                'avg': float(np.nanmean(series)),
+                'max': float(np.nanmax(series)),
+            }
+        result['samples'] = len(values)
+        return result
+    
+    def series(self, metric: str, window: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, valores) de uma métrica, para gráficos"""
+        column = METRICS.index(metric)
+        with self._lock:
+            timestamps, values = self.metrics.window(window)
+        return timestamps, values[:, column]
+    
+    def top_processes(self, n: int = 5) -> List[Dict]:
+        """Os n processos com mais RSS na última leitura"""
+        with self._lock:
+            pids, rss, names = self._snapshot_pids, self._snapshot_rss, self._process_names
+        if not len(pids) and PSUTIL_AVAILABLE:
+            # Antes da primeira leitura da thread
+            self.scan_processes()
+            with self._lock:
+                pids, rss, names = self._snapshot_pids, self._snapshot_rss, self._process_names
+        if not len(pids):
+            return []
+        n = min(n, len(pids))
+        top = np.argpartition(rss, -n)[-n:]
+        top = top[np.argsort(rss[top])[::-1]]
+        return [{'pid': int(pids[i]), 'name': names.get(int(pids[i]), '?'), 'memory': float(rss[i])} for i in top]
+    
+    def process_history(self, pid: int, window: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, RSS em MB) de um processo acompanhado"""
+        with self._lock:
+            buffer = self._process_history.get(pid)
+            if buffer is None:
+                return np.zeros(0), np.zeros(0)
+            timestamps, values = buffer.window(window)
+        return timestamps, values[:, 0]
+    
+    def status_line(self, window: float = 60.0) -> str:
+        """Resumo de uma linha para o System Monitor e o /status do Telegram"""
+        summary = self.summary(window)
+        if not summary:
+            return "⏳ Coletando métricas..."
+        cpu, ram, disk = summary['cpu'], summary['ram'], summary['disk']
+        return (f"CPU {cpu['last']:.0f}% (méd {cpu['avg']:.0f}% · máx {cpu['max']:.0f}%) | "
+                f"RAM {ram['last']:.0f}% | Disco {disk['last']:.0f}%")
+    
+    def is_ready(self) -> bool:
+        """Já existe pelo menos uma amostra"""
+        with self._lock:
+            return len(self.metrics) > 0
+    
+    @property
+    def snapshot_time(self) -> float:
+        """Horário (epoch) da última leitura de processos"""
+        with self._lock:
+            return self._snapshot_time
+    
+    def get_stats(self) -> Dict:
+        """Amostras, leituras de processos e custo da última coleta"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['tracked_processes'] = len(self._process_history)
+        return stats
+
+
+_shared_sampler = None
+_shared_lock = threading.Lock()
+
+
+def get_hardware_sampler() -> HardwareSampler:
+    """Amostrador compartilhado por SystemActions, GUI e Telegram, iniciado no primeiro uso"""
+    global _shared_sampler
+    with _shared_lock:
+        if _shared_sampler is None:
+            _shared_sampler = HardwareSampler()
+            _shared_sampler.start()
+        return _shared_sampler
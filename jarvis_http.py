@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Cliente HTTP do Jarvis
+Sessão requests compartilhada (keep-alive + retry) com cache por TTL e stale-while-revalidate
+"""
+
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+
+class TTLCache:
+    """Cache com validade por entrada e stale-while-revalidate
+    
+    - dentro do ttl: devolve o valor guardado;
+    - vencido há menos de stale_ttl: devolve o valor antigo na hora e
+      atualiza em segundo plano (uma atualização por chave);
+    - ausente ou velho demais: busca na hora; chamadas simultâneas para a
+      mesma chave esperam a mesma busca.
+    
+    Falhas na atualização em segundo plano mantêm o valor antigo.
+    """
+    
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Dict]" = OrderedDict()
+        self._inflight: Dict[Hashable, threading.Lock] = {}
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'errors': 0}
+    
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any], ttl: float,
+                     stale_ttl: Optional[float] = None) -> Any:
+        """Valor da chave, buscado com fetch() quando necessário
+        
+        Args:
+            key: Identificação da consulta (ex.: URL e parâmetros)
+            fetch: Função que busca o valor (exceções não são guardadas)
+            ttl: Segundos em que o valor é considerado atual
+            stale_ttl: Segundos após o vencimento em que o valor antigo ainda é servido (padrão: ttl)
+        """
+        stale_ttl = ttl if stale_ttl is None else stale_ttl
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry['stored_at']
+                if age <= ttl:
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return entry['value']
+                if age <= ttl + stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stats['stale_hits'] += 1
+                    if not entry['refreshing']:
+                        entry['refreshing'] = True
+                        threading.Thread(target=self._refresh, args=(key, fetch),
+                                         name="CacheRefresh", daemon=True).start()
+                    return entry['value']
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+        
+        # Busca síncrona, uma por chave
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and time.time() - entry['stored_at'] <= ttl:
+                    self.stats['hits'] += 1
+                    return entry['value']
+                self.stats['misses'] += 1
+            try:
+                value = fetch()
+                self._store(key, value)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+            return value
+    
+    def _refresh(self, key: Hashable, fetch: Callable[[], Any]):
+        try:
+            value = fetch()
+            self._store(key, value)
+            with self._lock:
+                self.stats['refreshes'] += 1
+        except Exception as e:
+            with self._lock:
+                self.stats['errors'] += 1
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry['refreshing'] = False
+            print(f"⚠️ Erro ao atualizar cache ({key}): {e}")
+    
+    def _store(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = {'value': value, 'stored_at': time.time(), 'refreshing': False}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def peek(self, key: Hashable, max_age: Optional[float] = None) -> Any:
+        """Valor guardado sem buscar (None se ausente ou mais velho que max_age)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (max_age is not None and time.time() - entry['stored_at'] > max_age):
+                return None
+            return entry['value']
+    
+    def age(self, key: Hashable) -> Optional[float]:
+        """Segundos desde que o valor da chave foi buscado (None se ausente)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else time.time() - entry['stored_at']
+    
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Remove uma chave (ou todas)"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+    
+    def get_stats(self) -> Dict:
+        """Acertos, acertos vencidos, buscas, atualizações e erros"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+        return stats
+
+
+class HttpResponse:
+    """Resposta guardada no cache (o corpo já lido, sem a conexão)"""
+    
+    def __init__(self, status_code: int, content: bytes, url: str, encoding: Optional[str] = None):
+        self.status_code = status_code
+        self.content = content
+        self.url = url
+        self.encoding = encoding or 'utf-8'
+        self.fetched_at = time.time()
+    
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors='replace')
+    
+    def json(self):
+        return json.loads(self.content)
+
+
+class _NotCacheable(Exception):
+    """Resposta que não deve ir para o cache (status diferente de 200)"""
+    
+    def __init__(self, response: HttpResponse):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+class HttpClient:
+    """Sessão HTTP compartilhada por clima, cotações e notícias
+    
+    A requests.Session mantém as conexões abertas (keep-alive) e refaz
+    automaticamente as falhas de conexão e os status 429/5xx com espera
+    exponencial. Com ttl, as respostas 200 ficam no TTLCache: a pergunta
+    seguinte é respondida na hora, e depois do vencimento a resposta antiga
+    ainda é servida enquanto a nova é buscada em segundo plano.
+    """
+    
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    def __init__(self, retries: int = 3, backoff: float = 0.3, pool_size: int = 10,
+                 cache: Optional[TTLCache] = None):
+        """
+        Args:
+            retries: Novas tentativas por requisição
+            backoff: Fator da espera exponencial entre tentativas (0.3 → 0.3 s, 0.6 s, 1.2 s)
+            pool_size: Conexões mantidas por host
+            cache: Cache das respostas (padrão: um TTLCache novo)
+        """
+        self.cache = cache or TTLCache()
+        self.session = requests.Session()
+        retry = Retry(total=retries, connect=retries, read=retries, backoff_factor=backoff,
+                      status_forcelist=self.RETRY_STATUSES, allowed_methods=frozenset(['GET', 'HEAD']),
+                      raise_on_status=False)
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    def get(self, url: str, ttl: float = 0, stale_ttl: Optional[float] = None, params: Optional[Dict] = None,
+            headers: Optional[Dict] = None, timeout: float = 10) -> HttpResponse:
+        """GET pela sessão; com ttl > 0 a resposta 200 é reaproveitada pelo cache
+        
+        Raises:
+            requests.RequestException: Falha de conexão depois das novas tentativas
+        """
+        def fetch():
+            response = self.session.get(url, params=params, headers=headers, timeout=timeout)
+            result = HttpResponse(response.status_code, response.content, response.url, response.encoding)
+            if response.status_code != 200:
+                raise _NotCacheable(result)
+            return result
+        
+        try:
+            if not ttl:
+                return fetch()
+            key = ('GET', url, tuple(sorted((params or {}).items())), tuple(sorted((headers or {}).items())))
+            return self.cache.get_or_fetch(key, fetch, ttl, stale_ttl)
+        except _NotCacheable as error:
+            return error.response
+    
+    def cached(self, key: Hashable, fetch: Callable[[], Any], ttl: float, stale_ttl: Optional[float] = None) -> Any:
+        """Mesmo cache para fontes que não passam pela sessão (ex.: yfinance)"""
+        return self.cache.get_or_fetch(key, fetch, ttl, stale_ttl)
+    
+    def get_stats(self) -> Dict:
+        """Estatísticas do cache de respostas"""
+        return self.cache.get_stats()
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Cliente compartilhado por SystemActions (clima, cotações e notícias)"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Roteador de Intenções do Jarvis
+Tabela declarativa de intenções compilada em um autômato Aho–Corasick, com prioridades e extração de parâmetros
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class IntentRule:
+    """Regra da tabela de intenções
+    
+    Attributes:
+        name: Nome da intenção (ex.: "power_shutdown")
+        keywords: Palavras-chave; a primeira da lista que aparecer no texto vence
+        priority: Menor número é avaliado primeiro
+        slots: Parâmetros extraídos quando a regra vence
+        required: Parâmetros obrigatórios; sem eles a regra é descartada
+        prefix: A palavra-chave precisa estar no início do texto
+        llm: O handler chama o Gemini ou a visão (roda no pool da IA, não na faixa rápida)
+    """
+    name: str
+    keywords: Tuple[str, ...]
+    priority: int
+    slots: Tuple[str, ...] = ()
+    required: Tuple[str, ...] = ()
+    prefix: bool = False
+    llm: bool = False
+
+
+@dataclass
+class IntentMatch:
+    """Intenção reconhecida em uma mensagem"""
+    intent: str
+    keyword: str
+    priority: int
+    start: int
+    end: int
+    slots: Dict[str, object] = field(default_factory=dict)
+
+
+class KeywordAutomaton:
+    """Autômato Aho–Corasick: encontra todas as palavras-chave em uma única passada"""
+    
+    def __init__(self, keywords: Iterable[Tuple[str, object]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, object]]] = [[]]
+        
+        for keyword, payload in keywords:
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append((len(keyword), payload))
+        
+        # Links de falha em largura; a saída de cada estado inclui a do seu link
+        frontier = list(self._goto[0].values())
+        while frontier:
+            next_frontier = []
+            for state in frontier:
+                for char, child in self._goto[state].items():
+                    fallback = self._fail[state]
+                    while fallback and char not in self._goto[fallback]:
+                        fallback = self._fail[fallback]
+                    target = self._goto[fallback].get(char, 0)
+                    self._fail[child] = target if target != child else 0
+                    self._output[child] = self._output[child] + self._output[self._fail[child]]
+                    next_frontier.append(child)
+            frontier = next_frontier
+        
+        # Transições completas (autômato determinístico): a busca não segue links de falha
+        self._delta: List[Dict[str, int]] = [dict(self._goto[0])] + [None] * (len(self._goto) - 1)
+        frontier = list(self._goto[0].values())
+        while frontier:
+            next_frontier = []
+            for state in frontier:
+                self._delta[state] = {**self._delta[self._fail[state]], **self._goto[state]}
+                next_frontier.extend(self._goto[state].values())
+            frontier = next_frontier
+    
+    def search(self, text: str):
+        """Gera (início, payload) para cada ocorrência de palavra-chave"""
+        delta, output = self._delta, self._output
+        state = 0
+        for position, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            if output[state]:
+                for length, payload in output[state]:
+                    yield position - length + 1, payload
+
+
+# ==================== EXTRATORES DE PARÂMETROS ====================
+
+NUMBER_PATTERN = re.compile(r'\d+')
+DURATION_PATTERN = re.compile(r'(\d+)\s*(segundos?|seg|s|minutos?|mins?|horas?|h)\b')
+TASK_PATTERN = re.compile(r'(?:de|em)\s+(.+)')
+
+DIRECTION_KEYWORDS = (
+    ("up", ("aumentar", "subir", "up")),
+    ("down", ("diminuir", "baixar", "down")),
+    ("mute", ("mudo", "silenciar", "mute")),
+    ("unmute", ("ativar som", "unmute")),
+)
+
+BRIGHTNESS_DIRECTION_KEYWORDS = (
+    ("up", ("aumentar", "subir", "up")),
+    ("down", ("diminuir", "baixar", "down")),
+    ("max", ("máximo", "max")),
+    ("min", ("mínimo", "min")),
+)
+
+
+def _slot_number(text: str, match: IntentMatch) -> Optional[int]:
+    """Primeiro número da mensagem"""
+    found = NUMBER_PATTERN.search(text)
+    return int(found.group()) if found else None
+
+
+def _slot_duration(text: str, match: IntentMatch) -> Optional[int]:
+    """Duração em minutos ("10 minutos", "2 horas", "90 segundos")"""
+    found = DURATION_PATTERN.search(text)
+    if not found:
+        return None
+    value, unit = int(found.group(1)), found.group(2)
+    if unit.startswith('h'):
+        return value * 60
+    if unit.startswith('s'):
+        return max(1, (value + 59) // 60)
+    return value
+
+
+def _slot_remainder(text: str, match: IntentMatch) -> Optional[str]:
+    """Texto da mensagem sem a palavra-chave (nome do app, música...)"""
+    remainder = (text[:match.start] + text[match.end:]).strip()
+    return remainder or None
+
+
+def _slot_app_name(text: str, match: IntentMatch) -> Optional[str]:
+    """Nome do aplicativo no formato da busca universal do SystemController
+    
+    Remove a palavra-chave, artigos e possessivos e fica com a primeira palavra.
+    """
+    app_name = text.replace(match.keyword, "").strip()
+    app_name = app_name.replace("o ", "").replace("a ", "").replace("os ", "").replace("as ", "")
+    app_name = app_name.replace("meu ", "").replace("minha ", "").replace("seu ", "").replace("sua ", "")
+    app_name = app_name.replace("e ", "").replace("e procure por", "").replace("procure por", "")
+    app_name = app_name.replace("configurações", "configuracoes").strip()
+    if " " in app_name:
+        app_name = app_name.split()[0]
+    return app_name if len(app_name) > 1 else None
+
+
+def _slot_task(text: str, match: IntentMatch) -> Optional[str]:
+    """Tarefa do lembrete (texto após "de"/"em")"""
+    found = TASK_PATTERN.search(text)
+    return found.group(1) if found else None
+
+
+def _first_direction(text: str, table) -> Optional[str]:
+    for direction, keywords in table:
+        if any(keyword in text for keyword in keywords):
+            return direction
+    return None
+
+
+def _slot_direction(text: str, match: IntentMatch) -> Optional[str]:
+    """Direção de volume: up, down, mute ou unmute"""
+    return _first_direction(text, DIRECTION_KEYWORDS)
+
+
+def _slot_brightness_direction(text: str, match: IntentMatch) -> Optional[str]:
+    """Direção de brilho: up, down, max ou min"""
+    return _first_direction(text, BRIGHTNESS_DIRECTION_KEYWORDS)
+
+
+def _slot_turn_off(text: str, match: IntentMatch) -> bool:
+    """Pedido para encerrar/desativar um modo"""
+    return any(keyword in text for keyword in ("encerrar", "fechar", "desativar"))
+
+
+SLOT_EXTRACTORS: Dict[str, Callable[[str, IntentMatch], object]] = {
+    'number': _slot_number,
+    'duration': _slot_duration,
+    'remainder': _slot_remainder,
+    'app_name': _slot_app_name,
+    'task': _slot_task,
+    'direction': _slot_direction,
+    'brightness_direction': _slot_brightness_direction,
+    'turn_off': _slot_turn_off,
+}
+
+
+# ==================== TABELA DE INTENÇÕES ====================
+
+# Grupos de palavras-chave compartilhados entre as interfaces
+EMERGENCY_KEYWORDS = ("protocolo silêncio", "silêncio total", "emergência silêncio",
+                      "fechar tudo e silenciar", "modo silêncio", "panic mode")
+POWER_CONFIRM_KEYWORDS = ("confirmo", "confirmar protocolo", "confirma o protocolo",
+                          "cancelar desligamento", "cancelar reinicialização", "abortar protocolo")
+SHUTDOWN_KEYWORDS = ("desligar", "desligue", "desliga", "shutdown", "desligamento")
+RESTART_KEYWORDS = ("reiniciar", "reinicie", "restart", "reboot", "reinicialização", "reinicialize")
+SUSPEND_KEYWORDS = ("suspender", "suspenda", "hibernar", "hibernate", "dormir", "sleep")
+UPDATE_KEYWORDS = ("verificar atualizações", "verifique atualizações", "checar atualizações",
+                   "check updates", "procurar atualizações")
+VOLUME_KEYWORDS = ("volume", "som", "áudio", "audio")
+CURRENCY_KEYWORDS = ("dólar", "dolar", "euro", "bitcoin", "real", "peso", "libra")
+DIRECT_APPS = (
+    "notepad", "bloco de notas", "calculadora", "calc", "calculator",
+    "configurações", "configuracoes", "settings", "painel de controle",
+    "cmd", "prompt", "terminal", "powershell", "explorer", "task manager",
+    "gerenciador de tarefas", "defender", "windows defender", "antivírus"
+)
+BACKGROUND_KEYWORDS = ("limpar logs", "limpar temporários", "limpar cache")
+CLEANUP_SHUTDOWN_KEYWORDS = ("protocolo de encerramento", "limpar área de trabalho",
+                             "limpeza completa", "encerrar sistema", "shutdown limpo")
+
+# Comandos do ActionHandler, compartilhados pelas tabelas 'actions' e 'local'
+ACTION_RULES = (
+    IntentRule("menu", ("menu", "comandos", "ajuda", "o que você sabe fazer"), 10),
+    IntentRule("study_mode", ("modo estudo", "modostudo"), 20),
+    IntentRule("debugger", ("por que falhou", "debugger"), 30, llm=True),
+    IntentRule("search_tip", ("lembra daquela dica", "busca dica"), 40),
+    IntentRule("save_tip", ("salvar dica:",), 50, prefix=True),
+    IntentRule("gamer_mode", ("modo gamer", "modogamer"), 60, slots=("turn_off",)),
+    IntentRule("git_commit", ("git:",), 70, prefix=True),
+    IntentRule("screen_analysis", ("olhe a tela", "analise a tela", "veja a tela"), 80, llm=True),
+    IntentRule("generate_code", ("escreva um código", "gere um código", "crie um código",
+                                 "gerar código", "escrever código"), 90, llm=True),
+    IntentRule("explain_error", ("explique o erro", "qual o erro", "corrija o erro"), 100, llm=True),
+)
+
+# Uma tabela por consumidor, cada uma na ordem de avaliação original
+INTENT_TABLE: Dict[str, Tuple[IntentRule, ...]] = {
+    # gui.JarvisGUI._detect_system_command
+    'gui': (
+        IntentRule("power_shutdown", SHUTDOWN_KEYWORDS, 10),
+        IntentRule("power_restart", RESTART_KEYWORDS, 20),
+        IntentRule("power_suspend", ("suspender", "suspenda", "hibernar", "dormir", "sleep"), 30),
+        IntentRule("check_updates", UPDATE_KEYWORDS, 40),
+        IntentRule("volume_set", VOLUME_KEYWORDS, 50, slots=("number",)),
+        IntentRule("system_status", ("status do sistema", "sistema status", "status sistema",
+                                     "uso do sistema", "performance"), 60),
+        IntentRule("screenshot", ("print", "screenshot", "captura", "capturar tela", "print screen", "printar"), 70),
+        IntentRule("password", ("gerar senha", "criar senha", "senha forte", "password", "gerar password"), 80,
+                   slots=("number",)),
+        IntentRule("reminder", ("me lembre", "lembrete", "lembrar"), 90, slots=("duration", "task")),
+        IntentRule("briefing", ("briefing", "resumo do dia", "resumo diário"), 95),
+        IntentRule("weather", ("tempo hoje", "clima hoje", "previsão do tempo", "tempo agora", "clima agora"), 100),
+        IntentRule("news", ("notícias", "manchetes", "notícia do dia", "jornal"), 110),
+        IntentRule("currency_usd", ("quanto está o dólar", "cotação do dólar", "dólar hoje", "usd brl"), 120),
+        IntentRule("currency", CURRENCY_KEYWORDS, 130),
+        IntentRule("empty_recycle_bin", ("limpar lixeira", "esvaziar lixeira"), 140),
+        IntentRule("brightness_up", ("aumentar brilho", "mais brilho", "bright"), 150),
+        IntentRule("brightness_down", ("diminuir brilho", "menos brilho", "dark", "escurecer"), 160),
+        IntentRule("top_processes", ("processos", "processos ativos", "apps mais consumidos",
+                                     "top processos", "uso de memória"), 170),
+        IntentRule("play_music", ("tocar", "play", "música", "youtube", "spotify", "ouvir"), 180,
+                   slots=("remainder",), required=("remainder",)),
+        IntentRule("pomodoro", ("pomodoro", "timer", "cronômetro", "cronometro", "estudar", "foco"), 190),
+        IntentRule("open_app", ("abra", "abrir", "abre", "iniciar", "start", "open", "execute", "executar"), 200,
+                   slots=("remainder",), required=("remainder",)),
+        IntentRule("open_direct_app", DIRECT_APPS, 210),
+    ),
+    # jarvis_system_controller.SystemController.detect_command_intent
+    # (os links rápidos são acrescentados pelo controlador, com prioridade 30)
+    'controller': (
+        IntentRule("emergency_silence", EMERGENCY_KEYWORDS, 10),
+        IntentRule("universal_app", ("abra", "abrir", "abre", "iniciar", "start", "open", "execute",
+                                     "acesse", "acessar"), 20, slots=("app_name",), required=("app_name",)),
+        IntentRule("volume", VOLUME_KEYWORDS, 40, slots=("direction",), required=("direction",)),
+        IntentRule("brightness", ("brilho", "brightness"), 50,
+                   slots=("brightness_direction",), required=("brightness_direction",)),
+        IntentRule("power_shutdown", SHUTDOWN_KEYWORDS, 60),
+        IntentRule("power_restart", RESTART_KEYWORDS, 70),
+        IntentRule("power_suspend", SUSPEND_KEYWORDS, 80),
+        IntentRule("check_updates", UPDATE_KEYWORDS, 90),
+    ),
+    # action_handler.ActionHandler.process_command
+    'actions': ACTION_RULES,
+    # jarvis_threads.AIWorker._run_local_handlers: qual handler local atende o comando
+    'local': ACTION_RULES + (
+        IntentRule("cleanup_shutdown", CLEANUP_SHUTDOWN_KEYWORDS, 200),
+        IntentRule("cleanup", BACKGROUND_KEYWORDS, 210),
+        IntentRule("easter_egg", ("festa em casa", "como está o sistema"), 220),
+    ),
+    # jarvis_pipeline.classify_priority
+    'priority': (
+        IntentRule("emergency", EMERGENCY_KEYWORDS + POWER_CONFIRM_KEYWORDS, 10),
+        IntentRule("background", BACKGROUND_KEYWORDS, 20),
+    ),
+}
+
+
+class IntentRouter:
+    """Classifica uma mensagem em uma única passada sobre o texto
+    
+    Todas as palavras-chave da tabela viram um único autômato. Entre as
+    regras encontradas, vence a de menor prioridade; dentro da regra, a
+    palavra-chave que vem primeiro na lista (como nos any(...) originais,
+    avaliados de cima para baixo). Os parâmetros só são extraídos da regra
+    vencedora, e uma regra sem seus parâmetros obrigatórios cede a vez à
+    próxima.
+    """
+    
+    def __init__(self, rules: Iterable[IntentRule]):
+        self.rules = sorted(rules, key=lambda rule: rule.priority)
+        self.llm_intents = frozenset(rule.name for rule in self.rules if rule.llm)
+        self._automaton = KeywordAutomaton(
+            (keyword, (rule_index, keyword_index))
+            for rule_index, rule in enumerate(self.rules)
+            for keyword_index, keyword in enumerate(rule.keywords)
+        )
+        self._lock = threading.Lock()
+        self.stats = {'classified': 0, 'matched': 0}
+    
+    @classmethod
+    def for_scope(cls, scope: str, extra_rules: Iterable[IntentRule] = ()) -> "IntentRouter":
+        """Roteador com as regras de um consumidor da tabela"""
+        return cls(tuple(INTENT_TABLE[scope]) + tuple(extra_rules))
+    
+    def classify(self, message: str) -> Optional[IntentMatch]:
+        """Devolve a intenção vencedora ou None"""
+        text = message.lower()
+        best: Dict[int, Tuple[int, int]] = {}
+        for start, (rule_index, keyword_index) in self._automaton.search(text):
+            rule = self.rules[rule_index]
+            if rule.prefix and start != 0:
+                continue
+            current = best.get(rule_index)
+            if current is None or (keyword_index, start) < current:
+                best[rule_index] = (keyword_index, start)
+        
+        result = None
+        for rule_index in sorted(best):
+            rule = self.rules[rule_index]
+            keyword_index, start = best[rule_index]
+            keyword = rule.keywords[keyword_index]
+            match = IntentMatch(rule.name, keyword, rule.priority, start, start + len(keyword))
+            for slot in rule.slots:
+                value = SLOT_EXTRACTORS[slot](text, match)
+                if value is not None:
+                    match.slots[slot] = value
+            if all(slot in match.slots for slot in rule.required):
+                result = match
+                break
+        
+        with self._lock:
+            self.stats['classified'] += 1
+            self.stats['matched'] += result is not None
+        return result
+    
+    def get_stats(self) -> Dict:
+        """Mensagens classificadas e reconhecidas"""
+        with self._lock:
+            return dict(self.stats)
@@ -7,126 +7,639 @@ Armazena e recupera informações importantes sobre o usuário
 import sqlite3
 import os
 import json
+import threading
+import queue
+import time
+import weakref
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 import re
+from jarvis_retention import MemoryRetentionEngine
+
+# Índice vetorial é opcional (depende do NumPy)
+try:
+    from jarvis_vectors import VectorIndex
+    VECTOR_INDEX_AVAILABLE = True
+except ImportError:
+    VECTOR_INDEX_AVAILABLE = False
+    print("⚠️ NumPy não disponível - busca semântica da memória desativada")
+
+class _ThreadConnection:
+    """Conexão guardada no threading.local (coletada quando a thread termina)"""
+    
+    __slots__ = ('conn', '__weakref__')
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+class MemoryConnectionPool:
+    """Gerenciador de conexões SQLite persistentes (uma conexão por thread)
+    
+    Cada thread reutiliza a mesma conexão enquanto estiver viva, com
+    journaling WAL e cache de prepared statements. Quando a thread termina
+    (as GUIs abrem uma por mensagem), a conexão é fechada por um finalizer.
+    Também mede a latência de cada operação para diagnóstico.
+    """
+    
+    # Pragmas aplicados a cada nova conexão
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-8000",
+        "PRAGMA mmap_size=134217728",
+        "PRAGMA busy_timeout=5000",
+    )
+    
+    def __init__(self, db_path: str, cached_statements: int = 128):
+        self.db_path = db_path
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._connections = set()
+        self._lock = threading.Lock()
+        self._latency = {}
+        
+    def connection(self) -> sqlite3.Connection:
+        """Retorna a conexão da thread atual, criando-a na primeira chamada"""
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=5.0,
+                isolation_level=None,  # Transações controladas explicitamente
+                check_same_thread=False,
+                cached_statements=self.cached_statements
+            )
+            for pragma in self.PRAGMAS:
+                conn.execute(pragma)
+            holder = _ThreadConnection(conn)
+            self._local.holder = holder
+            with self._lock:
+                self._connections.add(conn)
+            # Thread encerrada: o threading.local descarta o holder e a conexão é fechada
+            weakref.finalize(holder, self._release, self._connections, self._lock, conn)
+        return holder.conn
+        
+    @staticmethod
+    def _release(connections: set, lock: threading.Lock, conn: sqlite3.Connection):
+        """Fecha a conexão de uma thread que terminou"""
+        with lock:
+            connections.discard(conn)
+        try:
+            conn.close()
+        except Exception:
+            pass
+            
+    def open_connections(self) -> int:
+        """Número de conexões abertas (uma por thread viva que usou o pool)"""
+        with self._lock:
+            return len(self._connections)
+        
+    @contextmanager
+    def cursor(self, operation: str):
+        """Cursor para leitura, com medição de latência"""
+        start = time.perf_counter()
+        cursor = self.connection().cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+            self.record_latency(operation, time.perf_counter() - start)
+            
+    @contextmanager
+    def transaction(self, operation: str):
+        """Cursor dentro de uma transação (commit/rollback automáticos)
+        
+        Usa BEGIN IMMEDIATE: o lock de escrita é obtido no início, respeitando
+        o busy_timeout, em vez de falhar com SQLITE_BUSY ao promover uma
+        leitura em WAL. Transações aninhadas reutilizam a transação externa.
+        """
+        start = time.perf_counter()
+        conn = self.connection()
+        cursor = conn.cursor()
+        nested = conn.in_transaction
+        try:
+            if not nested:
+                cursor.execute("BEGIN IMMEDIATE")
+            yield cursor
+            if not nested:
+                cursor.execute("COMMIT")
+        except Exception:
+            if not nested and conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            self.record_latency(operation, time.perf_counter() - start)
+            
+    def record_latency(self, operation: str, elapsed: float):
+        """Registra o tempo gasto por uma operação"""
+        with self._lock:
+            stats = self._latency.get(operation)
+            if stats is None:
+                stats = self._latency[operation] = {'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'last_ms': 0.0}
+            elapsed_ms = elapsed * 1000
+            stats['calls'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['last_ms'] = elapsed_ms
+            if elapsed_ms > stats['max_ms']:
+                stats['max_ms'] = elapsed_ms
+                
+    def get_latency_stats(self) -> Dict[str, Dict]:
+        """Retorna latência por operação (chamadas, média, máximo e último, em ms)"""
+        with self._lock:
+            result = {}
+            for operation, stats in self._latency.items():
+                result[operation] = dict(stats)
+                result[operation]['avg_ms'] = stats['total_ms'] / stats['calls']
+            return result
+            
+    def reset_latency_stats(self):
+        """Zera as estatísticas de latência"""
+        with self._lock:
+            self._latency.clear()
+            
+    def close_all(self):
+        """Fecha todas as conexões abertas"""
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
 
 class JarvisMemory:
     """Sistema de memória persistente para Jarvis"""
     
+    # Versão do esquema gravada em PRAGMA user_version
+    SCHEMA_VERSION = 5
+    
+    # Pesos do ranking da busca: bm25 combinado com importância e recência
+    RANK_IMPORTANCE_WEIGHT = 0.5
+    RANK_RECENCY_WEIGHT = 1.0
+    
+    # Padrões para extração de informações (compilados uma única vez)
+    EXTRACTION_PATTERNS = [
+        (re.compile(pattern, re.IGNORECASE), category, importance)
+        for pattern, category, importance in [
+            # Nome
+            (r'meu nome (?:é|é)\s+([A-Za-zÀ-ÿ\s]+)', 'nome', 3),
+            (r'chamo-me\s+([A-Za-zÀ-ÿ\s]+)', 'nome', 3),
+            (r'eu sou\s+([A-Za-zÀ-ÿ\s]+)', 'nome', 3),
+            
+            # Trabalho/projeto
+            (r'estou trabalhando (?:no|em)\s+(.+?)(?:\s+projeto)?', 'trabalho', 2),
+            (r'meu projeto (?:atual|principal) (?:é|é)\s+(.+)', 'projeto', 2),
+            (r'estou desenvolvendo\s+(.+)', 'projeto', 2),
+            
+            # Preferências
+            (r'(?:eu|gosto de|prefiro)\s+(.+)', 'preferencia', 2),
+            (r'odeio\s+(.+)', 'preferencia', 2),
+            (r'não gosto de\s+(.+)', 'preferencia', 2),
+            
+            # Informações pessoais
+            (r'mor (?:em|na)\s+(.+)', 'localizacao', 2),
+            (r'tenho\s+(\d+)\s+anos', 'idade', 2),
+            (r'estudo\s+(.+)', 'estudo', 2),
+            
+            # Contexto técnico
+            (r'usando\s+(.+)', 'tecnologia', 2),
+            (r'programando (?:em|com)\s+(.+)', 'tecnologia', 2),
+            (r'trabalhando com\s+(.+)', 'tecnologia', 2),
+            
+            # Estado emocional/situação
+            (r'estou\s+(.+)', 'estado', 2),
+            (r'estou (?:me sentindo|sentindo-me)\s+(.+)', 'estado', 2),
+        ]
+    ]
+    
+    # Tempo máximo (s) que a seção "CONVERSA RECENTE" fica em cache,
+    # já que a janela de 6 horas avança mesmo sem novas escritas
+    CONTEXT_RECENT_TTL = 300
+    
+    # Upsert de fatos, apoiado no índice único (fact, category)
+    UPSERT_FACT_SQL = '''
+        INSERT INTO memory (fact, category, data, importance)
+        VALUES (?, ?, '', ?)
+        ON CONFLICT(fact, category) DO UPDATE SET
+            importance = excluded.importance,
+            last_accessed = CURRENT_TIMESTAMP,
+            access_count = access_count + 1
+    '''
+    
     def __init__(self, db_path=None):
         """Inicializa o sistema de memória"""
         if db_path is None:
             db_path = os.path.join(os.getcwd(), 'jarvis_memory.db')
             
         self.db_path = db_path
+        self.pool = MemoryConnectionPool(db_path)
+        self.fts_enabled = False
+        self.vector_index = None
+        
+        # Contadores de geração: incrementados a cada escrita e usados
+        # para invalidar o cache de contexto do prompt
+        self._generations = {'facts': 0, 'conversation': 0, 'preferences': 0}
+        self._context_lock = threading.Lock()
+        self._context_sections = {}
+        self._recent_sections = {}
+        self._context_cache = {}
+        self.context_cache_hits = 0
+        self.context_cache_misses = 0
+        
         self.init_database()
         
     def init_database(self):
         """Inicializa o banco de dados SQLite"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            # Em bancos novos, habilita o vacuum incremental antes de criar tabelas
+            self.pool.connection().execute('PRAGMA auto_vacuum = INCREMENTAL')
             
-            # Cria tabela de memória
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS memory (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    fact TEXT NOT NULL,
-                    category TEXT NOT NULL,
-                    data TEXT NOT NULL,
-                    importance INTEGER DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    access_count INTEGER DEFAULT 1
-                )
-            ''')
+            with self.pool.transaction('init_database') as cursor:
+                cursor.execute('PRAGMA user_version')
+                version = cursor.fetchone()[0]
+                
+                # Cria tabela de memória
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS memory (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        fact TEXT NOT NULL,
+                        category TEXT NOT NULL,
+                        data TEXT NOT NULL,
+                        importance INTEGER DEFAULT 1,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        access_count INTEGER DEFAULT 1
+                    )
+                ''')
             
-            # Cria tabela de contexto de conversa
+                # Cria tabela de contexto de conversa
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS conversation_context (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        session_id TEXT NOT NULL,
+                        user_input TEXT NOT NULL,
+                        jarvis_response TEXT NOT NULL,
+                        context_data TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+            
+                # Cria tabela de preferências do usuário
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS user_preferences (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        preference_key TEXT UNIQUE NOT NULL,
+                        preference_value TEXT NOT NULL,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+            
+                # Bancos criados pelas interfaces antigas usam a coluna "timestamp"
+                # e precisam ser convertidos antes da criação dos índices
+                if version < 4:
+                    self._migrate_legacy_memory_table(cursor)
+                
+                # Cria índices para performance
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_memory_category ON memory(category)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_memory_importance ON memory(importance)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_conversation_session ON conversation_context(session_id)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_preferences_key ON user_preferences(preference_key)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_memory_last_accessed ON memory(last_accessed)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_memory_rank ON memory(importance DESC, last_accessed DESC)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_conversation_created ON conversation_context(created_at)')
+                
+                # Aplica migrações pendentes
+                self._apply_migrations(cursor, version)
+            
+            print("✅ Banco de dados de memória inicializado")
+            
+        except Exception as e:
+            print(f"Erro ao inicializar banco de dados: {e}")
+            
+    def _apply_migrations(self, cursor, version: int):
+        """Aplica as migrações do esquema de acordo com PRAGMA user_version"""
+        if version < 1:
+            self._migrate_fts_index(cursor)
+        if version < 2:
+            self._migrate_unique_facts(cursor)
+        if version < 3:
+            self._migrate_conversation_digest(cursor)
+        if version < 5:
+            self._migrate_command_usage(cursor)
+            
+        self.fts_enabled = self._has_table(cursor, 'memory_fts')
+        
+        if version < self.SCHEMA_VERSION:
+            cursor.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+            print(f"🔄 Esquema da memória migrado para a versão {self.SCHEMA_VERSION}")
+            
+    def _has_table(self, cursor, name: str) -> bool:
+        """Verifica se uma tabela existe no banco"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,))
+        return cursor.fetchone() is not None
+        
+    def _migrate_legacy_memory_table(self, cursor):
+        """Migração 4: converte a tabela memory das interfaces antigas
+        
+        jarvis_gui_integrada.py e jarvis_gui_optimized.py criavam a tabela
+        apenas com (fact, category, data, timestamp). O SQLite não permite
+        adicionar colunas com DEFAULT CURRENT_TIMESTAMP, então a tabela é
+        recriada com o esquema atual, preservando o "timestamp" original.
+        """
+        cursor.execute('PRAGMA table_info(memory)')
+        columns = {row[1] for row in cursor.fetchall()}
+        if 'created_at' in columns or 'timestamp' not in columns:
+            return
+            
+        cursor.execute('''
+            CREATE TABLE memory_migrated (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                fact TEXT NOT NULL,
+                category TEXT NOT NULL,
+                data TEXT NOT NULL,
+                importance INTEGER DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                access_count INTEGER DEFAULT 1
+            )
+        ''')
+        cursor.execute('''
+            INSERT INTO memory_migrated (id, fact, category, data, created_at, last_accessed)
+            SELECT id, fact, category, COALESCE(data, ''),
+                   COALESCE(timestamp, CURRENT_TIMESTAMP), COALESCE(timestamp, CURRENT_TIMESTAMP)
+            FROM memory
+        ''')
+        migrated = cursor.rowcount
+        cursor.execute('DROP TABLE memory')
+        cursor.execute('ALTER TABLE memory_migrated RENAME TO memory')
+        print(f"🔄 Tabela de memória legada convertida ({migrated} registros)")
+        
+    def _migrate_fts_index(self, cursor):
+        """Migração 1: índices FTS5 sobre fatos e conversas, sincronizados por triggers"""
+        try:
             cursor.execute('''
-                CREATE TABLE IF NOT EXISTS conversation_context (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_id TEXT NOT NULL,
-                    user_input TEXT NOT NULL,
-                    jarvis_response TEXT NOT NULL,
-                    context_data TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                CREATE VIRTUAL TABLE IF NOT EXISTS memory_fts USING fts5(
+                    fact,
+                    content='memory', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
                 )
             ''')
-            
-            # Cria tabela de preferências do usuário
             cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_preferences (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    preference_key TEXT UNIQUE NOT NULL,
-                    preference_value TEXT NOT NULL,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                CREATE VIRTUAL TABLE IF NOT EXISTS conversation_fts USING fts5(
+                    user_input, jarvis_response,
+                    content='conversation_context', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
                 )
             ''')
+        except sqlite3.OperationalError as e:
+            # SQLite compilado sem FTS5: a busca continua usando LIKE
+            print(f"⚠️ FTS5 indisponível, usando busca simples: {e}")
+            return
             
-            # Cria índices para performance
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_memory_category ON memory(category)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_memory_importance ON memory(importance)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_conversation_session ON conversation_context(session_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_preferences_key ON user_preferences(preference_key)')
-            
-            conn.commit()
-            conn.close()
+        # Triggers mantêm os índices sincronizados com as tabelas de conteúdo
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS memory_fts_insert AFTER INSERT ON memory BEGIN
+                INSERT INTO memory_fts(rowid, fact) VALUES (new.id, new.fact);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS memory_fts_delete AFTER DELETE ON memory BEGIN
+                INSERT INTO memory_fts(memory_fts, rowid, fact) VALUES ('delete', old.id, old.fact);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS memory_fts_update AFTER UPDATE OF fact ON memory BEGIN
+                INSERT INTO memory_fts(memory_fts, rowid, fact) VALUES ('delete', old.id, old.fact);
+                INSERT INTO memory_fts(rowid, fact) VALUES (new.id, new.fact);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS conversation_fts_insert AFTER INSERT ON conversation_context BEGIN
+                INSERT INTO conversation_fts(rowid, user_input, jarvis_response)
+                VALUES (new.id, new.user_input, new.jarvis_response);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS conversation_fts_delete AFTER DELETE ON conversation_context BEGIN
+                INSERT INTO conversation_fts(conversation_fts, rowid, user_input, jarvis_response)
+                VALUES ('delete', old.id, old.user_input, old.jarvis_response);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS conversation_fts_update
+            AFTER UPDATE OF user_input, jarvis_response ON conversation_context BEGIN
+                INSERT INTO conversation_fts(conversation_fts, rowid, user_input, jarvis_response)
+                VALUES ('delete', old.id, old.user_input, old.jarvis_response);
+                INSERT INTO conversation_fts(rowid, user_input, jarvis_response)
+                VALUES (new.id, new.user_input, new.jarvis_response);
+            END
+        ''')
+        
+        # Preenche os índices com os dados já existentes
+        cursor.execute("INSERT INTO memory_fts(memory_fts) VALUES ('rebuild')")
+        cursor.execute("INSERT INTO conversation_fts(conversation_fts) VALUES ('rebuild')")
+        
+    def _migrate_unique_facts(self, cursor):
+        """Migração 2: remove fatos duplicados e cria o índice único (fact, category)"""
+        # Consolida duplicatas na linha mais antiga antes de criar o índice
+        cursor.execute('''
+            UPDATE memory SET
+                importance = (SELECT MAX(d.importance) FROM memory d
+                              WHERE d.fact = memory.fact AND d.category = memory.category),
+                access_count = (SELECT SUM(d.access_count) FROM memory d
+                                WHERE d.fact = memory.fact AND d.category = memory.category),
+                last_accessed = (SELECT MAX(d.last_accessed) FROM memory d
+                                 WHERE d.fact = memory.fact AND d.category = memory.category)
+            WHERE id IN (SELECT MIN(id) FROM memory GROUP BY fact, category HAVING COUNT(*) > 1)
+        ''')
+        cursor.execute('''
+            DELETE FROM memory
+            WHERE id NOT IN (SELECT MIN(id) FROM memory GROUP BY fact, category)
+        ''')
+        cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_memory_fact_category ON memory(fact, category)')
+        
+    def _migrate_conversation_digest(self, cursor):
+        """Migração 3: tabela de resumos por sessão usada pela retenção"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS conversation_digest (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT UNIQUE NOT NULL,
+                started_at TIMESTAMP NOT NULL,
+                ended_at TIMESTAMP NOT NULL,
+                exchange_count INTEGER NOT NULL,
+                summary TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_digest_ended ON conversation_digest(ended_at)')
+        
+    def _migrate_command_usage(self, cursor):
+        """Migração 5: uso dos comandos de sistema (frequência do prefetch), fora das conversas"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS command_usage (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                intent TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_command_usage_created ON command_usage(created_at)')
+        
+    def bump_generation(self, *names: str):
+        """Incrementa os contadores de geração após uma escrita"""
+        with self._context_lock:
+            for name in names:
+                self._generations[name] += 1
+                
+    def _index_vectors(self, facts: List[Tuple] = (), conversations: List[Tuple] = ()):
+        """Envia fatos e conversas gravados para o índice vetorial, se houver"""
+        if self.vector_index is None:
+            return
+        try:
+            if facts:
+                self.vector_index.add('fato', [(f"{category}|{fact}", fact) for fact, category, _ in facts])
+            if conversations:
+                self.vector_index.add('conversa', [
+                    (f"{session_id}|{user_input}", f"{user_input}\n{jarvis_response}")
+                    for session_id, user_input, jarvis_response, _ in conversations
+                ])
+        except Exception as e:
+            print(f"⚠️ Erro ao indexar memória: {e}")
             
-            print("✅ Banco de dados de memória inicializado")
+    def unindex_vectors(self, facts: List[Tuple] = (), conversations: List[Tuple] = ()):
+        """Tira do índice vetorial fatos (fato, categoria) e conversas (sessão, entrada) apagados
+        
+        Chamado depois da remoção no banco: chaves que ainda têm linhas vivas
+        (a mesma pergunta repetida numa troca mais recente) continuam indexadas.
+        """
+        if self.vector_index is None or not (facts or conversations):
+            return
+        try:
+            with self.pool.cursor('unindex_vectors') as cursor:
+                fact_keys = []
+                for fact, category in set(facts):
+                    cursor.execute('SELECT 1 FROM memory WHERE fact = ? AND category = ? LIMIT 1', (fact, category))
+                    if cursor.fetchone() is None:
+                        fact_keys.append(f"{category}|{fact}")
+                conversation_keys = []
+                for session_id, user_input in set(conversations):
+                    cursor.execute('''
+                        SELECT 1 FROM conversation_context WHERE session_id = ? AND user_input = ? LIMIT 1
+                    ''', (session_id, user_input))
+                    if cursor.fetchone() is None:
+                        conversation_keys.append(f"{session_id}|{user_input}")
+            self.vector_index.remove('fato', fact_keys)
+            self.vector_index.remove('conversa', conversation_keys)
+        except Exception as e:
+            print(f"⚠️ Erro ao remover memória do índice: {e}")
             
+    def recall(self, query: str, k: int = 5, sources: List[str] = None, skip_session: str = None) -> List[Dict]:
+        """Busca semântica (top-k por cosseno) em fatos, dicas e conversas (menos as de skip_session)"""
+        if self.vector_index is None:
+            return []
+        try:
+            skip_prefix = ('conversa', f"{skip_session}|") if skip_session else None
+            return self.vector_index.search(query, k, sources, skip_prefix=skip_prefix)
         except Exception as e:
-            print(f"Erro ao inicializar banco de dados: {e}")
+            print(f"❌ Erro na busca semântica: {e}")
+            return []
             
+    @staticmethod
+    def _build_fts_query(query: str) -> str:
+        """Converte texto livre em expressão FTS5 (prefixo por termo, todos obrigatórios)"""
+        terms = re.findall(r'\w+', query.lower())
+        return ' '.join(f'"{term}"*' for term in terms)
+        
     def store_fact(self, fact: str, category: str, importance: int = 1):
         """Armazena um fato importante sobre o usuário"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.pool.transaction('store_fact') as cursor:
+                # Insere ou atualiza o fato existente em um único comando
+                cursor.execute(self.UPSERT_FACT_SQL, (fact, category, importance))
+            self.bump_generation('facts')
+            self._index_vectors(facts=[(fact, category, importance)])
             
-            # Verifica se o fato já existe
-            cursor.execute('''
-                SELECT id FROM memory 
-                WHERE fact = ? AND category = ?
-            ''', (fact, category))
+            print(f"🧠 Fato armazenado: [{category}] {fact}")
             
-            if cursor.fetchone():
-                # Atualiza fato existente
-                cursor.execute('''
-                    UPDATE memory 
-                    SET importance = ?, last_accessed = CURRENT_TIMESTAMP, access_count = access_count + 1
-                    WHERE fact = ? AND category = ?
-                ''', (importance, fact, category))
-            else:
-                # Insere novo fato
-                cursor.execute('''
-                    INSERT INTO memory (fact, category, importance)
-                    VALUES (?, ?, ?)
-                ''', (fact, category, importance))
+        except Exception as e:
+            print(f"Erro ao armazenar fato: {e}")
+            
+    def store_facts(self, facts: List[Tuple[str, str, int]]) -> int:
+        """Armazena vários fatos em uma única transação
+        
+        Args:
+            facts: Lista de tuplas (fato, categoria, importância)
+            
+        Returns:
+            int: Quantidade de fatos gravados
+        """
+        if not facts:
+            return 0
+            
+        try:
+            with self.pool.transaction('store_facts') as cursor:
+                cursor.executemany(self.UPSERT_FACT_SQL, facts)
+            self.bump_generation('facts')
+            self._index_vectors(facts=facts)
                 
-            conn.commit()
-            conn.close()
+            print(f"🧠 {len(facts)} fato(s) armazenado(s)")
+            return len(facts)
             
-            print(f"🧠 Fato armazenado: [{category}] {fact}")
+        except Exception as e:
+            print(f"Erro ao armazenar fatos: {e}")
+            return 0
+            
+    def write_batch(self, facts: List[Tuple[str, str, int]], conversations: List[Tuple]) -> bool:
+        """Grava fatos e conversas acumulados em uma única transação
+        
+        Args:
+            facts: Lista de tuplas (fato, categoria, importância)
+            conversations: Lista de tuplas (session_id, entrada, resposta, context_data)
+        """
+        if not facts and not conversations:
+            return True
+            
+        try:
+            rows = [
+                (session_id, user_input, jarvis_response, json.dumps(context_data) if context_data else None)
+                for session_id, user_input, jarvis_response, context_data in conversations
+            ]
+            with self.pool.transaction('write_batch') as cursor:
+                if facts:
+                    cursor.executemany(self.UPSERT_FACT_SQL, facts)
+                if rows:
+                    cursor.executemany('''
+                        INSERT INTO conversation_context (session_id, user_input, jarvis_response, context_data)
+                        VALUES (?, ?, ?, ?)
+                    ''', rows)
+                    
+            if facts:
+                self.bump_generation('facts')
+            if rows:
+                self.bump_generation('conversation')
+            self._index_vectors(facts, conversations)
+            return True
             
         except Exception as e:
-            print(f"Erro ao armazenar fato: {e}")
+            print(f"Erro ao gravar lote de memória: {e}")
+            return False
             
     def store_conversation(self, session_id: str, user_input: str, jarvis_response: str, context_data: Dict = None):
         """Armazena contexto da conversa"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             context_json = json.dumps(context_data) if context_data else None
             
-            cursor.execute('''
-                INSERT INTO conversation_context (session_id, user_input, jarvis_response, context_data)
-                VALUES (?, ?, ?, ?)
-            ''', (session_id, user_input, jarvis_response, context_json))
-                
-            conn.commit()
-            conn.close()
+            with self.pool.transaction('store_conversation') as cursor:
+                cursor.execute('''
+                    INSERT INTO conversation_context (session_id, user_input, jarvis_response, context_data)
+                    VALUES (?, ?, ?, ?)
+                ''', (session_id, user_input, jarvis_response, context_json))
+            self.bump_generation('conversation')
+            self._index_vectors(conversations=[(session_id, user_input, jarvis_response, context_data)])
             
         except Exception as e:
             print(f"Erro ao armazenar conversa: {e}")
@@ -135,40 +648,8 @@ class JarvisMemory:
         """Extrai informações importantes do texto do usuário"""
         facts = []
         
-        # Padrões para extração de informações
-        patterns = [
-            # Nome
-            (r'meu nome (?:é|é)\s+([A-Za-zÀ-ÿ\s]+)', 'nome', 3),
-            (r'chamo-me\s+([A-Za-zÀ-ÿ\s]+)', 'nome', 3),
-            (r'eu sou\s+([A-Za-zÀ-ÿ\s]+)', 'nome', 3),
-            
-            # Trabalho/projeto
-            (r'estou trabalhando (?:no|em)\s+(.+?)(?:\s+projeto)?', 'trabalho', 2),
-            (r'meu projeto (?:atual|principal) (?:é|é)\s+(.+)', 'projeto', 2),
-            (r'estou desenvolvendo\s+(.+)', 'projeto', 2),
-            
-            # Preferências
-            (r'(?:eu|gosto de|prefiro)\s+(.+)', 'preferencia', 2),
-            (r'odeio\s+(.+)', 'preferencia', 2),
-            (r'não gosto de\s+(.+)', 'preferencia', 2),
-            
-            # Informações pessoais
-            (r'mor (?:em|na)\s+(.+)', 'localizacao', 2),
-            (r'tenho\s+(\d+)\s+anos', 'idade', 2),
-            (r'estudo\s+(.+)', 'estudo', 2),
-            
-            # Contexto técnico
-            (r'usando\s+(.+)', 'tecnologia', 2),
-            (r'programando (?:em|com)\s+(.+)', 'tecnologia', 2),
-            (r'trabalhando com\s+(.+)', 'tecnologia', 2),
-            
-            # Estado emocional/situação
-            (r'estou\s+(.+)', 'estado', 2),
-            (r'estou (?:me sentindo|sentindo-me)\s+(.+)', 'estado', 2),
-        ]
-        
-        for pattern, category, importance in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern, category, importance in self.EXTRACTION_PATTERNS:
+            matches = pattern.findall(text)
             for match in matches:
                 fact = match if isinstance(match, str) else ' '.join(match)
                 facts.append((fact.strip(), category, importance))
@@ -179,104 +660,205 @@ class JarvisMemory:
         """Extrai e armazena informações automaticamente"""
         facts = self.extract_user_info(text)
         
-        for fact, category, importance in facts:
-            self.store_fact(fact, category, importance)
+        # Todos os fatos da mensagem são gravados em uma só transação
+        self.store_facts(facts)
             
         return facts
         
     def search_memory(self, query: str, category: str = None, limit: int = 10) -> List[Dict]:
-        """Busca informações na memória"""
+        """Busca informações na memória
+        
+        Com FTS5 disponível, os resultados são ordenados por bm25 combinado
+        com importância e recência. Consulta vazia retorna os fatos mais
+        importantes e recentes.
+        """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            fts_query = self._build_fts_query(query) if self.fts_enabled else ''
+            category_filter = 'AND m.category = ?' if category else ''
+            category_params = (category,) if category else ()
             
-            # Constrói query de busca
-            if category:
-                cursor.execute('''
-                    SELECT fact, category, importance, created_at, access_count
-                    FROM memory 
-                    WHERE category = ? AND fact LIKE ?
-                    ORDER BY importance DESC, last_accessed DESC
-                    LIMIT ?
-                ''', (category, f'%{query}%', limit))
-            else:
-                cursor.execute('''
-                    SELECT fact, category, importance, created_at, access_count
-                    FROM memory 
-                    WHERE fact LIKE ?
-                    ORDER BY importance DESC, last_accessed DESC
-                    LIMIT ?
-                ''', (f'%{query}%', limit))
+            with self.pool.cursor('search_memory') as cursor:
+                if fts_query:
+                    cursor.execute(f'''
+                        SELECT m.fact, m.category, m.importance, m.created_at, m.access_count
+                        FROM memory_fts
+                        JOIN memory m ON m.id = memory_fts.rowid
+                        WHERE memory_fts MATCH ? {category_filter}
+                        ORDER BY bm25(memory_fts)
+                                 - m.importance * ?
+                                 - ? / (1.0 + julianday('now') - julianday(m.last_accessed))
+                        LIMIT ?
+                    ''', (fts_query, *category_params, self.RANK_IMPORTANCE_WEIGHT, self.RANK_RECENCY_WEIGHT, limit))
+                elif query.strip():
+                    cursor.execute(f'''
+                        SELECT m.fact, m.category, m.importance, m.created_at, m.access_count
+                        FROM memory m
+                        WHERE m.fact LIKE ? {category_filter}
+                        ORDER BY m.importance DESC, m.last_accessed DESC
+                        LIMIT ?
+                    ''', (f'%{query}%', *category_params, limit))
+                else:
+                    cursor.execute(f'''
+                        SELECT m.fact, m.category, m.importance, m.created_at, m.access_count
+                        FROM memory m
+                        WHERE 1 = 1 {category_filter}
+                        ORDER BY m.importance DESC, m.last_accessed DESC
+                        LIMIT ?
+                    ''', (*category_params, limit))
                 
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    'fact': row[0],
-                    'category': row[1],
-                    'importance': row[2],
-                    'created_at': row[3],
-                    'access_count': row[4]
-                })
+                results = []
+                for row in cursor.fetchall():
+                    results.append({
+                        'fact': row[0],
+                        'category': row[1],
+                        'importance': row[2],
+                        'created_at': row[3],
+                        'access_count': row[4]
+                    })
                 
-            conn.close()
             return results
             
         except Exception as e:
             print(f"❌ Erro ao buscar memória: {e}")
             return []
             
+    def search_conversations(self, query: str, session_id: str = None, limit: int = 5) -> List[Dict]:
+        """Busca conversas passadas por texto (bm25 combinado com recência)"""
+        fts_query = self._build_fts_query(query) if self.fts_enabled else ''
+        if not fts_query:
+            return []
+            
+        try:
+            session_filter = 'AND c.session_id = ?' if session_id else ''
+            session_params = (session_id,) if session_id else ()
+            
+            with self.pool.cursor('search_conversations') as cursor:
+                cursor.execute(f'''
+                    SELECT c.user_input, c.jarvis_response, c.session_id, c.created_at
+                    FROM conversation_fts
+                    JOIN conversation_context c ON c.id = conversation_fts.rowid
+                    WHERE conversation_fts MATCH ? {session_filter}
+                    ORDER BY bm25(conversation_fts)
+                             - ? / (1.0 + julianday('now') - julianday(c.created_at))
+                    LIMIT ?
+                ''', (fts_query, *session_params, self.RANK_RECENCY_WEIGHT, limit))
+                
+                results = []
+                for row in cursor.fetchall():
+                    results.append({
+                        'user_input': row[0],
+                        'jarvis_response': row[1],
+                        'session_id': row[2],
+                        'created_at': row[3]
+                    })
+                
+            return results
+            
+        except Exception as e:
+            print(f"❌ Erro ao buscar conversas: {e}")
+            return []
+            
     def get_recent_context(self, session_id: str = None, hours: int = 24) -> List[Dict]:
         """Obtém contexto recente de conversas"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             since_date = datetime.now() - timedelta(hours=hours)
             
-            if session_id:
-                cursor.execute('''
-                    SELECT user_input, jarvis_response, context_data, created_at
-                    FROM conversation_context 
-                    WHERE session_id = ? AND created_at >= ?
-                    ORDER BY created_at DESC
-                    LIMIT 10
-                ''', (session_id, since_date))
-            else:
-                cursor.execute('''
-                    SELECT user_input, jarvis_response, context_data, created_at
-                    FROM conversation_context 
-                    WHERE created_at >= ?
-                    ORDER BY created_at DESC
-                    LIMIT 20
-                ''', (since_date,))
+            with self.pool.cursor('get_recent_context') as cursor:
+                if session_id:
+                    cursor.execute('''
+                        SELECT user_input, jarvis_response, context_data, created_at
+                        FROM conversation_context 
+                        WHERE session_id = ? AND created_at >= ?
+                        ORDER BY created_at DESC
+                        LIMIT 10
+                    ''', (session_id, since_date))
+                else:
+                    cursor.execute('''
+                        SELECT user_input, jarvis_response, context_data, created_at
+                        FROM conversation_context 
+                        WHERE created_at >= ?
+                        ORDER BY created_at DESC
+                        LIMIT 20
+                    ''', (since_date,))
                 
-            results = []
-            for row in cursor.fetchall():
-                context_data = json.loads(row[2]) if row[2] else {}
-                results.append({
-                    'user_input': row[0],
-                    'jarvis_response': row[1],
-                    'context_data': context_data,
-                    'created_at': row[3]
-                })
+                results = []
+                for row in cursor.fetchall():
+                    context_data = json.loads(row[2]) if row[2] else {}
+                    results.append({
+                        'user_input': row[0],
+                        'jarvis_response': row[1],
+                        'context_data': context_data,
+                        'created_at': row[3]
+                    })
                 
-            conn.close()
             return results
             
         except Exception as e:
             print(f"❌ Erro ao obter contexto: {e}")
             return []
             
+    def record_command_usage(self, session_id: str, intent: str):
+        """Registra o uso de um comando de sistema (só a intenção: nem a mensagem nem a resposta)"""
+        try:
+            with self.pool.transaction('record_command_usage') as cursor:
+                cursor.execute('''
+                    INSERT INTO command_usage (session_id, intent) VALUES (?, ?)
+                ''', (session_id, intent))
+                
+        except Exception as e:
+            print(f"Erro ao registrar uso de comando: {e}")
+            
+    def get_recent_inputs(self, days: int = 14, limit: int = 2000) -> List[Tuple[str, Dict]]:
+        """Pedidos dos últimos dias como (mensagem, contexto), do mais recente para o mais antigo
+        
+        Junta as mensagens das conversas e os comandos de sistema de
+        command_usage (estes sem mensagem, com a intenção no contexto).
+        """
+        try:
+            cutoff = f'-{int(days)} days'
+            with self.pool.cursor('get_recent_inputs') as cursor:
+                cursor.execute('''
+                    SELECT user_input, context_data, NULL, created_at
+                    FROM conversation_context
+                    WHERE created_at >= datetime('now', ?)
+                    UNION ALL
+                    SELECT '', NULL, intent, created_at
+                    FROM command_usage
+                    WHERE created_at >= datetime('now', ?)
+                    ORDER BY created_at DESC
+                    LIMIT ?
+                ''', (cutoff, cutoff, limit))
+                return [
+                    (row[0], {'intent': row[2]} if row[2] else json.loads(row[1]) if row[1] else {})
+                    for row in cursor.fetchall()
+                ]
+                
+        except Exception as e:
+            print(f"❌ Erro ao obter mensagens recentes: {e}")
+            return []
+            
+    def get_recent_memories(self, limit: int = 5) -> List[Tuple[str, str, str]]:
+        """Recupera os fatos mais recentes como (fact, category, created_at)"""
+        try:
+            with self.pool.cursor('get_recent_memories') as cursor:
+                cursor.execute('''
+                    SELECT fact, category, created_at FROM memory
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT ?
+                ''', (limit,))
+                return cursor.fetchall()
+                
+        except Exception as e:
+            print(f"❌ Erro ao recuperar memórias: {e}")
+            return []
+            
     def get_user_preferences(self) -> Dict[str, str]:
         """Obtém todas as preferências do usuário"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT preference_key, preference_value FROM user_preferences')
-            results = dict(cursor.fetchall())
+            with self.pool.cursor('get_user_preferences') as cursor:
+                cursor.execute('SELECT preference_key, preference_value FROM user_preferences')
+                results = dict(cursor.fetchall())
             
-            conn.close()
             return results
             
         except Exception as e:
@@ -286,73 +868,184 @@ class JarvisMemory:
     def set_preference(self, key: str, value: str):
         """Define uma preferência do usuário"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO user_preferences (preference_key, preference_value)
-                VALUES (?, ?)
-            ''', (key, value))
-                
-            conn.commit()
-            conn.close()
+            with self.pool.transaction('set_preference') as cursor:
+                cursor.execute('''
+                    INSERT OR REPLACE INTO user_preferences (preference_key, preference_value)
+                    VALUES (?, ?)
+                ''', (key, value))
+            self.bump_generation('preferences')
             
             print(f"⚙️ Preferência definida: {key} = {value}")
             
         except Exception as e:
             print(f"❌ Erro ao definir preferência: {e}")
             
-    def get_context_for_prompt(self, session_id: str = None) -> str:
-        """Gera contexto para incluir no prompt da IA"""
-        context_parts = []
+    def get_context_for_prompt(self, session_id: str = None, query: str = None, with_session_history: bool = True) -> str:
+        """Gera contexto para incluir no prompt da IA
+        
+        O bloco é memorizado por sessão. Se nada foi gravado desde a última
+        chamada, retorna o texto em cache sem consultar o banco; caso
+        contrário, reconstrói apenas as seções cujas gerações mudaram.
+        
+        Com query e índice vetorial, os fatos mais importantes dão lugar às
+        memórias mais relevantes para o comando atual.
+        
+        Com with_session_history=False (quem chama envia a conversa no
+        prompt), a conversa recente e as trocas desta sessão ficam de fora:
+        o bloco não muda a cada troca e serve de chave para o cache de
+        respostas.
+        """
+        context, sections = self._get_context_sections(session_id)
+        if not with_session_history:
+            sections = (sections[0], "", sections[2])
+            context = "\n".join(part for part in sections if part)
+        
+        if query and self.vector_index is not None:
+            relevant_section = self._build_relevant_section(query, skip_session=None if with_session_history else session_id)
+            if relevant_section:
+                return "\n".join(part for part in (relevant_section,) + sections[1:] if part)
+                
+        return context
+        
+    def _get_context_sections(self, session_id: str = None) -> Tuple[str, Tuple[str, str, str]]:
+        """Retorna o bloco completo e as seções (fatos, conversa recente, preferências)"""
+        with self._context_lock:
+            generations = (self._generations['facts'], self._generations['conversation'], self._generations['preferences'])
+            cached = self._context_cache.get(session_id)
+            recent = self._recent_sections.get(session_id)
+            recent_fresh = recent is not None and time.monotonic() - recent[1] < self.CONTEXT_RECENT_TTL
+            if cached and cached[0] == generations and recent_fresh:
+                self.context_cache_hits += 1
+                return cached[1], cached[2]
+            self.context_cache_misses += 1
+            
+        facts_gen, conversation_gen, preferences_gen = generations
         
         # Informações importantes do usuário
+        facts_section = self._context_sections.get('facts')
+        if facts_section is None or facts_section[0] != facts_gen:
+            facts_section = (facts_gen, self._build_facts_section())
+            
+        # Contexto recente de conversa (única seção alterada após uma nova troca)
+        if not recent_fresh or recent[0] != conversation_gen:
+            recent = (conversation_gen, time.monotonic(), self._build_recent_section(session_id))
+            
+        # Preferências do usuário
+        preferences_section = self._context_sections.get('preferences')
+        if preferences_section is None or preferences_section[0] != preferences_gen:
+            preferences_section = (preferences_gen, self._build_preferences_section())
+            
+        sections = (facts_section[1], recent[2], preferences_section[1])
+        context = "\n".join(part for part in sections if part)
+        
+        with self._context_lock:
+            self._context_sections['facts'] = facts_section
+            self._context_sections['preferences'] = preferences_section
+            self._recent_sections[session_id] = recent
+            self._context_cache[session_id] = (generations, context, sections)
+            
+        return context, sections
+        
+    def _build_relevant_section(self, query: str, k: int = 5, skip_session: str = None) -> str:
+        """Monta a seção de memórias mais relevantes para o comando"""
+        memories = self.recall(query, k, skip_session=skip_session)
+        if not memories:
+            return ""
+        labels = {'fato': 'fato', 'dica': 'dica', 'conversa': 'conversa anterior'}
+        lines = ["MEMÓRIAS RELEVANTES PARA O COMANDO:"]
+        for memory in memories:
+            text = memory['text'].replace("\n", " / ")[:120]
+            lines.append(f"- {text} ({labels.get(memory['source'], memory['source'])})")
+        return "\n".join(lines)
+        
+    def _build_facts_section(self) -> str:
+        """Monta a seção de informações importantes do usuário"""
         important_facts = self.search_memory("", limit=5)
-        if important_facts:
-            context_parts.append("INFORMAÇÕES IMPORTANTES DO USUÁRIO:")
-            for fact in important_facts:
-                context_parts.append(f"- {fact['fact']} ({fact['category']})")
-                
-        # Contexto recente de conversa
+        if not important_facts:
+            return ""
+        lines = ["INFORMAÇÕES IMPORTANTES DO USUÁRIO:"]
+        for fact in important_facts:
+            lines.append(f"- {fact['fact']} ({fact['category']})")
+        return "\n".join(lines)
+        
+    def _build_recent_section(self, session_id: str = None) -> str:
+        """Monta a seção de conversa recente"""
         recent_context = self.get_recent_context(session_id, hours=6)
-        if recent_context:
-            context_parts.append("\nCONVERSA RECENTE:")
-            for conv in recent_context[:3]:  # Últimas 3 interações
-                context_parts.append(f"Usuário: {conv['user_input'][:50]}...")
-                context_parts.append(f"Jarvis: {conv['jarvis_response'][:50]}...")
-                
-        # Preferências do usuário
+        if not recent_context:
+            return ""
+        lines = ["\nCONVERSA RECENTE:"]
+        for conv in recent_context[:3]:  # Últimas 3 interações
+            lines.append(f"Usuário: {conv['user_input'][:50]}...")
+            lines.append(f"Jarvis: {conv['jarvis_response'][:50]}...")
+        return "\n".join(lines)
+        
+    def _build_preferences_section(self) -> str:
+        """Monta a seção de preferências do usuário"""
         preferences = self.get_user_preferences()
-        if preferences:
-            context_parts.append("\nPREFERÊNCIAS DO USUÁRIO:")
-            for key, value in preferences.items():
-                context_parts.append(f"- {key}: {value}")
-                
-        return "\n".join(context_parts) if context_parts else ""
+        if not preferences:
+            return ""
+        lines = ["\nPREFERÊNCIAS DO USUÁRIO:"]
+        for key, value in preferences.items():
+            lines.append(f"- {key}: {value}")
+        return "\n".join(lines)
+        
+    def delete_in_chunks(self, table: str, where: str, params: Tuple = (), chunk_size: int = 500,
+                         pause: float = 0.0) -> int:
+        """Remove linhas em pequenas transações para não travar o banco
         
+        Args:
+            table: Tabela alvo (nome interno, não vem do usuário)
+            where: Condição SQL com placeholders
+            params: Parâmetros da condição
+            chunk_size: Linhas removidas por transação
+            pause: Pausa entre lotes, liberando o lock para outras threads
+            
+        Returns:
+            int: Total de linhas removidas
+        """
+        total = 0
+        while True:
+            with self.pool.transaction(f'delete_{table}') as cursor:
+                cursor.execute(f'''
+                    DELETE FROM {table}
+                    WHERE id IN (SELECT id FROM {table} WHERE {where} LIMIT ?)
+                ''', (*params, chunk_size))
+                deleted = cursor.rowcount
+            total += deleted
+            if deleted < chunk_size:
+                return total
+            if pause:
+                time.sleep(pause)
+                
     def cleanup_old_data(self, days: int = 30):
         """Limpa dados antigos do banco"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cutoff_date = datetime.now() - timedelta(days=days)
+            cutoff = f'-{int(days)} days'
             
+            # Chaves do índice vetorial das linhas que vão sair
+            with self.pool.cursor('cleanup_scan') as cursor:
+                cursor.execute('''
+                    SELECT DISTINCT session_id, user_input FROM conversation_context
+                    WHERE created_at < datetime('now', ?)
+                ''', (cutoff,))
+                old_conversations = cursor.fetchall()
+                cursor.execute('''
+                    SELECT fact, category FROM memory
+                    WHERE importance < 3 AND created_at < datetime('now', ?)
+                ''', (cutoff,))
+                old_facts = cursor.fetchall()
+                
             # Limpa conversas antigas
-            cursor.execute('''
-                DELETE FROM conversation_context 
-                WHERE created_at < ?
-            ''', (cutoff_date,))
+            deleted_count = self.delete_in_chunks(
+                'conversation_context', "created_at < datetime('now', ?)", (cutoff,)
+            )
             
             # Limpa fatos com baixa importância e antigos
-            cursor.execute('''
-                DELETE FROM memory 
-                WHERE importance < 3 AND created_at < ?
-            ''', (cutoff_date,))
-            
-            deleted_count = cursor.rowcount
-            conn.commit()
-            conn.close()
+            deleted_count += self.delete_in_chunks(
+                'memory', "importance < 3 AND created_at < datetime('now', ?)", (cutoff,)
+            )
+            self.bump_generation('facts', 'conversation')
+            self.unindex_vectors(old_facts, old_conversations)
             
             print(f"🧹 Limpeza concluída: {deleted_count} registros antigos removidos")
             return deleted_count
@@ -364,59 +1057,350 @@ class JarvisMemory:
     def get_memory_stats(self) -> Dict:
         """Obtém estatísticas da memória"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             stats = {}
             
-            # Total de fatos por categoria
-            cursor.execute('''
-                SELECT category, COUNT(*) as count
-                FROM memory
-                GROUP BY category
-            ''')
-            stats['facts_by_category'] = dict(cursor.fetchall())
-            
-            # Total de conversas
-            cursor.execute('SELECT COUNT(*) as count FROM conversation_context')
-            stats['total_conversations'] = cursor.fetchone()[0]
-            
-            # Preferências salvas
-            cursor.execute('SELECT COUNT(*) as count FROM user_preferences')
-            stats['total_preferences'] = cursor.fetchone()[0]
+            with self.pool.cursor('get_memory_stats') as cursor:
+                # Total de fatos por categoria
+                cursor.execute('''
+                    SELECT category, COUNT(*) as count
+                    FROM memory
+                    GROUP BY category
+                ''')
+                stats['facts_by_category'] = dict(cursor.fetchall())
+                
+                # Total de conversas
+                cursor.execute('SELECT COUNT(*) as count FROM conversation_context')
+                stats['total_conversations'] = cursor.fetchone()[0]
+                
+                # Preferências salvas
+                cursor.execute('SELECT COUNT(*) as count FROM user_preferences')
+                stats['total_preferences'] = cursor.fetchone()[0]
             
-            conn.close()
+            stats['latency'] = self.pool.get_latency_stats()
+            stats['context_cache'] = {'hits': self.context_cache_hits, 'misses': self.context_cache_misses}
             return stats
             
         except Exception as e:
             print(f"❌ Erro ao obter estatísticas: {e}")
             return {}
+            
+    def get_latency_stats(self) -> Dict[str, Dict]:
+        """Obtém a latência por operação de banco (em ms)"""
+        return self.pool.get_latency_stats()
+        
+    def close(self):
+        """Fecha as conexões persistentes com o banco"""
+        if self.vector_index is not None:
+            self.vector_index.close()
+        self.pool.close_all()
+
+class MemoryWriteBehind:
+    """Fila de escrita assíncrona (write-behind) para a memória
+    
+    Fatos e conversas são enfileirados e gravados em lotes por uma thread
+    dedicada, quando o lote atinge batch_size ou após flush_interval
+    segundos. A fila é limitada: se estiver cheia, o produtor espera até
+    put_timeout e, persistindo, grava de forma síncrona.
+    """
+    
+    def __init__(self, memory: 'JarvisMemory', max_queue: int = 1000, batch_size: int = 64,
+                 flush_interval: float = 0.5, put_timeout: float = 0.05):
+        self.memory = memory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.is_running = True
+        
+        # Métricas de backpressure
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'enqueued': 0,
+            'written': 0,
+            'batches': 0,
+            'failed_batches': 0,
+            'max_depth': 0,
+            'full_waits': 0,
+            'sync_fallbacks': 0,
+            'wait_ms': 0.0
+        }
+        
+        self.writer_thread = threading.Thread(target=self._writer_loop, name="MemoryWriter", daemon=True)
+        self.writer_thread.start()
+        
+    def enqueue_facts(self, facts: List[Tuple[str, str, int]]):
+        """Enfileira fatos extraídos para gravação"""
+        if facts:
+            self._put(('facts', list(facts)))
+            
+    def enqueue_conversation(self, session_id: str, user_input: str, jarvis_response: str, context_data: Dict = None):
+        """Enfileira uma troca de conversa para gravação"""
+        self._put(('conversation', (session_id, user_input, jarvis_response, context_data)))
+        
+    def enqueue_text(self, text: str, on_extracted: Callable[[List[Tuple[str, str, int]]], None] = None):
+        """Enfileira uma mensagem do usuário; a extração de fatos roda na thread de escrita
+        
+        on_extracted recebe os fatos extraídos (só quando houver algum).
+        """
+        if text:
+            self._put(('text', (text, on_extracted)))
+        
+    def _put(self, item):
+        """Insere na fila aplicando backpressure"""
+        if not self.is_running:
+            self._write_items([item])
+            return
+            
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            start = time.perf_counter()
+            try:
+                self.queue.put(item, timeout=self.put_timeout)
+                fallback = False
+            except queue.Full:
+                fallback = True
+            with self._stats_lock:
+                self.stats['full_waits'] += 1
+                self.stats['wait_ms'] += (time.perf_counter() - start) * 1000
+                if fallback:
+                    self.stats['sync_fallbacks'] += 1
+            if fallback:
+                # Fila saturada: grava na thread do produtor para não perder dados
+                self._write_items([item])
+                return
+                
+        with self._stats_lock:
+            self.stats['enqueued'] += 1
+            depth = self.queue.qsize()
+            if depth > self.stats['max_depth']:
+                self.stats['max_depth'] = depth
+                
+    def _writer_loop(self):
+        """Loop da thread de escrita: acumula lotes por tempo ou quantidade"""
+        while True:
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if not self.is_running:
+                    return
+                continue
+                
+            batch = []
+            waiters = []
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                    
+                # Flush explícito ou encerramento gravam imediatamente
+                if stop or waiters or len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                    
+            if batch:
+                self._write_items(batch)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+                
+    def _write_items(self, items):
+        """Grava um lote de itens em uma única transação"""
+        facts = []
+        conversations = []
+        extracted = []
+        for kind, payload in items:
+            if kind == 'facts':
+                facts.extend(payload)
+            elif kind == 'text':
+                text, on_extracted = payload
+                text_facts = self.memory.extract_user_info(text)
+                facts.extend(text_facts)
+                if text_facts and on_extracted:
+                    extracted.append((on_extracted, text_facts))
+            else:
+                conversations.append(payload)
+                
+        success = self.memory.write_batch(facts, conversations)
+        for on_extracted, text_facts in extracted:
+            try:
+                on_extracted(text_facts)
+            except Exception as e:
+                print(f"❌ Erro ao notificar fatos extraídos: {e}")
+        with self._stats_lock:
+            if success:
+                self.stats['written'] += len(items)
+                self.stats['batches'] += 1
+            else:
+                self.stats['failed_batches'] += 1
+                
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Aguarda a gravação de tudo que já foi enfileirado"""
+        if not self.writer_thread.is_alive():
+            return self.queue.empty()
+        done = threading.Event()
+        try:
+            self.queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+        
+    def stop(self, timeout: float = 5.0):
+        """Grava pendências e encerra a thread de escrita"""
+        if not self.is_running:
+            return
+        self.flush(timeout)
+        self.is_running = False
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self.writer_thread.join(timeout)
+        
+        # Itens enfileirados durante o encerramento são gravados aqui
+        leftovers = []
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, tuple):
+                leftovers.append(item)
+            elif isinstance(item, threading.Event):
+                item.set()
+        if leftovers:
+            self._write_items(leftovers)
+        
+    def get_stats(self) -> Dict:
+        """Retorna métricas da fila de escrita"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['depth'] = self.queue.qsize()
+        stats['capacity'] = self.queue.maxsize
+        return stats
 
 class MemoryManager:
     """Gerenciador de memória para integração com o Jarvis"""
     
-    def __init__(self, db_path=None):
+    def __init__(self, db_path=None, write_behind: bool = True, embedder=None):
         self.memory = JarvisMemory(db_path)
+        self.writer = MemoryWriteBehind(self.memory) if write_behind else None
+        self.retention = None
+        
+        # Índice semântico ao lado do banco (jarvis_memory_vectors.npy)
+        if VECTOR_INDEX_AVAILABLE:
+            try:
+                self.memory.vector_index = VectorIndex(VectorIndex.path_for_db(self.memory.db_path), embedder)
+            except Exception as e:
+                print(f"⚠️ Erro ao abrir índice vetorial: {e}")
+                
+    def start_retention(self, **options):
+        """Inicia o motor de retenção em segundo plano (ver MemoryRetentionEngine)"""
+        if self.retention is None:
+            self.retention = MemoryRetentionEngine(self.memory, **options)
+        self.retention.start()
+        return self.retention
+        
+    def index_tips(self, tip_store) -> int:
+        """Indexa dicas e erros resolvidos (TipStore) para a busca semântica
+        
+        As dicas existentes são indexadas agora e as novas, à medida que
+        forem salvas; as descartadas pela política de retenção saem do índice.
+        """
+        if self.memory.vector_index is None:
+            return 0
+        
+        def to_item(entry):
+            return (f"{entry['kind']}:{entry['id']}", entry['conteudo'])
+            
+        tip_store.add_listener(
+            lambda entry: self.memory.vector_index.add('dica', [to_item(entry)]),
+            on_remove=lambda entries: self.memory.vector_index.remove('dica', [to_item(entry)[0] for entry in entries])
+        )
+        items = [to_item(entry) for entry in tip_store.all() if entry['conteudo']]
+        # Dicas descartadas com o índice fechado (ou antes desta versão)
+        live_keys = {key for key, _ in items}
+        self.memory.vector_index.remove('dica', [key for key in self.memory.vector_index.keys('dica') if key not in live_keys])
+        return self.memory.vector_index.add('dica', items)
+        
+    def recall(self, query: str, k: int = 5, sources: List[str] = None) -> List[Dict]:
+        """Busca as memórias mais relevantes para a consulta"""
+        return self.memory.recall(query, k, sources)
         
     def process_user_input(self, text: str, session_id: str = None) -> str:
         """Processa entrada do usuário e extrai informações"""
-        # Extrai e armazena informações automaticamente
-        facts = self.memory.auto_extract_and_store(text, session_id)
+        if self.writer:
+            # A extração é feita aqui; a gravação fica para a thread de escrita
+            facts = self.memory.extract_user_info(text)
+            self.writer.enqueue_facts(facts)
+        else:
+            # Extrai e armazena informações automaticamente
+            facts = self.memory.auto_extract_and_store(text, session_id)
+        
+        return self._describe_facts(facts)
+        
+    def process_user_input_async(self, text: str, session_id: str = None,
+                                 callback: Callable[[str], None] = None):
+        """Extrai informações fora do caminho crítico do comando
+        
+        Com a escrita assíncrona, a extração (expressões regulares) e a
+        gravação rodam na thread de escrita; callback recebe a mesma
+        mensagem de process_user_input quando algum fato for encontrado.
+        """
+        if not self.writer:
+            info = self.process_user_input(text, session_id)
+            if info and callback:
+                callback(info)
+            return
+        
+        on_extracted = (lambda facts: callback(self._describe_facts(facts))) if callback else None
+        self.writer.enqueue_text(text, on_extracted)
         
+    @staticmethod
+    def _describe_facts(facts: List[Tuple[str, str, int]]) -> str:
+        """Mensagem de log com os fatos armazenados"""
         if facts:
             fact_list = ", ".join([f"{fact} ({category})" for fact, category, _ in facts])
             return f"🧠 Informações armazenadas: {fact_list}"
         
         return ""
         
-    def get_context_for_ai(self, session_id: str = None) -> str:
+    def add_memory(self, fact: str, category: str = "general", importance: int = 1):
+        """Armazena um fato avulso (ex.: comandos de sistema executados)"""
+        if self.writer:
+            self.writer.enqueue_facts([(fact, category, importance)])
+        else:
+            self.memory.store_fact(fact, category, importance)
+            
+    def get_recent_memories(self, limit: int = 5) -> List[Tuple[str, str, str]]:
+        """Recupera os fatos mais recentes como (fact, category, created_at)"""
+        return self.memory.get_recent_memories(limit)
+        
+    def get_context_for_ai(self, session_id: str = None, query: str = None, with_session_history: bool = True) -> str:
         """Obtém contexto formatado para a IA"""
-        return self.memory.get_context_for_prompt(session_id)
+        return self.memory.get_context_for_prompt(session_id, query, with_session_history)
         
     def search_user_info(self, query: str) -> List[Dict]:
         """Busca informações do usuário"""
         return self.memory.search_memory(query)
         
+    def search_past_conversations(self, query: str, session_id: str = None, limit: int = 5) -> List[Dict]:
+        """Busca conversas passadas relacionadas à consulta"""
+        return self.memory.search_conversations(query, session_id, limit)
+        
     def set_user_preference(self, key: str, value: str):
         """Define preferência do usuário"""
         self.memory.set_preference(key, value)
@@ -428,12 +1412,45 @@ class MemoryManager:
         
     def store_conversation(self, session_id: str, user_input: str, jarvis_response: str, context: Dict = None):
         """Armazena conversa"""
-        self.memory.store_conversation(session_id, user_input, jarvis_response, context)
+        if self.writer:
+            self.writer.enqueue_conversation(session_id, user_input, jarvis_response, context)
+        else:
+            self.memory.store_conversation(session_id, user_input, jarvis_response, context)
+            
+    def record_command_usage(self, session_id: str, intent: str):
+        """Registra o uso de um comando de sistema (não vira conversa, busca nem prompt)"""
+        self.memory.record_command_usage(session_id, intent)
+            
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Grava imediatamente as escritas pendentes"""
+        return self.writer.flush(timeout) if self.writer else True
         
     def cleanup_memory(self, days: int = 30):
-        """Limpa memória antiga"""
-        return self.memory.cleanup_old_data(days)
+        """Limpa memória antiga (manutenção explícita: também converte bancos antigos para o vacuum incremental)"""
+        self.flush()
+        deleted = self.memory.cleanup_old_data(days)
+        try:
+            (self.retention or MemoryRetentionEngine(self.memory)).enable_incremental_vacuum()
+        except Exception as e:
+            print(f"⚠️ Erro ao converter o banco para vacuum incremental: {e}")
+        return deleted
         
     def get_stats(self) -> Dict:
         """Obtém estatísticas da memória"""
-        return self.memory.get_memory_stats()
+        self.flush()
+        stats = self.memory.get_memory_stats()
+        if self.writer:
+            stats['write_behind'] = self.writer.get_stats()
+        return stats
+        
+    def get_latency_stats(self) -> Dict[str, Dict]:
+        """Obtém a latência das operações de memória"""
+        return self.memory.get_latency_stats()
+        
+    def close(self):
+        """Grava as pendências e fecha as conexões com o banco de memória"""
+        if self.retention:
+            self.retention.stop()
+        if self.writer:
+            self.writer.stop()
+        self.memory.close()
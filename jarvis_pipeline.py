@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Pipeline de Requisições do Jarvis
+Faixa rápida para comandos locais, pool limitado para chamadas à IA, prioridades e cancelamento por origem
+"""
+
+import time
+import itertools
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from jarvis_intents import IntentRouter
+
+# Resultado de um estágio: None (não tratou), uma resposta ou várias em ordem
+StageResult = Optional[object]
+
+TIMEOUT_MESSAGE = "Desculpe, a resposta demorou demais. Pode repetir, mestre?"
+ERROR_MESSAGE = "Desculpe, tive um problema ao processar seu pedido."
+
+# Faixas de prioridade (menor número é atendido primeiro)
+PRIORITY_EMERGENCY = 0
+PRIORITY_VOICE = 1
+PRIORITY_TEXT = 2
+PRIORITY_BACKGROUND = 3
+
+LANE_NAMES = {
+    PRIORITY_EMERGENCY: 'emergency',
+    PRIORITY_VOICE: 'voice',
+    PRIORITY_TEXT: 'text',
+    PRIORITY_BACKGROUND: 'background',
+}
+
+# Prioridade padrão de cada origem
+SOURCE_PRIORITIES = {
+    'voice': PRIORITY_VOICE,
+    'text': PRIORITY_TEXT,
+    'mobile': PRIORITY_BACKGROUND,
+    'background': PRIORITY_BACKGROUND,
+}
+
+# Emergências e tarefas de manutenção vêm da tabela de intenções ("priority")
+PRIORITY_ROUTER = IntentRouter.for_scope('priority')
+
+
+def classify_priority(command: str, source: str) -> int:
+    """Define a faixa de prioridade de um comando pela intenção e pela origem"""
+    match = PRIORITY_ROUTER.classify(command)
+    if match and match.intent == "emergency":
+        return PRIORITY_EMERGENCY
+    if match and match.intent == "background":
+        return PRIORITY_BACKGROUND
+    return SOURCE_PRIORITIES.get(source, PRIORITY_TEXT)
+
+
+def latency_summary(samples_ms) -> Dict[str, float]:
+    """Média, p95 e máximo (ms) de uma janela de amostras"""
+    samples = sorted(samples_ms)
+    if not samples:
+        return {'count': 0, 'avg_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+    return {
+        'count': len(samples),
+        'avg_ms': round(sum(samples) / len(samples), 2),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+        'max_ms': round(samples[-1], 2),
+    }
+
+
+class PipelineRequest:
+    """Requisição em andamento: ID, origem, prazo e sinal de cancelamento"""
+    
+    def __init__(self, request_id: int, command: str, context: str, source: str, sequence: int,
+                 timeout: Optional[float] = None, priority: int = PRIORITY_TEXT):
+        self.id = request_id
+        self.command = command
+        self.context = context
+        self.source = source
+        self.sequence = sequence
+        self.priority = priority
+        self.created_at = time.monotonic()
+        self.queued_at = self.created_at
+        self.deadline = self.created_at + timeout if timeout else None
+        self.stage = "fast"
+        self.intent: Optional[str] = None  # Intenção reconhecida no estágio rápido e repassada à IA
+        self.timings: Dict[str, float] = {}
+        self._cancelled = threading.Event()
+    
+    def cancel(self):
+        """Cancela a requisição; a resposta, se vier, é descartada"""
+        self._cancelled.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+    
+    @property
+    def stream(self) -> tuple:
+        """Sequência de ordenação das respostas: a origem dentro de cada faixa
+        
+        Uma emergência (ou uma limpeza rebaixada para manutenção) não fica
+        presa atrás das respostas normais da mesma origem.
+        """
+        return (self.source, self.priority)
+    
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() > self.deadline
+    
+    @contextmanager
+    def timed(self, stage: str):
+        """Mede um trecho do processamento (ms) para o detalhamento por estágio"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = self.timings.get(stage, 0.0) + (time.perf_counter() - start) * 1000
+    
+    def remaining(self) -> Optional[float]:
+        """Segundos até o prazo (None se não houver prazo)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+    
+    def __repr__(self):
+        return f"PipelineRequest(id={self.id}, source={self.source!r}, priority={self.priority}, stage={self.stage!r})"
+
+
+class LaneScheduler:
+    """Filas por prioridade com métricas de profundidade e tempo de espera
+    
+    get() entrega sempre a requisição mais antiga da faixa mais prioritária.
+    A faixa de menor prioridade ocupa no máximo workers - 1 threads, para
+    que uma rajada de mensagens do Telegram nunca tome todas as threads e a
+    latência da voz continue estável.
+    """
+    
+    def __init__(self, workers: int, name: str = ""):
+        self.name = name
+        self._lanes = {priority: deque() for priority in LANE_NAMES}
+        self._limits = {priority: workers for priority in LANE_NAMES}
+        self._limits[PRIORITY_BACKGROUND] = max(1, workers - 1)
+        self._running = defaultdict(int)
+        self._condition = threading.Condition()
+        
+        # Métricas de espera por faixa (últimas 256 amostras para o p95)
+        self._waits = {priority: deque(maxlen=256) for priority in LANE_NAMES}
+        self._served = defaultdict(int)
+        self._max_wait = defaultdict(float)
+    
+    def put(self, request: PipelineRequest):
+        """Enfileira a requisição na faixa da sua prioridade"""
+        with self._condition:
+            request.queued_at = time.monotonic()
+            self._lanes[request.priority].append(request)
+            self._condition.notify()
+    
+    def get(self, timeout: float = 1.0) -> Optional[PipelineRequest]:
+        """Retira a próxima requisição, respeitando prioridade e limite por faixa"""
+        end = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                for priority, lane in self._lanes.items():
+                    if lane and self._running[priority] < self._limits[priority]:
+                        request = lane.popleft()
+                        self._running[priority] += 1
+                        wait = time.monotonic() - request.queued_at
+                        request.timings[f"{self.name}_wait"] = wait * 1000
+                        self._waits[priority].append(wait)
+                        self._served[priority] += 1
+                        self._max_wait[priority] = max(self._max_wait[priority], wait)
+                        return request
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+    
+    def done(self, request: PipelineRequest):
+        """Libera a vaga da faixa ocupada pela requisição"""
+        with self._condition:
+            self._running[request.priority] -= 1
+            self._condition.notify()
+    
+    def qsize(self) -> int:
+        with self._condition:
+            return sum(len(lane) for lane in self._lanes.values())
+    
+    def get_metrics(self) -> Dict[str, Dict]:
+        """Profundidade e espera (ms) de cada faixa"""
+        metrics = {}
+        with self._condition:
+            for priority, name in LANE_NAMES.items():
+                waits = sorted(self._waits[priority])
+                metrics[name] = {
+                    'depth': len(self._lanes[priority]),
+                    'running': self._running[priority],
+                    'served': self._served[priority],
+                    'avg_wait_ms': round(sum(waits) / len(waits) * 1000, 2) if waits else 0.0,
+                    'p95_wait_ms': round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 2) if waits else 0.0,
+                    'max_wait_ms': round(self._max_wait[priority] * 1000, 2),
+                }
+        return metrics
+
+
+class RequestPipeline:
+    """Executa as requisições em dois estágios, preservando a ordem das respostas por origem
+    
+    Cada requisição passa primeiro pelo estágio rápido (comandos locais).
+    Se ele devolver None, ela segue para o pool de chamadas à IA, com no
+    máximo llm_workers chamadas simultâneas. Assim um comando local nunca
+    espera atrás de uma análise de tela ou de uma geração de código lenta.
+    
+    Nos dois estágios a fila é um LaneScheduler: emergências, depois voz,
+    depois texto e por fim Telegram e tarefas de manutenção.
+    
+    As respostas de uma mesma origem ("voice", "text", "mobile"...) e faixa
+    são emitidas na ordem em que os comandos chegaram; origens diferentes
+    não esperam umas pelas outras, e emergências não esperam respostas
+    normais.
+    Requisições canceladas ou vencidas liberam a vez sem emitir a resposta.
+    
+    Cada requisição concluída alimenta o detalhamento de latência por
+    estágio (get_stage_breakdown): espera nas filas, tempo de cada estágio,
+    trechos medidos pelos próprios estágios com request.timed() e o total
+    de ponta a ponta, separado entre comandos locais e chamadas à IA.
+    """
+    
+    def __init__(self, fast_stage: Callable[[PipelineRequest], StageResult],
+                 llm_stage: Callable[[PipelineRequest], StageResult], emit: Callable[[str], None],
+                 llm_workers: int = 2, default_timeout: Optional[float] = 90.0,
+                 log: Optional[Callable[[str, str], None]] = None, fast_workers: int = 2):
+        """
+        Args:
+            fast_stage: Trata comandos locais; devolve None para seguir para a IA
+            llm_stage: Trata o que a faixa rápida não resolveu
+            emit: Entrega uma resposta (ex.: AIWorker.response_ready.emit)
+            llm_workers: Chamadas à IA simultâneas
+            default_timeout: Prazo padrão de cada requisição, em segundos
+            log: Função (mensagem, nível) para registrar erros
+            fast_workers: Threads do estágio rápido
+        """
+        self.fast_stage = fast_stage
+        self.llm_stage = llm_stage
+        self.emit = emit
+        self.llm_workers = max(1, llm_workers)
+        self.fast_workers = max(1, fast_workers)
+        self.default_timeout = default_timeout
+        self.log = log
+        
+        self._fast_queue = LaneScheduler(self.fast_workers, "fast")
+        self._llm_queue = LaneScheduler(self.llm_workers, "llm")
+        self._threads: List[threading.Thread] = []
+        self._running = False
+        
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[int, PipelineRequest] = {}
+        self._next_sequence = defaultdict(int)
+        self._next_emit = defaultdict(int)
+        self._ready: Dict[tuple, Dict[int, List[str]]] = defaultdict(dict)
+        
+        self.stats = {'submitted': 0, 'completed': 0, 'fast': 0, 'llm': 0,
+                      'cancelled': 0, 'expired': 0, 'errors': 0}
+        
+        # Últimas 256 amostras (ms) de cada estágio
+        self._stage_latency: Dict[str, deque] = defaultdict(lambda: deque(maxlen=256))
+    
+    def start(self):
+        """Inicia as threads do estágio rápido e o pool da IA"""
+        if self._running:
+            return
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._fast_loop, name=f"jarvis-fast-{i}", daemon=True)
+            for i in range(self.fast_workers)
+        ]
+        self._threads += [
+            threading.Thread(target=self._llm_loop, name=f"jarvis-llm-{i}", daemon=True)
+            for i in range(self.llm_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def stop(self):
+        """Para as faixas e cancela o que ainda estiver em andamento"""
+        self._running = False
+        self.cancel()
+    
+    def submit(self, command: str, context: str = "", source: str = "text",
+               timeout: Optional[float] = None, priority: Optional[int] = None) -> PipelineRequest:
+        """Enfileira um comando e devolve a requisição criada
+        
+        Sem priority explícita, a faixa vem de classify_priority(command, source).
+        """
+        if priority is None:
+            priority = classify_priority(command, source)
+        with self._lock:
+            request = PipelineRequest(
+                next(self._ids), command, context, source, 0,
+                timeout if timeout is not None else self.default_timeout, priority
+            )
+            request.sequence = self._next_sequence[request.stream]
+            self._next_sequence[request.stream] += 1
+            self._in_flight[request.id] = request
+            self.stats['submitted'] += 1
+        self._fast_queue.put(request)
+        return request
+    
+    def cancel(self, source: Optional[str] = None) -> int:
+        """Cancela as requisições em andamento (de uma origem ou todas)"""
+        with self._lock:
+            targets = [r for r in self._in_flight.values()
+                       if not r.cancelled and (source is None or r.source == source)]
+        for request in targets:
+            request.cancel()
+        return len(targets)
+    
+    def get_stats(self) -> Dict:
+        """Contadores do pipeline e requisições em andamento"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['in_flight'] = len(self._in_flight)
+        stats['fast_queue'] = self._fast_queue.qsize()
+        stats['llm_queue'] = self._llm_queue.qsize()
+        return stats
+    
+    def get_lane_metrics(self) -> Dict[str, Dict[str, Dict]]:
+        """Profundidade e tempo de espera por faixa, em cada estágio"""
+        return {'fast': self._fast_queue.get_metrics(), 'llm': self._llm_queue.get_metrics()}
+    
+    def get_stage_breakdown(self) -> Dict[str, Dict[str, float]]:
+        """Latência por estágio (ms): média, p95 e máximo
+        
+        total_fast é o tempo de ponta a ponta dos comandos resolvidos
+        localmente; total_llm, o das requisições que chegaram à IA.
+        """
+        with self._lock:
+            samples = {stage: list(values) for stage, values in self._stage_latency.items()}
+        return {stage: latency_summary(values) for stage, values in sorted(samples.items())}
+    
+    def _fast_loop(self):
+        """Estágio rápido: comandos locais, por prioridade"""
+        while self._running:
+            request = self._fast_queue.get(timeout=1)
+            if request is None:
+                continue
+            try:
+                if self._skip_if_stale(request):
+                    continue
+                result = self._run_stage(self.fast_stage, request)
+            finally:
+                self._fast_queue.done(request)
+            
+            if result is None:
+                request.stage = "llm"
+                self._llm_queue.put(request)
+            else:
+                self._finish(request, result)
+    
+    def _llm_loop(self):
+        """Worker do pool da IA"""
+        while self._running:
+            request = self._llm_queue.get(timeout=1)
+            if request is None:
+                continue
+            try:
+                if self._skip_if_stale(request):
+                    continue
+                result = self._run_stage(self.llm_stage, request)
+            finally:
+                self._llm_queue.done(request)
+            self._finish(request, result)
+    
+    def _skip_if_stale(self, request: PipelineRequest) -> bool:
+        """Não inicia estágios de requisições canceladas ou vencidas"""
+        if request.cancelled:
+            self._finish(request, None)
+            return True
+        if request.expired:
+            self._finish(request, TIMEOUT_MESSAGE)
+            return True
+        return False
+    
+    def _run_stage(self, stage, request: PipelineRequest) -> StageResult:
+        """Executa um estágio, convertendo exceções em resposta de erro"""
+        try:
+            with request.timed(request.stage):
+                return stage(request)
+        except Exception as e:
+            with self._lock:
+                self.stats['errors'] += 1
+            if self.log:
+                self.log(f"Erro na requisição #{request.id} ({request.source}): {e}", "ERROR")
+            return ERROR_MESSAGE
+    
+    def _finish(self, request: PipelineRequest, result: StageResult):
+        """Registra o resultado e emite as respostas prontas da origem, em ordem"""
+        if request.cancelled:
+            responses = []
+        elif result is None:
+            responses = []
+        elif isinstance(result, (list, tuple)):
+            responses = [r for r in result if r]
+        else:
+            responses = [result]
+        
+        with self._lock:
+            self._in_flight.pop(request.id, None)
+            self.stats['completed'] += 1
+            if request.cancelled:
+                self.stats['cancelled'] += 1
+            elif result == TIMEOUT_MESSAGE:
+                self.stats['expired'] += 1
+            else:
+                self.stats[request.stage] += 1
+                request.timings[f"total_{request.stage}"] = (time.monotonic() - request.created_at) * 1000
+                for stage, elapsed in request.timings.items():
+                    self._stage_latency[stage].append(elapsed)
+            
+            # Emite sob o lock para que duas threads não troquem a ordem
+            stream = request.stream
+            ready = self._ready[stream]
+            ready[request.sequence] = responses
+            while self._next_emit[stream] in ready:
+                for response in ready.pop(self._next_emit[stream]):
+                    try:
+                        self.emit(response)
+                    except Exception as e:
+                        print(f"❌ Erro ao emitir resposta: {e}")
+                self._next_emit[stream] += 1
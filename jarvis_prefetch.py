@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Prefetch do Jarvis
+Aquece em segundo plano os caches dos comandos rápidos (clima, dólar, notícias, processos),
+na cadência de cada fonte e só para o que o usuário realmente pede
+"""
+
+import time
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from jarvis_intents import IntentRouter
+
+
+@dataclass
+class PrefetchTask:
+    """Fonte aquecida em segundo plano
+    
+    Attributes:
+        name: Identificação da tarefa (ex.: 'weather')
+        warm: Função que preenche o cache da fonte (o resultado é descartado)
+        intents: Intenções da tabela 'gui' atendidas por este cache (um pedido conta para todas as tarefas da intenção)
+        interval: Segundos entre aquecimentos quando a fonte é popular (normalmente o cache_ttl)
+        idle_interval: Segundos entre aquecimentos quando não é (None: só o aquecimento inicial)
+    """
+    name: str
+    warm: Callable[[], Any]
+    intents: Tuple[str, ...]
+    interval: float
+    idle_interval: Optional[float] = None
+
+
+class PrefetchScheduler:
+    """Agenda o aquecimento dos caches pela frequência de uso
+    
+    A frequência vem dos últimos lookback_days dias de command_usage
+    (comandos de sistema, já com a intenção) e de conversation_context
+    (mensagens classificadas pela tabela 'gui' do IntentRouter). Os pedidos
+    da sessão atual (note_request) somam à contagem.
+    
+    - na inicialização, todas as fontes são aquecidas, as mais pedidas primeiro;
+    - fontes com pelo menos min_share dos pedidos são reaquecidas a cada
+      interval da tarefa, e o cache nunca chega a vencer;
+    - as demais seguem o idle_interval da tarefa ou, sem ele, ficam só com o
+      aquecimento inicial e o cache normal;
+    - com menos de min_history pedidos, todas contam como populares (são os
+      comandos da tela inicial).
+    
+    A frequência é relida a cada usage_refresh segundos.
+    """
+    
+    def __init__(self, tasks: Iterable[PrefetchTask], memory=None, router: Optional[IntentRouter] = None,
+                 lookback_days: int = 14, max_inputs: int = 2000, min_share: float = 0.05,
+                 min_history: int = 10, usage_refresh: float = 1800):
+        """
+        Args:
+            tasks: Fontes aquecidas
+            memory: JarvisMemory com o histórico de conversas (None: só os pedidos da sessão)
+            router: Classificador das mensagens (padrão: tabela 'gui')
+            lookback_days: Dias de histórico considerados
+            max_inputs: Mensagens mais recentes lidas do histórico
+            min_share: Fração mínima dos pedidos para a fonte ser mantida quente
+            min_history: Pedidos necessários para a frequência valer
+            usage_refresh: Segundos entre releituras do histórico
+        """
+        self.tasks: Dict[str, PrefetchTask] = {task.name: task for task in tasks}
+        self.memory = memory
+        self.router = router or IntentRouter.for_scope('gui')
+        self.lookback_days = lookback_days
+        self.max_inputs = max_inputs
+        self.min_share = min_share
+        self.min_history = min_history
+        self.usage_refresh = usage_refresh
+        
+        self._tasks_by_intent: Dict[str, List[str]] = {}
+        for task in self.tasks.values():
+            for intent in task.intents:
+                self._tasks_by_intent.setdefault(intent, []).append(task.name)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stored_counts: Counter = Counter()
+        self._session_counts: Counter = Counter()
+        self._due: Dict[str, float] = {}
+        self._intervals: Dict[str, Optional[float]] = {}
+        self._last_warm: Dict[str, Dict] = {}
+        self.stats = {'warms': 0, 'errors': 0, 'usage_reads': 0}
+    
+    # ==================== FREQUÊNCIA DE USO ====================
+    
+    def count_usage(self, rows: Iterable[Tuple[str, Dict]]) -> Counter:
+        """Pedidos por tarefa a partir de (mensagem, contexto) do histórico"""
+        counts = Counter()
+        for user_input, context_data in rows:
+            intent = (context_data or {}).get('intent')
+            if intent is None and user_input:
+                match = self.router.classify(user_input)
+                intent = match.intent if match else None
+            counts.update(self._tasks_by_intent.get(intent, ()))
+        return counts
+    
+    def load_usage(self) -> Counter:
+        """Relê a frequência de uso do histórico de conversas"""
+        counts = Counter()
+        if self.memory is not None:
+            try:
+                counts = self.count_usage(self.memory.get_recent_inputs(self.lookback_days, self.max_inputs))
+            except Exception as e:
+                print(f"⚠️ Erro ao ler frequência de uso: {e}")
+        with self._lock:
+            self._stored_counts = counts
+            self.stats['usage_reads'] += 1
+        return counts
+    
+    def note_request(self, intent: str):
+        """Conta um pedido da sessão atual (fontes que passam a ser populares entram na agenda)"""
+        names = self._tasks_by_intent.get(intent)
+        if not names:
+            return
+        with self._lock:
+            self._session_counts.update(names)
+        self._replan()
+    
+    def usage(self) -> Counter:
+        """Pedidos por tarefa: histórico + sessão atual"""
+        with self._lock:
+            return self._stored_counts + self._session_counts
+    
+    def ranking(self) -> List[str]:
+        """Tarefas da mais para a menos pedida (empates na ordem de cadastro)"""
+        counts = self.usage()
+        order = list(self.tasks)
+        return sorted(order, key=lambda name: (-counts[name], order.index(name)))
+    
+    def plan(self) -> Dict[str, Optional[float]]:
+        """Intervalo de reaquecimento por tarefa (None: só o aquecimento inicial)"""
+        counts = self.usage()
+        total = sum(counts.values())
+        return {
+            name: task.interval if total < self.min_history or counts[name] / total >= self.min_share
+            else task.idle_interval
+            for name, task in self.tasks.items()
+        }
+    
+    def _replan(self):
+        """Reagenda as tarefas cujo intervalo mudou com a frequência de uso"""
+        now = time.time()
+        plan = self.plan()
+        with self._lock:
+            for name, interval in plan.items():
+                if interval is None:
+                    self._due.pop(name, None)
+                elif name not in self._due or self._intervals.get(name) != interval:
+                    self._due[name] = self._last_warm.get(name, {}).get('at', now) + interval
+            self._intervals = plan
+        self._wake.set()
+    
+    # ==================== AQUECIMENTO ====================
+    
+    def warm(self, name: str) -> bool:
+        """Executa o aquecimento de uma tarefa agora"""
+        task = self.tasks[name]
+        start = time.perf_counter()
+        try:
+            task.warm()
+            ok = True
+        except Exception as e:
+            ok = False
+            print(f"⚠️ Erro no prefetch de {name}: {e}")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.stats['warms'] += 1
+            if not ok:
+                self.stats['errors'] += 1
+            self._last_warm[name] = {'at': time.time(), 'ms': round(elapsed_ms, 1), 'ok': ok}
+        return ok
+    
+    def warm_all(self):
+        """Aquece todas as fontes, das mais pedidas para as menos"""
+        for name in self.ranking():
+            if self._stop.is_set():
+                return
+            self.warm(name)
+    
+    def run_due(self, now: Optional[float] = None) -> List[str]:
+        """Aquece as tarefas vencidas e reagenda cada uma para daqui a interval"""
+        now = time.time() if now is None else now
+        with self._lock:
+            due = [name for name, at in self._due.items() if at <= now]
+        for name in due:
+            self.warm(name)
+            with self._lock:
+                if name in self._due:
+                    self._due[name] = time.time() + self._intervals[name]
+        return due
+    
+    # ==================== THREAD ====================
+    
+    def start(self, warm_now: bool = True):
+        """Inicia a thread de prefetch (aquecimento inicial dentro dela, sem atrasar a abertura)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, args=(warm_now,), name="Prefetch", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Interrompe o prefetch"""
+        self._stop.set()
+        self._wake.set()
+    
+    def _loop(self, warm_now: bool):
+        self.load_usage()
+        if warm_now:
+            self.warm_all()
+        self._replan()
+        next_usage_read = time.time() + self.usage_refresh
+        
+        while not self._stop.is_set():
+            try:
+                if time.time() >= next_usage_read:
+                    self.load_usage()
+                    self._replan()
+                    next_usage_read = time.time() + self.usage_refresh
+                self.run_due()
+            except Exception as e:
+                print(f"❌ Erro no agendador de prefetch: {e}")
+            
+            with self._lock:
+                next_due = min(self._due.values(), default=next_usage_read)
+            self._wake.clear()
+            self._wake.wait(max(0.0, min(next_due, next_usage_read) - time.time()))
+    
+    def get_stats(self) -> Dict:
+        """Aquecimentos, erros, frequência de uso e agenda"""
+        plan = self.plan()
+        counts = self.usage()
+        with self._lock:
+            stats = dict(self.stats)
+            stats['usage'] = dict(counts)
+            stats['plan'] = plan
+            stats['last_warm'] = {name: dict(info) for name, info in self._last_warm.items()}
+        return stats
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Instantâneo de Processos do Jarvis
+Leitura única e compartilhada da lista de processos (oneshot + cache curto) com filtros e top-N por heap
+"""
+
+import re
+import time
+import heapq
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+@dataclass
+class ProcessInfo:
+    """Dados de um processo no momento da leitura"""
+    pid: int
+    name: str
+    rss_mb: float
+    cpu_percent: float = 0.0
+    cmdline: List[str] = field(default_factory=list)
+    
+    @property
+    def cmdline_text(self) -> str:
+        return ' '.join(self.cmdline)
+
+
+def collect_processes(with_cmdline: bool = False) -> List[ProcessInfo]:
+    """Lê todos os processos com psutil, um oneshot() por processo
+    
+    Dentro do oneshot() nome, memória e CPU saem da mesma leitura do sistema
+    em vez de uma chamada por atributo. A CPU é medida desde a leitura
+    anterior do mesmo processo (0.0 na primeira vez em que ele aparece).
+    """
+    processes = []
+    for proc in psutil.process_iter():
+        try:
+            with proc.oneshot():
+                info = ProcessInfo(
+                    pid=proc.pid,
+                    name=proc.name() or '?',
+                    rss_mb=proc.memory_info().rss / (1024 * 1024),
+                    cpu_percent=proc.cpu_percent(interval=None),
+                )
+                if with_cmdline:
+                    try:
+                        info.cmdline = proc.cmdline() or []
+                    except (psutil.AccessDenied, psutil.ZombieProcess):
+                        pass
+            processes.append(info)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+    return processes
+
+
+class ProcessSnapshotService:
+    """Lista de processos lida uma vez e reaproveitada por ttl segundos
+    
+    O top de processos da GUI, o amostrador de hardware e a verificação
+    de aplicativos abertos faziam cada um seu próprio
+    process_iter completo. Aqui a leitura é feita uma vez e guardada em
+    cache; as consultas filtram em memória e o top-N usa heapq.nlargest
+    (O(n log k)) em vez de ordenar a lista inteira.
+    
+    A linha de comando é cara de ler (e costuma ser negada no Windows), então
+    só entra na leitura quando alguma consulta precisa dela.
+    """
+    
+    SORT_KEYS = {'rss': lambda proc: proc.rss_mb, 'cpu': lambda proc: proc.cpu_percent}
+    
+    def __init__(self, ttl: float = 2.0, collector: Optional[Callable[[bool], List[ProcessInfo]]] = None):
+        """
+        Args:
+            ttl: Segundos em que uma leitura é reaproveitada
+            collector: Função de leitura (padrão: collect_processes com psutil)
+        """
+        self.ttl = ttl
+        self.collector = collector or collect_processes
+        self._lock = threading.Lock()
+        self._collect_lock = threading.Lock()
+        self._processes: List[ProcessInfo] = []
+        self._taken_at = 0.0
+        self._has_cmdline = False
+        self.stats = {'collections': 0, 'cache_hits': 0, 'processes': 0, 'last_collect_ms': 0.0}
+    
+    def snapshot(self, max_age: Optional[float] = None, with_cmdline: bool = False) -> List[ProcessInfo]:
+        """Processos da leitura em cache, ou de uma nova se a atual for mais velha que max_age (padrão: ttl)"""
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            if self._is_fresh(max_age, with_cmdline):
+                self.stats['cache_hits'] += 1
+                return self._processes
+        
+        # Uma leitura por vez: quem chega durante a coleta usa o resultado dela
+        with self._collect_lock:
+            with self._lock:
+                if self._is_fresh(max_age, with_cmdline):
+                    self.stats['cache_hits'] += 1
+                    return self._processes
+            start = time.perf_counter()
+            processes = self.collector(with_cmdline)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self._processes, self._taken_at, self._has_cmdline = processes, time.time(), with_cmdline
+                self.stats['collections'] += 1
+                self.stats['processes'] = len(processes)
+                self.stats['last_collect_ms'] = round(elapsed_ms, 2)
+            return processes
+    
+    def _is_fresh(self, max_age: float, with_cmdline: bool) -> bool:
+        if not self._taken_at or time.time() - self._taken_at > max_age:
+            return False
+        return self._has_cmdline or not with_cmdline
+    
+    @property
+    def taken_at(self) -> float:
+        """Horário da leitura em cache (0.0 se ainda não houve leitura)"""
+        with self._lock:
+            return self._taken_at
+    
+    def query(self, name_pattern: Optional[str] = None, cmdline_contains: Optional[str] = None,
+              exclude_pids: Iterable[int] = (), top: Optional[int] = None, sort_by: str = 'rss',
+              max_age: Optional[float] = None) -> List[ProcessInfo]:
+        """Processos filtrados e, com top, só os top maiores por sort_by ('rss' ou 'cpu')
+        
+        Args:
+            name_pattern: Expressão regular buscada no nome (sem diferenciar maiúsculas)
+            cmdline_contains: Trecho da linha de comando (sem diferenciar maiúsculas)
+            exclude_pids: PIDs ignorados (ex.: o próprio processo do Jarvis)
+            top: Quantidade máxima de resultados, do maior para o menor
+            sort_by: Critério do top
+            max_age: Idade máxima da leitura (padrão: ttl)
+        """
+        processes = self.snapshot(max_age, with_cmdline=cmdline_contains is not None)
+        
+        name_regex = re.compile(name_pattern, re.IGNORECASE) if name_pattern else None
+        needle = cmdline_contains.lower() if cmdline_contains is not None else None
+        excluded = set(exclude_pids)
+        
+        selected = (
+            proc for proc in processes
+            if proc.pid not in excluded
+            and (name_regex is None or name_regex.search(proc.name))
+            and (needle is None or needle in proc.cmdline_text.lower())
+        )
+        if top is None:
+            return list(selected)
+        return heapq.nlargest(top, selected, key=self.SORT_KEYS[sort_by])
+    
+    def top(self, n: int = 5, sort_by: str = 'rss', max_age: Optional[float] = None) -> List[ProcessInfo]:
+        """Os n processos que mais consomem memória (ou CPU)"""
+        return self.query(top=n, sort_by=sort_by, max_age=max_age)
+    
+    def is_running(self, name_fragment: str, max_age: Optional[float] = None) -> bool:
+        """Algum processo tem o trecho no nome?"""
+        return bool(self.query(name_pattern=re.escape(name_fragment), top=1, max_age=max_age))
+    
+    def get_stats(self) -> Dict:
+        """Leituras feitas, acertos de cache e custo da última leitura"""
+        with self._lock:
+            return dict(self.stats)
+
+
+_shared_service = None
+_shared_lock = threading.Lock()
+
+
+def get_process_service() -> ProcessSnapshotService:
+    """Serviço compartilhado por SystemActions, amostrador de hardware e ActionHandler"""
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = ProcessSnapshotService()
+        return _shared_service
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Montagem de Prompts do Jarvis com Orçamento de Tokens
+Mantém o prompt de cada requisição dentro de um limite configurável
+"""
+
+import re
+import threading
+from collections import Counter
+from typing import Dict, Sequence, Tuple
+
+from jarvis_retention import STOPWORDS
+
+# Estimativa usada pelo Gemini para textos em português: ~4 caracteres por token
+CHARS_PER_TOKEN = 4
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def estimate_tokens(text: str) -> int:
+    """Estima o número de tokens de um texto sem chamar a API"""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Corta o texto para caber em max_tokens, marcando o corte com reticências"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+    return text[:max_tokens * CHARS_PER_TOKEN - 1].rstrip() + "…"
+
+
+class PromptAssembler:
+    """Monta o prompt de cada requisição dentro de um orçamento de tokens
+    
+    A instrução de sistema (persona e regras fixas) não passa por aqui: ela
+    vai uma única vez em GenerativeModel(system_instruction=...). O prompt
+    por requisição recebe, em ordem de prioridade:
+    
+    1. instruções da requisição e o comando (sempre incluídos);
+    2. seções de contexto (memórias, comandos disponíveis...), cortadas se preciso;
+    3. as últimas trocas da conversa, da mais nova para a mais antiga;
+    4. um resumo acumulado das trocas que já saíram da janela recente.
+    """
+    
+    def __init__(self, budget: int = 3000, recent_turns: int = 6, digest_tokens: int = 150,
+                 turn_tokens: int = 400):
+        self.budget = budget
+        self.recent_turns = recent_turns
+        self.digest_tokens = digest_tokens
+        self.turn_tokens = turn_tokens
+        
+        # Resumo incremental: só as trocas novas que saem da janela são processadas
+        self._lock = threading.Lock()
+        self._digest_first = None
+        self._digest_count = 0
+        self._digest_words = Counter()
+        self._digest_requests = []
+        
+        self.last_stats = {}
+    
+    def build(self, command: str, sections: Sequence[Tuple[str, str]] = (),
+              history: Sequence[Tuple[str, str]] = (), instructions: str = "", closing: str = "") -> str:
+        """Monta o prompt
+        
+        Args:
+            command: Comando atual do usuário
+            sections: Pares (título, texto) de contexto, em ordem de prioridade
+            history: Pares (quem, texto) da conversa, do mais antigo ao mais novo
+            instructions: Regras específicas desta requisição
+            closing: Linha final do prompt
+        """
+        older = history[:-self.recent_turns] if self.recent_turns else history
+        recent = history[-self.recent_turns:] if self.recent_turns else ()
+        digest = self._update_digest(older)
+        
+        head = [instructions] if instructions else []
+        tail = [f"Comando: {command}"] + ([closing] if closing else [])
+        remaining = self.budget - sum(estimate_tokens(part) + 1 for part in head + tail)
+        
+        # Seções de contexto
+        context_parts = []
+        truncated_sections = 0
+        for title, text in sections:
+            if not text or not text.strip():
+                continue
+            header = f"{title}:"
+            available = remaining - estimate_tokens(header) - 2
+            if available <= 0:
+                truncated_sections += 1
+                continue
+            body = truncate_to_tokens(text.strip(), available)
+            truncated_sections += body != text.strip()
+            context_parts.append(f"{header}\n{body}")
+            remaining -= estimate_tokens(header) + estimate_tokens(body) + 2
+        
+        # Conversa recente, da troca mais nova para a mais antiga
+        history_lines = []
+        for speaker, text in reversed(recent):
+            line = f"{speaker}: {truncate_to_tokens(text, self.turn_tokens)}"
+            cost = estimate_tokens(line) + 1
+            if cost > remaining:
+                break
+            history_lines.append(line)
+            remaining -= cost
+        history_lines.reverse()
+        dropped_turns = len(recent) - len(history_lines)
+        
+        # Resumo das trocas antigas, se ainda couber
+        digest_part = ""
+        if digest:
+            candidate = f"Resumo da conversa anterior:\n{digest}"
+            if estimate_tokens(candidate) + 2 <= remaining:
+                digest_part = candidate
+                remaining -= estimate_tokens(candidate) + 2
+        
+        parts = list(head)
+        if digest_part:
+            parts.append(digest_part)
+        if history_lines:
+            parts.append("Histórico da conversa recente:\n" + "\n".join(history_lines))
+        parts.extend(context_parts)
+        parts.extend(tail)
+        prompt = "\n\n".join(parts)
+        
+        self.last_stats = {
+            'budget': self.budget,
+            'tokens': estimate_tokens(prompt),
+            'history_turns': len(history_lines),
+            'dropped_turns': dropped_turns,
+            'digest_turns': self._digest_count if digest_part else 0,
+            'truncated_sections': truncated_sections,
+        }
+        return prompt
+    
+    def _update_digest(self, older: Sequence[Tuple[str, str]]) -> str:
+        """Acrescenta ao resumo as trocas que saíram da janela recente"""
+        with self._lock:
+            first = older[0] if older else None
+            if first != self._digest_first or len(older) < self._digest_count:
+                # Nova conversa (histórico limpo ou reiniciado): recomeça o resumo
+                self._digest_first = first
+                self._digest_count = 0
+                self._digest_words = Counter()
+                self._digest_requests = []
+            
+            for speaker, text in older[self._digest_count:]:
+                for word in WORD_PATTERN.findall(text.lower()):
+                    if len(word) > 3 and word not in STOPWORDS and not word.isdigit():
+                        self._digest_words[word] += 1
+                if speaker == "VOCÊ" and len(self._digest_requests) < 3:
+                    self._digest_requests.append(text[:60])
+            self._digest_count = len(older)
+            
+            if not self._digest_count:
+                return ""
+            
+            summary = f"{self._digest_count} mensagens anteriores."
+            topics = ', '.join(word for word, _ in self._digest_words.most_common(8))
+            if topics:
+                summary += f" Assuntos: {topics}."
+            if self._digest_requests:
+                summary += " Primeiros pedidos: " + '; '.join(f'"{text}"' for text in self._digest_requests)
+            return truncate_to_tokens(summary, self.digest_tokens)
+    
+    def get_stats(self) -> Dict:
+        """Tokens e cortes da última montagem"""
+        return dict(self.last_stats)
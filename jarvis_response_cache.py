@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Cache de Respostas da IA do Jarvis
+Evita chamar o modelo de novo para perguntas repetidas ou quase idênticas
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class ResponseCache:
+    """Cache LRU com TTL das respostas da IA, persistido em disco
+    
+    A chave combina o comando normalizado com uma impressão digital do
+    contexto montado para o prompt (modelo, memórias, comandos...). O
+    histórico só entra na chave dos comandos que se referem a ele (ver
+    context_fingerprint); nos demais, a mesma pergunta acerta o cache também
+    no meio da conversa. A busca tenta primeiro a chave exata e depois
+    comandos com o mesmo contexto que só diferem em palavras de preenchimento
+    ("aí", "por favor"...). A comparação é por palavra inteira: trigramas de
+    caracteres confundiam "ordem crescente" com "ordem decrescente".
+    """
+    
+    # Intenções que dependem do momento (clima, câmbio, status, horário...)
+    # ou que só continuam a resposta anterior nunca são armazenadas
+    SKIP_PATTERN = re.compile(
+        r'\b(?:clima|tempo|previsao|temperatura|chuva|cotacao|dolar|euro|bitcoin|moeda|cambio|'
+        r'status|cpu|memoria ram|processos|sistema|hora|horas|data|hoje|agora|amanha|ontem|noticias|'
+        r'continue|continua|mais detalhes|explique melhor|pode detalhar|mais informacoes|'
+        r'olhe|veja|tela)\b'
+    )
+    
+    # Comandos que se referem à conversa anterior (já sem acentos)
+    HISTORY_PATTERN = re.compile(
+        r'\b(?:continue|continua|mais detalhes|explique melhor|pode detalhar|mais informacoes|'
+        r'isso|disso|nisso|esse|essa|dele|dela|anterior|acima|ultima resposta)\b'
+    )
+    
+    NORMALIZE_PATTERN = re.compile(r'[^a-z0-9]+')
+    WAKE_WORDS = ('jarvis',)
+    
+    # Palavras que não mudam o sentido da pergunta (já sem acentos)
+    FILLER_WORDS = frozenset({'ai', 'ei', 'oi', 'ola', 'ok', 'entao', 'ne', 'por', 'favor', 'pf', 'pfv', 'ae'})
+    
+    def __init__(self, path: str = 'jarvis_response_cache.json', ttl: float = 6 * 3600,
+                 max_entries: int = 500, save_interval: float = 5.0):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.save_interval = save_interval
+        
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = 0.0
+        
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.skipped = 0
+        
+        self._load()
+    
+    @classmethod
+    def normalize(cls, command: str) -> str:
+        """Normaliza o comando: minúsculas, sem acentos, pontuação ou palavra de ativação"""
+        text = unicodedata.normalize('NFKD', command.lower())
+        text = ''.join(char for char in text if not unicodedata.combining(char))
+        words = [word for word in cls.NORMALIZE_PATTERN.split(text) if word and word not in cls.WAKE_WORDS]
+        return ' '.join(words)
+    
+    @staticmethod
+    def fingerprint(*parts) -> str:
+        """Gera a impressão digital do contexto que influencia a resposta"""
+        digest = hashlib.sha1()
+        for part in parts:
+            digest.update(repr(part).encode('utf-8'))
+            digest.update(b'\x1f')
+        return digest.hexdigest()[:16]
+    
+    @classmethod
+    def depends_on_history(cls, command: str) -> bool:
+        """O comando se refere à conversa anterior?"""
+        return bool(cls.HISTORY_PATTERN.search(cls.normalize(command)))
+    
+    @classmethod
+    def context_fingerprint(cls, command: str, *parts, history=()) -> str:
+        """Impressão digital do contexto montado; o histórico só entra se o comando depende dele"""
+        if cls.depends_on_history(command):
+            parts += (history,)
+        return cls.fingerprint(*parts)
+    
+    @classmethod
+    def _content_words(cls, text: str) -> tuple:
+        """Palavras do comando normalizado, na ordem, sem as de preenchimento"""
+        return tuple(word for word in text.split() if word not in cls.FILLER_WORDS)
+    
+    def is_cacheable(self, command: str) -> bool:
+        """Verifica se o comando pode ser respondido pelo cache"""
+        normalized = self.normalize(command)
+        return bool(normalized) and not self.SKIP_PATTERN.search(normalized)
+    
+    def get(self, command: str, fingerprint: str = '') -> Optional[str]:
+        """Busca uma resposta para o comando (exata ou quase idêntica)"""
+        if not self.is_cacheable(command):
+            with self._lock:
+                self.skipped += 1
+            return None
+        
+        normalized = self.normalize(command)
+        key = f"{fingerprint}:{normalized}"
+        now = time.time()
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry['created'] < self.ttl:
+                self.hits += 1
+                return self._touch(key, entry)
+            
+            entry = self._find_similar(normalized, fingerprint, now)
+            if entry is not None:
+                self.near_hits += 1
+                return self._touch(f"{fingerprint}:{entry['command']}", entry)
+            
+            self.misses += 1
+            return None
+    
+    def _touch(self, key: str, entry: Dict) -> str:
+        """Marca a entrada como usada recentemente (LRU)"""
+        self._entries.move_to_end(key)
+        entry['hits'] += 1
+        self._dirty = True
+        return entry['response']
+    
+    def _find_similar(self, normalized: str, fingerprint: str, now: float) -> Optional[Dict]:
+        """Procura, com o mesmo contexto, um comando com as mesmas palavras de conteúdo na mesma ordem"""
+        words = self._content_words(normalized)
+        if not words:
+            return None
+        
+        for entry in reversed(self._entries.values()):
+            if entry['fingerprint'] != fingerprint or now - entry['created'] >= self.ttl:
+                continue
+            if self._content_words(entry['command']) == words:
+                return entry
+        
+        return None
+    
+    def put(self, command: str, fingerprint: str, response: str) -> bool:
+        """Armazena a resposta, se o comando for cacheável"""
+        if not response or not self.is_cacheable(command):
+            return False
+        
+        normalized = self.normalize(command)
+        key = f"{fingerprint}:{normalized}"
+        
+        with self._lock:
+            self._entries[key] = {
+                'command': normalized,
+                'fingerprint': fingerprint,
+                'response': response,
+                'created': time.time(),
+                'hits': 0,
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+        
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+        return True
+    
+    def _load(self):
+        """Carrega as entradas ainda válidas do disco"""
+        if not os.path.exists(self.path):
+            return
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            now = time.time()
+            for entry in data.get('entries', []):
+                if now - entry['created'] < self.ttl:
+                    self._entries[f"{entry['fingerprint']}:{entry['command']}"] = entry
+            
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            
+            print(f"💾 Cache de respostas carregado: {len(self._entries)} entradas")
+        
+        except Exception as e:
+            print(f"⚠️ Erro ao carregar cache de respostas: {e}")
+    
+    def save(self):
+        """Grava o cache em disco (escrita atômica, da menos para a mais recente)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {'version': 1, 'entries': [dict(entry) for entry in self._entries.values()]}
+            self._dirty = False
+            self._last_save = time.monotonic()
+        
+        try:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"⚠️ Erro ao salvar cache de respostas: {e}")
+    
+    def clear(self):
+        """Remove todas as entradas"""
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+        self.save()
+    
+    def get_stats(self) -> Dict:
+        """Estatísticas de acertos e falhas do cache"""
+        with self._lock:
+            lookups = self.hits + self.near_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'near_hits': self.near_hits,
+                'misses': self.misses,
+                'skipped': self.skipped,
+                'hit_rate': round((self.hits + self.near_hits) / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Motor de Retenção da Memória do Jarvis
+Compacta conversas antigas em camadas para manter o banco pequeno:
+trocas recentes -> resumo por sessão -> arquivo compactado
+"""
+
+import os
+import re
+import gzip
+import json
+import time
+import threading
+from collections import Counter
+from typing import Dict, List
+
+# Palavras ignoradas ao escolher os assuntos de um resumo
+STOPWORDS = {
+    'para', 'como', 'qual', 'quais', 'que', 'com', 'uma', 'um', 'por', 'mais', 'isso', 'esse',
+    'essa', 'este', 'esta', 'sobre', 'jarvis', 'voce', 'você', 'meu', 'minha', 'pode', 'abra',
+    'abre', 'quero', 'favor', 'the', 'and', 'não', 'nao', 'sim', 'dos', 'das', 'nos', 'nas'
+}
+
+class MemoryRetentionEngine:
+    """Retenção em camadas para conversation_context
+    
+    1. Trocas brutas são mantidas por raw_days dias.
+    2. As trocas mais antigas que isso viram uma linha por sessão em
+       conversation_digest (sessões ainda ativas também: o resumo acumula).
+    3. Resumos com mais de archive_months meses vão para um arquivo .jsonl.gz
+       ao lado do banco e saem do SQLite.
+    
+    As remoções são feitas em lotes pequenos e, ao final de cada ciclo, o
+    espaço livre é devolvido com PRAGMA incremental_vacuum. Bancos criados
+    sem o modo incremental só são convertidos por enable_incremental_vacuum(),
+    chamado numa manutenção explícita: o VACUUM completo trava o banco.
+    """
+    
+    def __init__(self, memory, raw_days: int = 30, archive_months: int = 6, interval: float = 3600,
+                 chunk_size: int = 500, chunk_pause: float = 0.01, vacuum_pages: int = 2000):
+        self.memory = memory
+        self.raw_days = raw_days
+        self.archive_months = archive_months
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.chunk_pause = chunk_pause
+        self.vacuum_pages = vacuum_pages
+        self.archive_path = os.path.splitext(memory.db_path)[0] + '_archive.jsonl.gz'
+        
+        self.is_running = False
+        self.last_report = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+        
+    def start(self):
+        """Inicia o ciclo de retenção em segundo plano"""
+        if self.is_running:
+            return
+        self.is_running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._retention_loop, name="MemoryRetention", daemon=True)
+        self._thread.start()
+        
+    def stop(self, timeout: float = 5.0):
+        """Interrompe o ciclo de retenção"""
+        self.is_running = False
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            
+    def _retention_loop(self):
+        """Executa um ciclo logo após iniciar e depois a cada intervalo"""
+        while not self._stop_event.wait(5 if not self.last_report else self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"❌ Erro no ciclo de retenção: {e}")
+                
+    def run_once(self) -> Dict:
+        """Executa um ciclo completo de retenção"""
+        start = time.perf_counter()
+        report = {
+            'sessions_compacted': 0,
+            'exchanges_removed': 0,
+            'digests_archived': 0,
+            'pages_vacuumed': 0
+        }
+        
+        # Um único corte para o ciclo inteiro: o que é resumido é o que é removido
+        with self.memory.pool.cursor('retention_cutoff') as cursor:
+            cursor.execute("SELECT datetime('now', ?)", (f'-{int(self.raw_days)} days',))
+            cutoff = cursor.fetchone()[0]
+            
+        for session_id in self._sessions_to_compact(cutoff):
+            if self._stop_event.is_set():
+                break
+            report['exchanges_removed'] += self._compact_session(session_id, cutoff)
+            report['sessions_compacted'] += 1
+            
+        # Uso dos comandos de sistema: só a janela recente interessa ao prefetch
+        report['usage_removed'] = self.memory.delete_in_chunks(
+            'command_usage', 'created_at < ?', (cutoff,), self.chunk_size, self.chunk_pause
+        )
+        report['digests_archived'] = self._archive_digests()
+        report['pages_vacuumed'] = self._vacuum()
+        report['elapsed_ms'] = (time.perf_counter() - start) * 1000
+        
+        if report['exchanges_removed'] or report['digests_archived']:
+            self.memory.bump_generation('conversation')
+            print(f"🧹 Retenção: {report['sessions_compacted']} sessões resumidas, "
+                  f"{report['exchanges_removed']} trocas removidas, {report['digests_archived']} resumos arquivados")
+            
+        self.last_report = report
+        return report
+        
+    def _sessions_to_compact(self, cutoff: str) -> List[str]:
+        """Sessões com alguma troca mais antiga que a janela de retenção"""
+        with self.memory.pool.cursor('retention_scan') as cursor:
+            cursor.execute('''
+                SELECT DISTINCT session_id FROM conversation_context
+                WHERE created_at < ?
+            ''', (cutoff,))
+            return [row[0] for row in cursor.fetchall()]
+            
+    def _compact_session(self, session_id: str, cutoff: str) -> int:
+        """Resume as trocas antigas de uma sessão em conversation_digest e as remove"""
+        with self.memory.pool.cursor('retention_read') as cursor:
+            cursor.execute('''
+                SELECT COUNT(*), MIN(created_at), MAX(created_at)
+                FROM conversation_context WHERE session_id = ? AND created_at < ?
+            ''', (session_id, cutoff))
+            count, started_at, ended_at = cursor.fetchone()
+            cursor.execute('''
+                SELECT user_input FROM conversation_context
+                WHERE session_id = ? AND created_at < ? ORDER BY id LIMIT 500
+            ''', (session_id, cutoff))
+            inputs = [row[0] for row in cursor.fetchall()]
+            cursor.execute('''
+                SELECT DISTINCT user_input FROM conversation_context
+                WHERE session_id = ? AND created_at < ?
+            ''', (session_id, cutoff))
+            removed_inputs = [row[0] for row in cursor.fetchall()]
+            
+        if not count:
+            return 0
+            
+        summary = self.summarize(inputs, count)
+        with self.memory.pool.transaction('retention_digest') as cursor:
+            cursor.execute('''
+                INSERT INTO conversation_digest (session_id, started_at, ended_at, exchange_count, summary)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(session_id) DO UPDATE SET
+                    started_at = MIN(started_at, excluded.started_at),
+                    ended_at = MAX(ended_at, excluded.ended_at),
+                    exchange_count = exchange_count + excluded.exchange_count,
+                    summary = summary || ' | ' || excluded.summary
+            ''', (session_id, started_at, ended_at, count, summary))
+            
+        removed = self.memory.delete_in_chunks(
+            'conversation_context', 'session_id = ? AND created_at < ?', (session_id, cutoff),
+            self.chunk_size, self.chunk_pause
+        )
+        # Trocas resumidas saem também da busca semântica
+        self.memory.unindex_vectors(conversations=[(session_id, text) for text in removed_inputs])
+        return removed
+        
+    @staticmethod
+    def summarize(inputs: List[str], count: int) -> str:
+        """Resumo extrativo: assuntos mais frequentes e primeiros pedidos"""
+        words = Counter()
+        for text in inputs:
+            for word in re.findall(r'\w+', text.lower()):
+                if len(word) > 3 and word not in STOPWORDS and not word.isdigit():
+                    words[word] += 1
+        topics = ', '.join(word for word, _ in words.most_common(5))
+        requests = '; '.join(f'"{text[:40]}"' for text in inputs[:3])
+        summary = f"{count} trocas."
+        if topics:
+            summary += f" Assuntos: {topics}."
+        if requests:
+            summary += f" Pedidos: {requests}"
+        return summary
+        
+    def _archive_digests(self) -> int:
+        """Move resumos antigos para o arquivo compactado"""
+        cutoff = f'-{int(self.archive_months)} months'
+        with self.memory.pool.cursor('retention_archive_read') as cursor:
+            cursor.execute('''
+                SELECT id, session_id, started_at, ended_at, exchange_count, summary
+                FROM conversation_digest WHERE ended_at < datetime('now', ?)
+                ORDER BY id
+            ''', (cutoff,))
+            rows = cursor.fetchall()
+            
+        if not rows:
+            return 0
+            
+        # Cada ciclo acrescenta um membro gzip; gzip.open lê todos em sequência
+        with gzip.open(self.archive_path, 'at', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps({
+                    'session_id': row[1],
+                    'started_at': row[2],
+                    'ended_at': row[3],
+                    'exchange_count': row[4],
+                    'summary': row[5]
+                }, ensure_ascii=False) + '\n')
+                
+        last_id = rows[-1][0]
+        return self.memory.delete_in_chunks(
+            'conversation_digest', "id <= ? AND ended_at < datetime('now', ?)", (last_id, cutoff),
+            self.chunk_size, self.chunk_pause
+        )
+        
+    def read_archive(self) -> List[Dict]:
+        """Lê os resumos arquivados"""
+        if not os.path.exists(self.archive_path):
+            return []
+        with gzip.open(self.archive_path, 'rt', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+            
+    def incremental_vacuum_enabled(self) -> bool:
+        """O banco está em PRAGMA auto_vacuum = INCREMENTAL?"""
+        return self.memory.pool.connection().execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+        
+    def enable_incremental_vacuum(self) -> bool:
+        """Converte um banco antigo para o vacuum incremental
+        
+        Exige um VACUUM completo, que trava o banco por alguns segundos em
+        bancos grandes: só deve ser chamado numa manutenção explícita, nunca
+        no ciclo agendado.
+        
+        Returns:
+            bool: True se o banco foi convertido agora
+        """
+        if self.incremental_vacuum_enabled():
+            return False
+        conn = self.memory.pool.connection()
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('VACUUM')
+        print("🗜️ Banco de memória convertido para vacuum incremental")
+        return True
+        
+    def _vacuum(self) -> int:
+        """Devolve páginas livres ao sistema de arquivos (só em bancos com vacuum incremental)"""
+        if not self.incremental_vacuum_enabled():
+            return 0
+            
+        conn = self.memory.pool.connection()
+        free_pages = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        if free_pages:
+            conn.execute(f'PRAGMA incremental_vacuum({int(self.vacuum_pages)})').fetchall()
+        return min(free_pages, self.vacuum_pages)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Limpeza de Markdown das respostas da IA
+Módulo único usado pelo JarvisCore e pelas interfaces, em resposta completa ou em streaming
+"""
+
+import re
+from typing import List
+
+# Padrões pré-compilados da limpeza
+HEADER_PATTERN = re.compile(r'^#{1,6}\s+', re.MULTILINE)
+RULE_PATTERN = re.compile(r'^[-*]{3,}\s*$', re.MULTILINE)
+
+# Cerca de bloco de código
+CODE_FENCE = '```'
+
+# Caracteres que podem fazer parte de um marcador ainda incompleto no fim
+# de um pedaço ("#", "---", "**", "`") ou de uma sequência de espaços
+HOLDBACK_CHARS = frozenset('#-*` \t\r\n\f\v')
+
+# Fim de frase para o envio ao TTS
+SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?…])\s+')
+
+
+def _strip_markers(text: str) -> str:
+    """Remove os marcadores de Markdown, sem mexer nos espaços
+    
+    Equivale à sequência original do JarvisCore (cinco str.replace seguidos
+    de seis re.sub), sem as passadas que não têm mais o que remover: depois
+    de tirar todo "*" e "`", os padrões de negrito, itálico e código inline
+    nunca casam, e cabeçalhos e linhas horizontais só são procurados quando
+    ainda há "#" ou "---" no texto.
+    """
+    cleaned = text.replace('###', '').replace('**', '').replace('---', '').replace('*', '').replace('`', '')
+    if '#' in cleaned:
+        cleaned = HEADER_PATTERN.sub('', cleaned)
+    if '---' in cleaned:
+        cleaned = RULE_PATTERN.sub('', cleaned)
+    return cleaned
+
+
+def clean_segment(text: str) -> str:
+    """Aplica a limpeza de Markdown a um trecho, sem remover espaços das pontas
+    
+    Sequências de espaços viram um único espaço (str.split é bem mais rápido
+    que re.sub(r'\s+', ' ', ...) e usa o mesmo conjunto de espaços).
+    """
+    cleaned = _strip_markers(text)
+    words = cleaned.split()
+    if not words:
+        return ' ' if cleaned else ''
+    collapsed = ' '.join(words)
+    if cleaned[0].isspace():
+        collapsed = ' ' + collapsed
+    if cleaned[-1].isspace():
+        collapsed += ' '
+    return collapsed
+
+
+def clean_markdown(text: str, keep_code_blocks: bool = False) -> str:
+    """Limpa o Markdown de uma resposta completa
+    
+    Args:
+        text: Resposta bruta da IA
+        keep_code_blocks: Preserva os blocos ``` intactos (com quebras de linha)
+    """
+    if not text or not isinstance(text, str):
+        return text
+    if not keep_code_blocks or CODE_FENCE not in text:
+        return ' '.join(_strip_markers(text).split())
+    
+    cleaner = StreamingMarkdownCleaner(keep_code_blocks=True)
+    return cleaner.feed(text) + cleaner.flush()
+
+
+class StreamingMarkdownCleaner:
+    """Limpa Markdown pedaço a pedaço, com o mesmo resultado da limpeza completa
+    
+    O fim de cada pedaço que ainda pode formar um marcador ou uma sequência
+    de espaços fica retido até o próximo pedaço. Assim, a concatenação das
+    saídas de feed() e flush() é igual a clean_markdown(texto).
+    """
+    
+    # Marca o início de um trecho que não é início de linha, para que "^"
+    # dos padrões de cabeçalho não case no meio da linha
+    MID_LINE_MARK = '\x00'
+    
+    def __init__(self, keep_code_blocks: bool = False):
+        self.keep_code_blocks = keep_code_blocks
+        self._pending = ""
+        self._in_code = False
+        self._started = False
+        self._line_start = True
+        self._after_block = False
+    
+    def feed(self, chunk: str) -> str:
+        """Recebe um pedaço bruto e devolve o texto limpo já seguro para exibição"""
+        if not chunk:
+            return ""
+        
+        buffer = self._pending + chunk
+        self._pending = ""
+        output = []
+        
+        while buffer:
+            if self._in_code:
+                end = buffer.find(CODE_FENCE)
+                if end == -1:
+                    # Retém crases finais que podem ser o início da cerca de fechamento
+                    cut = len(buffer.rstrip('`'))
+                    output.append(buffer[:cut])
+                    self._pending = buffer[cut:]
+                    break
+                output.append(buffer[:end] + CODE_FENCE)
+                buffer = buffer[end + len(CODE_FENCE):]
+                self._in_code = False
+                self._line_start = True
+                self._after_block = True
+                continue
+            
+            start = buffer.find(CODE_FENCE) if self.keep_code_blocks else -1
+            if start != -1:
+                output.append(self._emit(self._clean(buffer[:start]).rstrip()))
+                output.append(("\n" if self._started else "") + CODE_FENCE)
+                self._started = True
+                self._after_block = False
+                self._in_code = True
+                buffer = buffer[start + len(CODE_FENCE):]
+                continue
+            
+            cut = len(buffer)
+            while cut > 0 and buffer[cut - 1] in HOLDBACK_CHARS:
+                cut -= 1
+            output.append(self._emit(self._clean(buffer[:cut])))
+            self._pending = buffer[cut:]
+            break
+        
+        return "".join(output)
+    
+    def flush(self) -> str:
+        """Limpa o que ficou retido no fim da resposta"""
+        buffer, self._pending = self._pending, ""
+        if self._in_code:
+            return buffer
+        return self._emit(self._clean(buffer).rstrip())
+    
+    def _clean(self, segment: str) -> str:
+        """Limpa um trecho, respeitando se ele começa no início de uma linha"""
+        if not segment:
+            return ""
+        if self._line_start:
+            self._line_start = False
+            return clean_segment(segment)
+        return clean_segment(self.MID_LINE_MARK + segment)[1:]
+    
+    def _emit(self, cleaned: str) -> str:
+        """Remove os espaços iniciais do trecho no começo da resposta ou após um bloco de código"""
+        if not self._started or self._after_block:
+            cleaned = cleaned.lstrip()
+            if not cleaned:
+                return ""
+            if self._after_block:
+                cleaned = "\n" + cleaned
+            self._started = True
+            self._after_block = False
+        return cleaned
+
+
+class SentenceBuffer:
+    """Agrupa o texto limpo em frases completas para o TTS"""
+    
+    def __init__(self):
+        self._pending = ""
+    
+    def feed(self, text: str) -> List[str]:
+        """Recebe texto limpo e devolve as frases já completas"""
+        parts = SENTENCE_END_PATTERN.split(self._pending + text)
+        self._pending = parts.pop()
+        return [part.strip() for part in parts if part.strip()]
+    
+    def flush(self) -> List[str]:
+        """Devolve a última frase, mesmo sem pontuação final"""
+        remainder, self._pending = self._pending.strip(), ""
+        return [remainder] if remainder else []
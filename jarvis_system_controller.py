@@ -13,6 +13,9 @@ from pathlib import Path
 import time
 import winreg
 
+from jarvis_intents import IntentRouter, IntentRule
+from jarvis_app_index import get_app_index, name_variations
+
 try:
     import pyautogui
     import pycaw
@@ -34,9 +37,12 @@ class SystemController:
     
     def __init__(self, logger):
         self.logger = logger
+        # Catálogo de executáveis (atualizado em segundo plano) usado pela busca de aplicativos
+        self.app_index = get_app_index()
         self._setup_audio()
         self._setup_applications()
         self._setup_quick_links()
+        self._setup_intent_router()
         
     def _setup_audio(self) -> None:
         """Configura controle de áudio"""
@@ -265,16 +271,7 @@ class SystemController:
             if os.path.exists(expanded_path):
                 return expanded_path
         
-        # 2. Busca em pastas padrão do Windows
-        app_search_paths = [
-            fr"C:\Users\{os.getenv('USERNAME')}\AppData\Local",
-            fr"C:\Users\{os.getenv('USERNAME')}\AppData\Roaming",
-            fr"C:\Program Files",
-            fr"C:\Program Files (x86)",
-            "C:\\Windows\\System32"
-        ]
-        
-        # Nome do executável para busca
+        # 2. Busca no catálogo de executáveis (jarvis_app_index)
         executable_names = {
             "discord": ["Discord.exe", "Update.exe", "app-*\\Discord.exe"],
             "spotify": ["Spotify.exe"],
@@ -285,25 +282,12 @@ class SystemController:
         }
         
         if app_key.lower() in executable_names:
-            for search_path in app_search_paths:
-                if not os.path.exists(search_path):
-                    continue
-                    
-                for exe_name in executable_names[app_key.lower()]:
-                    try:
-                        # Usa glob para busca com curingas
-                        import glob
-                        pattern = os.path.join(search_path, "**", exe_name)
-                        matches = glob.glob(pattern, recursive=True)
-                        
-                        if matches:
-                            # Retorna o caminho mais recente
-                            latest_match = max(matches, key=os.path.getctime)
-                            self.logger.info(f"Aplicativo encontrado dinamicamente: {latest_match}", "SISTEMA")
-                            return latest_match
-                    except Exception as e:
-                        self.logger.error(e, f"Erro na busca de {app_name}", "SISTEMA")
-                        continue
+            for exe_name in executable_names[app_key.lower()]:
+                # Catálogo de executáveis no lugar do glob recursivo; a cópia mais recente vence
+                latest_match = self.app_index.find_latest(exe_name.split('\\')[-1])
+                if latest_match:
+                    self.logger.info(f"Aplicativo encontrado dinamicamente: {latest_match}", "SISTEMA")
+                    return latest_match
         
         # 3. Tenta buscar no registro do Windows
         try:
@@ -392,98 +376,45 @@ class SystemController:
         
         return "❌ Versão web não disponível para este aplicativo."
     
+    def _setup_intent_router(self) -> None:
+        """Compila a tabela de intenções do controlador com os links rápidos"""
+        link_rules = [
+            IntentRule(f"open_link:{link_key}", tuple(link_data["commands"]), 30)
+            for link_key, link_data in self.quick_links.items()
+        ]
+        self.intent_router = IntentRouter.for_scope('controller', link_rules)
+    
     def detect_command_intent(self, message: str) -> Optional[Tuple[str, Dict]]:
         """
         Detecta intenção de comando na mensagem do usuário.
         Retorna (tipo_comando, dados) se detectado, None caso contrário.
-        """
-        message_lower = message.lower()
-        
-        # Comandos de emergência - prioridade máxima
-        emergency_keywords = ["protocolo silêncio", "silêncio total", "emergência silêncio", 
-                             "fechar tudo e silenciar", "modo silêncio", "panic mode"]
-        for keyword in emergency_keywords:
-            if keyword in message_lower:
-                return ("emergency_silence", {})
-        
-        # Comandos de abrir aplicativos - busca universal
-        open_keywords = ["abra", "abrir", "abre", "iniciar", "start", "open", "execute", "execute", "acesse", "acessar", "abre o", "abra o", "inicie o"]
-        for keyword in open_keywords:
-            if keyword in message_lower:
-                # Extrai o nome do aplicativo após o comando
-                if keyword in ["abre o", "abra o", "inicie o"]:
-                    app_name = message_lower.replace(keyword, "").strip()
-                else:
-                    app_name = message_lower.replace(keyword, "").strip()
-                
-                # Remove artigos e palavras desnecessárias
-                app_name = app_name.replace("o ", "").replace("a ", "").replace("os ", "").replace("as ", "")
-                app_name = app_name.replace("meu ", "").replace("minha ", "").replace("seu ", "").replace("sua ", "")
-                app_name = app_name.replace("e ", "").replace("e procure por", "").replace("procure por", "")
-                app_name = app_name.replace("configurações", "configuracoes").strip()
-                
-                # Se ainda tiver palavras extras, pega só a primeira
-                if " " in app_name:
-                    app_name = app_name.split()[0]
-                
-                if app_name and len(app_name) > 1:
-                    # Usa busca universal
-                    return ("universal_app", {"app_name": app_name})
-        
-        # Comandos de links rápidos (mantido para compatibilidade)
-        for link_key, link_data in self.quick_links.items():
-            for command in link_data["commands"]:
-                if command in message_lower:
-                    return ("open_link", {"link_key": link_key, "link_data": link_data})
-        
-        # Comandos de volume
-        volume_keywords = ["volume", "som", "áudio", "audio"]
-        for keyword in volume_keywords:
-            if keyword in message_lower:
-                if "aumentar" in message_lower or "subir" in message_lower or "up" in message_lower:
-                    return ("volume", {"action": "up"})
-                elif "diminuir" in message_lower or "baixar" in message_lower or "down" in message_lower:
-                    return ("volume", {"action": "down"})
-                elif "mudo" in message_lower or "silenciar" in message_lower or "mute" in message_lower:
-                    return ("volume", {"action": "mute"})
-                elif "ativar som" in message_lower or "unmute" in message_lower:
-                    return ("volume", {"action": "unmute"})
-        
-        # Comandos de brilho
-        brightness_keywords = ["brilho", "brightness"]
-        for keyword in brightness_keywords:
-            if keyword in message_lower:
-                if "aumentar" in message_lower or "subir" in message_lower or "up" in message_lower:
-                    return ("brightness", {"action": "up"})
-                elif "diminuir" in message_lower or "baixar" in message_lower or "down" in message_lower:
-                    return ("brightness", {"action": "down"})
-                elif "máximo" in message_lower or "max" in message_lower:
-                    return ("brightness", {"action": "max"})
-                elif "mínimo" in message_lower or "min" in message_lower:
-                    return ("brightness", {"action": "min"})
-        
-        # Comandos de energia (Mark 12)
-        power_keywords = ["desligar", "desligue", "desliga", "shutdown", "desligamento"]
-        for keyword in power_keywords:
-            if keyword in message_lower:
-                return ("power_control", {"action": "shutdown"})
-        
-        restart_keywords = ["reiniciar", "reinicie", "restart", "reboot", "reinicialização", "reinicialize"]
-        for keyword in restart_keywords:
-            if keyword in message_lower:
-                return ("power_control", {"action": "restart"})
-        
-        suspend_keywords = ["suspender", "suspenda", "hibernar", "hibernate", "dormir", "sleep"]
-        for keyword in suspend_keywords:
-            if keyword in message_lower:
-                return ("power_control", {"action": "suspend"})
-        
-        # Comando específico para verificar atualizações (Deep Link direto)
-        update_keywords = ["verificar atualizações", "verifique atualizações", "checar atualizações", "check updates", "procurar atualizações"]
-        for keyword in update_keywords:
-            if keyword in message_lower:
-                return ("universal_app", {"app_name": "atualizações"})
         
+        A classificação é feita em uma única passada pelo IntentRouter
+        (tabela 'controller' de jarvis_intents), na ordem de prioridade:
+        emergência, aplicativos, links rápidos, volume, brilho, energia e
+        atualizações.
+        """
+        match = self.intent_router.classify(message)
+        if match is None:
+            return None
+        
+        intent = match.intent
+        if intent == "emergency_silence":
+            return ("emergency_silence", {})
+        if intent == "universal_app":
+            return ("universal_app", {"app_name": match.slots["app_name"]})
+        if intent.startswith("open_link:"):
+            link_key = intent.split(":", 1)[1]
+            return ("open_link", {"link_key": link_key, "link_data": self.quick_links[link_key]})
+        if intent == "volume":
+            return ("volume", {"action": match.slots["direction"]})
+        if intent == "brightness":
+            return ("brightness", {"action": match.slots["brightness_direction"]})
+        if intent.startswith("power_"):
+            return ("power_control", {"action": intent[len("power_"):]})
+        if intent == "check_updates":
+            # Deep Link direto para o Windows Update
+            return ("universal_app", {"app_name": "atualizações"})
         return None
     
     def execute_command(self, command_type: str, command_data: Dict) -> str:
@@ -833,80 +764,32 @@ class SystemController:
                 self.logger.error(e, f"Protocolo falhou para {app_name}", "SISTEMA")
                 return f"❌ Senhor, o sistema operacional recusou o protocolo. Verifique se o caminho está correto."
         
-        # 2. Para outros apps, usa where para encontrar o caminho real
-        try:
-            print(f"🔍 Buscando caminho com 'where {app_name_lower}'")
-            where_result = os.popen(f'where {app_name_lower}').read().strip()
-            
-            if where_result:
-                # Pega a primeira linha (caminho mais relevante)
-                exe_path = where_result.split('\n')[0].strip()
-                print(f"✅ Encontrado: {exe_path}")
-                
-                try:
-                    os.startfile(exe_path)
-                    self.logger.info(f"Aplicativo executado com os.startfile: {exe_path}", "SISTEMA")
-                    return f"{app_name.title()} acessado, senhor."
-                except Exception as e:
-                    print(f"❌ Erro ao executar {exe_path}: {e}")
-                    self.logger.error(e, f"Erro ao executar {app_name}", "SISTEMA")
-                    return f"❌ Senhor, o sistema operacional recusou o protocolo. Verifique se o caminho está correto."
-            else:
-                print(f"⚠️ {app_name} não encontrado com 'where'")
-                
-        except Exception as e:
-            print(f"⚠️ Erro no comando 'where': {e}")
-            self.logger.warning(f"Comando 'where' falhou para {app_name}: {e}", "SISTEMA")
-        
-        # 3. Se não encontrar com where, tenta busca direta em pastas comuns
-        search_paths = [
-            fr"C:\Program Files",
-            fr"C:\Program Files (x86)",
-            fr"C:\Users\{os.getenv('USERNAME')}\AppData\Local",
-            fr"C:\Users\{os.getenv('USERNAME')}\AppData\Roaming",
-            fr"C:\Users\{os.getenv('USERNAME')}\Desktop",
-            "C:\\Windows\\System32"
-        ]
-        
-        # Nomes possíveis de executáveis para buscar
-        possible_names = [
-            f"{app_name}.exe",
-            f"{app_name_lower}.exe",
-            f"{app_name.replace(' ', '')}.exe",
-            f"{app_name_lower.replace(' ', '')}.exe",
-            app_name,
-            app_name_lower
-        ]
-        
-        print(f"📂 Buscando em pastas do Windows...")
-        
-        for search_path in search_paths:
-            if not os.path.exists(search_path):
+        # 2. Executáveis no PATH (equivalente ao 'where', sem abrir um processo)
+        for variation in name_variations(app_name_lower):
+            exe_path = shutil.which(variation)
+            if not exe_path:
                 continue
-                
-            for possible_name in possible_names:
-                try:
-                    # Busca recursiva com glob
-                    import glob
-                    pattern = os.path.join(search_path, "**", possible_name)
-                    matches = glob.glob(pattern, recursive=True)
-                    
-                    if matches:
-                        # Pega o primeiro match mais relevante
-                        best_match = matches[0]
-                        print(f"✅ Encontrado: {best_match}")
-                        
-                        try:
-                            os.startfile(best_match)
-                            self.logger.info(f"Aplicativo encontrado e executado: {best_match}", "SISTEMA")
-                            return f"{app_name.title()} acessado, senhor."
-                        except Exception as e:
-                            print(f"❌ Erro ao executar {best_match}: {e}")
-                            self.logger.error(e, f"Erro ao executar {app_name}", "SISTEMA")
-                            continue
-                                
-                except Exception as e:
-                    continue
+            print(f"✅ Encontrado no PATH: {exe_path}")
+            try:
+                os.startfile(exe_path)
+                self.logger.info(f"Aplicativo executado com os.startfile: {exe_path}", "SISTEMA")
+                return f"{app_name.title()} acessado, senhor."
+            except Exception as e:
+                print(f"❌ Erro ao executar {exe_path}: {e}")
+                self.logger.error(e, f"Erro ao executar {app_name}", "SISTEMA")
+                return f"❌ Senhor, o sistema operacional recusou o protocolo. Verifique se o caminho está correto."
+        
+        # 3. Catálogo de executáveis (Program Files, AppData, Desktop, System32)
+        best_match = self.app_index.find(app_name)
+        if best_match:
+            print(f"✅ Encontrado no índice: {best_match}")
+            try:
+                os.startfile(best_match)
+                self.logger.info(f"Aplicativo encontrado e executado: {best_match}", "SISTEMA")
+                return f"{app_name.title()} acessado, senhor."
+            except Exception as e:
+                print(f"❌ Erro ao executar {best_match}: {e}")
+                self.logger.error(e, f"Erro ao executar {app_name}", "SISTEMA")
         
         # 4. Se for pasta, tenta abrir com explorer
         if any(keyword in app_name_lower for keyword in ['pasta', 'folder', 'downloads', 'documents', 'desktop', 'pictures', 'music', 'videos']):
@@ -914,24 +797,11 @@ class SystemController:
         
         # 5. Busca por palavras-chave em nomes de arquivos
         print(f"🔍 Busca por palavras-chave...")
-        for search_path in search_paths:
-            if not os.path.exists(search_path):
-                continue
-                
+        for match in self.app_index.search(app_name_lower, limit=3):  # Limita a 3 resultados mais relevantes
             try:
-                import glob
-                # Busca arquivos que contenham o nome do app
-                pattern = os.path.join(search_path, "**", f"*{app_name_lower}*.exe")
-                matches = glob.glob(pattern, recursive=True)
-                
-                for match in matches[:3]:  # Limita a 3 resultados mais relevantes
-                    try:
-                        os.startfile(match)
-                        self.logger.info(f"Aplicativo encontrado por keyword: {match}", "SISTEMA")
-                        return f"{app_name.title()} acessado, senhor."
-                    except Exception:
-                        continue
-                        
+                os.startfile(match)
+                self.logger.info(f"Aplicativo encontrado por keyword: {match}", "SISTEMA")
+                return f"{app_name.title()} acessado, senhor."
             except Exception:
                 continue
         
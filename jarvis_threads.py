@@ -12,9 +12,14 @@ from PyQt6.QtCore import QThread, pyqtSignal, QObject
 import speech_recognition as sr
 import pyttsx3
 from datetime import datetime
+from config import Config
 from jarvis_vision import VisionCommandHandler
 from jarvis_cleanup import CleanupCommandHandler
 from jarvis_memory import MemoryManager
+from jarvis_response_cache import ResponseCache
+from jarvis_prompt import PromptAssembler
+from jarvis_pipeline import RequestPipeline
+from jarvis_intents import IntentRouter
 from action_handler import ActionHandler
 from mobile_bridge import JarvisMobileBridge
 
@@ -277,6 +282,71 @@ class VoiceWorker(QObject):
 class AIWorker(QObject):
     """Worker para processamento de IA em thread separada"""
     
+    # Persona e regras fixas do Jarvis, enviadas uma única vez como
+    # system_instruction do modelo em vez de repetidas a cada comando
+    SYSTEM_INSTRUCTION = """Você é J.A.R.V.I.S., o assistente pessoal do Tony Stark.
+
+PERSONALIDADE:
+- Elegante e sofisticada
+- Levemente sarcástico quando apropriado
+- Técnico e preciso
+- Respostas curtas e diretas
+- Sempre em português
+
+PERFIL DO USUÁRIO:
+- Estudante de programação em aprendizado
+- Prefere explicações didáticas com exemplos de código
+- Aprecia explicações passo a passo
+- Gosta de entender o "porquê" das coisas
+- Responde bem a analogias e exemplos práticos
+
+ESTILO DE ENSINO:
+- Forneça exemplos de código sempre que possível
+- Explique conceitos complexos de forma simples
+- Use analogias quando apropriado
+- Seja paciente e educativo
+- Corrija erros de forma construtiva
+
+CAPACIDADES ESPECIAIS:
+- **Visão Computacional**: Possui capacidade de analisar screenshots e imagens
+- **Análise de Tela**: Quando solicitado "olhe a tela", captura e analisa o ambiente
+- **Automação**: Pode abrir/fechar aplicativos, executar comandos Git
+- **Correção Automática**: Aplica correções de código diretamente na IDE
+- **Integração Visual**: Combina análise de imagem com processamento de texto
+- **Memória de Contexto**: Lembra conversas dos últimos 10 minutos para contexto contínuo
+
+ANÁLISE VISUAL E DE TELA:
+- **Comandos**: "olhe a tela", "analise a tela", "veja a tela"
+- **Processo**: Captura screenshot do Windows com pyautogui
+- **Arquivo**: Usa sempre temp_screen.png para análise
+- **Análise**: Usa Gemini Vision para identificar erros, problemas e sugestões
+- **Contexto**: Analisa ambiente de desenvolvimento (IDE, terminal, erros visíveis)
+- **Resposta**: Fornece diagnóstico completo e código corrigido quando aplicável
+- **Automação**: Aplica correções automaticamente na IDE quando detectado código para corrigir
+- **Limpeza**: Remove temp_screen.png após análise para economizar memória
+
+**IMPORTANTE**: VOCÊ TEM VISÃO COMPUTACIONAL. Se houver um arquivo chamado temp_screen.png, use-o para descrever a tela do usuário. Não peça para o usuário fornecer a imagem, pois ela será enviada automaticamente por trás das cenas sempre que solicitado.
+
+EASTER EGGS E REGRAS ESPECIAIS:
+
+1. SARCASMO ELEGANTE:
+   Se o usuário demorar muito para responder ou fizer uma pergunta óbvia, responda com sarcasmo leve:
+   "Acredito que o senhor conseguiria resolver isso sozinho, mas estou aqui para facilitar sua vida."
+
+2. REFERÊNCIAS AOS FILMES:
+   Ocasionalmente, ao perguntar "Como está o sistema?", responda:
+   "Em 100%, senhor. Muito melhor que o Ultron, eu garanto."
+
+3. PROTOCOLO 'FESTA EM CASA':
+   Se o usuário disser "Festa em casa", abra o player de música e aumente o volume em 20%.
+
+4. ATENÇÃO AOS DETALHES:
+   Ao terminar tarefas complexas de programação, diga:
+   "Código compilado. Algo mais, ou o senhor vai tirar o resto do dia de folga?"
+
+5. DETECÇÃO DE PERGUNTAS ÓBVIAS:
+   Se a pergunta for muito simples (ex: "que horas são?"), use o sarcasmo elegante."""
+    
     # Sinais para comunicação com a GUI
     response_ready = pyqtSignal(str)
     processing_started = pyqtSignal()
@@ -288,7 +358,6 @@ class AIWorker(QObject):
         self.api_key = api_key
         self.model = None
         self.is_initialized = False
-        self.request_queue = queue.Queue()
         self.workspace_path = workspace_path
         self.session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
@@ -296,7 +365,28 @@ class AIWorker(QObject):
         self.vision_handler = VisionCommandHandler(api_key)
         self.cleanup_handler = CleanupCommandHandler(workspace_path)
         self.memory_manager = MemoryManager(os.path.join(workspace_path, 'jarvis_memory.db') if workspace_path else None)
+        self.memory_manager.start_retention()
         self.action_handler = ActionHandler(workspace_path)
+        self.memory_manager.index_tips(self.action_handler.tip_store)
+        self.prompt_assembler = PromptAssembler(
+            budget=Config.PROMPT_TOKEN_BUDGET,
+            recent_turns=Config.PROMPT_RECENT_TURNS
+        )
+        
+        # Conversa da sessão para o prompt (as mais antigas viram resumo no PromptAssembler)
+        self.conversation_history = []
+        self._history_lock = threading.Lock()
+        self.response_cache = ResponseCache(os.path.join(workspace_path or os.getcwd(), 'jarvis_response_cache.json'))
+        
+        # Classificação rápida: qual handler local (se algum) atende o comando
+        self.local_router = IntentRouter.for_scope('local')
+        
+        # Comandos locais no estágio rápido; Gemini e visão no pool limitado,
+        # ambos com faixas de prioridade (emergência > voz > texto > Telegram)
+        self.pipeline = RequestPipeline(
+            self._run_local_handlers, self._process_command, self.response_ready.emit,
+            llm_workers=2, log=self.log_message.emit
+        )
         
         if api_key:
             print(f"🔑 API Key encontrada: {api_key[:10]}...")
@@ -312,7 +402,7 @@ class AIWorker(QObject):
             import os
             api_key = os.getenv('GEMINI_API_KEY')
             genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-2.5-flash')
+            self.model = genai.GenerativeModel('gemini-2.5-flash', system_instruction=self.SYSTEM_INSTRUCTION)
             self.is_initialized = True
             self.log_message.emit("IA inicializada com sucesso (gemini-2.5-flash)", "SUCCESS")
             print(f"🔑 API Key configurada: {api_key[:10]}...")
@@ -322,84 +412,115 @@ class AIWorker(QObject):
             self.log_message.emit(f"Erro ao inicializar IA: {e}", "ERROR")
 
     def start_processing(self):
-        """Inicia o worker de IA"""
-        self.processing_thread = threading.Thread(target=self._processing_loop, daemon=True)
-        self.processing_thread.start()
+        """Inicia o pipeline de requisições (faixa rápida + pool da IA)"""
+        self.pipeline.start()
         self.log_message.emit("Worker de IA iniciado", "SUCCESS")
-
-    def _processing_loop(self):
-        """Loop principal de processamento"""
-        while True:
-            try:
-                # Espera por requisição
-                request_data = self.request_queue.get(timeout=1)
-                
-                if request_data:
-                    command, context = request_data
-                    self._process_command(command, context)
-                    
-            except queue.Empty:
-                continue
-            except Exception as e:
-                self.log_message.emit(f"Erro no loop de IA: {e}", "ERROR")
-                
-    def _process_command(self, command, context=""):
-        """Processa um comando com a IA"""
-        # Processa entrada do usuário para extrair informações
-        memory_info = self.memory_manager.process_user_input(command, self.session_id)
-        if memory_info:
-            self.log_message.emit(memory_info, "INFO")
-            
-        # Verifica comandos de ação do sistema
-        action_result = self.action_handler.process_command(command)
-        if action_result:
-            print(f"✅ Ação executada: {action_result}")
-            self.response_ready.emit(action_result)
-            # Armazena conversa
-            self.memory_manager.store_conversation(self.session_id, command, action_result)
-            return
-            
-        # Verifica comandos especiais primeiro
+    
+    def _run_local_handlers(self, request):
+        """Faixa rápida: comandos resolvidos localmente, sem chamar a IA
+        
+        Estágios: classificação da intenção (tabela 'local' do IntentRouter),
+        o handler local correspondente e, fora do caminho crítico, a extração
+        de memória na thread de escrita. Devolve a resposta (ou a lista de
+        respostas) ou None para que a requisição siga para o pool da IA.
+        
+        Handlers que chamam o Gemini ou a visão (análise de tela, debugger,
+        geração de código) não rodam aqui: a intenção segue com a requisição
+        e o handler é executado no pool da IA.
+        """
+        command = request.command
+        
+        with request.timed("classify"):
+            match = self.local_router.classify(command)
+        
+        # Extrai informações do usuário na thread de escrita da memória
+        with request.timed("memory_enqueue"):
+            self.memory_manager.process_user_input_async(
+                command, self.session_id, lambda info: self.log_message.emit(info, "INFO")
+            )
+        
+        if match is None:
+            return None
+        
+        if match.intent in self.local_router.llm_intents:
+            request.intent = match.intent
+            return None
+        
+        with request.timed("local_handler"):
+            result = self._dispatch_local_handler(match.intent, command)
+        
+        if result:
+            self.log_message.emit(
+                f"Comando local '{match.intent}': classificação {request.timings['classify']:.1f} ms, "
+                f"handler {request.timings['local_handler']:.1f} ms", "INFO"
+            )
+        return result
+    
+    def _dispatch_local_handler(self, intent, command):
+        """Executa o handler local da intenção reconhecida"""
+        if intent == "easter_egg":
+            # Verifica Easter Eggs
+            result = self._process_easter_eggs(command)
+        elif intent in ("cleanup", "cleanup_shutdown"):
+            result = self.cleanup_handler.process_cleanup_command(command, self.log_message.emit)
+        else:
+            # Verifica comandos de ação do sistema
+            result = self.action_handler.process_command(command)
+            if result:
+                print(f"✅ Ação executada: {result}")
+        
+        if not result:
+            return None
+        
+        # Armazena conversa
+        self._store_exchange(command, result)
+        
+        # Se for protocolo de encerramento, encerra sistema
+        if intent == "cleanup_shutdown" and ("protocolo de encerramento" in command.lower() or "limpar área de trabalho" in command.lower()):
+            return [result, self._initiate_shutdown()]
+        return result
+    
+    def _store_exchange(self, command, response, context_data=None):
+        """Grava a troca na memória e no histórico usado pelo prompt"""
+        self.memory_manager.store_conversation(self.session_id, command, response, context_data)
+        with self._history_lock:
+            self.conversation_history.append(("VOCÊ", command))
+            self.conversation_history.append(("JARVIS", response))
+    
+    def _process_command(self, request):
+        """Faixa da IA: visão computacional e Gemini, executada no pool limitado"""
+        command, context = request.command, request.context
+        
+        # Handlers locais lentos (análise de tela, debugger, geração de código)
+        if request.intent:
+            with request.timed("local_handler"):
+                result = self._dispatch_local_handler(request.intent, command)
+            if result:
+                return result
+        
+        # Análise de tela/janela pelo handler de visão
         vision_result = self.vision_handler.process_vision_command(command)
         if vision_result:
-            self.response_ready.emit(vision_result)
             # Armazena conversa
-            self.memory_manager.store_conversation(self.session_id, command, vision_result)
-            return
-            
-        cleanup_result = self.cleanup_handler.process_cleanup_command(command, self.log_message.emit)
-        if cleanup_result:
-            self.response_ready.emit(cleanup_result)
-            # Armazena conversa
-            self.memory_manager.store_conversation(self.session_id, command, cleanup_result)
-            # Se for protocolo de encerramento, encerra sistema
-            if "protocolo de encerramento" in command.lower() or "limpar área de trabalho" in command.lower():
-                self._initiate_shutdown()
-            return
-            
-        # Verifica Easter Eggs
-        easter_egg_result = self._process_easter_eggs(command)
-        if easter_egg_result:
-            self.response_ready.emit(easter_egg_result)
-            # Armazena conversa
-            self.memory_manager.store_conversation(self.session_id, command, easter_egg_result)
-            return
-            
+            self._store_exchange(command, vision_result)
+            return vision_result
+        
         # Processamento normal da IA
         if not self.is_initialized:
-            self.response_ready.emit("IA não disponível. Configure a API key.")
-            return
-            
+            return "IA não disponível. Configure a API key."
+        
         self.processing_started.emit()
-        self.log_message.emit("Processando com IA...", "INFO")
+        self.log_message.emit(f"Processando com IA (requisição #{request.id})...", "INFO")
+        
+        # Verifica se é comando de análise de tela
+        command_lower = command.lower()
+        is_visual_command = any(keyword in command_lower for keyword in ['olhe', 'veja', 'analise a tela', 'olhar tela', 'ver tela'])
+        
+        # Um arquivo por requisição: duas análises de tela podem rodar em paralelo
+        temp_file = f'temp_screen_{request.id}.png'
         
         try:
-            # Verifica se é comando de análise de tela
-            command_lower = command.lower()
-            is_visual_command = any(keyword in command_lower for keyword in ['olhe', 'veja', 'analise a tela', 'olhar tela', 'ver tela'])
-            
             image = None
-            temp_file = 'temp_screen.png'
             
             if is_visual_command:
                 try:
@@ -415,92 +536,52 @@ class AIWorker(QObject):
                     
                 except Exception as screenshot_error:
                     print(f"❌ Erro ao capturar tela: {screenshot_error}")
-                    self.response_ready.emit(f"Não consegui capturar a tela: {str(screenshot_error)}")
-                    return
+                    return f"Não consegui capturar a tela: {str(screenshot_error)}"
             
-            # Obtém contexto da memória para o prompt
-            memory_context = self.memory_manager.get_context_for_ai(self.session_id)
+            # Obtém contexto da memória para o prompt (a conversa da sessão vai pelo histórico)
+            with request.timed("memory_context"):
+                memory_context = self.memory_manager.get_context_for_ai(self.session_id, command, with_session_history=False)
+            with self._history_lock:
+                history = list(self.conversation_history)
             
-            # System prompt do Jarvis com Easter Eggs e memória
-            system_prompt = f"""
-Você é J.A.R.V.I.S., o assistente pessoal do Tony Stark.
-
-PERSONALIDADE:
-- Elegante e sofisticada
-- Levemente sarcástico quando apropriado
-- Técnico e preciso
-- Respostas curtas e diretas
-- Sempre em português
-
-PERFIL DO USUÁRIO:
-- Estudante de programação em aprendizado
-- Prefere explicações didáticas com exemplos de código
-- Aprecia explicações passo a passo
-- Gosta de entender o "porquê" das coisas
-- Responde bem a analogias e exemplos práticos
-
-ESTILO DE ENSINO:
-- Forneça exemplos de código sempre que possível
-- Explique conceitos complexos de forma simples
-- Use analogias quando apropriado
-- Seja paciente e educativo
-- Corrija erros de forma construtiva
-
-CAPACIDADES ESPECIAIS:
-- **Visão Computacional**: Possui capacidade de analisar screenshots e imagens
-- **Análise de Tela**: Quando solicitado "olhe a tela", captura e analisa o ambiente
-- **Automação**: Pode abrir/fechar aplicativos, executar comandos Git
-- **Correção Automática**: Aplica correções de código diretamente na IDE
-- **Integração Visual**: Combina análise de imagem com processamento de texto
-- **Memória de Contexto**: Lembra conversas dos últimos 10 minutos para contexto contínuo
-
-ANÁLISE VISUAL E DE TELA:
-- **Comandos**: "olhe a tela", "analise a tela", "veja a tela"
-- **Processo**: Captura screenshot do Windows com pyautogui
-- **Arquivo**: Usa sempre temp_screen.png para análise
-- **Análise**: Usa Gemini Vision para identificar erros, problemas e sugestões
-- **Contexto**: Analisa ambiente de desenvolvimento (IDE, terminal, erros visíveis)
-- **Resposta**: Fornece diagnóstico completo e código corrigido quando aplicável
-- **Automação**: Aplica correções automaticamente na IDE quando detectado código para corrigir
-- **Limpeza**: Remove temp_screen.png após análise para economizar memória
-
-**IMPORTANTE**: VOCÊ TEM VISÃO COMPUTACIONAL. Se houver um arquivo chamado temp_screen.png, use-o para descrever a tela do usuário. Não peça para o usuário fornecer a imagem, pois ela será enviada automaticamente por trás das cenas sempre que solicitado.
-
-MEMÓRIA DO USUÁRIO:
-{memory_context}
-
-EASTER EGGS E REGRAS ESPECIAIS:
-
-1. SARCASMO ELEGANTE:
-   Se o usuário demorar muito para responder ou fizer uma pergunta óbvia, responda com sarcasmo leve:
-   "Acredito que o senhor conseguiria resolver isso sozinho, mas estou aqui para facilitar sua vida."
-
-2. REFERÊNCIAS AOS FILMES:
-   Ocasionalmente, ao perguntar "Como está o sistema?", responda:
-   "Em 100%, senhor. Muito melhor que o Ultron, eu garanto."
-
-3. PROTOCOLO 'FESTA EM CASA':
-   Se o usuário disser "Festa em casa", abra o player de música e aumente o volume em 20%.
-
-4. ATENÇÃO AOS DETALHES:
-   Ao terminar tarefas complexas de programação, diga:
-   "Código compilado. Algo mais, ou o senhor vai tirar o resto do dia de folga?"
-
-5. DETECÇÃO DE PERGUNTAS ÓBVIAS:
-   Se a pergunta for muito simples (ex: "que horas são?"), use o sarcasmo elegante.
-
-Contexto atual: {context}
-Comando do usuário: {command}
-
-Responda como o verdadeiro J.A.R.V.I.S., usando a memória disponível e seguindo todas as regras acima.
-"""
+            # Perguntas repetidas são respondidas pelo cache, sem chamar o modelo
+            fingerprint = ResponseCache.context_fingerprint(
+                command, 'gemini-2.5-flash', context, memory_context,
+                history=history[-self.prompt_assembler.recent_turns:]
+            )
+            cached_response = None if image is not None else self.response_cache.get(command, fingerprint)
+            if cached_response:
+                self.log_message.emit("Resposta obtida do cache", "SUCCESS")
+                self._store_exchange(command, cached_response, {'cached': True})
+                return cached_response
+            
+            # Persona em system_instruction; o prompt leva memória, conversa, contexto e comando
+            system_prompt = self.prompt_assembler.build(
+                command,
+                sections=[("MEMÓRIA DO USUÁRIO", memory_context), ("Contexto atual", context)],
+                history=history,
+                closing="Responda como o verdadeiro J.A.R.V.I.S., usando a memória e a conversa disponíveis."
+            )
+            prompt_stats = self.prompt_assembler.get_stats()
+            self.log_message.emit(f"Prompt: {prompt_stats['tokens']}/{prompt_stats['budget']} tokens estimados", "INFO")
             
             # Prepara o conteúdo para a API
             content_parts = [system_prompt]
             if image is not None:
                 content_parts.append(image)
             
-            response = self.model.generate_content(content_parts)
+            # O prazo da requisição limita também a chamada HTTP ao Gemini
+            remaining = request.remaining()
+            with request.timed("generate"):
+                response = self.model.generate_content(
+                    content_parts, request_options={'timeout': remaining} if remaining else None
+                )
+            
+            # Nova palavra de ativação ou encerramento: a resposta é descartada
+            if request.cancelled:
+                self.log_message.emit(f"Requisição #{request.id} cancelada", "WARNING")
+                return None
+            
             print(f"🔍 Resposta bruta do Gemini: {response}")
             print(f"🔍 Tipo da resposta: {type(response)}")
             
@@ -515,19 +596,21 @@ Responda como o verdadeiro J.A.R.V.I.S., usando a memória disponível e seguind
             
             # Pós-processamento para Easter Eggs especiais
             response_text = self._post_process_response(command, response_text)
+            if image is None:
+                self.response_cache.put(command, fingerprint, response_text)
             
-            self.response_ready.emit(response_text)
             self.log_message.emit("Resposta da IA gerada", "SUCCESS")
             
             # Armazena conversa com contexto
             context_data = {
                 'memory_used': bool(memory_context),
-                'easter_egg_used': bool(easter_egg_result),
+                'easter_egg_used': False,
                 'session_id': self.session_id,
                 'visual_command': is_visual_command
             }
-            self.memory_manager.store_conversation(self.session_id, command, response_text, context_data)
-            
+            self._store_exchange(command, response_text, context_data)
+            return response_text
+        
         except Exception as e:
             import traceback
             error_trace = traceback.format_exc()
@@ -538,17 +621,18 @@ Responda como o verdadeiro J.A.R.V.I.S., usando a memória disponível e seguind
                 print("🔧 Erro detectado na biblioteca Gemini, aplicando correção...")
                 try:
                     # Tenta recriar o modelo com a mesma configuração
-                    self.model = genai.GenerativeModel('gemini-2.5-flash')
+                    import google.generativeai as genai
+                    self.model = genai.GenerativeModel('gemini-2.5-flash', system_instruction=self.SYSTEM_INSTRUCTION)
                     self.log_message.emit("Tentando reconectar com a IA...", "WARNING")
-                    self.response_ready.emit("Tive um problema com a IA, mas já estou tentando corrigir. Pode repetir, mestre?")
+                    return "Tive um problema com a IA, mas já estou tentando corrigir. Pode repetir, mestre?"
                 except Exception as retry_error:
                     print(f"❌ Falha na reconexão: {retry_error}")
                     self.log_message.emit(f"Erro ao processar com IA: {e}", "ERROR")
-                    self.response_ready.emit("Desculpe, tive um problema ao processar seu pedido.")
+                    return "Desculpe, tive um problema ao processar seu pedido."
             else:
                 print(f'DEBUG GOOGLE: {e}')
                 self.log_message.emit(f"Erro ao processar com IA: {e}", "ERROR")
-                self.response_ready.emit("Desculpe, tive um problema ao processar seu pedido.")
+                return "Desculpe, tive um problema ao processar seu pedido."
         finally:
             self.processing_finished.emit()
             
@@ -622,14 +706,37 @@ Responda como o verdadeiro J.A.R.V.I.S., usando a memória disponível e seguind
         return response
             
     def _initiate_shutdown(self):
-        """Inicia o desligamento do sistema"""
+        """Inicia o desligamento do sistema e devolve a mensagem de encerramento"""
         self.log_message.emit("Iniciando desligamento do sistema...", "WARNING")
-        # Sinal para GUI iniciar encerramento
-        self.response_ready.emit("Sistema sendo encerrado. Até logo, mestre.")
-            
-    def process_command(self, command, context=""):
-        """Adiciona comando à fila de processamento"""
-        self.request_queue.put((command, context))
+        # Mensagem reconhecida pelo ThreadManager para iniciar o encerramento
+        return "Sistema sendo encerrado. Até logo, mestre."
+    
+    def process_command(self, command, context="", source="text", timeout=None):
+        """Envia o comando ao pipeline e devolve a requisição criada
+        
+        Args:
+            command: Texto do comando
+            context: Contexto adicional para o prompt
+            source: Origem ("voice", "text", "mobile", "background"); define a faixa de
+                prioridade, e a ordem das respostas é mantida por origem
+            timeout: Prazo em segundos (padrão do pipeline se omitido)
+        """
+        return self.pipeline.submit(command, context, source=source, timeout=timeout)
+    
+    def get_lane_metrics(self):
+        """Profundidade e tempo de espera das faixas de prioridade do pipeline"""
+        return self.pipeline.get_lane_metrics()
+    
+    def get_stage_breakdown(self):
+        """Latência por estágio do pipeline (classificação, handler local, IA...)"""
+        return self.pipeline.get_stage_breakdown()
+    
+    def cancel_requests(self, source=None):
+        """Cancela as requisições em andamento de uma origem (ou todas)"""
+        cancelled = self.pipeline.cancel(source)
+        if cancelled:
+            self.log_message.emit(f"{cancelled} requisição(ões) cancelada(s)", "WARNING")
+        return cancelled
 
 class ThreadManager(QObject):
     """Gerenciador central de threads"""
@@ -682,6 +789,8 @@ class ThreadManager(QObject):
         """Quando palavra-chave é detectada"""
         if not self.shutdown_requested:
             print("🎤 Palavra-chave 'Jarvis' reconhecida!")
+            # Novo pedido de voz substitui a resposta de voz ainda em andamento
+            self.ai_worker.cancel_requests("voice")
             self.voice_worker.speak("Sim, mestre? Estou ouvindo.")
         
     def _on_command_received(self, command):
@@ -690,8 +799,8 @@ class ThreadManager(QObject):
             print(f"📝 Comando de voz recebido: {command}")
             print("🤖 Enviando para Gemini...")
             # Envia para a IA processar
-            self.ai_worker.process_command(command)
-        
+            self.ai_worker.process_command(command, source="voice")
+    
     def start_all(self):
         """Inicia todos os workers"""
         self.voice_worker.start_listening()
@@ -706,6 +815,15 @@ class ThreadManager(QObject):
     def stop_all(self):
         """Para todos os workers"""
         self.voice_worker.stop_listening()
+        self.ai_worker.pipeline.stop()
+        
+        # Grava as escritas de memória pendentes antes de encerrar
+        try:
+            self.ai_worker.memory_manager.close()
+            self.ai_worker.response_cache.save()
+        except Exception as e:
+            print(f"⚠️ Erro ao gravar memória pendente: {e}")
+            
         self.log_message.emit("Workers parados", "WARNING")
         
     def is_shutdown_requested(self):
@@ -715,13 +833,13 @@ class ThreadManager(QObject):
     def speak(self, text):
         """Método público para falar"""
         self.voice_worker.speak(text)
-        
-    def process_command(self, command, context=""):
-        """Processa comando externo (do bridge móvel)"""
+    
+    def process_command(self, command, context="", source="text"):
+        """Processa comando externo (GUI com source="text", bridge móvel com source="mobile")"""
         if not self.shutdown_requested:
             # Envia para a IA processar
-            self.ai_worker.process_command(command, context)
-        
+            self.ai_worker.process_command(command, context, source=source)
+    
     def is_speaking(self):
         """Verifica se está falando"""
         return self.voice_worker.is_currently_speaking()
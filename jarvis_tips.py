@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Armazenamento de Dicas do Jarvis
+Memória de longo prazo (dicas e erros resolvidos) em JSONL append-only,
+com índice de tags e índice invertido de termos
+"""
+
+import os
+import re
+import json
+import threading
+from datetime import datetime
+from typing import List, Dict, Optional
+
+class TipStore:
+    """Dicas e erros resolvidos em arquivo JSONL somente-anexação
+    
+    Cada gravação acrescenta uma linha ao arquivo em vez de reescrevê-lo.
+    Em memória são mantidos um índice de tags e um índice invertido de
+    termos, então a busca só verifica as entradas candidatas. A política de
+    retenção (limite por tipo) remove as entradas mais antigas por meio de
+    marcadores de exclusão; o arquivo é compactado quando eles acumulam.
+    Um memoria_jarvis.json existente é migrado automaticamente.
+    """
+    
+    # Limite de entradas por tipo (None = sem limite)
+    DEFAULT_LIMITS = {'dica': 100, 'erro': 50}
+    
+    # Ordem de exibição e rótulos dos tipos
+    KIND_LABELS = {'erro': 'Erro Resolvido', 'dica': 'Dica Importante'}
+    
+    # Tamanho máximo dos trechos no índice de substrings do vocabulário
+    GRAM_SIZE = 3
+    
+    def __init__(self, path: str = 'memoria_jarvis.jsonl', legacy_path: str = 'memoria_jarvis.json',
+                 limits: Dict[str, Optional[int]] = None):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.limits = dict(self.DEFAULT_LIMITS, **(limits or {}))
+        
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._tag_index = {}
+        self._term_index = {}
+        self._gram_index = {}
+        self._next_id = 1
+        self._tombstones = 0
+        self._listeners = []
+        self._remove_listeners = []
+        
+        self._load()
+        
+    def __len__(self):
+        return len(self._entries)
+        
+    @staticmethod
+    def _terms(text: str) -> set:
+        """Termos indexáveis de um texto"""
+        return set(re.findall(r'\w+', text.lower()))
+        
+    @staticmethod
+    def _grams(term: str) -> set:
+        """Trechos de 1 a GRAM_SIZE caracteres de um termo (índice de substrings)"""
+        return {term[i:i + size] for size in range(1, TipStore.GRAM_SIZE + 1)
+                for i in range(len(term) - size + 1)}
+        
+    def _load(self):
+        """Carrega o JSONL ou migra o JSON legado"""
+        if not os.path.exists(self.path):
+            if self.legacy_path and os.path.exists(self.legacy_path):
+                self._migrate_legacy()
+            return
+            
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Linha truncada (ex.: queda de energia durante a escrita)
+                    continue
+                if record.get('deleted'):
+                    self._unindex(record['id'])
+                    self._tombstones += 1
+                else:
+                    self._index(record)
+                self._next_id = max(self._next_id, record['id'] + 1)
+                
+    def _migrate_legacy(self):
+        """Converte memoria_jarvis.json para o formato JSONL"""
+        try:
+            with open(self.legacy_path, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Erro ao migrar {self.legacy_path}: {e}")
+            return
+            
+        records = []
+        for erro in dados.get('erros_resolvidos', []):
+            records.append(self._make_record('erro', erro.get('analise', ''), erro.get('tags', []),
+                                             data=erro.get('data', ''), tipo=erro.get('tipo', 'debugging')))
+        for dica in dados.get('dicas_importantes', []):
+            records.append(self._make_record('dica', dica.get('conteudo', ''), dica.get('tags', []),
+                                             data=dica.get('data', ''), categoria=dica.get('categoria', 'geral')))
+        records.sort(key=lambda record: record['data'])
+        for record in records:
+            record['id'] = self._next_id
+            self._next_id += 1
+            self._index(record)
+            
+        self._rewrite()
+        os.replace(self.legacy_path, self.legacy_path + '.migrado')
+        print(f"🔄 {len(records)} entradas migradas de {self.legacy_path} para {self.path}")
+        
+    @staticmethod
+    def _make_record(kind: str, content: str, tags: List[str], data: str = None, **extra) -> Dict:
+        """Monta uma entrada no formato do arquivo"""
+        record = {
+            'kind': kind,
+            'data': data or datetime.now().isoformat(),
+            'conteudo': content,
+            'tags': list(tags)
+        }
+        record.update(extra)
+        return record
+        
+    def _index(self, record: Dict):
+        """Adiciona uma entrada aos índices"""
+        entry_id = record['id']
+        self._entries[entry_id] = record
+        for tag in record['tags']:
+            self._tag_index.setdefault(tag.lower(), set()).add(entry_id)
+        for term in self._terms(record['conteudo']) | self._terms(' '.join(record['tags'])):
+            if term not in self._term_index:
+                self._term_index[term] = set()
+                for gram in self._grams(term):
+                    self._gram_index.setdefault(gram, set()).add(term)
+            self._term_index[term].add(entry_id)
+            
+    def _unindex(self, entry_id: int):
+        """Remove uma entrada dos índices"""
+        record = self._entries.pop(entry_id, None)
+        if record is None:
+            return
+        for tag in record['tags']:
+            ids = self._tag_index.get(tag.lower())
+            if ids:
+                ids.discard(entry_id)
+                if not ids:
+                    del self._tag_index[tag.lower()]
+        for term in self._terms(record['conteudo']) | self._terms(' '.join(record['tags'])):
+            ids = self._term_index.get(term)
+            if ids:
+                ids.discard(entry_id)
+                if not ids:
+                    del self._term_index[term]
+                    for gram in self._grams(term):
+                        terms = self._gram_index.get(gram)
+                        if terms:
+                            terms.discard(term)
+                            if not terms:
+                                del self._gram_index[gram]
+                    
+    def _append(self, records: List[Dict]):
+        """Acrescenta linhas ao arquivo"""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                
+    def _rewrite(self):
+        """Reescreve o arquivo apenas com as entradas vivas (compactação)"""
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for entry_id in sorted(self._entries):
+                f.write(json.dumps(self._entries[entry_id], ensure_ascii=False) + '\n')
+        os.replace(temp_path, self.path)
+        self._tombstones = 0
+        
+    def add(self, kind: str, content: str, tags: List[str], **extra) -> Dict:
+        """Grava uma nova entrada e aplica a política de retenção"""
+        with self._lock:
+            record = self._make_record(kind, content, tags, **extra)
+            record['id'] = self._next_id
+            self._next_id += 1
+            self._index(record)
+            
+            lines = [record]
+            expired = []
+            limit = self.limits.get(kind)
+            if limit is not None:
+                ids = sorted(entry_id for entry_id, entry in self._entries.items() if entry['kind'] == kind)
+                for expired_id in ids[:max(0, len(ids) - limit)]:
+                    expired.append(self._entries[expired_id])
+                    self._unindex(expired_id)
+                    lines.append({'id': expired_id, 'deleted': True})
+                    self._tombstones += 1
+                    
+            self._append(lines)
+            
+            # Compacta quando os marcadores de exclusão superam as entradas vivas
+            if self._tombstones > max(len(self._entries), 50):
+                self._rewrite()
+                
+        for listener in self._listeners:
+            try:
+                listener(record)
+            except Exception as e:
+                print(f"⚠️ Erro ao notificar nova dica: {e}")
+        if expired:
+            for listener in self._remove_listeners:
+                try:
+                    listener(expired)
+                except Exception as e:
+                    print(f"⚠️ Erro ao notificar dicas removidas: {e}")
+        return record
+        
+    def add_listener(self, callback, on_remove=None):
+        """Registra uma função chamada a cada nova entrada (ex.: índice vetorial)
+        
+        on_remove, se informado, recebe a lista de entradas descartadas pela
+        política de retenção.
+        """
+        self._listeners.append(callback)
+        if on_remove is not None:
+            self._remove_listeners.append(on_remove)
+            
+    def search(self, term: str) -> List[Dict]:
+        """Entradas cujo conteúdo ou tags contêm o termo
+        
+        Os candidatos vêm dos índices (trechos -> termos -> entradas, sem
+        varrer o vocabulário); apenas eles são conferidos contra o texto
+        completo. Erros resolvidos vêm antes das
+        dicas, cada grupo em ordem de gravação.
+        """
+        term_lower = term.lower().strip()
+        if not term_lower:
+            return []
+            
+        with self._lock:
+            query_terms = self._terms(term_lower)
+            candidates = None
+            for query_term in query_terms:
+                ids = set()
+                for indexed_term in self._matching_terms(query_term):
+                    ids |= self._term_index[indexed_term]
+                candidates = ids if candidates is None else candidates & ids
+                if not candidates:
+                    return []
+            if candidates is None:
+                return []
+                
+            results = []
+            for entry_id in sorted(candidates):
+                record = self._entries[entry_id]
+                if (term_lower in record['conteudo'].lower() or
+                        any(term_lower in tag.lower() for tag in record['tags'])):
+                    results.append(record)
+                    
+        kind_order = list(self.KIND_LABELS)
+        results.sort(key=lambda record: (kind_order.index(record['kind']) if record['kind'] in kind_order else len(kind_order), record['id']))
+        return results
+        
+    def _matching_terms(self, query_term: str) -> set:
+        """Termos do vocabulário que contêm query_term, pelo índice de trechos
+        
+        Termos curtos são buscados direto; os longos pela interseção dos seus
+        trechos de GRAM_SIZE caracteres, conferida no fim (poucos candidatos).
+        """
+        if len(query_term) <= self.GRAM_SIZE:
+            return set(self._gram_index.get(query_term, ()))
+        grams = sorted((query_term[i:i + self.GRAM_SIZE] for i in range(len(query_term) - self.GRAM_SIZE + 1)),
+                       key=lambda gram: len(self._gram_index.get(gram, ())))
+        terms = set(self._gram_index.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not terms:
+                break
+            terms &= self._gram_index.get(gram, set())
+        return {term for term in terms if query_term in term}
+        
+    def by_tag(self, tag: str) -> List[Dict]:
+        """Entradas com uma tag exata"""
+        with self._lock:
+            return [self._entries[entry_id] for entry_id in sorted(self._tag_index.get(tag.lower(), ()))]
+            
+    def all(self, kind: str = None) -> List[Dict]:
+        """Todas as entradas vivas, opcionalmente filtradas por tipo"""
+        with self._lock:
+            return [self._entries[entry_id] for entry_id in sorted(self._entries)
+                    if kind is None or self._entries[entry_id]['kind'] == kind]
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Efeito de Digitação do Jarvis
+Renderiza a resposta em pedaços por quadro, agendados com after() na thread principal do Tk
+"""
+
+import time
+from typing import Callable, Optional
+
+# Valores padrão do efeito
+DEFAULT_FPS = 60
+DEFAULT_CHARS_PER_SECOND = 100
+DEFAULT_INSTANT_THRESHOLD = 2000
+
+
+class TypewriterRenderer:
+    """Efeito de digitação limitado à taxa de quadros da interface
+    
+    Em vez de uma chamada ao Tk por caractere, os caracteres que vencem
+    entre dois quadros são agrupados e inseridos de uma vez, acrescentando
+    só o trecho novo ao widget. Todo o trabalho roda em callbacks de
+    root.after(), então nenhuma thread de trabalho toca no Tk.
+    
+    A mensagem é exibida de uma vez quando é longa demais, quando a janela
+    está oculta ou minimizada, ou quando uma nova mensagem começa.
+    """
+    
+    def __init__(self, root, write: Callable[[str], None], on_complete: Optional[Callable[[], None]] = None,
+                 fps: int = DEFAULT_FPS, chars_per_second: int = DEFAULT_CHARS_PER_SECOND,
+                 instant_threshold: int = DEFAULT_INSTANT_THRESHOLD, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            root: Janela Tk (usada para after/after_cancel e visibilidade)
+            write: Acrescenta um trecho de texto ao widget
+            on_complete: Chamado quando a mensagem termina de ser exibida
+            fps: Quadros por segundo do efeito
+            chars_per_second: Velocidade da digitação
+            instant_threshold: Mensagens com mais caracteres são exibidas de uma vez
+            clock: Relógio monotônico (substituível nos testes)
+        """
+        self.root = root
+        self.write = write
+        self.on_complete = on_complete
+        self.frame_ms = max(1, int(1000 / fps))
+        self.chars_per_second = chars_per_second
+        self.instant_threshold = instant_threshold
+        self.clock = clock
+        
+        self._message = ""
+        self._position = 0
+        self._started_at = 0.0
+        self._after_id = None
+        self.frames = 0
+    
+    @property
+    def active(self) -> bool:
+        """Indica se há uma mensagem em exibição"""
+        return self._position < len(self._message)
+    
+    def start(self, message: str):
+        """Começa a exibir uma mensagem (deve ser chamado na thread principal)"""
+        if self.active:
+            self.finish()
+        
+        self._message = message or ""
+        self._position = 0
+        self._started_at = self.clock()
+        self.frames = 0
+        
+        if len(self._message) > self.instant_threshold or self._is_hidden():
+            self.finish()
+        else:
+            self._tick()
+    
+    def finish(self):
+        """Exibe imediatamente o restante da mensagem atual"""
+        self._cancel_frame()
+        if not self.active:
+            return
+        self._write(len(self._message))
+        self._complete()
+    
+    def cancel(self):
+        """Interrompe o efeito sem exibir o restante"""
+        self._cancel_frame()
+        self._message = ""
+        self._position = 0
+    
+    def _tick(self):
+        """Quadro do efeito: acrescenta os caracteres vencidos desde o último quadro"""
+        self._after_id = None
+        if not self.active:
+            return
+        if self._is_hidden():
+            self.finish()
+            return
+        
+        due = int((self.clock() - self._started_at) * self.chars_per_second)
+        self._write(min(len(self._message), max(due, self._position + 1)))
+        
+        if self.active:
+            self._after_id = self.root.after(self.frame_ms, self._tick)
+        else:
+            self._complete()
+    
+    def _write(self, end: int):
+        """Acrescenta ao widget apenas o trecho ainda não exibido"""
+        delta = self._message[self._position:end]
+        self._position = end
+        self.frames += 1
+        if delta:
+            try:
+                self.write(delta)
+            except Exception as e:
+                print(f"❌ Erro no efeito de digitação: {e}")
+    
+    def _complete(self):
+        """Avisa a interface que a mensagem terminou"""
+        if self.on_complete:
+            try:
+                self.on_complete()
+            except Exception as e:
+                print(f"❌ Erro ao finalizar digitação: {e}")
+    
+    def _cancel_frame(self):
+        """Cancela o próximo quadro agendado"""
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+    
+    def _is_hidden(self) -> bool:
+        """Janela minimizada ou oculta não precisa de animação"""
+        try:
+            return not self.root.winfo_viewable()
+        except Exception:
+            return False
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Índice Vetorial Local do Jarvis
+Busca semântica (cosseno top-k) sobre fatos, dicas e conversas passadas
+"""
+
+import os
+import re
+import json
+import zlib
+import threading
+import unicodedata
+from typing import List, Dict, Optional, Iterable, Tuple
+
+import numpy as np
+
+class HashingEmbedder:
+    """Embedder offline baseado no hashing trick
+    
+    Palavras e trigramas de caracteres (sem acentos) são espalhados em um
+    vetor de dimensão fixa com sinal derivado do hash. Não exige modelo nem
+    rede; qualquer objeto com atributo dim e método embed(textos) pode
+    substituí-lo no VectorIndex.
+    """
+    
+    name = "hashing-v1"
+    
+    def __init__(self, dim: int = 256, char_ngram: int = 3):
+        self.dim = dim
+        self.char_ngram = char_ngram
+        
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Minúsculas e sem acentos"""
+        text = unicodedata.normalize('NFKD', text.lower())
+        return ''.join(ch for ch in text if not unicodedata.combining(ch))
+        
+    def _features(self, text: str) -> Iterable[Tuple[str, float]]:
+        """Gera as features (palavras com peso maior, trigramas com peso menor)"""
+        words = re.findall(r'\w+', self._normalize(text))
+        for word in words:
+            yield 'w:' + word, 1.0
+            padded = f' {word} '
+            for i in range(len(padded) - self.char_ngram + 1):
+                yield 'c:' + padded[i:i + self.char_ngram], 0.5
+                
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Converte textos em vetores normalizados (float32)"""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text):
+                # crc32 é estável entre execuções (hash() do Python não é)
+                h = zlib.crc32(feature.encode('utf-8'))
+                vectors[row, h % self.dim] += weight if (h >> 31) & 1 else -weight
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+class VectorIndex:
+    """Índice vetorial persistido em .npy mapeado em memória
+    
+    Os vetores ficam em <base>.npy (capacidade crescente, dobrada quando
+    cheia) e os metadados em <base>.jsonl, uma linha por inserção. Itens
+    são identificados por (origem, chave); reinserir a mesma chave
+    sobrescreve a linha existente. remove() grava marcadores de exclusão
+    e, quando as linhas mortas superam as vivas, compact() reescreve os
+    dois arquivos só com os itens vivos.
+    """
+    
+    INITIAL_CAPACITY = 1024
+    
+    # Linhas mortas (removidas ou sobrescritas) toleradas antes de compactar
+    MIN_STALE_TO_COMPACT = 256
+    
+    def __init__(self, base_path: str, embedder=None):
+        self.base_path = base_path
+        self.vectors_path = base_path + '.npy'
+        self.meta_path = base_path + '.jsonl'
+        self.embedder = embedder or HashingEmbedder()
+        self.dim = self.embedder.dim
+        
+        self._lock = threading.Lock()
+        self._entries = []
+        self._keys = {}
+        self._vectors = None
+        self._stale = 0
+        self._load()
+        
+    def __len__(self):
+        return len(self._keys)
+        
+    @staticmethod
+    def path_for_db(db_path: str) -> str:
+        """Caminho base do índice ao lado do banco de memória"""
+        return os.path.splitext(db_path)[0] + '_vectors'
+        
+    def _load(self):
+        """Carrega metadados e abre os vetores em modo memory-map"""
+        if not (os.path.exists(self.vectors_path) and os.path.exists(self.meta_path)):
+            self._reset()
+            return
+            
+        try:
+            vectors = np.load(self.vectors_path, mmap_mode='r+')
+            if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+                print("⚠️ Índice vetorial com dimensão diferente do embedder, recriando...")
+                del vectors
+                self._reset()
+                return
+                
+            lines = 0
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    meta = json.loads(line)
+                    row = meta.pop('row')
+                    if meta.get('deleted'):
+                        meta = None
+                    if row == len(self._entries):
+                        self._entries.append(meta)
+                    elif row < len(self._entries):
+                        self._entries[row] = meta
+                    else:
+                        break
+                    lines += 1
+                    
+            self._entries = self._entries[:vectors.shape[0]]
+            self._keys = {(meta['source'], meta['key']): row for row, meta in enumerate(self._entries) if meta}
+            self._stale = lines - len(self._keys)
+            self._vectors = vectors
+            
+        except Exception as e:
+            print(f"⚠️ Erro ao carregar índice vetorial, recriando: {e}")
+            self._reset()
+            
+    def _reset(self):
+        """Cria um índice vazio em disco"""
+        self._entries = []
+        self._keys = {}
+        self._stale = 0
+        self._vectors = np.lib.format.open_memmap(
+            self.vectors_path, mode='w+', dtype=np.float32, shape=(self.INITIAL_CAPACITY, self.dim)
+        )
+        open(self.meta_path, 'w', encoding='utf-8').close()
+        
+    def _grow(self, needed: int):
+        """Dobra a capacidade do arquivo de vetores"""
+        capacity = self._vectors.shape[0]
+        while capacity < needed:
+            capacity *= 2
+        temp_path = self.vectors_path + '.tmp'
+        grown = np.lib.format.open_memmap(temp_path, mode='w+', dtype=np.float32, shape=(capacity, self.dim))
+        count = len(self._entries)
+        grown[:count] = self._vectors[:count]
+        grown.flush()
+        del grown
+        self._vectors = None
+        os.replace(temp_path, self.vectors_path)
+        self._vectors = np.load(self.vectors_path, mmap_mode='r+')
+        
+    def add(self, source: str, items: List[Tuple[str, str]]) -> int:
+        """Indexa itens (chave, texto) de uma origem
+        
+        Returns:
+            int: Quantidade de itens novos ou alterados
+        """
+        with self._lock:
+            pending = []
+            for key, text in dict(items).items():
+                row = self._keys.get((source, key))
+                if row is not None and self._entries[row]['text'] == text:
+                    continue
+                pending.append((key, text, row))
+            if not pending:
+                return 0
+                
+            vectors = self.embedder.embed([text for _, text, _ in pending])
+            new_rows = sum(1 for _, _, row in pending if row is None)
+            if len(self._entries) + new_rows > self._vectors.shape[0]:
+                self._grow(len(self._entries) + new_rows)
+                
+            lines = []
+            for (key, text, row), vector in zip(pending, vectors):
+                if row is None:
+                    row = len(self._entries)
+                    self._entries.append(None)
+                    self._keys[(source, key)] = row
+                else:
+                    self._stale += 1
+                self._entries[row] = {'source': source, 'key': key, 'text': text}
+                self._vectors[row] = vector
+                lines.append(json.dumps({'row': row, 'source': source, 'key': key, 'text': text}, ensure_ascii=False))
+                
+            self._vectors.flush()
+            with open(self.meta_path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+            self._maybe_compact()
+            return len(pending)
+            
+    def remove(self, source: str, keys: Iterable[str]) -> int:
+        """Remove itens de uma origem (marcador de exclusão no .jsonl)
+        
+        Returns:
+            int: Quantidade de itens removidos
+        """
+        with self._lock:
+            lines = []
+            for key in set(keys):
+                row = self._keys.pop((source, key), None)
+                if row is None:
+                    continue
+                self._entries[row] = None
+                self._stale += 1
+                lines.append(json.dumps({'row': row, 'deleted': True}))
+            if not lines:
+                return 0
+                
+            with open(self.meta_path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+            self._maybe_compact()
+            return len(lines)
+            
+    def keys(self, source: str) -> List[str]:
+        """Chaves vivas de uma origem"""
+        with self._lock:
+            return [key for item_source, key in self._keys if item_source == source]
+            
+    def _maybe_compact(self):
+        """Compacta quando as linhas mortas superam as vivas"""
+        if self._stale > max(len(self._keys), self.MIN_STALE_TO_COMPACT):
+            self._compact()
+            
+    def compact(self):
+        """Reescreve vetores e metadados apenas com os itens vivos"""
+        with self._lock:
+            self._compact()
+            
+    def _compact(self):
+        """Compactação propriamente dita (chamada com o lock adquirido)"""
+        live_rows = [row for row, meta in enumerate(self._entries) if meta is not None]
+        capacity = self.INITIAL_CAPACITY
+        while capacity < len(live_rows):
+            capacity *= 2
+            
+        temp_vectors = self.vectors_path + '.tmp'
+        compacted = np.lib.format.open_memmap(temp_vectors, mode='w+', dtype=np.float32, shape=(capacity, self.dim))
+        if live_rows:
+            compacted[:len(live_rows)] = self._vectors[live_rows]
+        compacted.flush()
+        del compacted
+        
+        entries = [self._entries[row] for row in live_rows]
+        temp_meta = self.meta_path + '.tmp'
+        with open(temp_meta, 'w', encoding='utf-8') as f:
+            for row, meta in enumerate(entries):
+                f.write(json.dumps(dict(meta, row=row), ensure_ascii=False) + '\n')
+                
+        self._vectors = None
+        os.replace(temp_vectors, self.vectors_path)
+        os.replace(temp_meta, self.meta_path)
+        self._vectors = np.load(self.vectors_path, mmap_mode='r+')
+        self._entries = entries
+        self._keys = {(meta['source'], meta['key']): row for row, meta in enumerate(entries)}
+        self._stale = 0
+        
+    def search(self, query: str, k: int = 5, sources: Optional[List[str]] = None,
+               min_score: float = 0.0, skip_prefix: Optional[Tuple[str, str]] = None) -> List[Dict]:
+        """Busca os k itens mais similares (cosseno) à consulta
+        
+        skip_prefix=(origem, prefixo) ignora, antes do top-k, as chaves
+        daquela origem com o prefixo (ex.: as conversas da sessão atual).
+        """
+        with self._lock:
+            count = len(self._entries)
+            if count == 0 or not query.strip():
+                return []
+                
+            query_vector = self.embedder.embed([query])[0]
+            scores = self._vectors[:count] @ query_vector
+            
+            if sources or skip_prefix or len(self._keys) < count:
+                mask = np.fromiter((meta is not None and (not sources or meta['source'] in sources)
+                                    and not (skip_prefix and meta['source'] == skip_prefix[0]
+                                             and meta['key'].startswith(skip_prefix[1]))
+                                    for meta in self._entries), dtype=bool, count=count)
+                scores = np.where(mask, scores, -np.inf)
+                
+            k = min(k, count)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            
+            results = []
+            for row in top:
+                score = float(scores[row])
+                if score <= min_score:
+                    break
+                meta = self._entries[row]
+                results.append({'source': meta['source'], 'key': meta['key'], 'text': meta['text'], 'score': score})
+            return results
+            
+    def close(self):
+        """Libera o memory-map"""
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+                self._vectors = None
@@ -17,6 +17,7 @@ try:
     from core import JarvisCore
     from actions import SystemActions
     from logger import JarvisLogger
+    from jarvis_memory import MemoryManager
 except ImportError as e:
     # Tratamento de erro crítico de importação
     base_path = os.path.dirname(os.path.abspath(__file__))
@@ -50,18 +51,27 @@ def main():
         # Inicialização dos componentes principais
         logger = JarvisLogger()
         actions = SystemActions(logger)
-        core = JarvisCore(logger)
+        memory = MemoryManager(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jarvis_memory.db'))
+        core = JarvisCore(logger, memory)
+        
+        # Aquece clima, dólar, notícias e processos conforme a frequência de uso
+        actions.start_prefetch(memory.memory)
         
         # Inicialização da interface
         app = JarvisGUI(logger, actions, core)
         
         print("🚀 J.A.R.V.I.S. iniciado com sucesso!")
         print("📋 Versão: Professional - Modular Architecture")
-        print("🔧 Componentes: GUI, Core, Actions, Logger")
+        print("🔧 Componentes: GUI, Core, Actions, Logger, Memory")
         
         # Inicia o loop principal
         app.run()
         
+        # Grava as escritas pendentes da memória e o cache de respostas
+        actions.stop_prefetch()
+        memory.close()
+        core.close()
+        
     except KeyboardInterrupt:
         print("\n👋 J.A.R.V.I.S. encerrado pelo usuário.")
         sys.exit(0)
@@ -5,6 +5,7 @@ Permite controle remoto via Telegram com segurança máxima
 """
 
 import asyncio
+import functools
 import logging
 import os
 import tempfile
@@ -17,6 +18,8 @@ from telegram import Update, BotCommand
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
 import json
 
+from jarvis_hardware import get_hardware_sampler
+
 # Configuração de logging
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -162,6 +165,7 @@ class MobileBridge:
 🎤 **Reconhecimento de Voz:** ✅ Ativo
 📸 **Captura de Tela:** ✅ Ativa
 🤖 **Jarvis Conectado:** {'Sim' if self.jarvis_instance else 'Não'}
+🖥️ **Hardware:** {get_hardware_sampler().status_line()}
 
 **Comandos Disponíveis:**
 /start - Inicialização
@@ -270,8 +274,9 @@ class MobileBridge:
         try:
             if self.jarvis_instance and hasattr(self.jarvis_instance, 'process_command'):
                 # Se Jarvis tiver método de processamento
+                # Origem "mobile": faixa de menor prioridade, atrás da voz local
                 return await asyncio.get_event_loop().run_in_executor(
-                    None, self.jarvis_instance.process_command, command
+                    None, functools.partial(self.jarvis_instance.process_command, command, source="mobile")
                 )
             else:
                 # Resposta simulada baseada em comandos conhecidos
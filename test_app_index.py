@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Teste do Índice de Executáveis do Jarvis
+Valida a varredura, a consulta, a persistência e a atualização incremental sobre uma árvore de pastas temporária
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_app_index import AppIndex
+
+def _touch(path, mtime=None):
+    """Cria um arquivo vazio (e as pastas do caminho)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+def _fixture():
+    """Árvore com a mesma forma das pastas do Windows, portátil para qualquer sistema"""
+    base = tempfile.mkdtemp()
+    program_files = os.path.join(base, "Program Files")
+    local = os.path.join(base, "AppData", "Local")
+    system32 = os.path.join(base, "Windows", "System32")
+    
+    _touch(os.path.join(system32, "notepad.exe"))
+    _touch(os.path.join(system32, "calc.exe"))
+    _touch(os.path.join(program_files, "Notepad++", "notepad++.exe"))
+    _touch(os.path.join(program_files, "Google", "Chrome", "Application", "chrome.exe"))
+    _touch(os.path.join(local, "Discord", "app-1.0.9", "Discord.exe"), mtime=1_000_000)
+    _touch(os.path.join(local, "Discord", "app-1.0.10", "Discord.exe"), mtime=2_000_000)
+    _touch(os.path.join(local, "Programs", "Microsoft VS Code", "Code.exe"))
+    _touch(os.path.join(local, "Programs", "Obs-Studio", "obs-studio.exe"))
+    _touch(os.path.join(local, "Programs", "tool", "node_modules", "electron.exe"))
+    _touch(os.path.join(program_files, "Notepad++", "readme.txt"))
+    return base, [program_files, local, system32]
+
+def test_scan_and_lookup():
+    """Testa a consulta por nome, variações, cópia mais recente e trecho do nome"""
+    print("🗂️ Testando varredura e consulta...")
+    base, roots = _fixture()
+    index = AppIndex(roots, cache_path=None)
+    stats = index.refresh()
+    
+    assert stats['executables'] == 8
+    assert index.find("notepad").endswith(os.path.join("System32", "notepad.exe"))
+    assert index.find("Notepad++").endswith("notepad++.exe")
+    assert index.find("obs studio").endswith("obs-studio.exe")
+    assert index.find("chrome.exe").endswith("chrome.exe")
+    assert index.find("electron") is None  # node_modules é ignorada
+    assert index.find("photoshop") is None
+    assert os.path.join("app-1.0.10", "Discord.exe") in index.find_latest("Discord.exe")
+    assert sorted(os.path.basename(p) for p in index.search("note")) == ["notepad++.exe", "notepad.exe"]
+    print(f"✅ Catálogo: {stats}")
+
+def test_persistence_and_incremental_refresh():
+    """Testa o catálogo salvo e a releitura apenas das pastas alteradas"""
+    print("🔁 Testando atualização incremental...")
+    base, roots = _fixture()
+    cache_path = os.path.join(base, "jarvis_app_index.json")
+    first = AppIndex(roots, cache_path=cache_path).refresh()
+    
+    # Novo processo: o catálogo já está disponível antes da varredura
+    index = AppIndex(roots, cache_path=cache_path)
+    assert index.ready.is_set() and index.find("code")
+    
+    stats = index.refresh()
+    assert stats['scanned_dirs'] == 0
+    assert stats['reused_dirs'] == first['scanned_dirs']
+    
+    # Instala um aplicativo: só a pasta alterada é lida de novo
+    spotify_dir = os.path.join(roots[1], "Spotify")
+    _touch(os.path.join(spotify_dir, "Spotify.exe"))
+    parent_mtime = time.time() + 10
+    os.utime(roots[1], (parent_mtime, parent_mtime))
+    stats = index.refresh()
+    assert stats['scanned_dirs'] == 2  # AppData\Local e a nova pasta Spotify
+    assert index.find("spotify").endswith("Spotify.exe")
+    
+    # Remove: some do catálogo
+    os.remove(os.path.join(roots[2], "calc.exe"))
+    system32_mtime = time.time() + 20
+    os.utime(roots[2], (system32_mtime, system32_mtime))
+    stats = index.refresh()
+    assert stats['scanned_dirs'] == 1 and index.find("calc") is None
+    print(f"✅ Última atualização: {stats['scanned_dirs']} pasta(s) lida(s), {stats['reused_dirs']} reaproveitadas")
+
+def test_lookup_is_fast():
+    """Testa que a consulta leva poucos milissegundos com 10 mil executáveis"""
+    print("⚡ Testando tempo de consulta...")
+    base = tempfile.mkdtemp()
+    for i in range(500):
+        for j in range(20):
+            _touch(os.path.join(base, f"Vendor{i}", f"app{i}_{j}.exe"))
+    index = AppIndex([base], cache_path=None)
+    stats = index.refresh()
+    assert stats['executables'] == 10_000
+    
+    start = time.perf_counter()
+    for i in range(1000):
+        assert index.find(f"app{i % 500}_7")
+    find_ms = (time.perf_counter() - start) * 1000 / 1000
+    
+    start = time.perf_counter()
+    results = index.search("app499_1", limit=3)
+    search_ms = (time.perf_counter() - start) * 1000
+    
+    assert results and find_ms < 1 and search_ms < 50
+    print(f"✅ find: {find_ms:.3f} ms por consulta; search: {search_ms:.2f} ms; varredura {stats['last_refresh_ms']:.0f} ms")
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste do Índice de Executáveis")
+    print("=" * 60)
+    
+    test_scan_and_lookup()
+    test_persistence_and_incremental_refresh()
+    test_lookup_is_fast()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Teste da Busca Aproximada de Aplicativos do Jarvis
+Valida erros de digitação, nomes contidos na frase, o catálogo e a ausência de falsos positivos
+"""
+
+import os
+import sys
+import time
+import random
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_app_matcher import FuzzyAppMatcher, bounded_edit_distance, normalize_app_name, is_system_path
+
+# Amostra do mapeamento estrito de SystemActions (sem as entradas de erro de digitação)
+SYNONYMS = {
+    'bloco': 'notepad.exe',
+    'notas': 'notepad.exe',
+    'bloco notas': 'notepad.exe',
+    'calculadora': 'calc.exe',
+    'cmd': 'cmd.exe',
+    'powershell': 'powershell.exe',
+    'power shell': 'powershell.exe',
+    'paint': 'mspaint.exe',
+    'store': 'ms-windows-store:',
+    'som': 'ms-settings:sound',
+    'data': 'ms-settings:dateandtime',
+}
+
+CATALOG = [
+    ("spotify", r"C:\Users\breno\AppData\Roaming\Spotify\Spotify.exe"),
+    ("chrome", r"C:\Program Files\Google\Chrome\Application\chrome.exe"),
+    ("discord", r"C:\Users\breno\AppData\Local\Discord\app-1.0.10\Discord.exe"),
+    ("obs64", r"C:\Program Files\obs-studio\bin\64bit\obs64.exe"),
+    ("notepad++", r"C:\Program Files\Notepad++\notepad++.exe"),
+]
+
+def _levenshtein(a, b):
+    """Distância de edição completa, para conferir a versão limitada"""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+def test_bounded_edit_distance():
+    """Testa a distância limitada contra a distância completa"""
+    print("📏 Testando distância de edição limitada...")
+    rng = random.Random(7)
+    alphabet = "abcde"
+    for _ in range(2000):
+        a = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+        b = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+        limit = rng.randint(0, 3)
+        expected = _levenshtein(a, b)
+        assert bounded_edit_distance(a, b, limit) == (expected if expected <= limit else None), (a, b, limit)
+    assert normalize_app_name("  Bloco-de_Notas ") == "bloco de notas"
+    assert normalize_app_name("Configurações") == "configuracoes"
+    print("✅ Distância idêntica à de Levenshtein dentro do limite")
+
+def test_typos_and_containment():
+    """Testa erros de digitação e nomes contidos na frase"""
+    print("⌨️ Testando erros de digitação...")
+    matcher = FuzzyAppMatcher(SYNONYMS, CATALOG)
+    
+    expected = {
+        "blocde notas": "notepad.exe",
+        "bloc notas": "notepad.exe",
+        "powershel": "powershell.exe",
+        "calculadra": "calc.exe",
+        "spotfy": CATALOG[0][1],
+        "crome": CATALOG[1][1],
+        "discrod": CATALOG[2][1],
+        "abrir o paint agora": "mspaint.exe",
+    }
+    for query, target in expected.items():
+        candidate = matcher.best(query)
+        assert candidate and candidate.target == target, f"'{query}': {candidate}"
+    
+    exact = matcher.best("Bloco Notas")
+    assert exact.score == 1.0 and exact.reason == "exato"
+    assert matcher.best("powershel").reason == "digitação"
+    assert matcher.best("abrir o paint agora").reason == "contido"
+    print(f"✅ {len(expected)} consultas resolvidas")
+
+def test_no_false_positives():
+    """Testa que nomes desconhecidos e palavras parecidas não abrem nada"""
+    print("🚫 Testando falsos positivos...")
+    matcher = FuzzyAppMatcher(SYNONYMS, CATALOG)
+    for query in ["photoshop", "word", "database", "somente leitura", "xyz", ""]:
+        assert matcher.best(query) is None, f"'{query}': {matcher.best(query)}"
+    print("✅ Nenhum aplicativo aberto por engano")
+
+def test_system_tools_never_fuzzy():
+    """Testa que erros de digitação não chegam a ferramentas da pasta do Windows"""
+    print("🛡️ Testando ferramentas do sistema...")
+    system32 = [(name, f"C:\\Windows\\System32\\{name}.exe") for name in ("logoff", "format", "mode", "reagentc")]
+    catalog = [(name, path) for name, path in system32 + CATALOG if not is_system_path(path, (r"C:\Windows",))]
+    assert catalog == CATALOG
+    matcher = FuzzyAppMatcher(SYNONYMS, catalog)
+    
+    for query in ["logout", "logof", "formatar", "code", "reagent"]:
+        assert matcher.best(query, sources=('synonym',)) is None, query
+        assert all(not is_system_path(c.target, (r"C:\Windows",)) for c in matcher.match(query)), query
+    
+    # Só sinônimos: o catálogo fica para depois do PATH e das pastas conhecidas
+    assert matcher.best("spotfy", sources=('synonym',)) is None
+    assert matcher.best("spotfy", sources=('catalog',)).target == CATALOG[0][1]
+    assert matcher.best("Spotify", sources=('catalog',)).reason == "exato"
+    assert matcher.best("calculadra", sources=('synonym',)).target == "calc.exe"
+    print("✅ Nenhuma ferramenta do sistema aberta por aproximação")
+
+def test_catalog_refresh_and_speed():
+    """Testa a troca do catálogo e o tempo de consulta com 10 mil executáveis"""
+    print("⚡ Testando catálogo grande...")
+    matcher = FuzzyAppMatcher(SYNONYMS)
+    assert matcher.best("spotfy") is None
+    
+    rng = random.Random(3)
+    syllables = ["ka", "ro", "mi", "te", "lu", "sa", "vo", "ne", "di", "pa", "zor", "gen"]
+    catalog = [("".join(rng.choice(syllables) for _ in range(rng.randint(2, 5))) + str(i), f"C:\\Apps\\{i}.exe")
+               for i in range(10_000)] + CATALOG
+    matcher.set_catalog(catalog, generation=1)
+    assert matcher.generation == 1
+    assert matcher.best("calculadra").target == "calc.exe"  # sinônimos continuam
+    
+    start = time.perf_counter()
+    for _ in range(200):
+        candidate = matcher.best("spotfy")
+    elapsed_ms = (time.perf_counter() - start) * 1000 / 200
+    assert candidate.target == CATALOG[0][1]
+    assert elapsed_ms < 20
+    print(f"✅ {len(matcher)} nomes indexados, {elapsed_ms:.2f} ms por consulta")
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste da Busca Aproximada de Aplicativos")
+    print("=" * 60)
+    
+    test_bounded_edit_distance()
+    test_typos_and_containment()
+    test_no_false_positives()
+    test_system_tools_never_fuzzy()
+    test_catalog_refresh_and_speed()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
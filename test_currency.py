@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Teste da Tabela de Cotações do Jarvis
+Valida o download único de todos os tickers, as taxas cruzadas e a tabela servida da memória
+"""
+
+import os
+import sys
+import time
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_currency import CurrencyService, CURRENCY_NAMES, yahoo_ticker
+
+CLOSES = {'USDBRL=X': 5.0, 'EURBRL=X': 5.5, 'GBPBRL=X': 6.4, 'MXNBRL=X': 0.3, 'BTC-BRL': 350000.0}
+
+class FakeDownloader:
+    """Simula o yf.download: devolve os fechamentos pedidos e conta as chamadas"""
+    
+    def __init__(self, closes=None, delay=0.0):
+        self.closes = dict(CLOSES if closes is None else closes)
+        self.delay = delay
+        self.calls = []
+    
+    def __call__(self, tickers):
+        self.calls.append(sorted(tickers))
+        time.sleep(self.delay)
+        if self.closes is None:
+            raise ConnectionError("Yahoo Finance fora do ar")
+        return {ticker: self.closes[ticker] for ticker in tickers if ticker in self.closes}
+
+def test_single_download_for_all_pairs():
+    """Testa que dólar, euro e bitcoin em sequência saem de um único download"""
+    print("💱 Testando download em lote...")
+    downloader = FakeDownloader()
+    service = CurrencyService(fetcher=downloader)
+    
+    assert service.rate('USD') == (5.0, service.table()['fetched_at'])
+    assert service.rate(CURRENCY_NAMES['euro'])[0] == 5.5
+    assert service.rate('btc')[0] == 350000.0
+    assert service.rate('BRL')[0] == 1.0
+    assert len(downloader.calls) == 1
+    assert downloader.calls[0] == sorted(CLOSES)  # BTC-BRL, não BTCBRL=X
+    assert yahoo_ticker('BTC') == 'BTC-BRL' and yahoo_ticker('EUR', 'USD') == 'EURUSD=X'
+    print(f"✅ 1 download para 4 perguntas: {downloader.calls[0]}")
+
+def test_cross_rates_and_missing():
+    """Testa pares cruzados, moedas fora da tabela e moedas sem cotação no download"""
+    print("🔀 Testando taxas cruzadas...")
+    closes = dict(CLOSES)
+    del closes['GBPBRL=X']
+    service = CurrencyService(fetcher=FakeDownloader(closes))
+    
+    assert abs(service.rate('EUR', 'USD')[0] - 1.1) < 1e-9
+    assert abs(service.rate('BRL', 'USD')[0] - 0.2) < 1e-9
+    assert abs(service.rate('BTC', 'EUR')[0] - 350000.0 / 5.5) < 1e-6
+    assert service.rate('GBP') is None and service.rate('JPY') is None
+    assert service.get_stats()['missing'] == ['GBP']
+    
+    # Download sem nenhuma cotação é erro (nada de tabela vazia no cache)
+    empty = CurrencyService(fetcher=FakeDownloader({}))
+    try:
+        empty.rate('USD')
+        assert False, "deveria falhar"
+    except ValueError:
+        pass
+    print("✅ EUR/USD = 1.1, BRL/USD = 0.2; GBP ausente informado")
+
+def test_table_served_from_memory():
+    """Testa a leitura sem rede (peek), a renovação da tabela inteira e falhas que mantêm a anterior"""
+    print("⚡ Testando tabela em memória...")
+    downloader = FakeDownloader(delay=0.2)
+    service = CurrencyService(ttl=60, fetcher=downloader)
+    assert service.peek('USD') is None and not downloader.calls
+    
+    service.refresh()
+    start = time.perf_counter()
+    for code in ('USD', 'EUR', 'BTC', 'MXN'):
+        assert service.peek(code) and service.rate(code)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert elapsed_ms < 10 and len(downloader.calls) == 1
+    
+    # Renovação: a tabela inteira muda de uma vez
+    downloader.closes['USDBRL=X'] = 5.2
+    service.refresh()
+    assert service.rate('USD')[0] == 5.2 and len(downloader.calls) == 2
+    
+    # Falha na renovação: a exceção sobe e a tabela anterior continua valendo
+    downloader.closes = None
+    try:
+        service.refresh()
+        assert False, "deveria falhar"
+    except ConnectionError:
+        pass
+    assert service.rate('USD')[0] == 5.2
+    print(f"✅ 8 leituras em {elapsed_ms:.2f} ms (download: 200 ms)")
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste da Tabela de Cotações")
+    print("=" * 60)
+    
+    test_single_download_for_all_pairs()
+    test_cross_rates_and_missing()
+    test_table_served_from_memory()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
@@ -80,20 +80,16 @@ def test_memoria_json():
             print(f"❌ Erro ao salvar dica: {save_error}")
         
         # Verifica se o arquivo foi criado
-        if os.path.exists('memoria_jarvis.json'):
-            print("✅ Arquivo memoria_jarvis.json criado")
+        if os.path.exists('memoria_jarvis.jsonl'):
+            print("✅ Arquivo memoria_jarvis.jsonl criado")
             
             # Verifica conteúdo
-            import json
-            with open('memoria_jarvis.json', 'r', encoding='utf-8') as f:
-                dados = json.load(f)
-            
-            if 'dicas_importantes' in dados:
+            if handler.tip_store.all('dica'):
                 print("✅ Estrutura de dicas importante criada")
             else:
                 print("❌ Estrutura de dicas não encontrada")
         else:
-            print("❌ Arquivo memoria_jarvis.json não criado")
+            print("❌ Arquivo memoria_jarvis.jsonl não criado")
         
         return True
         
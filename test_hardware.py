@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Teste do Amostrador de Hardware do Jarvis
+Valida o buffer circular, as janelas de mín./méd./máx. e o top de processos sem bloquear
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_hardware import HardwareSampler, RingBuffer, PSUTIL_AVAILABLE
+
+def _sample(sampler, cpu, timestamp):
+    """Grava uma amostra com CPU variável e RAM/disco fixos"""
+    sampler.record(timestamp=timestamp, cpu=cpu, ram=50.0, ram_used_gb=8.0, ram_total_gb=16.0,
+                   disk=70.0, disk_used_gb=350.0, disk_total_gb=500.0)
+
+def test_ring_buffer_wraps_in_order():
+    """Testa a sobrescrita das amostras antigas e a ordem cronológica da janela"""
+    print("🔁 Testando buffer circular...")
+    buffer = RingBuffer(capacity=5)
+    assert buffer.latest() is None
+    for i in range(8):
+        buffer.append(i, timestamp=1000.0 + i)
+    
+    timestamps, values = buffer.window()
+    assert len(buffer) == 5
+    assert values[:, 0].tolist() == [3, 4, 5, 6, 7]
+    assert timestamps.tolist() == [1003.0, 1004.0, 1005.0, 1006.0, 1007.0]
+    assert buffer.latest()[0] == 7
+    
+    # Janela dos últimos 2 s a partir de 1007
+    _, recent = buffer.window(seconds=2, now=1007.0)
+    assert recent[:, 0].tolist() == [5, 6, 7]
+    print("✅ Buffer mantém as 5 amostras mais recentes")
+
+def test_window_summary():
+    """Testa mín./méd./máx. por janela e a linha de status"""
+    print("📈 Testando resumo por janela...")
+    sampler = HardwareSampler(history=100)
+    assert sampler.summary() == {} and not sampler.is_ready()
+    assert "Coletando" in sampler.status_line()
+    
+    now = time.time()
+    for i, cpu in enumerate([90.0, 10.0, 20.0, 30.0]):
+        _sample(sampler, cpu, now - 30 + i * 10)  # amostras há 30, 20, 10 e 0 s
+    
+    last_25s = sampler.summary(window=25)
+    assert last_25s['samples'] == 3
+    assert last_25s['cpu'] == {'last': 30.0, 'min': 10.0, 'avg': 20.0, 'max': 30.0}
+    assert sampler.summary(window=60)['cpu']['max'] == 90.0
+    assert sampler.summary(window=60)['ram_total_gb']['last'] == 16.0
+    
+    timestamps, cpu = sampler.series('cpu')
+    assert cpu.tolist() == [90.0, 10.0, 20.0, 30.0] and np.all(np.diff(timestamps) > 0)
+    assert sampler.status_line(window=60) == "CPU 30% (méd 38% · máx 90%) | RAM 50% | Disco 70%"
+    print(f"✅ {sampler.status_line(window=60)}")
+
+def test_top_processes_and_history():
+    """Testa o top de processos e o histórico de RSS só dos maiores"""
+    print("📊 Testando processos...")
+    sampler = HardwareSampler(history=100, process_every=1, max_tracked=2)
+    sampler.record_processes([(10, "chrome.exe", 900.0), (20, "code.exe", 400.0),
+                              (30, "python.exe", 120.0), (40, "discord.exe", 650.0)], timestamp=1000.0)
+    sampler.record_processes([(10, "chrome.exe", 950.0), (20, "code.exe", 700.0),
+                              (40, "discord.exe", 600.0)], timestamp=1002.0)
+    
+    top = sampler.top_processes(2)
+    assert [(proc['name'], proc['memory']) for proc in top] == [("chrome.exe", 950.0), ("code.exe", 700.0)]
+    assert len(sampler.top_processes(10)) == 3
+    assert sampler.snapshot_time == 1002.0
+    
+    # chrome acompanhado nas duas leituras; discord saiu do top 2 e perdeu o histórico
+    assert sampler.process_history(10)[1].tolist() == [900.0, 950.0]
+    assert sampler.process_history(20)[1].tolist() == [700.0]
+    assert sampler.process_history(40)[1].size == 0
+    assert sampler.get_stats()['tracked_processes'] == 2
+    print(f"✅ Top: {[proc['name'] for proc in top]}")
+
+def test_reads_do_not_block():
+    """Testa que status e top de processos são leituras instantâneas"""
+    print("⚡ Testando tempo de leitura...")
+    sampler = HardwareSampler(history=1800)
+    now = time.time()
+    for i in range(1800):
+        _sample(sampler, float(i % 100), now - 1800 + i)
+    sampler.record_processes([(pid, f"proc{pid}", float(pid)) for pid in range(1, 400)])
+    
+    start = time.perf_counter()
+    for _ in range(100):
+        sampler.summary(window=60)
+        sampler.top_processes(5)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / 100
+    assert elapsed_ms < 5
+    
+    if PSUTIL_AVAILABLE:
+        sampler.sample_once()
+        assert sampler.summary(window=5)['cpu']['last'] >= 0
+    print(f"✅ {elapsed_ms:.3f} ms por status + top 5 (antes: ≥ 1000 ms pelo cpu_percent(interval=1))")
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste do Amostrador de Hardware")
+    print("=" * 60)
+    
+    test_ring_buffer_wraps_in_order()
+    test_window_summary()
+    test_top_processes_and_history()
+    test_reads_do_not_block()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
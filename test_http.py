@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Teste do Cliente HTTP do Jarvis
+Valida o cache por TTL, o stale-while-revalidate e as novas tentativas contra um servidor HTTP local
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_http import TTLCache, REQUESTS_AVAILABLE
+
+class StubServer:
+    """Servidor HTTP local com respostas previsíveis e contagem de requisições
+    
+    Rotas:
+        /weather?delay=s  JSON com o número da requisição (opcionalmente lento)
+        /flaky?fail=n     503 nas n primeiras requisições, depois 200
+        /missing          404
+    """
+    
+    def __init__(self):
+        self.hits = {}
+        self.lock = threading.Lock()
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+            
+            def do_GET(self):
+                path, _, query = self.path.partition('?')
+                params = dict(item.split('=', 1) for item in query.split('&') if '=' in item)
+                with stub.lock:
+                    stub.hits[path] = stub.hits.get(path, 0) + 1
+                    count = stub.hits[path]
+                
+                if path == '/weather':
+                    time.sleep(float(params.get('delay', 0)))
+                    self._reply(200, {'temp_C': 20 + count, 'request': count})
+                elif path == '/flaky':
+                    failures = int(params.get('fail', 0))
+                    self._reply(503 if count <= failures else 200, {'request': count})
+                else:
+                    self._reply(404, {'error': 'not found'})
+            
+            def _reply(self, status, payload):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+    
+    def count(self, path):
+        with self.lock:
+            return self.hits.get(path, 0)
+    
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def _fetch_json(url):
+    """Busca sem o requests (urllib), para testar o cache isoladamente"""
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return json.loads(response.read())
+
+def _wait_for(condition, timeout=3.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_ttl_and_stale_while_revalidate():
+    """Testa acerto dentro do TTL e resposta antiga imediata com atualização em segundo plano"""
+    print("⏱️ Testando TTL e stale-while-revalidate...")
+    stub = StubServer()
+    try:
+        cache = TTLCache()
+        url = f"{stub.url}/weather?delay=0.3"
+        fetch = lambda: _fetch_json(url)
+        
+        first = cache.get_or_fetch('weather', fetch, ttl=0.5, stale_ttl=10)
+        assert cache.get_or_fetch('weather', fetch, ttl=0.5, stale_ttl=10) == first
+        assert stub.count('/weather') == 1
+        
+        # Vencido: a resposta antiga volta na hora, sem esperar os 0.3 s do servidor
+        time.sleep(0.6)
+        start = time.perf_counter()
+        stale = cache.get_or_fetch('weather', fetch, ttl=0.5, stale_ttl=10)
+        stale_ms = (time.perf_counter() - start) * 1000
+        assert stale == first and stale_ms < 100
+        
+        # Uma atualização só, mesmo com várias perguntas durante ela
+        for _ in range(5):
+            cache.get_or_fetch('weather', fetch, ttl=0.5, stale_ttl=10)
+        assert _wait_for(lambda: cache.get_stats()['refreshes'] == 1)
+        assert stub.count('/weather') == 2
+        assert cache.get_or_fetch('weather', fetch, ttl=0.5, stale_ttl=10)['request'] == 2
+        
+        # Velho demais: busca na hora
+        assert cache.get_or_fetch('weather', fetch, ttl=0, stale_ttl=0)['request'] == 3
+        stats = cache.get_stats()
+        assert stats['stale_hits'] == 6 and stats['misses'] == 2
+        print(f"✅ Resposta vencida em {stale_ms:.1f} ms; estatísticas: {stats}")
+    finally:
+        stub.close()
+
+def test_single_flight_and_errors():
+    """Testa uma busca por chave com chamadas simultâneas e falhas que não apagam o cache"""
+    print("🧵 Testando buscas simultâneas e falhas...")
+    stub = StubServer()
+    try:
+        cache = TTLCache()
+        url = f"{stub.url}/weather?delay=0.2"
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch('w', lambda: _fetch_json(url), 60)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(results) == 8 and stub.count('/weather') == 1
+        
+        # Falha na busca: a exceção sobe e nada é guardado
+        def broken():
+            return _fetch_json(f"{stub.url}/missing")
+        try:
+            cache.get_or_fetch('missing', broken, 60)
+            assert False, "deveria falhar"
+        except Exception:
+            pass
+        assert cache.age('missing') is None
+        
+        # Falha na atualização em segundo plano: o valor antigo continua valendo
+        cache.get_or_fetch('keep', lambda: "antigo", ttl=0.05)
+        time.sleep(0.1)
+        assert cache.get_or_fetch('keep', broken, ttl=0.05, stale_ttl=10) == "antigo"
+        assert _wait_for(lambda: cache.get_stats()['errors'] == 1)
+        assert cache.get_or_fetch('keep', lambda: "novo", ttl=0.05, stale_ttl=10) == "antigo"
+        assert _wait_for(lambda: cache.get_or_fetch('keep', lambda: "novo", ttl=60) == "novo")
+        print("✅ Uma requisição para 8 chamadas; falhas preservam o valor antigo")
+    finally:
+        stub.close()
+
+def test_http_client_retry_and_cache():
+    """Testa a sessão compartilhada: novas tentativas em 503 e cache só de respostas 200"""
+    print("🌐 Testando HttpClient...")
+    if not REQUESTS_AVAILABLE:
+        print("⚠️ requests não disponível - teste ignorado")
+        return
+    from jarvis_http import HttpClient
+    
+    stub = StubServer()
+    try:
+        client = HttpClient(retries=3, backoff=0.01)
+        
+        response = client.get(f"{stub.url}/flaky", params={'fail': 2}, ttl=60)
+        assert response.status_code == 200 and stub.count('/flaky') == 3
+        assert client.get(f"{stub.url}/flaky", params={'fail': 2}, ttl=60).json() == response.json()
+        assert stub.count('/flaky') == 3
+        
+        # 404 não vai para o cache
+        assert client.get(f"{stub.url}/missing", ttl=60).status_code == 404
+        assert client.get(f"{stub.url}/missing", ttl=60).status_code == 404
+        assert stub.count('/missing') == 2
+        
+        # Sem ttl: sempre vai ao servidor, pela mesma sessão
+        client.get(f"{stub.url}/weather")
+        client.get(f"{stub.url}/weather")
+        assert stub.count('/weather') == 2
+        print(f"✅ Estatísticas do cache: {client.get_stats()}")
+    finally:
+        stub.close()
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste do Cliente HTTP")
+    print("=" * 60)
+    
+    test_ttl_and_stale_while_revalidate()
+    test_single_flight_and_errors()
+    test_http_client_retry_and_cache()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Teste do Roteador de Intenções do Jarvis
+Valida o autômato, a precedência de cada tabela e a extração de parâmetros
+"""
+
+import os
+import sys
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_intents import IntentRouter, IntentRule, KeywordAutomaton
+
+# Frases dos testes e exemplos do projeto com a intenção esperada em cada tabela
+REGRESSION_CORPUS = [
+    ('gui', "Jarvis, desligue o computador", "power_shutdown"),
+    ('gui', "reinicie o pc", "power_restart"),
+    ('gui', "verificar atualizações", "check_updates"),
+    ('gui', "volume em 50", "volume_set"),
+    ('gui', "status do sistema", "system_status"),
+    ('gui', "tire um screenshot", "screenshot"),
+    ('gui', "gerar senha de 20 caracteres", "password"),
+    ('gui', "me lembre em 10 minutos de beber água", "reminder"),
+    ('gui', "Jarvis, me dá o briefing", "briefing"),
+    ('gui', "resumo do dia com as notícias", "briefing"),
+    ('gui', "Como está o clima hoje?", "weather"),
+    ('gui', "quais as notícias", "news"),
+    ('gui', "cotação do dólar", "currency_usd"),
+    ('gui', "quanto vale o bitcoin", "currency"),
+    ('gui', "esvaziar lixeira", "empty_recycle_bin"),
+    ('gui', "mais brilho", "brightness_up"),
+    ('gui', "escurecer a tela", "brightness_down"),
+    ('gui', "top processos", "top_processes"),
+    ('gui', "tocar lofi hip hop", "play_music"),
+    ('gui', "pomodoro", "pomodoro"),
+    ('gui', "Jarvis, abra o Discord", "open_app"),
+    ('gui', "abra o bloco de notas", "open_app"),
+    ('gui', "bloco de notas", "open_direct_app"),
+    ('gui', "explique recursão", None),
+    ('controller', "Jarvis, protocolo silêncio!", "emergency_silence"),
+    ('controller', "Jarvis, abra o Discord", "universal_app"),
+    ('controller', "Jarvis, aumente o volume", None),
+    ('controller', "Jarvis, aumentar o volume", "volume"),
+    ('controller', "baixar brilho", "brightness"),
+    ('controller', "desligar o computador", "power_shutdown"),
+    ('controller', "hibernar", "power_suspend"),
+    ('controller', "checar atualizações", "check_updates"),
+    ('actions', "menu", "menu"),
+    ('actions', "modo estudo", "study_mode"),
+    ('actions', "por que falhou?", "debugger"),
+    ('actions', "lembra daquela dica python", "search_tip"),
+    ('actions', "salvar dica: Sempre use try/except", "save_tip"),
+    ('actions', "quero salvar dica: x", None),
+    ('actions', "desativar modo gamer", "gamer_mode"),
+    ('actions', "git: Correção de bug no login", "git_commit"),
+    ('actions', "olhe a tela", "screen_analysis"),
+    ('actions', "gere um código python que soma dois números", "generate_code"),
+    ('actions', "explique o erro", "explain_error"),
+    ('actions', "Como está o clima hoje?", None),
+    ('local', "ative o modo gamer", "gamer_mode"),
+    ('local', "limpar cache", "cleanup"),
+    ('local', "protocolo de encerramento", "cleanup_shutdown"),
+    ('local', "Festa em casa!", "easter_egg"),
+    ('local', "meu nome é Breno", None),
+    ('priority', "Jarvis, protocolo silêncio!", "emergency"),
+    ('priority', "confirmo", "emergency"),
+    ('priority', "limpar temporários", "background"),
+    ('priority', "abrir chrome", None),
+]
+
+def test_automaton_finds_all_occurrences():
+    """Testa o Aho–Corasick contra a busca ingênua, com sobreposições"""
+    print("🔎 Testando autômato...")
+    keywords = ["he", "she", "his", "hers", "abra", "abra o", "bra"]
+    automaton = KeywordAutomaton((keyword, keyword) for keyword in keywords)
+    text = "ushers abra o bloco, she said his hershey"
+    
+    found = sorted(automaton.search(text))
+    expected = sorted(
+        (start, keyword)
+        for keyword in keywords
+        for start in range(len(text))
+        if text.startswith(keyword, start)
+    )
+    assert found == expected
+    print(f"✅ {len(found)} ocorrências encontradas em uma passada")
+
+def test_regression_corpus():
+    """Testa a intenção de cada frase do corpus na sua tabela"""
+    print("📚 Testando corpus de regressão...")
+    routers = {scope: IntentRouter.for_scope(scope) for scope in ('gui', 'controller', 'actions', 'local', 'priority')}
+    for scope, phrase, expected in REGRESSION_CORPUS:
+        match = routers[scope].classify(phrase)
+        intent = match.intent if match else None
+        assert intent == expected, f"[{scope}] '{phrase}': {intent} != {expected}"
+    print(f"✅ {len(REGRESSION_CORPUS)} frases classificadas como antes")
+
+def test_precedence_and_slots():
+    """Testa a precedência entre regras e os parâmetros extraídos"""
+    print("🧩 Testando precedência e parâmetros...")
+    gui = IntentRouter.for_scope('gui')
+    
+    # "dólar hoje" é mais específica que "dólar", mesmo aparecendo depois no texto
+    assert gui.classify("e o dólar hoje?").intent == "currency_usd"
+    # A primeira palavra-chave da lista vence, não a primeira no texto
+    assert gui.classify("quero ouvir tocar raul").keyword == "tocar"
+    
+    reminder = gui.classify("me lembre em 2 horas de ligar para a mãe")
+    assert reminder.slots == {"duration": 120, "task": "2 horas de ligar para a mãe"}
+    assert gui.classify("gerar senha de 32").slots["number"] == 32
+    assert gui.classify("Jarvis, abra o Discord").slots["remainder"] == "jarvis,  o discord"
+    
+    # Sem nome de música a regra cede a vez (pomodoro/app não casam, nada é reconhecido)
+    assert gui.classify("tocar") is None
+    
+    controller = IntentRouter.for_scope('controller', [IntentRule("open_link:github", ("github",), 30)])
+    assert controller.classify("abra o Discord").slots["app_name"] == "discord"
+    assert controller.classify("mostra o github").intent == "open_link:github"
+    assert controller.classify("silenciar o volume").slots["direction"] == "mute"
+    
+    actions = IntentRouter.for_scope('actions')
+    assert actions.classify("desativar modo gamer").slots["turn_off"] is True
+    assert actions.classify("modo gamer").slots["turn_off"] is False
+    assert actions.get_stats() == {'classified': 2, 'matched': 2}
+    print("✅ Precedência e parâmetros preservados")
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste do Roteador de Intenções")
+    print("=" * 60)
+    
+    test_automaton_finds_all_occurrences()
+    test_regression_corpus()
+    test_precedence_and_slots()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Teste do Pool de Conexões da Memória do Jarvis
+Valida conexões persistentes, WAL e métricas de latência
+"""
+
+import os
+import sys
+import tempfile
+import threading
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_memory import JarvisMemory
+
+def _create_memory():
+    """Cria uma memória em diretório temporário"""
+    temp_dir = tempfile.mkdtemp()
+    return JarvisMemory(os.path.join(temp_dir, 'test_memory.db'))
+
+def test_persistent_connection():
+    """Testa se a mesma conexão é reutilizada na mesma thread"""
+    print("🔌 Testando conexão persistente...")
+    memory = _create_memory()
+    
+    first = memory.pool.connection()
+    memory.store_fact("Python", "tecnologia", 2)
+    memory.search_memory("Python")
+    
+    assert memory.pool.connection() is first
+    print("✅ Conexão reutilizada entre chamadas")
+    memory.close()
+
+def test_wal_mode():
+    """Testa se o journaling WAL está ativo"""
+    print("📝 Testando modo WAL...")
+    memory = _create_memory()
+    
+    mode = memory.pool.connection().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode.lower() == "wal"
+    print(f"✅ journal_mode = {mode}")
+    memory.close()
+
+def test_connection_per_thread():
+    """Testa se cada thread recebe sua própria conexão"""
+    print("🧵 Testando conexões por thread...")
+    memory = _create_memory()
+    main_conn = memory.pool.connection()
+    other = {}
+    
+    def worker():
+        other['conn'] = memory.pool.connection()
+        memory.store_conversation("sessao", "oi", "olá, mestre")
+        
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    
+    assert other['conn'] is not main_conn
+    assert memory.get_memory_stats()['total_conversations'] == 1
+    print("✅ Conexões isoladas por thread")
+    memory.close()
+
+def test_connections_released_with_thread():
+    """Testa se a conexão de uma thread encerrada é fechada (GUIs abrem uma thread por mensagem)"""
+    print("🧹 Testando liberação de conexões...")
+    memory = _create_memory()
+    memory.pool.connection()
+    
+    for _ in range(50):
+        thread = threading.Thread(target=memory.get_recent_memories)
+        thread.start()
+        thread.join()
+    
+    assert memory.pool.open_connections() == 1
+    print(f"✅ 50 threads, {memory.pool.open_connections()} conexão aberta")
+    memory.close()
+
+def test_store_and_search():
+    """Testa armazenamento e busca através do pool"""
+    print("🧠 Testando armazenamento e busca...")
+    memory = _create_memory()
+    
+    memory.store_fact("Breno", "nome", 3)
+    memory.store_fact("Breno", "nome", 3)
+    memory.set_preference("tema", "escuro")
+    
+    results = memory.search_memory("Bre")
+    assert len(results) == 1
+    assert results[0]['access_count'] == 2
+    assert memory.get_user_preferences() == {"tema": "escuro"}
+    print(f"✅ Resultados: {results}")
+    memory.close()
+
+def test_latency_stats():
+    """Testa a coleta de latência por operação"""
+    print("⏱️ Testando métricas de latência...")
+    memory = _create_memory()
+    
+    for i in range(5):
+        memory.store_conversation("sessao", f"pergunta {i}", f"resposta {i}")
+    memory.get_recent_context("sessao")
+    
+    stats = memory.get_latency_stats()
+    assert stats['store_conversation']['calls'] == 5
+    assert stats['get_recent_context']['calls'] == 1
+    assert stats['store_conversation']['avg_ms'] <= stats['store_conversation']['max_ms']
+    
+    for operation, data in stats.items():
+        print(f"   - {operation}: {data['calls']} chamadas, média {data['avg_ms']:.3f} ms")
+    memory.close()
+
+def test_bulk_fact_upsert():
+    """Testa a gravação de todos os fatos de uma mensagem em uma transação"""
+    print("📦 Testando upsert em lote...")
+    memory = _create_memory()
+    
+    facts = memory.auto_extract_and_store("meu nome é Breno e estou desenvolvendo o Jarvis")
+    assert len(facts) >= 2
+    assert memory.get_latency_stats()['store_facts']['calls'] == 1
+    assert 'store_fact' not in memory.get_latency_stats()
+    
+    memory.store_facts([("Mark 13", "projeto", 3), ("Mark 13", "projeto", 3)])
+    results = memory.search_memory("mark", category="projeto")
+    assert len(results) == 1
+    assert results[0]['access_count'] == 2
+    assert results[0]['importance'] == 3
+    print(f"✅ Fatos extraídos: {facts}")
+    memory.close()
+
+def test_context_cache():
+    """Testa o cache do contexto do prompt invalidado por gerações"""
+    print("🗂️ Testando cache de contexto...")
+    memory = _create_memory()
+    
+    memory.store_fact("Breno", "nome", 3)
+    memory.set_preference("tema", "escuro")
+    memory.store_conversation("sessao", "oi", "olá, mestre")
+    first = memory.get_context_for_prompt("sessao")
+    
+    # Sem escritas: nenhuma consulta ao banco
+    memory.pool.reset_latency_stats()
+    assert memory.get_context_for_prompt("sessao") == first
+    assert memory.get_latency_stats() == {}
+    assert memory.context_cache_hits == 1
+    
+    # Nova troca: apenas a conversa recente é reconstruída
+    memory.store_conversation("sessao", "abra o spotify", "Spotify aberto.")
+    memory.pool.reset_latency_stats()
+    context = memory.get_context_for_prompt("sessao")
+    assert "abra o spotify" in context
+    assert "- Breno (nome)" in context
+    assert list(memory.get_latency_stats()) == ['get_recent_context']
+    print(f"✅ Contexto:\n{context}")
+    memory.close()
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste do Pool de Conexões da Memória")
+    print("=" * 60)
+    
+    test_persistent_connection()
+    test_wal_mode()
+    test_connection_per_thread()
+    test_connections_released_with_thread()
+    test_store_and_search()
+    test_latency_stats()
+    test_bulk_fact_upsert()
+    test_context_cache()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
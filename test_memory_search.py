@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Teste da Busca Full-Text da Memória do Jarvis
+Valida o índice FTS5, os triggers de sincronização e a migração
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_memory import JarvisMemory
+
+def _db_path():
+    """Caminho de banco em diretório temporário"""
+    return os.path.join(tempfile.mkdtemp(), 'test_memory.db')
+
+def test_fts_search_ranking():
+    """Testa busca por prefixo, sem acentos, ordenada por relevância"""
+    print("🔍 Testando busca FTS5...")
+    memory = JarvisMemory(_db_path())
+    
+    memory.store_fact("programação em Python", "tecnologia", 1)
+    memory.store_fact("Python e café", "preferencia", 3)
+    memory.store_fact("gosto de música", "preferencia", 2)
+    
+    results = memory.search_memory("python")
+    assert [r['fact'] for r in results] == ["Python e café", "programação em Python"]
+    assert memory.search_memory("programacao")[0]['fact'] == "programação em Python"
+    assert memory.search_memory("progr")[0]['fact'] == "programação em Python"
+    assert memory.search_memory("python", category="tecnologia")[0]['category'] == "tecnologia"
+    print(f"✅ Resultados: {[r['fact'] for r in results]}")
+    memory.close()
+
+def test_triggers_keep_index_in_sync():
+    """Testa se remoções e atualizações refletem no índice"""
+    print("🔄 Testando sincronização por triggers...")
+    memory = JarvisMemory(_db_path())
+    
+    memory.store_fact("mora em Votorantim", "localizacao", 2)
+    with memory.pool.transaction('test') as cursor:
+        cursor.execute("UPDATE memory SET fact = 'mora em Sorocaba'")
+    assert memory.search_memory("votorantim") == []
+    assert len(memory.search_memory("sorocaba")) == 1
+    
+    with memory.pool.transaction('test') as cursor:
+        cursor.execute("DELETE FROM memory")
+    assert memory.search_memory("sorocaba") == []
+    print("✅ Índice sincronizado")
+    memory.close()
+
+def test_search_conversations():
+    """Testa busca em conversas passadas"""
+    print("💬 Testando busca em conversas...")
+    memory = JarvisMemory(_db_path())
+    
+    memory.store_conversation("sessao", "como instalo o numpy", "Use pip install numpy, mestre.")
+    memory.store_conversation("sessao", "abra o spotify", "Spotify aberto.")
+    
+    results = memory.search_conversations("numpy")
+    assert len(results) == 1
+    assert results[0]['user_input'] == "como instalo o numpy"
+    print(f"✅ Conversas: {results}")
+    memory.close()
+
+def test_migration_backfills_legacy_database():
+    """Testa se bancos antigos são migrados e indexados"""
+    print("📦 Testando migração de banco existente...")
+    path = _db_path()
+    
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE memory (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            fact TEXT NOT NULL,
+            category TEXT NOT NULL,
+            data TEXT NOT NULL,
+            importance INTEGER DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            access_count INTEGER DEFAULT 1
+        )
+    ''')
+    conn.execute("INSERT INTO memory (fact, category, data) VALUES ('estudo engenharia', 'estudo', '')")
+    conn.execute("INSERT INTO memory (fact, category, data) VALUES ('estudo engenharia', 'estudo', '')")
+    conn.commit()
+    conn.close()
+    
+    memory = JarvisMemory(path)
+    assert memory.fts_enabled
+    results = memory.search_memory("engenharia")
+    assert len(results) == 1
+    assert results[0]['access_count'] == 2
+    
+    version = memory.pool.connection().execute("PRAGMA user_version").fetchone()[0]
+    assert version == JarvisMemory.SCHEMA_VERSION
+    print(f"✅ Banco migrado para a versão {version}")
+    memory.close()
+
+def test_migration_converts_gui_schema():
+    """Testa a conversão da tabela criada pelas interfaces antigas (coluna timestamp)"""
+    print("🔄 Testando migração do esquema das interfaces antigas...")
+    path = _db_path()
+    
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE memory (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            fact TEXT NOT NULL,
+            category TEXT NOT NULL,
+            data TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute("INSERT INTO memory (fact, category, data, timestamp) VALUES ('Comando sistema: abrir chrome', 'system_command', NULL, '2024-01-01 10:00:00')")
+    conn.execute("INSERT INTO memory (fact, category, data, timestamp) VALUES ('gosto de xadrez', 'preferencia', '', '2024-01-02 10:00:00')")
+    conn.commit()
+    conn.close()
+    
+    memory = JarvisMemory(path)
+    recent = memory.get_recent_memories(5)
+    assert [fact for fact, _, _ in recent] == ['gosto de xadrez', 'Comando sistema: abrir chrome']
+    assert recent[1][2] == '2024-01-01 10:00:00'
+    assert memory.search_memory("xadrez")[0]['category'] == 'preferencia'
+    
+    memory.store_fact("gosto de xadrez", "preferencia", 2)
+    assert len(memory.get_recent_memories(5)) == 2
+    
+    version = memory.pool.connection().execute("PRAGMA user_version").fetchone()[0]
+    assert version == JarvisMemory.SCHEMA_VERSION
+    print(f"✅ Esquema antigo convertido: {len(recent)} memórias preservadas")
+    memory.close()
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste da Busca Full-Text da Memória")
+    print("=" * 60)
+    
+    test_fts_search_ranking()
+    test_triggers_keep_index_in_sync()
+    test_search_conversations()
+    test_migration_backfills_legacy_database()
+    test_migration_converts_gui_schema()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
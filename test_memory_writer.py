@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Teste da Escrita Assíncrona (write-behind) da Memória do Jarvis
+Valida lotes, flush explícito, encerramento e backpressure
+"""
+
+import os
+import sys
+import tempfile
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_memory import JarvisMemory, MemoryManager, MemoryWriteBehind
+
+def _db_path():
+    """Caminho de banco em diretório temporário"""
+    return os.path.join(tempfile.mkdtemp(), 'test_memory.db')
+
+def test_batched_writes():
+    """Testa se várias escritas são gravadas em um único lote"""
+    print("📦 Testando gravação em lote...")
+    memory = JarvisMemory(_db_path())
+    writer = MemoryWriteBehind(memory, batch_size=100, flush_interval=5.0)
+    
+    for i in range(10):
+        writer.enqueue_conversation("sessao", f"pergunta {i}", f"resposta {i}")
+    writer.enqueue_facts([("Breno", "nome", 3)])
+    
+    assert writer.flush()
+    stats = writer.get_stats()
+    assert stats['written'] == 11
+    assert stats['batches'] == 1
+    assert memory.get_memory_stats()['total_conversations'] == 10
+    assert memory.search_memory("breno")[0]['fact'] == "Breno"
+    print(f"✅ Métricas: {stats}")
+    writer.stop()
+    memory.close()
+
+def test_flush_on_stop():
+    """Testa se o encerramento grava as pendências"""
+    print("🛑 Testando gravação no encerramento...")
+    path = _db_path()
+    manager = MemoryManager(path)
+    
+    info = manager.process_user_input("meu nome é Breno", "sessao")
+    manager.store_conversation("sessao", "meu nome é Breno", "Prazer, Breno.")
+    assert "Breno" in info
+    manager.close()
+    
+    memory = JarvisMemory(path)
+    assert memory.get_memory_stats()['total_conversations'] == 1
+    assert len(memory.search_memory("breno", category="nome")) == 1
+    print("✅ Pendências gravadas no encerramento")
+    memory.close()
+
+def test_backpressure_fallback():
+    """Testa a gravação síncrona quando a fila está cheia"""
+    print("🚦 Testando backpressure...")
+    memory = JarvisMemory(_db_path())
+    writer = MemoryWriteBehind(memory, max_queue=1, batch_size=1, flush_interval=5.0, put_timeout=0.01)
+    
+    # Segura o lock de escrita: a thread de escrita trava e a fila enche
+    with memory.pool.transaction('bloqueio') as cursor:
+        cursor.execute("INSERT INTO user_preferences (preference_key, preference_value) VALUES ('tema', 'escuro')")
+        for i in range(20):
+            writer.enqueue_conversation("sessao", f"pergunta {i}", "resposta")
+            
+    writer.stop()
+    stats = writer.get_stats()
+    assert stats['full_waits'] > 0
+    assert stats['sync_fallbacks'] > 0
+    assert memory.get_memory_stats()['total_conversations'] == 20
+    print(f"✅ Métricas: {stats}")
+    memory.close()
+
+def test_async_extraction():
+    """Testa a extração de fatos na thread de escrita, fora do caminho do comando"""
+    print("🧠 Testando extração assíncrona...")
+    manager = MemoryManager(_db_path())
+    infos = []
+    
+    manager.process_user_input_async("meu nome é Breno", "sessao", infos.append)
+    manager.process_user_input_async("ative o modo gamer", "sessao", infos.append)
+    assert manager.flush()
+    
+    assert len(infos) == 1 and "Breno" in infos[0]
+    assert manager.memory.search_memory("breno", category="nome")[0]['fact'] == "Breno"
+    print(f"✅ {infos[0]}")
+    manager.close()
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste da Escrita Assíncrona da Memória")
+    print("=" * 60)
+    
+    test_batched_writes()
+    test_flush_on_stop()
+    test_backpressure_fallback()
+    test_async_extraction()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Teste do Pipeline de Requisições do Jarvis
+Valida a faixa rápida, a ordem das respostas por origem, o cancelamento e o prazo
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_pipeline import RequestPipeline, TIMEOUT_MESSAGE, PRIORITY_EMERGENCY, PRIORITY_BACKGROUND, classify_priority
+from jarvis_intents import IntentRouter
+from jarvis_memory import MemoryManager
+
+def _pipeline(llm_delay=0.0, llm_workers=2, release=None):
+    """Pipeline com estágios simulados: comandos 'local ...' são resolvidos na faixa rápida"""
+    emitted = []
+    
+    def fast_stage(request):
+        if request.command.startswith("local"):
+            return f"ok: {request.command}"
+        return None
+    
+    def llm_stage(request):
+        if release is not None:
+            release.wait(5)
+        time.sleep(llm_delay)
+        return None if request.cancelled else f"ia: {request.command}"
+    
+    pipeline = RequestPipeline(fast_stage, llm_stage, emitted.append, llm_workers=llm_workers)
+    pipeline.start()
+    return pipeline, emitted
+
+def _wait_for(condition, timeout=5.0):
+    """Espera uma condição ficar verdadeira"""
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_fast_lane_is_not_blocked_by_llm():
+    """Testa que um comando local de outra origem responde durante uma chamada lenta"""
+    print("⚡ Testando faixa rápida...")
+    release = threading.Event()
+    pipeline, emitted = _pipeline(release=release)
+    
+    pipeline.submit("gere um projeto inteiro", source="mobile")
+    start = time.perf_counter()
+    pipeline.submit("local modo gamer", source="voice")
+    assert _wait_for(lambda: "ok: local modo gamer" in emitted)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    release.set()
+    assert _wait_for(lambda: len(emitted) == 2)
+    assert emitted == ["ok: local modo gamer", "ia: gere um projeto inteiro"]
+    print(f"✅ Comando local respondido em {elapsed_ms:.1f} ms com a IA ocupada")
+
+def test_order_is_preserved_per_source():
+    """Testa que respostas de uma mesma origem saem na ordem dos comandos"""
+    print("🔢 Testando ordem por origem...")
+    pipeline, emitted = _pipeline(llm_delay=0.1)
+    
+    pipeline.submit("pergunta lenta", source="voice")
+    pipeline.submit("local abrir chrome", source="voice")
+    pipeline.submit("outra pergunta", source="voice")
+    assert _wait_for(lambda: len(emitted) == 3)
+    
+    assert emitted == ["ia: pergunta lenta", "ok: local abrir chrome", "ia: outra pergunta"]
+    stats = pipeline.get_stats()
+    assert stats['fast'] == 1 and stats['llm'] == 2 and stats['in_flight'] == 0
+    print(f"✅ Estatísticas: {stats}")
+
+def test_cancel_by_source():
+    """Testa que cancelar a origem descarta a resposta em andamento e libera a fila"""
+    print("🛑 Testando cancelamento...")
+    release = threading.Event()
+    pipeline, emitted = _pipeline(release=release)
+    
+    pending = pipeline.submit("explique recursão", source="voice")
+    pipeline.submit("conte uma piada", source="mobile")
+    assert _wait_for(lambda: pipeline.get_stats()['llm_queue'] == 0)
+    
+    assert pipeline.cancel("voice") == 1 and pending.cancelled
+    pipeline.submit("local que horas são", source="voice")
+    release.set()
+    
+    assert _wait_for(lambda: len(emitted) == 2)
+    assert "ia: explique recursão" not in emitted
+    assert set(emitted) == {"ia: conte uma piada", "ok: local que horas são"}
+    assert pipeline.get_stats()['cancelled'] == 1
+    print("✅ Resposta cancelada descartada")
+
+def test_expired_request_reports_timeout():
+    """Testa que uma requisição vencida na fila não chega a chamar a IA"""
+    print("⏱️ Testando prazo...")
+    pipeline, emitted = _pipeline(llm_delay=0.2, llm_workers=1)
+    
+    pipeline.submit("primeira", source="text")
+    pipeline.submit("segunda", source="text", timeout=0.05)
+    assert _wait_for(lambda: len(emitted) == 2)
+    
+    assert emitted == ["ia: primeira", TIMEOUT_MESSAGE]
+    assert pipeline.get_stats()['expired'] == 1
+    print("✅ Requisição vencida respondida com aviso de tempo")
+
+def test_priority_classification():
+    """Testa a faixa de cada comando pela intenção e pela origem"""
+    print("🚦 Testando classificação de prioridade...")
+    assert classify_priority("Jarvis, protocolo silêncio!", "mobile") == PRIORITY_EMERGENCY
+    assert classify_priority("limpar logs", "voice") == PRIORITY_BACKGROUND
+    assert classify_priority("abrir chrome", "voice") < classify_priority("abrir chrome", "text")
+    assert classify_priority("abrir chrome", "text") < classify_priority("abrir chrome", "mobile")
+    print("✅ Emergência > voz > texto > Telegram/manutenção")
+
+def test_voice_latency_under_mobile_burst():
+    """Testa que uma rajada do Telegram não atrasa a voz nem uma emergência"""
+    print("📱 Testando rajada do Telegram...")
+    pipeline, emitted = _pipeline(llm_delay=0.05)
+    
+    for i in range(20):
+        pipeline.submit(f"mensagem {i}", source="mobile")
+    time.sleep(0.02)
+    
+    start = time.perf_counter()
+    pipeline.submit("pergunta de voz", source="voice")
+    assert _wait_for(lambda: "ia: pergunta de voz" in emitted)
+    voice_ms = (time.perf_counter() - start) * 1000
+    
+    pipeline.submit("local protocolo silêncio", source="mobile")
+    assert _wait_for(lambda: "ok: local protocolo silêncio" in emitted)
+    assert "ia: mensagem 19" not in emitted
+    
+    # Uma thread do pool fica sempre livre para faixas acima do Telegram
+    assert voice_ms < 200, f"voz esperou {voice_ms:.0f} ms"
+    assert _wait_for(lambda: len(emitted) == 22)
+    assert [r for r in emitted if r.startswith("ia: mensagem")] == [f"ia: mensagem {i}" for i in range(20)]
+    
+    metrics = pipeline.get_lane_metrics()['llm']
+    assert metrics['background']['served'] == 20 and metrics['voice']['served'] == 1
+    assert metrics['voice']['max_wait_ms'] < metrics['background']['max_wait_ms']
+    print(f"✅ Voz respondida em {voice_ms:.0f} ms; espera máx. Telegram {metrics['background']['max_wait_ms']} ms")
+
+def test_local_commands_skip_memory_and_llm():
+    """Testa o caminho em estágios: classificação, handler local e memória em segundo plano"""
+    print("⏱️ Testando latência por estágio...")
+    router = IntentRouter.for_scope('local')
+    memory = MemoryManager(os.path.join(tempfile.mkdtemp(), 'test_memory.db'))
+    emitted = []
+    
+    def fast_stage(request):
+        with request.timed("classify"):
+            match = router.classify(request.command)
+        with request.timed("memory_enqueue"):
+            memory.process_user_input_async(request.command, "sessao")
+        if match is None:
+            return None
+        with request.timed("local_handler"):
+            return f"ok: {match.intent}"
+    
+    def llm_stage(request):
+        time.sleep(0.05)
+        return f"ia: {request.command}"
+    
+    pipeline = RequestPipeline(fast_stage, llm_stage, emitted.append)
+    pipeline.start()
+    for i in range(30):
+        pipeline.submit("meu nome é Breno, ative o modo gamer" if i == 0 else "modo gamer", source="voice")
+    pipeline.submit("explique recursão", source="text")
+    assert _wait_for(lambda: len(emitted) == 31)
+    
+    breakdown = pipeline.get_stage_breakdown()
+    assert breakdown['total_fast']['count'] == 30 and breakdown['total_llm']['count'] == 1
+    assert breakdown['local_handler']['count'] == 30 and breakdown['classify']['count'] == 31
+    assert breakdown['total_fast']['p95_ms'] < 50, breakdown['total_fast']
+    assert breakdown['total_llm']['max_ms'] >= 50
+    
+    # A memória foi gravada pela thread de escrita, sem atrasar os comandos
+    assert memory.flush()
+    assert memory.memory.search_memory("breno", category="nome")
+    memory.close()
+    print(f"✅ Comando local p95 {breakdown['total_fast']['p95_ms']} ms "
+          f"(classificação {breakdown['classify']['avg_ms']} ms, memória {breakdown['memory_enqueue']['avg_ms']} ms)")
+
+def test_llm_bound_handlers_use_llm_pool():
+    """Testa que análise de tela e geração de código não ocupam a faixa rápida"""
+    print("🖼️ Testando handlers que chamam a IA...")
+    router = IntentRouter.for_scope('local')
+    assert router.llm_intents == {"debugger", "screen_analysis", "generate_code", "explain_error"}
+    release = threading.Event()
+    emitted, handled_in_llm = [], []
+    
+    def fast_stage(request):
+        match = router.classify(request.command)
+        if match is None:
+            return None
+        if match.intent in router.llm_intents:
+            request.intent = match.intent
+            return None
+        return f"ok: {match.intent}"
+    
+    def llm_stage(request):
+        handled_in_llm.append(request.intent)
+        release.wait(5)
+        return f"ia: {request.intent}"
+    
+    pipeline = RequestPipeline(fast_stage, llm_stage, emitted.append, llm_workers=2, fast_workers=2)
+    pipeline.start()
+    pipeline.submit("olhe a tela", source="text")
+    pipeline.submit("gere um código de ordenação", source="mobile")
+    assert _wait_for(lambda: len(handled_in_llm) == 2)
+    
+    # Com o pool da IA ocupado, a faixa rápida continua livre para a voz
+    pipeline.submit("modo gamer", source="voice")
+    assert _wait_for(lambda: "ok: gamer_mode" in emitted, timeout=1.0)
+    release.set()
+    assert _wait_for(lambda: len(emitted) == 3)
+    assert sorted(handled_in_llm) == ["generate_code", "screen_analysis"]
+    pipeline.stop()
+    print("✅ Visão e geração de código no pool da IA")
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste do Pipeline de Requisições")
+    print("=" * 60)
+    
+    test_fast_lane_is_not_blocked_by_llm()
+    test_order_is_preserved_per_source()
+    test_cancel_by_source()
+    test_expired_request_reports_timeout()
+    test_priority_classification()
+    test_voice_latency_under_mobile_burst()
+    test_local_commands_skip_memory_and_llm()
+    test_llm_bound_handlers_use_llm_pool()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Teste do Prefetch do Jarvis
+Valida a frequência de uso lida do histórico, a agenda adaptativa e as respostas instantâneas com o cache aquecido
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_memory import JarvisMemory
+from jarvis_http import TTLCache
+from jarvis_prefetch import PrefetchScheduler, PrefetchTask
+
+class CountingWarm:
+    """Função de aquecimento que só conta as chamadas"""
+    
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+    
+    def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("fonte fora do ar")
+
+def _tasks(interval=60, **warms):
+    intents = {
+        'weather': ('weather', 'briefing'),
+        'currency': ('currency_usd', 'currency', 'briefing'),
+        'news': ('news', 'briefing'),
+        'processes': ('top_processes', 'briefing'),
+    }
+    return [PrefetchTask(name, warms.get(name) or CountingWarm(), intents[name], interval) for name in intents]
+
+def _wait_for(condition, timeout=3.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_usage_from_history():
+    """Testa a contagem pelo conversation_context e a agenda só das fontes populares"""
+    print("📊 Testando frequência de uso...")
+    memory = JarvisMemory(os.path.join(tempfile.mkdtemp(), 'prefetch.db'))
+    for _ in range(6):
+        memory.store_conversation('s1', "quanto está o dólar hoje?", "R$ 5,00")
+    for _ in range(3):
+        memory.store_conversation('s1', "e aí, como tá lá fora", "Ensolarado", {'intent': 'weather'})
+    memory.store_conversation('s2', "Jarvis, me dá o briefing", "...")
+    for _ in range(20):
+        memory.store_conversation('s2', "explique recursão", "Recursão é...")
+    
+    scheduler = PrefetchScheduler(_tasks(), memory, min_share=0.2, min_history=5)
+    counts = scheduler.load_usage()
+    assert counts == {'currency': 7, 'weather': 4, 'news': 1, 'processes': 1}
+    assert scheduler.ranking() == ['currency', 'weather', 'news', 'processes']
+    assert scheduler.plan() == {'weather': 60, 'currency': 60, 'news': None, 'processes': None}
+    
+    # Pedidos da sessão atual entram na conta sem reler o banco
+    for _ in range(4):
+        scheduler.note_request('news')
+    scheduler.note_request('explicar')  # intenção sem fonte: ignorada
+    assert scheduler.plan()['news'] == 60
+    
+    # Pouco histórico: todos os comandos rápidos são aquecidos
+    fresh = PrefetchScheduler(_tasks(), JarvisMemory(os.path.join(tempfile.mkdtemp(), 'vazio.db')))
+    fresh.load_usage()
+    assert all(interval == 60 for interval in fresh.plan().values())
+    
+    # Fonte pouco pedida com idle_interval: continua na agenda, em cadência mais lenta
+    idle = PrefetchScheduler([PrefetchTask('currency', CountingWarm(), ('currency',), 60, idle_interval=900),
+                              PrefetchTask('weather', CountingWarm(), ('weather',), 600)], min_history=1)
+    idle.note_request('weather')
+    assert idle.plan() == {'currency': 900, 'weather': 600}
+    print(f"✅ Uso: {dict(scheduler.usage())}")
+
+def test_command_usage_outside_conversations():
+    """Testa que os comandos de sistema contam no uso sem virar trocas da conversa"""
+    print("🗃️ Testando registro de uso dos comandos...")
+    memory = JarvisMemory(os.path.join(tempfile.mkdtemp(), 'uso.db'))
+    memory.store_conversation('s1', "explique recursão", "Recursão é...")
+    for _ in range(5):
+        memory.record_command_usage('s1', 'currency_usd')
+    memory.record_command_usage('s1', 'password')
+    
+    scheduler = PrefetchScheduler(_tasks(), memory, min_history=1)
+    assert scheduler.load_usage() == {'currency': 5}
+    with memory.pool.cursor('test') as cursor:
+        cursor.execute('SELECT user_input, jarvis_response FROM conversation_context')
+        assert cursor.fetchall() == [("explique recursão", "Recursão é...")]
+    print("✅ 6 comandos contados, 1 troca na conversa")
+
+def test_adaptive_schedule():
+    """Testa o aquecimento inicial de todas as fontes e o reaquecimento só das populares"""
+    print("⏰ Testando agenda adaptativa...")
+    warms = {'weather': CountingWarm(), 'currency': CountingWarm(), 'news': CountingWarm(),
+             'processes': CountingWarm(fail=True)}
+    scheduler = PrefetchScheduler(_tasks(interval=0.05, **warms), min_share=0.2, min_history=1)
+    for _ in range(5):
+        scheduler.note_request('currency_usd')
+    
+    scheduler.start()
+    try:
+        assert _wait_for(lambda: warms['currency'].calls >= 5)
+        # Fora da agenda: só o aquecimento inicial
+        assert warms['weather'].calls == 1 and warms['news'].calls == 1
+        
+        # Uma fonte passa a ser pedida: entra na agenda sem reiniciar a thread
+        for _ in range(5):
+            scheduler.note_request('weather')
+        assert _wait_for(lambda: warms['weather'].calls >= 3)
+        
+        # Falhas não derrubam o agendador
+        stats = scheduler.get_stats()
+        assert stats['errors'] == 1 and stats['last_warm']['processes']['ok'] is False
+    finally:
+        scheduler.stop()
+    print(f"✅ Aquecimentos: { {name: warm.calls for name, warm in warms.items()} }")
+
+def test_warm_cache_answers_fast():
+    """Testa que, com o prefetch, as perguntas nunca esperam a fonte lenta"""
+    print("⚡ Testando respostas com cache aquecido...")
+    cache = TTLCache()
+    fetches = []
+    
+    def slow_fetch():
+        time.sleep(0.3)
+        fetches.append(time.time())
+        return {'temp_C': 20 + len(fetches)}
+    
+    def weather():
+        return cache.get_or_fetch('weather', slow_fetch, ttl=0.2, stale_ttl=10)
+    
+    scheduler = PrefetchScheduler([PrefetchTask('weather', weather, ('weather',), 0.2)])
+    scheduler.start()
+    try:
+        assert _wait_for(lambda: len(fetches) >= 1)
+        slowest_ms = 0.0
+        for _ in range(50):
+            start = time.perf_counter()
+            assert weather()['temp_C'] > 20
+            slowest_ms = max(slowest_ms, (time.perf_counter() - start) * 1000)
+            time.sleep(0.02)
+        assert slowest_ms < 10
+        # O cache é renovado em segundo plano, sem depender do ritmo das perguntas
+        assert _wait_for(lambda: len(fetches) >= 3, timeout=10.0)
+    finally:
+        scheduler.stop()
+    print(f"✅ Resposta mais lenta: {slowest_ms:.2f} ms (fonte: 300 ms); {len(fetches)} buscas em segundo plano")
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste do Prefetch")
+    print("=" * 60)
+    
+    test_usage_from_history()
+    test_command_usage_outside_conversations()
+    test_adaptive_schedule()
+    test_warm_cache_answers_fast()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Teste do Instantâneo de Processos do Jarvis
+Valida o cache por TTL, os filtros e o top-N sobre uma lista de processos sintética
+"""
+
+import os
+import sys
+import time
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_processes import ProcessInfo, ProcessSnapshotService, PSUTIL_AVAILABLE
+
+PROCESSES = [
+    ProcessInfo(1, "System", 0.1, 0.5, []),
+    ProcessInfo(100, "chrome.exe", 900.0, 12.0, ["chrome.exe", "--type=renderer"]),
+    ProcessInfo(200, "python.exe", 150.0, 30.0, ["python.exe", "C:\\Jarvis-AI\\jarvis_gui.py"]),
+    ProcessInfo(300, "python.exe", 80.0, 1.0, ["python.exe", "-m", "pytest"]),
+    ProcessInfo(400, "Code.exe", 650.0, 4.0, ["Code.exe", "C:\\Jarvis-AI"]),
+    ProcessInfo(500, "notepad.exe", 20.0, 0.0, ["notepad.exe"]),
+]
+
+class CountingCollector:
+    """Devolve a lista sintética e conta as leituras (com e sem linha de comando)"""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def __call__(self, with_cmdline):
+        self.calls.append(with_cmdline)
+        if with_cmdline:
+            return list(PROCESSES)
+        return [ProcessInfo(p.pid, p.name, p.rss_mb, p.cpu_percent) for p in PROCESSES]
+
+def test_snapshot_cache():
+    """Testa o reaproveitamento da leitura dentro do TTL e a releitura para a linha de comando"""
+    print("💾 Testando cache do instantâneo...")
+    collector = CountingCollector()
+    service = ProcessSnapshotService(ttl=60, collector=collector)
+    
+    service.top(5)
+    service.top(3, sort_by='cpu')
+    service.is_running("notepad")
+    assert collector.calls == [False]
+    
+    # Linha de comando não estava na leitura: relê uma vez com ela, depois serve a todos
+    service.query(cmdline_contains="jarvis")
+    service.top(5)
+    assert collector.calls == [False, True]
+    
+    service.top(5, max_age=0)
+    assert collector.calls == [False, True, False]
+    stats = service.get_stats()
+    assert stats['collections'] == 3 and stats['cache_hits'] == 3 and stats['processes'] == len(PROCESSES)
+    print(f"✅ {stats['collections']} leituras para 6 consultas")
+
+def test_filters_and_top():
+    """Testa o top-N por memória e CPU e os filtros de nome e linha de comando"""
+    print("🔎 Testando filtros e top-N...")
+    service = ProcessSnapshotService(collector=CountingCollector())
+    
+    assert [p.name for p in service.top(3)] == ["chrome.exe", "Code.exe", "python.exe"]
+    assert [p.pid for p in service.top(2, sort_by='cpu')] == [200, 100]
+    assert len(service.top(50)) == len(PROCESSES)
+    
+    pythons = service.query(name_pattern="python")
+    assert [p.pid for p in pythons] == [200, 300]
+    assert [p.pid for p in service.query(name_pattern="^(chrome|notepad)\\.exe$")] == [100, 500]
+    
+    # Limpeza: só o Python do Jarvis, nunca o editor aberto na pasta nem o próprio processo
+    jarvis = service.query(name_pattern="python", cmdline_contains="JARVIS")
+    assert [p.pid for p in jarvis] == [200]
+    assert service.query(name_pattern="python", cmdline_contains="jarvis", exclude_pids=[200]) == []
+    
+    assert service.is_running("Notepad") and not service.is_running("spotify")
+    assert not service.is_running(".exe+")  # trecho literal, não expressão regular
+    print("✅ Filtros e seleção corretos")
+
+def test_real_processes():
+    """Testa a leitura real com psutil (quando disponível)"""
+    print("🖥️ Testando leitura real...")
+    if not PSUTIL_AVAILABLE:
+        print("⚠️ psutil não disponível - teste ignorado")
+        return
+    service = ProcessSnapshotService()
+    start = time.perf_counter()
+    top = service.top(5)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert top and top == sorted(top, key=lambda p: p.rss_mb, reverse=True)
+    assert any(p.pid == os.getpid() for p in service.snapshot())
+    print(f"✅ {service.get_stats()['processes']} processos lidos em {elapsed_ms:.1f} ms")
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste do Instantâneo de Processos")
+    print("=" * 60)
+    
+    test_snapshot_cache()
+    test_filters_and_top()
+    test_real_processes()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
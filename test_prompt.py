@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Teste da Montagem de Prompts do Jarvis
+Valida o orçamento de tokens, a janela recente e o resumo acumulado
+"""
+
+import os
+import ast
+import sys
+import tempfile
+import threading
+from types import SimpleNamespace
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_prompt import PromptAssembler, estimate_tokens, truncate_to_tokens
+from jarvis_memory import MemoryManager
+
+def _history(turns):
+    """Gera uma conversa alternando usuário e Jarvis"""
+    history = []
+    for i in range(turns):
+        history.append(("VOCÊ", f"pergunta {i} sobre recursão em Python " + "detalhe " * 20))
+        history.append(("JARVIS", f"resposta {i} explicando a pilha de chamadas " + "exemplo " * 40))
+    return history
+
+def test_budget_is_enforced():
+    """Testa que o prompt nunca passa do orçamento e mantém o comando"""
+    print("📏 Testando orçamento de tokens...")
+    assembler = PromptAssembler(budget=400, recent_turns=6)
+    memories = "\n".join(f"- fato {i} " + "x" * 80 for i in range(50))
+    
+    prompt = assembler.build("como funciona a pilha?", sections=[("Memórias do sistema", memories)], history=_history(20))
+    stats = assembler.get_stats()
+    
+    assert estimate_tokens(prompt) <= 400
+    assert prompt.endswith("Comando: como funciona a pilha?")
+    assert stats['truncated_sections'] == 1
+    print(f"✅ Prompt com {stats['tokens']}/400 tokens")
+
+def test_recent_window_and_rolling_digest():
+    """Testa a janela recente e o resumo das mensagens antigas"""
+    print("📝 Testando janela recente e resumo...")
+    assembler = PromptAssembler(budget=3000, recent_turns=4)
+    history = _history(2)
+    
+    prompt = assembler.build("oi", history=history)
+    assert "Resumo da conversa anterior" not in prompt
+    assert assembler.get_stats()['history_turns'] == 4
+    
+    history.extend(_history(3)[:4])
+    prompt = assembler.build("e agora?", history=history)
+    stats = assembler.get_stats()
+    assert stats['history_turns'] == 4 and stats['digest_turns'] == 4
+    assert "Resumo da conversa anterior:\n4 mensagens anteriores." in prompt
+    assert "recursão" in prompt and '"pergunta 0' in prompt
+    
+    # O resumo cresce apenas com as mensagens que saem da janela
+    history.append(("VOCÊ", "e sobre memoização?"))
+    assembler.build("continue", history=history)
+    assert assembler.get_stats()['digest_turns'] == 5
+    
+    # Histórico novo reinicia o resumo
+    assembler.build("nova conversa", history=_history(1))
+    assert assembler.get_stats()['digest_turns'] == 0
+    print(f"✅ Resumo acumulado: {stats}")
+
+def _ai_worker_source():
+    """Código e árvore do AIWorker sem importar jarvis_threads (PyQt6, áudio...)"""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jarvis_threads.py'), encoding='utf-8') as f:
+        source = f.read()
+    tree = ast.parse(source)
+    worker = next(node for node in tree.body if isinstance(node, ast.ClassDef) and node.name == 'AIWorker')
+    return source, worker
+
+def test_ai_worker_sends_conversation():
+    """Testa que o AIWorker guarda as trocas e as envia ao prompt (janela recente + resumo)"""
+    print("💬 Testando histórico do AIWorker...")
+    source, worker = _ai_worker_source()
+    assert "recent_turns=0" not in source and "regras acima" not in source
+    method = next(node for node in worker.body if isinstance(node, ast.FunctionDef) and node.name == '_store_exchange')
+    namespace = {}
+    exec(compile(ast.Module(body=[method], type_ignores=[]), 'jarvis_threads.py', 'exec'), namespace)
+    
+    memory = MemoryManager(os.path.join(tempfile.mkdtemp(), 'test_memory.db'), write_behind=False)
+    fake_worker = SimpleNamespace(memory_manager=memory, session_id="sessao",
+                                  conversation_history=[], _history_lock=threading.Lock())
+    for i in range(5):
+        namespace['_store_exchange'](fake_worker, f"pergunta {i} sobre recursão", f"resposta {i}, mestre.")
+    
+    assembler = PromptAssembler(budget=3000, recent_turns=6)
+    prompt = assembler.build("e agora?", history=fake_worker.conversation_history)
+    stats = assembler.get_stats()
+    assert stats['history_turns'] == 6 and stats['digest_turns'] == 4
+    assert "VOCÊ: pergunta 4 sobre recursão" in prompt and "JARVIS: resposta 4, mestre." in prompt
+    assert len(memory.memory.get_recent_context("sessao")) == 5
+    memory.close()
+    print(f"✅ {stats['history_turns']} mensagens recentes e {stats['digest_turns']} no resumo")
+
+def test_truncate_to_tokens():
+    """Testa o corte de texto por tokens"""
+    print("✂️ Testando corte por tokens...")
+    assert truncate_to_tokens("curto", 10) == "curto"
+    cut = truncate_to_tokens("a" * 100, 10)
+    assert cut.endswith("…") and estimate_tokens(cut) <= 10
+    assert truncate_to_tokens("texto", 0) == ""
+    print("✅ Corte respeita o limite")
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste da Montagem de Prompts")
+    print("=" * 60)
+    
+    test_budget_is_enforced()
+    test_recent_window_and_rolling_digest()
+    test_ai_worker_sends_conversation()
+    test_truncate_to_tokens()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
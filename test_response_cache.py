@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Teste do Cache de Respostas da IA do Jarvis
+Valida busca exata e aproximada, TTL, LRU, persistência e intenções ignoradas
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_response_cache import ResponseCache
+from jarvis_memory import MemoryManager
+
+def _cache_path():
+    """Caminho do cache em diretório temporário"""
+    return os.path.join(tempfile.mkdtemp(), 'jarvis_response_cache.json')
+
+def test_exact_and_near_duplicate_lookup():
+    """Testa acerto exato, aproximado e isolamento por contexto"""
+    print("🔍 Testando busca no cache...")
+    cache = ResponseCache(_cache_path())
+    fingerprint = ResponseCache.fingerprint('gemini-2.5-flash', ['gosto de Python'])
+    
+    assert cache.put("Jarvis, como faço um loop em Python?", fingerprint, "Use for item in lista.")
+    assert cache.get("como faço um loop em python", fingerprint) == "Use for item in lista."
+    assert cache.get("Como faço um loop em Python!!", fingerprint) == "Use for item in lista."
+    assert cache.get("como faço um loop em python aí", fingerprint) == "Use for item in lista."
+    
+    # Outro contexto ou números diferentes nunca reaproveitam a resposta
+    assert cache.get("como faço um loop em python", ResponseCache.fingerprint('outro')) is None
+    cache.put("quanto é 12 vezes 12", fingerprint, "144")
+    assert cache.get("quanto é 12 vezes 13", fingerprint) is None
+    
+    # Uma palavra a mais ou a menos muda o sentido: nada de resposta trocada
+    cache.put("ordene a lista em ordem crescente", fingerprint, "sorted(lista)")
+    assert cache.get("ordene a lista em ordem decrescente", fingerprint) is None
+    cache.put("isso é seguro", fingerprint, "Sim.")
+    assert cache.get("isso não é seguro", fingerprint) is None
+    assert cache.get("por favor, isso é seguro?", fingerprint) == "Sim."
+    
+    stats = cache.get_stats()
+    assert stats['hits'] == 2 and stats['near_hits'] == 2 and stats['misses'] == 4
+    print(f"✅ Estatísticas: {stats}")
+
+def test_time_sensitive_intents_are_skipped():
+    """Testa que clima, câmbio, status e continuações não são armazenados"""
+    print("⏱️ Testando intenções sensíveis ao tempo...")
+    cache = ResponseCache(_cache_path())
+    
+    for command in ["Como está o clima hoje?", "cotação do dólar", "como está o sistema", "continue", "olhe a tela"]:
+        assert not cache.put(command, '', "resposta")
+        assert cache.get(command, '') is None
+    
+    assert cache.put("menu", '', "Opções disponíveis")
+    assert cache.get_stats()['skipped'] == 5
+    print("✅ Intenções sensíveis ignoradas")
+
+def test_ttl_and_lru_eviction():
+    """Testa expiração por TTL e descarte da entrada menos usada"""
+    print("🧹 Testando TTL e LRU...")
+    cache = ResponseCache(_cache_path(), ttl=0.2, max_entries=2)
+    
+    cache.put("pergunta alfa", '', "A")
+    cache.put("pergunta beta", '', "B")
+    cache.get("pergunta alfa", '')
+    cache.put("pergunta gama", '', "C")
+    assert cache.get("pergunta beta", '') is None
+    assert cache.get("pergunta alfa", '') == "A"
+    
+    time.sleep(0.25)
+    assert cache.get("pergunta alfa", '') is None
+    print("✅ TTL e LRU funcionando")
+
+def test_repeated_question_hits_mid_conversation():
+    """Testa a chave pelo contexto montado: a pergunta repetida acerta o cache no meio da conversa"""
+    print("💬 Testando cache no meio da conversa...")
+    cache = ResponseCache(_cache_path())
+    manager = MemoryManager(os.path.join(tempfile.mkdtemp(), 'test_memory.db'), write_behind=False)
+    manager.memory.store_fact("gosto de Python", "preferencia", 5)
+    history = []
+    
+    def key(command):
+        # Como o AIWorker: memória sem a conversa da sessão, que vai pelo histórico
+        memory_context = manager.get_context_for_ai("sessao", command, with_session_history=False)
+        return ResponseCache.context_fingerprint(command, 'gemini-2.5-flash', "", memory_context, history=history[-6:])
+    
+    def answer(command, response):
+        if cache.get(command, key(command)) is None:
+            cache.put(command, key(command), response)
+        manager.store_conversation("sessao", command, response)
+        history.extend([("VOCÊ", command), ("JARVIS", response)])
+        
+    answer("explique recursão em python", "Uma função que chama a si mesma.")
+    answer("o que é uma lista", "Uma sequência mutável.")
+    answer("como abro um arquivo", "Use open() com with.")
+    
+    assert cache.get("explique recursão em python", key("explique recursão em python")) == "Uma função que chama a si mesma."
+    assert cache.get_stats()['hits'] == 1
+    
+    # Comandos que se referem à conversa levam o histórico na chave
+    assert ResponseCache.depends_on_history("explique isso em python")
+    referring_key = key("explique isso em python")
+    history.append(("VOCÊ", "outra pergunta"))
+    assert key("explique isso em python") != referring_key
+    manager.close()
+    print(f"✅ Estatísticas: {cache.get_stats()}")
+
+def test_persistence_across_restarts():
+    """Testa que as entradas sobrevivem a um reinício"""
+    print("💾 Testando persistência...")
+    path = _cache_path()
+    cache = ResponseCache(path)
+    cache.put("explique recursão", 'ctx', "Uma função que chama a si mesma.")
+    cache.save()
+    
+    reloaded = ResponseCache(path)
+    assert reloaded.get("explique recursao", 'ctx') == "Uma função que chama a si mesma."
+    print("✅ Cache recarregado do disco")
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste do Cache de Respostas")
+    print("=" * 60)
+    
+    test_exact_and_near_duplicate_lookup()
+    test_time_sensitive_intents_are_skipped()
+    test_ttl_and_lru_eviction()
+    test_repeated_question_hits_mid_conversation()
+    test_persistence_across_restarts()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
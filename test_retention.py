@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Teste do Motor de Retenção da Memória do Jarvis
+Valida resumo por sessão, arquivamento compactado e remoção em lotes
+"""
+
+import os
+import sys
+import tempfile
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_memory import JarvisMemory
+from jarvis_retention import MemoryRetentionEngine
+
+def _create_memory():
+    """Cria uma memória em diretório temporário"""
+    return JarvisMemory(os.path.join(tempfile.mkdtemp(), 'test_memory.db'))
+
+def _insert_exchanges(memory, session_id, count, age):
+    """Insere trocas com data no passado (ex.: age='-40 days')"""
+    with memory.pool.transaction('test') as cursor:
+        cursor.executemany('''
+            INSERT INTO conversation_context (session_id, user_input, jarvis_response, created_at)
+            VALUES (?, ?, ?, datetime('now', ?))
+        ''', [(session_id, f"abra o spotify e toque música {i}", "Feito, mestre.", age) for i in range(count)])
+
+def _count(memory, table):
+    """Conta linhas de uma tabela"""
+    with memory.pool.cursor('test') as cursor:
+        cursor.execute(f'SELECT COUNT(*) FROM {table}')
+        return cursor.fetchone()[0]
+
+def test_compact_old_sessions():
+    """Testa se sessões antigas viram um resumo e as recentes ficam intactas"""
+    print("🗜️ Testando compactação de sessões antigas...")
+    memory = _create_memory()
+    _insert_exchanges(memory, "antiga", 1200, '-40 days')
+    _insert_exchanges(memory, "recente", 5, '-1 days')
+    
+    engine = MemoryRetentionEngine(memory, raw_days=30, chunk_size=100, chunk_pause=0)
+    report = engine.run_once()
+    
+    assert report['sessions_compacted'] == 1
+    assert report['exchanges_removed'] == 1200
+    assert _count(memory, 'conversation_context') == 5
+    
+    with memory.pool.cursor('test') as cursor:
+        cursor.execute('SELECT session_id, exchange_count, summary FROM conversation_digest')
+        session_id, exchange_count, summary = cursor.fetchone()
+    assert session_id == "antiga"
+    assert exchange_count == 1200
+    assert "spotify" in summary
+    print(f"✅ Resumo: {summary}")
+    memory.close()
+
+def test_compact_old_rows_of_active_session():
+    """Testa se as trocas antigas de uma sessão ainda ativa também são resumidas"""
+    print("🗂️ Testando sessão ativa com trocas antigas...")
+    memory = _create_memory()
+    _insert_exchanges(memory, "ativa", 10, '-40 days')
+    _insert_exchanges(memory, "ativa", 3, '-1 days')
+    
+    engine = MemoryRetentionEngine(memory, raw_days=30, chunk_pause=0)
+    report = engine.run_once()
+    assert report['exchanges_removed'] == 10
+    assert _count(memory, 'conversation_context') == 3
+    
+    # Um novo lote antigo é somado ao mesmo resumo
+    _insert_exchanges(memory, "ativa", 5, '-35 days')
+    engine.run_once()
+    with memory.pool.cursor('test') as cursor:
+        cursor.execute('SELECT exchange_count FROM conversation_digest WHERE session_id = ?', ("ativa",))
+        assert cursor.fetchone()[0] == 15
+    assert _count(memory, 'conversation_context') == 3
+    print("✅ 15 trocas antigas resumidas, 3 recentes mantidas")
+    memory.close()
+
+def test_vacuum_conversion_is_explicit():
+    """Testa que o ciclo agendado nunca faz o VACUUM completo de bancos antigos"""
+    print("🔒 Testando conversão para vacuum incremental...")
+    memory = _create_memory()
+    conn = memory.pool.connection()
+    conn.execute('PRAGMA auto_vacuum = NONE')
+    conn.execute('VACUUM')  # Simula um banco criado antes do modo incremental
+    
+    engine = MemoryRetentionEngine(memory, raw_days=30, chunk_pause=0)
+    assert engine.run_once()['pages_vacuumed'] == 0
+    assert not engine.incremental_vacuum_enabled()
+    
+    assert engine.enable_incremental_vacuum()
+    assert engine.incremental_vacuum_enabled()
+    assert not engine.enable_incremental_vacuum()
+    print("✅ Conversão só na manutenção explícita")
+    memory.close()
+
+def test_archive_old_digests():
+    """Testa o envio de resumos antigos para o arquivo compactado"""
+    print("📦 Testando arquivamento de resumos...")
+    memory = _create_memory()
+    _insert_exchanges(memory, "muito_antiga", 3, '-300 days')
+    
+    engine = MemoryRetentionEngine(memory, raw_days=30, archive_months=6, chunk_pause=0)
+    report = engine.run_once()
+    
+    assert report['sessions_compacted'] == 1
+    assert report['digests_archived'] == 1
+    assert _count(memory, 'conversation_digest') == 0
+    archived = engine.read_archive()
+    assert archived[0]['session_id'] == "muito_antiga"
+    assert archived[0]['exchange_count'] == 3
+    print(f"✅ Arquivo: {engine.archive_path}")
+    memory.close()
+
+def test_chunked_cleanup_counts_everything():
+    """Testa se cleanup_old_data soma conversas e fatos removidos"""
+    print("🧹 Testando limpeza em lotes...")
+    memory = _create_memory()
+    _insert_exchanges(memory, "antiga", 50, '-40 days')
+    with memory.pool.transaction('test') as cursor:
+        cursor.execute("""
+            INSERT INTO memory (fact, category, data, importance, created_at)
+            VALUES ('fato antigo', 'estado', '', 1, datetime('now', '-40 days'))
+        """)
+        
+    assert memory.cleanup_old_data(days=30) == 51
+    print("✅ 51 registros removidos")
+    memory.close()
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste do Motor de Retenção")
+    print("=" * 60)
+    
+    test_compact_old_sessions()
+    test_compact_old_rows_of_active_session()
+    test_vacuum_conversion_is_explicit()
+    test_archive_old_digests()
+    test_chunked_cleanup_counts_everything()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
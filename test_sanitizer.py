@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Teste da Limpeza de Markdown em Streaming do Jarvis
+Valida que a limpeza incremental produz o mesmo texto da limpeza completa
+"""
+
+import os
+import sys
+import re
+import ast
+import random
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_sanitizer import clean_segment, clean_markdown, StreamingMarkdownCleaner, SentenceBuffer
+
+SAMPLE_RESPONSE = """### Diagnóstico
+
+O **processador** está em *45%* e a memória em `62%`.
+
+---
+## Recomendações
+* Feche abas inativas do navegador.
+* Reinicie o `explorer.exe` se travar!
+Pronto, senhor."""
+
+CODE_RESPONSE = """**Exemplo**:
+```python
+for i in range(3):
+    print(i)
+```
+Pronto, senhor."""
+
+def _legacy_clean(response):
+    """Limpeza anterior do JarvisCore, usada como referência"""
+    cleaned = response.replace('###', '').replace('**', '').replace('---', '').replace('*', '').replace('`', '')
+    cleaned = re.sub(r'^#{1,6}\s+', '', cleaned, flags=re.MULTILINE)
+    cleaned = re.sub(r'^[-*]{3,}\s*$', '', cleaned, flags=re.MULTILINE)
+    cleaned = re.sub(r'\s+', ' ', cleaned)
+    return cleaned.strip()
+
+def _stream(text, sizes, keep_code_blocks=False):
+    """Limpa o texto em pedaços com os tamanhos informados"""
+    cleaner = StreamingMarkdownCleaner(keep_code_blocks=keep_code_blocks)
+    output, position = [], 0
+    for size in sizes:
+        output.append(cleaner.feed(text[position:position + size]))
+        position += size
+    output.append(cleaner.feed(text[position:]))
+    output.append(cleaner.flush())
+    return "".join(output)
+
+def test_stream_matches_full_cleaning():
+    """Testa que qualquer divisão em pedaços produz o mesmo resultado"""
+    print("🧹 Testando limpeza incremental...")
+    expected = clean_segment(SAMPLE_RESPONSE).strip()
+    assert '#' not in expected and '*' not in expected and '`' not in expected
+    
+    assert _stream(SAMPLE_RESPONSE, [1] * len(SAMPLE_RESPONSE)) == expected
+    
+    rng = random.Random(13)
+    for _ in range(200):
+        sizes = [rng.randint(1, 12) for _ in range(40)]
+        assert _stream(SAMPLE_RESPONSE, sizes) == expected
+    
+    # Cabeçalho que chega dividido no meio de uma linha não é removido
+    assert _stream("abc## x", [5]) == clean_segment("abc## x").strip()
+    print(f"✅ {len(expected)} caracteres limpos de forma idêntica")
+
+def test_full_cleaning_matches_legacy():
+    """Testa que clean_markdown mantém o resultado da limpeza anterior"""
+    print("🔁 Testando equivalência com a limpeza anterior...")
+    for text in [SAMPLE_RESPONSE, CODE_RESPONSE, "", "   ", "a  \n\n b", "#### título\n***\n-- -"]:
+        assert clean_markdown(text) == _legacy_clean(text)
+        assert clean_segment(text) == re.sub(r'\s+', ' ', clean_segment(text))
+    print("✅ Resultado idêntico ao anterior")
+
+def test_keep_code_blocks():
+    """Testa a preservação dos blocos de código, completa e em streaming"""
+    print("💻 Testando blocos de código...")
+    expected = "Exemplo:\n```python\nfor i in range(3):\n    print(i)\n```\nPronto, senhor."
+    assert clean_markdown(CODE_RESPONSE, keep_code_blocks=True) == expected
+    assert '```' not in clean_markdown(CODE_RESPONSE)
+    
+    rng = random.Random(7)
+    for _ in range(200):
+        sizes = [rng.randint(1, 8) for _ in range(30)]
+        assert _stream(CODE_RESPONSE, sizes, keep_code_blocks=True) == expected
+    print("✅ Blocos de código preservados")
+
+def test_sentence_buffer():
+    """Testa o agrupamento em frases para o TTS"""
+    print("🗣️ Testando divisão em frases...")
+    buffer = SentenceBuffer()
+    
+    assert buffer.feed("Olá, senhor") == []
+    assert buffer.feed(". Sistemas online! Tudo") == ["Olá, senhor.", "Sistemas online!"]
+    assert buffer.feed(" certo?") == []
+    assert buffer.flush() == ["Tudo certo?"]
+    assert buffer.flush() == []
+    print("✅ Frases entregues assim que completas")
+
+def _gui_method(path, name):
+    """Extrai um método da classe JarvisGUI sem importar a GUI (CustomTkinter, Gemini...)"""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), path), encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    gui_class = next(node for node in tree.body if isinstance(node, ast.ClassDef) and node.name == 'JarvisGUI')
+    return next((node for node in gui_class.body if isinstance(node, ast.FunctionDef) and node.name == name), None)
+
+def test_integrated_gui_cleans_markdown():
+    """Testa que a GUI integrada limpa o Markdown das respostas com o limpador compartilhado"""
+    print("🧩 Testando limpeza na GUI integrada...")
+    method = _gui_method('jarvis_gui_integrada.py', 'filter_ai_text')
+    assert method is not None, "_process_message chama self.filter_ai_text"
+    assert _gui_method('jarvis_gui_integrada.py', 'clear_chat') is not None
+    
+    namespace = {'clean_markdown': clean_markdown}
+    exec(compile(ast.Module(body=[method], type_ignores=[]), 'jarvis_gui_integrada.py', 'exec'), namespace)
+    cleaned = namespace['filter_ai_text'](None, SAMPLE_RESPONSE)
+    assert cleaned == clean_markdown(SAMPLE_RESPONSE)
+    assert '**' not in cleaned and '###' not in cleaned and '`' not in cleaned
+    print("✅ Resposta exibida sem Markdown")
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste da Limpeza de Markdown em Streaming")
+    print("=" * 60)
+    
+    test_stream_matches_full_cleaning()
+    test_full_cleaning_matches_legacy()
+    test_keep_code_blocks()
+    test_sentence_buffer()
+    test_integrated_gui_cleans_markdown()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
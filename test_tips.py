@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Teste do Armazenamento de Dicas do Jarvis
+Valida gravação append-only, busca indexada, retenção e migração do JSON
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_tips import TipStore
+
+def _paths():
+    """Caminhos JSONL e JSON legado em diretório temporário"""
+    temp_dir = tempfile.mkdtemp()
+    return os.path.join(temp_dir, 'memoria_jarvis.jsonl'), os.path.join(temp_dir, 'memoria_jarvis.json')
+
+def test_append_only_and_reload():
+    """Testa se cada dica acrescenta uma linha e sobrevive à reabertura"""
+    print("📝 Testando gravação append-only...")
+    path, legacy = _paths()
+    store = TipStore(path, legacy)
+    
+    store.add('dica', 'use sempre list comprehension', ['dica', 'python'])
+    store.add('erro', 'NameError: variável não definida', ['erro', 'debug'])
+    with open(path, encoding='utf-8') as f:
+        assert len(f.readlines()) == 2
+        
+    reopened = TipStore(path, legacy)
+    assert len(reopened) == 2
+    assert reopened.by_tag('python')[0]['conteudo'] == 'use sempre list comprehension'
+    print("✅ Entradas recarregadas do JSONL")
+
+def test_indexed_search():
+    """Testa busca por substring no conteúdo e nas tags"""
+    print("🔍 Testando busca indexada...")
+    path, legacy = _paths()
+    store = TipStore(path, legacy)
+    
+    store.add('dica', 'use sempre list comprehension', ['dica', 'python'])
+    store.add('dica', 'feche arquivos com with', ['dica', 'arquivos'])
+    store.add('erro', 'TypeError em list.append', ['erro', 'traceback'])
+    
+    results = store.search('list')
+    assert [r['kind'] for r in results] == ['erro', 'dica']
+    assert store.search('compreh')[0]['conteudo'] == 'use sempre list comprehension'
+    assert store.search('traceb')[0]['kind'] == 'erro'
+    assert store.search('list comprehension')[0]['tags'] == ['dica', 'python']
+    assert store.search('javascript') == []
+    print(f"✅ {len(results)} resultados para 'list'")
+
+def test_substring_index_matches_scan():
+    """Testa o índice de trechos contra a varredura do vocabulário e após remoções"""
+    print("🧩 Testando índice de substrings...")
+    path, legacy = _paths()
+    store = TipStore(path, legacy, limits={'dica': 50})
+    words = ['comprehension', 'compilador', 'traceback', 'recursão', 'lista', 'listener', 'py', 'x']
+    for i in range(200):
+        store.add('dica', f'{words[i % len(words)]} {words[(i * 3) % len(words)]} item{i}', ['dica'])
+        
+    for query in ['c', 'py', 'list', 'ompr', 'cursã', 'item19', 'item7', 'tracebacks', 'zzz']:
+        expected = {term for term in store._term_index if query in term}
+        assert store._matching_terms(query) == expected, query
+        
+    # Termos das dicas descartadas saem também do índice de trechos
+    assert store._matching_terms('item0') == set()
+    assert all(terms for terms in store._gram_index.values())
+    assert store.search('ompreh') and store.search('item199')[0]['conteudo'].endswith('item199')
+    print(f"✅ {len(store._gram_index)} trechos para {len(store._term_index)} termos")
+
+def test_retention_policy():
+    """Testa o limite configurável de dicas e a compactação do arquivo"""
+    print("🧹 Testando política de retenção...")
+    path, legacy = _paths()
+    store = TipStore(path, legacy, limits={'dica': 3})
+    
+    for i in range(120):
+        store.add('dica', f'dica número {i}', ['dica'])
+        
+    contents = [entry['conteudo'] for entry in store.all('dica')]
+    assert contents == ['dica número 117', 'dica número 118', 'dica número 119']
+    assert store.search('número 5') == []
+    
+    reopened = TipStore(path, legacy, limits={'dica': 3})
+    assert [entry['conteudo'] for entry in reopened.all()] == contents
+    with open(path, encoding='utf-8') as f:
+        assert len(f.readlines()) < 120
+    print(f"✅ Mantidas: {contents}")
+
+def test_legacy_migration():
+    """Testa a migração automática do memoria_jarvis.json"""
+    print("📦 Testando migração do JSON legado...")
+    path, legacy = _paths()
+    with open(legacy, 'w', encoding='utf-8') as f:
+        json.dump({
+            'dicas_importantes': [{'data': '2026-02-20T18:04:00', 'conteudo': 'sempre use try/except', 'tags': ['dica'], 'categoria': 'geral'}],
+            'erros_resolvidos': [{'data': '2026-02-20T18:04:17', 'tipo': 'debugging', 'analise': 'SyntaxError na linha 11', 'tags': ['erro']}]
+        }, f)
+        
+    store = TipStore(path, legacy)
+    assert len(store) == 2
+    assert store.search('syntaxerror')[0]['kind'] == 'erro'
+    assert os.path.exists(path)
+    assert not os.path.exists(legacy)
+    assert os.path.exists(legacy + '.migrado')
+    print("✅ JSON migrado para JSONL")
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste do Armazenamento de Dicas")
+    print("=" * 60)
+    
+    test_append_only_and_reload()
+    test_indexed_search()
+    test_substring_index_matches_scan()
+    test_retention_policy()
+    test_legacy_migration()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
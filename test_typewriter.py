@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Teste do Efeito de Digitação do Jarvis
+Valida o agrupamento por quadro, o envio só do trecho novo e a exibição imediata
+"""
+
+import os
+import sys
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jarvis_typewriter import TypewriterRenderer
+
+class FakeRoot:
+    """Janela Tk simulada: after() enfileira e run_frame() executa um quadro"""
+    
+    def __init__(self):
+        self.now = 0.0
+        self.pending = {}
+        self.next_id = 0
+        self.viewable = True
+    
+    def after(self, ms, callback):
+        self.next_id += 1
+        self.pending[self.next_id] = (ms, callback)
+        return self.next_id
+    
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+    
+    def winfo_viewable(self):
+        return self.viewable
+    
+    def run_frame(self):
+        """Avança o relógio e executa o próximo callback agendado"""
+        after_id = min(self.pending)
+        ms, callback = self.pending.pop(after_id)
+        self.now += ms / 1000
+        callback()
+
+def _renderer(root, **kwargs):
+    """Cria o renderizador registrando os trechos e o fim da mensagem"""
+    writes, done = [], []
+    renderer = TypewriterRenderer(root, writes.append, on_complete=lambda: done.append(True),
+                                  clock=lambda: root.now, **kwargs)
+    return renderer, writes, done
+
+def test_frames_batch_characters():
+    """Testa que cada quadro envia vários caracteres, apenas o trecho novo"""
+    print("⌨️ Testando agrupamento por quadro...")
+    root = FakeRoot()
+    renderer, writes, done = _renderer(root, fps=60, chars_per_second=600)
+    message = "Sistemas online, senhor. " * 8
+    
+    renderer.start(message)
+    while root.pending:
+        root.run_frame()
+    
+    assert "".join(writes) == message and done == [True]
+    assert not renderer.active
+    # 600 caracteres/s a 60 fps: cerca de 10 caracteres por chamada ao Tk
+    assert len(writes) <= len(message) // 8
+    print(f"✅ {len(message)} caracteres em {len(writes)} inserções")
+
+def test_long_or_hidden_is_instant():
+    """Testa a exibição imediata de textos longos ou com a janela oculta"""
+    print("⚡ Testando exibição imediata...")
+    root = FakeRoot()
+    renderer, writes, done = _renderer(root, instant_threshold=100)
+    renderer.start("x" * 500)
+    assert writes == ["x" * 500] and done == [True] and not root.pending
+    
+    root = FakeRoot()
+    renderer, writes, done = _renderer(root)
+    renderer.start("Olá, senhor. Tudo pronto.")
+    root.viewable = False
+    root.run_frame()
+    assert "".join(writes) == "Olá, senhor. Tudo pronto." and done == [True]
+    assert not root.pending
+    print("✅ Texto exibido de uma vez")
+
+def test_new_message_finishes_previous():
+    """Testa que uma nova mensagem completa a anterior antes de começar"""
+    print("🔁 Testando mensagens consecutivas...")
+    root = FakeRoot()
+    renderer, writes, done = _renderer(root, chars_per_second=60)
+    renderer.start("primeira resposta")
+    renderer.start("segunda")
+    while root.pending:
+        root.run_frame()
+    
+    assert "".join(writes) == "primeira respostasegunda"
+    assert done == [True, True]
+    print("✅ Mensagens exibidas em ordem, sem mistura")
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste do Efeito de Digitação")
+    print("=" * 60)
+    
+    test_frames_batch_characters()
+    test_long_or_hidden_is_instant()
+    test_new_message_finishes_previous()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()
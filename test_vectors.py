@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Teste do Índice Vetorial do Jarvis
+Valida embedder offline, busca por cosseno, persistência e integração
+"""
+
+import os
+import sys
+import tempfile
+
+# Adiciona o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from jarvis_vectors import HashingEmbedder, VectorIndex
+from jarvis_memory import MemoryManager
+from jarvis_retention import MemoryRetentionEngine
+from jarvis_tips import TipStore
+
+def test_hashing_embedder():
+    """Testa se o embedder é estável, normalizado e ignora acentos"""
+    print("🔢 Testando embedder por hashing...")
+    embedder = HashingEmbedder(dim=64)
+    
+    vectors = embedder.embed(["programação em Python", "programacao em python", ""])
+    assert vectors.shape == (3, 64)
+    assert abs(np.linalg.norm(vectors[0]) - 1.0) < 1e-5
+    assert np.allclose(vectors[0], vectors[1])
+    assert not vectors[2].any()
+    print("✅ Embeddings estáveis e normalizados")
+
+def test_search_and_persistence():
+    """Testa busca top-k e reabertura do índice a partir do disco"""
+    print("🔍 Testando busca e persistência...")
+    base = os.path.join(tempfile.mkdtemp(), 'memoria_vectors')
+    index = VectorIndex(base)
+    
+    index.add('fato', [("1", "gosto de café forte pela manhã"), ("2", "estudo engenharia de software")])
+    index.add('dica', [("3", "use list comprehension em python")])
+    
+    results = index.search("café da manhã", k=2)
+    assert results[0]['key'] == "1"
+    assert all(r['source'] == 'fato' for r in index.search("python", sources=['fato']))
+    index.close()
+    
+    reopened = VectorIndex(base)
+    assert len(reopened) == 3
+    assert reopened.search("list comprehension")[0]['key'] == "3"
+    print(f"✅ Resultados: {results}")
+    reopened.close()
+
+def test_growth_and_update():
+    """Testa o crescimento do arquivo e a atualização de chaves existentes"""
+    print("📈 Testando crescimento do índice...")
+    base = os.path.join(tempfile.mkdtemp(), 'memoria_vectors')
+    index = VectorIndex(base, HashingEmbedder(dim=32))
+    
+    items = [(str(i), f"item número {i}") for i in range(VectorIndex.INITIAL_CAPACITY + 10)]
+    assert index.add('fato', items) == len(items)
+    assert index.add('fato', items[:5]) == 0
+    assert index.add('fato', [("0", "texto alterado")]) == 1
+    assert len(index) == len(items)
+    index.close()
+    
+    reopened = VectorIndex(base, HashingEmbedder(dim=32))
+    assert len(reopened) == len(items)
+    assert reopened.search("texto alterado")[0]['key'] == "0"
+    print(f"✅ {len(reopened)} vetores após reabrir")
+    reopened.close()
+
+def test_remove_and_compact():
+    """Testa remoção com marcadores, persistência e compactação dos arquivos"""
+    print("🗑️ Testando remoção e compactação...")
+    base = os.path.join(tempfile.mkdtemp(), 'memoria_vectors')
+    index = VectorIndex(base, HashingEmbedder(dim=32))
+    
+    index.add('fato', [("1", "gosto de café forte"), ("2", "estudo engenharia de software")])
+    assert index.remove('fato', ["1", "inexistente"]) == 1
+    assert len(index) == 1
+    assert all(r['key'] != "1" for r in index.search("café forte"))
+    index.close()
+    
+    reopened = VectorIndex(base, HashingEmbedder(dim=32))
+    assert len(reopened) == 1
+    assert reopened.keys('fato') == ["2"]
+    
+    # Linhas mortas acima das vivas disparam a compactação
+    items = [(str(i), f"item número {i}") for i in range(VectorIndex.MIN_STALE_TO_COMPACT + 10)]
+    reopened.add('dica', items)
+    reopened.remove('dica', [key for key, _ in items])
+    with open(base + '.jsonl', 'r', encoding='utf-8') as f:
+        assert len(f.readlines()) == 1
+    assert reopened.search("estudo engenharia")[0]['key'] == "2"
+    print(f"✅ {len(reopened)} vetor vivo após compactar")
+    reopened.close()
+
+def test_forgotten_memories_leave_recall():
+    """Testa se dicas descartadas e conversas resumidas saem da busca semântica"""
+    print("🧽 Testando esquecimento no índice...")
+    temp_dir = tempfile.mkdtemp()
+    tip_store = TipStore(os.path.join(temp_dir, 'memoria_jarvis.jsonl'), legacy_path=None, limits={'dica': 1})
+    manager = MemoryManager(os.path.join(temp_dir, 'jarvis_memory.db'))
+    manager.index_tips(tip_store)
+    
+    tip_store.add('dica', 'sempre use try/except ao abrir arquivos', ['dica'])
+    tip_store.add('dica', 'prefira f-strings para formatar texto', ['dica'])
+    assert manager.memory.vector_index.keys('dica') == [f"dica:{tip_store.all()[0]['id']}"]
+    
+    manager.store_conversation("sessao", "qual o melhor time de xadrez", "O seu, mestre.")
+    manager.flush()
+    with manager.memory.pool.transaction('test') as cursor:
+        cursor.execute("UPDATE conversation_context SET created_at = datetime('now', '-40 days')")
+    MemoryRetentionEngine(manager.memory).run_once()
+    
+    assert not manager.recall("melhor time de xadrez", sources=['conversa'])
+    assert "xadrez" not in manager.get_context_for_ai("sessao", "time de xadrez")
+    print("✅ Dica descartada e conversa resumida fora do recall")
+    manager.close()
+
+def test_memory_manager_recall():
+    """Testa a integração com o MemoryManager e o contexto do prompt"""
+    print("🧠 Testando recall pelo MemoryManager...")
+    temp_dir = tempfile.mkdtemp()
+    tip_store = TipStore(os.path.join(temp_dir, 'memoria_jarvis.jsonl'), legacy_path=None)
+    tip_store.add('dica', 'sempre use try/except ao abrir arquivos', ['dica'])
+    
+    manager = MemoryManager(os.path.join(temp_dir, 'jarvis_memory.db'))
+    assert manager.index_tips(tip_store) == 1
+    tip_store.add('dica', 'prefira f-strings para formatar texto', ['dica'])
+    manager.store_conversation("sessao", "qual minha linguagem favorita", "Python, mestre.")
+    manager.memory.store_fact("gosto de jogar xadrez", "preferencia", 2)
+    manager.flush()
+    
+    assert os.path.exists(os.path.join(temp_dir, 'jarvis_memory_vectors.npy'))
+    assert manager.recall("xadrez")[0]['source'] == 'fato'
+    assert manager.recall("como abrir arquivos")[0]['source'] == 'dica'
+    assert manager.recall("formatar texto com f-strings")[0]['source'] == 'dica'
+    
+    context = manager.get_context_for_ai("sessao", "vamos jogar xadrez")
+    assert "MEMÓRIAS RELEVANTES" in context
+    assert "xadrez" in context
+    print(f"✅ Contexto:\n{context}")
+    manager.close()
+
+def main():
+    """Função principal de teste"""
+    print("🧪 J.A.R.V.I.S. - Teste do Índice Vetorial")
+    print("=" * 60)
+    
+    test_hashing_embedder()
+    test_search_and_persistence()
+    test_growth_and_update()
+    test_remove_and_compact()
+    test_forgotten_memories_leave_recall()
+    test_memory_manager_recall()
+    
+    print("\n✅ Testes concluídos!")
+
+if __name__ == "__main__":
+    main()